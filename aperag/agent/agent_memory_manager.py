@@ -66,16 +66,13 @@ class AgentMemoryManager:
 
         try:
             # Get recent messages from history
-            messages = await history.messages
+            # Each turn = user message + AI response, so we take last (context_limit * 2) messages
+            recent_messages = await history.tail(context_limit * 2)
 
-            if not messages:
+            if not recent_messages:
                 logger.debug("No history found, returning empty memory")
                 return memory
 
-            # Apply context limit - take the most recent conversation turns
-            # Each turn = user message + AI response, so we take last (context_limit * 2) messages
-            recent_messages = messages[-(context_limit * 2) :] if len(messages) > context_limit * 2 else messages
-
             logger.debug(f"Retrieved {len(recent_messages)} recent messages from history")
 
             # Use LangChain's official utility to convert messages to OpenAI format
@@ -116,14 +113,11 @@ class AgentMemoryManager:
         """
         try:
             # Get recent messages from history
-            messages = await history.messages
+            recent_messages = await history.tail(limit)
 
-            if not messages:
+            if not recent_messages:
                 return ""
 
-            # Convert to context format (limit to recent messages)
-            recent_messages = messages[-limit:] if len(messages) > limit else messages
-
             context_lines = []
             for message in recent_messages:
                 role = "User" if message.type == "human" else "Assistant"
@@ -37,7 +37,10 @@ from aperag.agent.agent_event_listener import agent_event_listener  # noqa: E402
 from aperag.agent.agent_session_manager_lifecycle import agent_session_manager_lifespan  # noqa: E402
 from aperag.exception_handlers import register_exception_handlers
 from aperag.llm.litellm_track import register_custom_llm_track
-from aperag.mcp import mcp_server
+from aperag.mcp import enable_in_process_mode, mcp_server
+from aperag.mcp.server import close_http_client
+from aperag.service.api_key_auth import api_key_usage_recorder
+from aperag.service.audit_service import audit_service
 from aperag.views.api_key import router as api_key_router
 from aperag.views.audit import router as audit_router
 from aperag.views.auth import router as auth_router
@@ -58,6 +61,8 @@ from aperag.views.web import router as web_router
 
 # Initialize MCP server integration with stateless HTTP to fix OpenAI tool call sequence issues
 mcp_app = mcp_server.http_app(path="/", stateless_http=True)
+# The MCP server is served by this application, so its search tools call the services directly
+enable_in_process_mode()
 
 
 # Combined lifespan function for both MCP and Agent session management
@@ -71,6 +76,9 @@ async def combined_lifespan(app: FastAPI):
         # Then start Agent session manager
         async with agent_session_manager_lifespan(app):
             yield
+    await close_http_client()
+    await api_key_usage_recorder.stop()
+    await audit_service.writer.stop()
 
 
 # Create the main FastAPI app with combined lifespan
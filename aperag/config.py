@@ -96,6 +96,17 @@ class Config(BaseSettings):
     logto_domain: str = Field("aperag.authing.cn", alias="LOGTO_DOMAIN")
     logto_app_id: str = Field("", alias="LOGTO_APP_ID")
 
+    # Seconds an authenticated API key is cached per process (0 = look it up on every request)
+    api_key_cache_ttl: int = Field(60, alias="API_KEY_CACHE_TTL")
+    # Seconds between batched writes of API key last-used times
+    api_key_last_used_flush_interval: float = Field(30, alias="API_KEY_LAST_USED_FLUSH_INTERVAL")
+
+    # Audit log: events are queued in memory and written in batches by a background task
+    audit_queue_size: int = Field(10000, alias="AUDIT_QUEUE_SIZE")
+    audit_batch_size: int = Field(200, alias="AUDIT_BATCH_SIZE")
+    # Seconds between writes of a partial batch
+    audit_flush_interval: float = Field(1.0, alias="AUDIT_FLUSH_INTERVAL")
+
     # Celery
     celery_broker_url: Optional[str] = Field(None, alias="CELERY_BROKER_URL")
     celery_result_backend: Optional[str] = None  # Will be set in __post_init__
@@ -111,6 +122,12 @@ class Config(BaseSettings):
 
     # Embedding
     embedding_max_chunks_in_batch: int = Field(10, alias="EMBEDDING_MAX_CHUNKS_IN_BATCH")
+    # Per-text embedding cache keyed on (provider, model, sha256(text))
+    embedding_cache_enabled: bool = Field(True, alias="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_local_size: int = Field(10000, alias="EMBEDDING_CACHE_LOCAL_SIZE")  # Max vectors in process LRU
+    embedding_cache_ttl: int = Field(7 * 86400, alias="EMBEDDING_CACHE_TTL")  # Redis TTL in seconds
+    # Redis tier of the embedding cache, defaults to a dedicated DB (2) on the main Redis
+    embedding_cache_redis_url: Optional[str] = Field(None, alias="EMBEDDING_CACHE_REDIS_URL")
 
     # Memory backend
     memory_redis_url: Optional[str] = Field(None, alias="MEMORY_REDIS_URL")
@@ -125,6 +142,16 @@ class Config(BaseSettings):
     object_store_type: str = Field("local", alias="OBJECT_STORE_TYPE")
     object_store_local_config: Optional[LocalObjectStoreConfig] = None
     object_store_s3_config: Optional[S3Config] = None
+    # Memory-map parsed document artifacts read from the local object store
+    parsed_artifact_mmap: bool = Field(True, alias="PARSED_ARTIFACT_MMAP")
+    # Processes rendering PDF pages to images while parsing a document, capped by the CPU count (1 = no pool)
+    pdf_render_workers: int = Field(4, alias="PDF_RENDER_WORKERS")
+    # Resolution of rendered PDF pages, unless the collection sets pdf_render_dpi
+    pdf_render_dpi: int = Field(72, alias="PDF_RENDER_DPI")
+    # Do not render PDF pages that have a text layer when the collection has no vision index
+    pdf_render_skip_text_pages: bool = Field(True, alias="PDF_RENDER_SKIP_TEXT_PAGES")
+    # Concurrent uploads of document assets (e.g. rendered pages) to the object store
+    asset_upload_concurrency: int = Field(8, alias="ASSET_UPLOAD_CONCURRENCY")
 
     # Limits
     max_bot_count: int = Field(10, alias="MAX_BOT_COUNT")
@@ -141,6 +168,30 @@ class Config(BaseSettings):
     es_host: Optional[str] = Field(None, alias="ES_HOST")
     es_timeout: int = Field(30, alias="ES_TIMEOUT")  # ES request timeout in seconds
     es_max_retries: int = Field(3, alias="ES_MAX_RETRIES")  # Max retries for ES requests
+    es_bulk_chunk_size: int = Field(500, alias="ES_BULK_CHUNK_SIZE")  # Max documents per bulk request
+    # Max bytes per bulk request
+    es_bulk_max_chunk_bytes: int = Field(10 * 1024 * 1024, alias="ES_BULK_MAX_CHUNK_BYTES")
+    # Disable index refresh while bulk indexing documents with at least this many chunks (0 = never)
+    es_bulk_disable_refresh_min_chunks: int = Field(0, alias="ES_BULK_DISABLE_REFRESH_MIN_CHUNKS")
+
+    # LightRAG instance pool (per process and event loop), 0 disables pooling
+    lightrag_pool_size: int = Field(32, alias="LIGHTRAG_POOL_SIZE")
+    # Seconds a pooled LightRAG instance is reused before it is rebuilt
+    lightrag_pool_ttl: int = Field(600, alias="LIGHTRAG_POOL_TTL")
+    # hnsw.ef_search used by LightRAG vector similarity queries, higher is more accurate and slower (0 = server default)
+    lightrag_hnsw_ef_search: int = Field(100, alias="LIGHTRAG_HNSW_EF_SEARCH")
+    # Comma separated embedding dimensions that get HNSW indexes on the LightRAG vector tables when migrating
+    lightrag_vector_index_dimensions: str = Field("1024,1536", alias="LIGHTRAG_VECTOR_INDEX_DIMENSIONS")
+    # Rows per multi-row INSERT (or per COPY) when upserting LightRAG chunks, entities and relations
+    lightrag_upsert_batch_size: int = Field(500, alias="LIGHTRAG_UPSERT_BATCH_SIZE")
+    # Upserts of at least this many rows are staged with COPY in a temp table (0 = never)
+    lightrag_upsert_copy_threshold: int = Field(2000, alias="LIGHTRAG_UPSERT_COPY_THRESHOLD")
+    # Seconds after which graph search is dropped from a search and the other results are returned (0 = no limit)
+    search_graph_timeout: float = Field(30, alias="SEARCH_GRAPH_TIMEOUT")
+    # Cut the first document that does not fit the LLM context at a sentence boundary instead of skipping it
+    llm_context_trim_sentences: bool = Field(False, alias="LLM_CONTEXT_TRIM_SENTENCES")
+    # Downscale images sent to vision LLMs to at most this many pixels per side (0 = send as stored)
+    llm_image_max_resolution: int = Field(0, alias="LLM_IMAGE_MAX_RESOLUTION")
 
     # LLM keyword extraction
     llm_keyword_extraction_provider: str = Field("", alias="LLM_KEYWORD_EXTRACTION_PROVIDER")
@@ -209,6 +260,11 @@ class Config(BaseSettings):
             self.memory_redis_url = (
                 f"redis://{self.redis_user}:{self.redis_password}@{self.redis_host}:{self.redis_port}/1"
             )
+        # EMBEDDING_CACHE_REDIS_URL
+        if self.embedding_cache_redis_url is None:
+            self.embedding_cache_redis_url = (
+                f"redis://{self.redis_user}:{self.redis_password}@{self.redis_host}:{self.redis_port}/2"
+            )
         # ES_HOST
         if not self.es_host:
             if self.es_user and self.es_password:
@@ -16,7 +16,7 @@ from abc import ABC
 from typing import Any, List, Optional
 
 from aperag.query.query import QueryWithEmbedding
-from aperag.vectorstore.connector import VectorStoreConnectorAdaptor
+from aperag.vectorstore.connector import get_vector_store_adaptor
 
 
 class ContextManager(ABC):
@@ -24,7 +24,7 @@ class ContextManager(ABC):
         self.collection_name = collection_name
         self.embedding_model = embedding_model
         self.vectordb_type = vectordb_type
-        self.adaptor = VectorStoreConnectorAdaptor(vectordb_type, vectordb_ctx)
+        self.adaptor = get_vector_store_adaptor(vectordb_type, vectordb_ctx)
 
     def query(self, query, score_threshold=0.5, topk=3, vector=None, index_types=None, chat_id=None):
         """
@@ -45,12 +45,30 @@ class ContextManager(ABC):
         if vector is None:
             vector = self.embedding_model.embed_query(query)
 
+        query_embedding, search_kwargs = self._build_search(query, score_threshold, topk, vector, index_types, chat_id)
+        results = self.adaptor.connector.search(query_embedding, **search_kwargs)
+        return results.results
+
+    async def aquery(self, query, score_threshold=0.5, topk=3, vector=None, index_types=None, chat_id=None):
+        """
+        Async version of query, for use from the event loop
+
+        Embeds the query (if no vector is given) and searches the vector store without blocking the loop.
+        Takes the same arguments and returns the same results as query.
+        """
+        if vector is None:
+            vector = await self.embedding_model.aembed_query(query)
+
+        query_embedding, search_kwargs = self._build_search(query, score_threshold, topk, vector, index_types, chat_id)
+        results = await self.adaptor.connector.asearch(query_embedding, **search_kwargs)
+        return results.results
+
+    def _build_search(self, query, score_threshold, topk, vector, index_types, chat_id):
         # Create filter based on index_types and chat_id if provided
         filter_condition = self._create_combined_filter(index_types, chat_id)
 
         query_embedding = QueryWithEmbedding(query=query, top_k=topk, embedding=vector)
-        results = self.adaptor.connector.search(
-            query_embedding,
+        search_kwargs = dict(
             collection_name=self.collection_name,
             query_vector=query_embedding.embedding,
             with_vectors=True,
@@ -60,7 +78,7 @@ class ContextManager(ABC):
             score_threshold=score_threshold,
             filter=filter_condition,
         )
-        return results.results
+        return query_embedding, search_kwargs
 
     def _create_index_types_filter(self, index_types: List[str]) -> Optional[Any]:
         """
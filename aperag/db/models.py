@@ -863,6 +863,13 @@ class LightRAGGraphNode(Base):
         Index("idx_lightrag_nodes_entity_type_createtime", "workspace", "entity_type", "createtime"),
         # Composite index for common query patterns
         Index("idx_lightrag_nodes_workspace_type_id", "workspace", "entity_type", "entity_id"),
+        # Trigram index for label search (requires the pg_trgm extension)
+        Index(
+            "idx_lightrag_nodes_entity_id_trgm",
+            "entity_id",
+            postgresql_using="gin",
+            postgresql_ops={"entity_id": "gin_trgm_ops"},
+        ),
     )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -22,6 +22,84 @@ from aperag.db.models import LightRAGGraphEdge, LightRAGGraphNode
 
 logger = logging.getLogger(__name__)
 
+LABEL_SEARCH_MODES = ("prefix", "fuzzy")
+
+# Columns of a subgraph node row, "n" is lightrag_graph_nodes
+_SUBGRAPH_NODE_COLUMNS = (
+    "n.entity_id, n.entity_name, n.entity_type, n.description, n.source_id, n.file_path, n.createtime"
+)
+
+# Nodes of a workspace by degree. "total" is the number of nodes before the limit.
+OVERVIEW_SQL = f"""
+    WITH degrees AS (
+        SELECT entity_id, COUNT(*) AS degree
+        FROM (
+            SELECT source_entity_id AS entity_id FROM lightrag_graph_edges WHERE workspace = :workspace
+            UNION ALL
+            SELECT target_entity_id FROM lightrag_graph_edges WHERE workspace = :workspace
+        ) endpoints
+        GROUP BY entity_id
+    )
+    SELECT {_SUBGRAPH_NODE_COLUMNS}, COALESCE(d.degree, 0) AS degree, COUNT(*) OVER () AS total
+    FROM lightrag_graph_nodes n
+    LEFT JOIN degrees d ON d.entity_id = n.entity_id
+    WHERE n.workspace = :workspace
+    ORDER BY degree DESC, n.entity_id
+    LIMIT :max_nodes
+"""
+
+# Bounded breadth-first search from the node labelled :label, or from the nodes whose label matches
+# :pattern when there is none. Nodes are kept by depth, then degree, and returned by degree.
+BFS_SUBGRAPH_SQL = f"""
+    WITH RECURSIVE seeds AS (
+        SELECT entity_id FROM lightrag_graph_nodes WHERE workspace = :workspace AND entity_id = :label
+        UNION ALL
+        (
+            SELECT entity_id FROM lightrag_graph_nodes
+            WHERE workspace = :workspace AND entity_id ILIKE :pattern
+              AND NOT EXISTS (
+                  SELECT 1 FROM lightrag_graph_nodes WHERE workspace = :workspace AND entity_id = :label
+              )
+            ORDER BY entity_id
+            LIMIT :max_nodes
+        )
+    ),
+    bfs(entity_id, depth) AS (
+        SELECT entity_id, 0 FROM seeds
+        UNION
+        SELECT neighbor.entity_id, b.depth + 1
+        FROM bfs b
+        CROSS JOIN LATERAL (
+            SELECT e.target_entity_id AS entity_id FROM lightrag_graph_edges e
+            WHERE e.workspace = :workspace AND e.source_entity_id = b.entity_id
+            UNION ALL
+            SELECT e.source_entity_id FROM lightrag_graph_edges e
+            WHERE e.workspace = :workspace AND e.target_entity_id = b.entity_id
+        ) neighbor
+        WHERE b.depth < :max_depth
+    ),
+    reached AS (
+        SELECT entity_id, MIN(depth) AS depth FROM bfs GROUP BY entity_id
+    ),
+    ranked AS (
+        SELECT {_SUBGRAPH_NODE_COLUMNS}, r.depth, d.degree, COUNT(*) OVER () AS total
+        FROM reached r
+        JOIN lightrag_graph_nodes n ON n.workspace = :workspace AND n.entity_id = r.entity_id
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS degree FROM lightrag_graph_edges e
+            WHERE e.workspace = :workspace AND (e.source_entity_id = r.entity_id OR e.target_entity_id = r.entity_id)
+        ) d
+        ORDER BY r.depth, d.degree DESC, n.entity_id
+        LIMIT :max_nodes
+    )
+    SELECT * FROM ranked
+    ORDER BY degree DESC, entity_id
+"""
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class GraphRepositoryMixin:
     """Graph Repository Mixin for LightRAG Graph operations using SQLAlchemy"""
@@ -314,6 +392,98 @@ class GraphRepositoryMixin:
 
         return self._execute_query(_get_labels)
 
+    def search_graph_labels(self, workspace: str, query: str, mode: str = "fuzzy", limit: int = 50) -> List[str]:
+        """
+        Search entity labels, backed by the pg_trgm GIN index on entity_id.
+
+        "prefix" matches labels starting with the query, "fuzzy" matches labels containing it or
+        trigram-similar to it, best matches first. An empty query returns the first labels by name.
+        """
+        if mode not in LABEL_SEARCH_MODES:
+            raise ValueError(f"Unsupported label search mode: {mode}")
+
+        def _search_labels(session):
+            entity_id = LightRAGGraphNode.entity_id
+            stmt = select(entity_id).where(LightRAGGraphNode.workspace == workspace)
+            if not query:
+                stmt = stmt.order_by(entity_id)
+            elif mode == "prefix":
+                stmt = stmt.where(entity_id.ilike(f"{escape_like(query)}%", escape="\\")).order_by(entity_id)
+            else:
+                contains = entity_id.ilike(f"%{escape_like(query)}%", escape="\\")
+                stmt = stmt.where(or_(contains, entity_id.op("%")(query))).order_by(
+                    contains.desc(), func.similarity(entity_id, query).desc(), entity_id
+                )
+
+            result = session.execute(stmt.limit(limit))
+            return [row[0] for row in result]
+
+        return self._execute_query(_search_labels)
+
+    def get_graph_subgraph(self, workspace: str, node_label: str, max_depth: int = 3, max_nodes: int = 1000):
+        """
+        Get a subgraph in one traversal query, nodes ordered by degree.
+
+        For "*" the best connected nodes of the workspace are returned. Otherwise a breadth-first search
+        (recursive CTE) starts from the node with that label, or from the nodes whose label contains it
+        when there is none, and keeps the max_nodes closest nodes, better connected ones first within a depth.
+
+        Returns:
+            Dict with "nodes" (node dicts with their "degree"), "edges" between those nodes and "is_truncated"
+        """
+
+        def _get_subgraph(session):
+            params = {"workspace": workspace, "max_nodes": max_nodes}
+            if node_label == "*":
+                query = OVERVIEW_SQL
+            else:
+                query = BFS_SUBGRAPH_SQL
+                params.update(label=node_label, pattern=f"%{escape_like(node_label)}%", max_depth=max_depth)
+
+            rows = session.execute(text(query), params).mappings().all()
+            nodes = []
+            for row in rows:
+                node_dict = {
+                    "entity_id": row["entity_id"],
+                    "entity_type": row["entity_type"],
+                    "description": row["description"],
+                    "source_id": row["source_id"],
+                    "file_path": row["file_path"],
+                    "created_at": int(row["createtime"].timestamp()) if row["createtime"] else None,
+                    "degree": row["degree"],
+                }
+                if row["entity_name"] and row["entity_name"] != row["entity_id"]:
+                    node_dict["entity_name"] = row["entity_name"]
+                nodes.append({k: v for k, v in node_dict.items() if v is not None})
+
+            edges = []
+            node_ids = [node["entity_id"] for node in nodes]
+            if node_ids:
+                stmt = select(LightRAGGraphEdge).where(
+                    LightRAGGraphEdge.workspace == workspace,
+                    LightRAGGraphEdge.source_entity_id.in_(node_ids),
+                    LightRAGGraphEdge.target_entity_id.in_(node_ids),
+                )
+                for edge in session.execute(stmt).scalars():
+                    edge_dict = {
+                        "source": edge.source_entity_id,
+                        "target": edge.target_entity_id,
+                        "weight": float(edge.weight) if edge.weight is not None else 0.0,
+                        "keywords": edge.keywords,
+                        "description": edge.description,
+                        "source_id": edge.source_id,
+                        "file_path": edge.file_path,
+                    }
+                    edges.append({k: v for k, v in edge_dict.items() if v is not None})
+
+            return {
+                "nodes": nodes,
+                "edges": edges,
+                "is_truncated": bool(rows) and rows[0]["total"] > len(rows),
+            }
+
+        return self._execute_query(_get_subgraph)
+
     def drop_graph_workspace(self, workspace: str) -> Dict[str, str]:
         """Drop all graph data for a workspace"""
 
@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from sqlalchemy import select
+import io
+import json
+from datetime import datetime
 
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from aperag.config import settings
 from aperag.db.models import (
     LightRAGDocChunksModel,
     LightRAGVDBEntityModel,
@@ -22,6 +28,201 @@ from aperag.db.models import (
 from aperag.db.repositories.base import SyncRepositoryProtocol
 from aperag.utils.utils import utc_now
 
+# Columns written by the upserts per table, in COPY order
+UPSERT_COLUMNS = {
+    "lightrag_doc_chunks": (
+        "workspace",
+        "id",
+        "tokens",
+        "chunk_order_index",
+        "full_doc_id",
+        "content",
+        "content_vector",
+        "file_path",
+        "create_time",
+        "update_time",
+    ),
+    "lightrag_vdb_entity": (
+        "workspace",
+        "id",
+        "entity_name",
+        "content",
+        "content_vector",
+        "chunk_ids",
+        "file_path",
+        "create_time",
+        "update_time",
+    ),
+    "lightrag_vdb_relation": (
+        "workspace",
+        "id",
+        "source_id",
+        "target_id",
+        "content",
+        "content_vector",
+        "chunk_ids",
+        "file_path",
+        "create_time",
+        "update_time",
+    ),
+}
+
+# Columns an upsert leaves alone on existing rows
+UPSERT_KEEP_COLUMNS = ("workspace", "id", "create_time")
+
+
+def prepare_upsert_rows(workspace: str, data: dict, columns: tuple) -> list:
+    now = utc_now()
+    rows = []
+    for item_id, item in data.items():
+        # Vectors may come as JSON strings
+        vector = item.get("content_vector")
+        if isinstance(vector, str):
+            vector = json.loads(vector)
+        elif hasattr(vector, "tolist"):
+            vector = vector.tolist()
+        row = {column: item.get(column) for column in columns}
+        row.update(
+            workspace=workspace,
+            id=item_id,
+            content=item.get("content", ""),
+            content_vector=vector,
+            create_time=now,
+            update_time=now,
+        )
+        rows.append(row)
+    return rows
+
+
+def build_upsert_stmt(model, rows: list):
+    """Multi-row INSERT ... ON CONFLICT, keeping the stored vector when a row has none"""
+    stmt = pg_insert(model).values(rows)
+    set_ = {column: stmt.excluded[column] for column in rows[0] if column not in UPSERT_KEEP_COLUMNS}
+    set_["content_vector"] = func.coalesce(stmt.excluded.content_vector, model.__table__.c.content_vector)
+    return stmt.on_conflict_do_update(index_elements=["workspace", "id"], set_=set_)
+
+
+def build_upsert_from_staging_sql(table: str, staging: str, columns: list) -> str:
+    updates = [
+        f"{column} = COALESCE(EXCLUDED.{column}, {table}.{column})"
+        if column == "content_vector"
+        else f"{column} = EXCLUDED.{column}"
+        for column in columns
+        if column not in UPSERT_KEEP_COLUMNS
+    ]
+    column_list = ", ".join(columns)
+    return (
+        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} "
+        f"ON CONFLICT (workspace, id) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+def _copy_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _array_element(value) -> str:
+    if value is None:
+        return "NULL"
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def copy_line(row: dict) -> str:
+    """Format a row for COPY ... FROM STDIN in text format"""
+    fields = []
+    for column, value in row.items():
+        if value is None:
+            fields.append("\\N")
+            continue
+        if column == "content_vector":
+            value = vector_literal(value)
+        elif isinstance(value, (list, tuple)):
+            value = "{" + ",".join(_array_element(v) for v in value) + "}"
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        fields.append(_copy_text(str(value)))
+    return "\t".join(fields) + "\n"
+
+
+# Result columns of the similarity queries per table, "t" is the queried table
+SIMILARITY_COLUMNS = {
+    "lightrag_doc_chunks": {
+        "id": "t.id",
+        "content": "t.content",
+        "file_path": "t.file_path",
+        "created_at": "EXTRACT(EPOCH FROM t.create_time)::BIGINT",
+    },
+    "lightrag_vdb_entity": {
+        "entity_name": "t.entity_name",
+        "created_at": "EXTRACT(EPOCH FROM t.create_time)::BIGINT",
+    },
+    "lightrag_vdb_relation": {
+        "src_id": "t.source_id",
+        "tgt_id": "t.target_id",
+        "created_at": "EXTRACT(EPOCH FROM t.create_time)::BIGINT",
+    },
+}
+
+
+def vector_literal(embedding) -> str:
+    """Format an embedding as a pgvector text literal, bound as a parameter and cast to vector in SQL"""
+    if hasattr(embedding, "tolist"):
+        embedding = embedding.tolist()
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+
+def vector_dimension(embeddings: list) -> int:
+    dimensions = {len(embedding) for embedding in embeddings}
+    if len(dimensions) != 1 or 0 in dimensions:
+        raise ValueError(f"Query embeddings must be non-empty and of the same dimension, got {sorted(dimensions)}")
+    return dimensions.pop()
+
+
+def build_similarity_sql(table: str, dimension: int, filter_doc_ids: bool, batch: bool = False) -> str:
+    """
+    Build a top-k cosine similarity query on a LightRAG vector table.
+
+    The vector columns have no fixed dimension, so the HNSW indexes are partial expression indexes on
+    content_vector::vector(<dimension>) (see the lightrag_hnsw_indexes migration). The query orders by
+    exactly that expression and limits before the threshold is applied, which lets the index drive the scan.
+    The batch form takes :query_vectors and runs the same scan once per vector through a LATERAL join.
+    """
+    columns = SIMILARITY_COLUMNS[table]
+    dimension = int(dimension)
+    query_vector = "q.query_vector" if batch else ":query_vector"
+    where = f"t.workspace = :workspace AND vector_dims(t.content_vector) = {dimension}"
+    if filter_doc_ids:
+        if table == "lightrag_doc_chunks":
+            where += " AND t.full_doc_id = ANY(:doc_ids)"
+        else:
+            where += (
+                " AND EXISTS (SELECT 1 FROM lightrag_doc_chunks c WHERE c.workspace = :workspace"
+                " AND c.full_doc_id = ANY(:doc_ids) AND c.id = ANY(t.chunk_ids))"
+            )
+    nearest = f"""
+        SELECT {", ".join(f"{expr} AS {name}" for name, expr in columns.items())},
+               t.content_vector::vector({dimension}) <=> CAST({query_vector} AS vector({dimension})) AS cosine_distance
+        FROM {table} t
+        WHERE {where}
+        ORDER BY cosine_distance
+        LIMIT :top_k"""
+    output = ", ".join(f"nearest.{name}" for name in columns)
+    # "distance" is the cosine similarity, kept under the name callers already use
+    if batch:
+        return f"""
+    SELECT q.ord - 1 AS query_index, {output}, 1 - nearest.cosine_distance AS distance
+    FROM unnest(CAST(:query_vectors AS text[])) WITH ORDINALITY AS q(query_vector, ord)
+    CROSS JOIN LATERAL ({nearest}
+    ) nearest
+    WHERE 1 - nearest.cosine_distance > :threshold
+    ORDER BY q.ord, nearest.cosine_distance"""
+    return f"""
+    SELECT {output}, 1 - nearest.cosine_distance AS distance
+    FROM ({nearest}
+    ) nearest
+    WHERE 1 - nearest.cosine_distance > :threshold
+    ORDER BY nearest.cosine_distance"""
+
 
 class LightragRepositoryMixin(SyncRepositoryProtocol):
     # LightRAG Doc Chunks Operations
@@ -76,55 +277,9 @@ class LightragRepositoryMixin(SyncRepositoryProtocol):
         return self._execute_query(_query)
 
     def upsert_lightrag_doc_chunks(self, workspace: str, chunks_data: dict):
-        """Upsert LightRAG document chunks records using PostgreSQL UPSERT"""
-
-        def _operation(session):
-            for chunk_id, chunk_data in chunks_data.items():
-                # Prepare vector data - convert from JSON string if needed
-                vector_data = chunk_data.get("content_vector")
-                if isinstance(vector_data, str):
-                    import json
-
-                    vector_data = json.loads(vector_data)
-
-                # Use raw SQL UPSERT to avoid race conditions
-                sql = """
-                INSERT INTO lightrag_doc_chunks (workspace, id, tokens, chunk_order_index, full_doc_id, content, content_vector, file_path, create_time, update_time)
-                VALUES (:workspace, :id, :tokens, :chunk_order_index, :full_doc_id, :content, :content_vector, :file_path, :create_time, :update_time)
-                ON CONFLICT (workspace, id) DO UPDATE SET
-                    tokens = EXCLUDED.tokens,
-                    chunk_order_index = EXCLUDED.chunk_order_index,
-                    full_doc_id = EXCLUDED.full_doc_id,
-                    content = EXCLUDED.content,
-                    content_vector = CASE 
-                        WHEN EXCLUDED.content_vector IS NOT NULL THEN EXCLUDED.content_vector 
-                        ELSE lightrag_doc_chunks.content_vector 
-                    END,
-                    file_path = EXCLUDED.file_path,
-                    update_time = EXCLUDED.update_time
-                """
-
-                from sqlalchemy import text
-
-                session.execute(
-                    text(sql),
-                    {
-                        "workspace": workspace,
-                        "id": chunk_id,
-                        "tokens": chunk_data.get("tokens"),
-                        "chunk_order_index": chunk_data.get("chunk_order_index"),
-                        "full_doc_id": chunk_data.get("full_doc_id"),
-                        "content": chunk_data.get("content", ""),
-                        "content_vector": vector_data,
-                        "file_path": chunk_data.get("file_path"),
-                        "create_time": utc_now(),
-                        "update_time": utc_now(),
-                    },
-                )
-
-            session.commit()
-
-        return self._execute_transaction(_operation)
+        """Upsert LightRAG document chunks records in bulk using PostgreSQL UPSERT"""
+        rows = prepare_upsert_rows(workspace, chunks_data, UPSERT_COLUMNS["lightrag_doc_chunks"])
+        return self._bulk_upsert_lightrag_rows(LightRAGDocChunksModel, rows)
 
     def delete_lightrag_doc_chunks(self, workspace: str, chunk_ids: list):
         """Delete LightRAG document chunks records"""
@@ -157,53 +312,9 @@ class LightragRepositoryMixin(SyncRepositoryProtocol):
         return self._execute_query(_query)
 
     def upsert_lightrag_vdb_entity(self, workspace: str, entity_data: dict):
-        """Upsert LightRAG VDB Entity records using PostgreSQL UPSERT"""
-
-        def _operation(session):
-            for entity_id, entity_info in entity_data.items():
-                # Prepare vector data - convert from JSON string if needed
-                vector_data = entity_info.get("content_vector")
-                if isinstance(vector_data, str):
-                    import json
-
-                    vector_data = json.loads(vector_data)
-
-                # Use raw SQL UPSERT to avoid race conditions
-                sql = """
-                INSERT INTO lightrag_vdb_entity (workspace, id, entity_name, content, content_vector, chunk_ids, file_path, create_time, update_time)
-                VALUES (:workspace, :id, :entity_name, :content, :content_vector, :chunk_ids, :file_path, :create_time, :update_time)
-                ON CONFLICT (workspace, id) DO UPDATE SET
-                    entity_name = EXCLUDED.entity_name,
-                    content = EXCLUDED.content,
-                    content_vector = CASE 
-                        WHEN EXCLUDED.content_vector IS NOT NULL THEN EXCLUDED.content_vector 
-                        ELSE lightrag_vdb_entity.content_vector 
-                    END,
-                    chunk_ids = EXCLUDED.chunk_ids,
-                    file_path = EXCLUDED.file_path,
-                    update_time = EXCLUDED.update_time
-                """
-
-                from sqlalchemy import text
-
-                session.execute(
-                    text(sql),
-                    {
-                        "workspace": workspace,
-                        "id": entity_id,
-                        "entity_name": entity_info.get("entity_name"),
-                        "content": entity_info.get("content", ""),
-                        "content_vector": vector_data,
-                        "chunk_ids": entity_info.get("chunk_ids"),
-                        "file_path": entity_info.get("file_path"),
-                        "create_time": utc_now(),
-                        "update_time": utc_now(),
-                    },
-                )
-
-            session.commit()
-
-        return self._execute_transaction(_operation)
+        """Upsert LightRAG VDB Entity records in bulk using PostgreSQL UPSERT"""
+        rows = prepare_upsert_rows(workspace, entity_data, UPSERT_COLUMNS["lightrag_vdb_entity"])
+        return self._bulk_upsert_lightrag_rows(LightRAGVDBEntityModel, rows)
 
     def delete_lightrag_vdb_entity(self, workspace: str, entity_ids: list):
         """Delete LightRAG VDB Entity records"""
@@ -236,55 +347,9 @@ class LightragRepositoryMixin(SyncRepositoryProtocol):
         return self._execute_query(_query)
 
     def upsert_lightrag_vdb_relation(self, workspace: str, relation_data: dict):
-        """Upsert LightRAG VDB Relation records using PostgreSQL UPSERT"""
-
-        def _operation(session):
-            for relation_id, relation_info in relation_data.items():
-                # Prepare vector data - convert from JSON string if needed
-                vector_data = relation_info.get("content_vector")
-                if isinstance(vector_data, str):
-                    import json
-
-                    vector_data = json.loads(vector_data)
-
-                # Use raw SQL UPSERT to avoid race conditions
-                sql = """
-                INSERT INTO lightrag_vdb_relation (workspace, id, source_id, target_id, content, content_vector, chunk_ids, file_path, create_time, update_time)
-                VALUES (:workspace, :id, :source_id, :target_id, :content, :content_vector, :chunk_ids, :file_path, :create_time, :update_time)
-                ON CONFLICT (workspace, id) DO UPDATE SET
-                    source_id = EXCLUDED.source_id,
-                    target_id = EXCLUDED.target_id,
-                    content = EXCLUDED.content,
-                    content_vector = CASE 
-                        WHEN EXCLUDED.content_vector IS NOT NULL THEN EXCLUDED.content_vector 
-                        ELSE lightrag_vdb_relation.content_vector 
-                    END,
-                    chunk_ids = EXCLUDED.chunk_ids,
-                    file_path = EXCLUDED.file_path,
-                    update_time = EXCLUDED.update_time
-                """
-
-                from sqlalchemy import text
-
-                session.execute(
-                    text(sql),
-                    {
-                        "workspace": workspace,
-                        "id": relation_id,
-                        "source_id": relation_info.get("source_id"),
-                        "target_id": relation_info.get("target_id"),
-                        "content": relation_info.get("content", ""),
-                        "content_vector": vector_data,
-                        "chunk_ids": relation_info.get("chunk_ids"),
-                        "file_path": relation_info.get("file_path"),
-                        "create_time": utc_now(),
-                        "update_time": utc_now(),
-                    },
-                )
-
-            session.commit()
-
-        return self._execute_transaction(_operation)
+        """Upsert LightRAG VDB Relation records in bulk using PostgreSQL UPSERT"""
+        rows = prepare_upsert_rows(workspace, relation_data, UPSERT_COLUMNS["lightrag_vdb_relation"])
+        return self._bulk_upsert_lightrag_rows(LightRAGVDBRelationModel, rows)
 
     def delete_lightrag_vdb_relation(self, workspace: str, relation_ids: list):
         """Delete LightRAG VDB Relation records"""
@@ -303,177 +368,112 @@ class LightragRepositoryMixin(SyncRepositoryProtocol):
 
         return self._execute_transaction(_operation)
 
-    # Add vector similarity search methods
-    def query_lightrag_doc_chunks_similarity(
-        self, workspace: str, embedding: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
-    ):
-        """Query similar document chunks using vector similarity"""
+    def _bulk_upsert_lightrag_rows(self, model, rows: list):
+        """
+        Upsert rows with one multi-row INSERT ... ON CONFLICT per batch, or for large loads by
+        COPYing them into a temp table and upserting from it with a single INSERT ... SELECT
+        """
+        if not rows:
+            return
 
-        def _query(session):
-            from sqlalchemy import text
-
-            # Convert embedding to PostgreSQL array format
-            embedding_string = ",".join(map(str, embedding))
-
-            if doc_ids:
-                # Query with document ID filter
-                sql = text(
-                    """
-                    WITH relevant_chunks AS (
-                        SELECT id as chunk_id
-                        FROM lightrag_doc_chunks
-                        WHERE workspace = :workspace AND full_doc_id = ANY(:doc_ids)
-                    )
-                    SELECT id, content, file_path, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at,
-                           1 - (content_vector <=> '[:embedding]'::vector) as distance
-                    FROM lightrag_doc_chunks
-                    WHERE workspace = :workspace
-                    AND id IN (SELECT chunk_id FROM relevant_chunks)
-                    AND 1 - (content_vector <=> '[:embedding]'::vector) > :threshold
-                    ORDER BY distance DESC
-                    LIMIT :top_k
-                """.replace(":embedding", embedding_string)
-                )
-
-                result = session.execute(
-                    sql, {"workspace": workspace, "doc_ids": doc_ids, "threshold": threshold, "top_k": top_k}
-                )
+        def _operation(session):
+            batch_size = max(settings.lightrag_upsert_batch_size, 1)
+            copy_threshold = settings.lightrag_upsert_copy_threshold
+            if copy_threshold > 0 and len(rows) >= copy_threshold:
+                table = model.__tablename__
+                staging = f"tmp_{table}_upsert"
+                columns = list(rows[0])
+                session.execute(text(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+                cursor = session.connection().connection.cursor()
+                try:
+                    for start in range(0, len(rows), batch_size):
+                        buffer = io.StringIO("".join(copy_line(row) for row in rows[start : start + batch_size]))
+                        cursor.copy_expert(f"COPY {staging} ({', '.join(columns)}) FROM STDIN", buffer)
+                finally:
+                    cursor.close()
+                session.execute(text(build_upsert_from_staging_sql(table, staging, columns)))
             else:
-                # Query without document ID filter
-                sql = text(
-                    """
-                    SELECT id, content, file_path, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at,
-                           1 - (content_vector <=> '[:embedding]'::vector) as distance
-                    FROM lightrag_doc_chunks
-                    WHERE workspace = :workspace
-                    AND 1 - (content_vector <=> '[:embedding]'::vector) > :threshold
-                    ORDER BY distance DESC
-                    LIMIT :top_k
-                """.replace(":embedding", embedding_string)
-                )
-
-                result = session.execute(sql, {"workspace": workspace, "threshold": threshold, "top_k": top_k})
+                for start in range(0, len(rows), batch_size):
+                    session.execute(build_upsert_stmt(model, rows[start : start + batch_size]))
+            session.commit()
 
-            # Properly convert SQLAlchemy Row objects to dictionaries
-            return [dict(row._mapping) for row in result]
+        return self._execute_transaction(_operation)
 
-        return self._execute_query(_query)
+    # Vector similarity search methods
+    def query_lightrag_doc_chunks_similarity(
+        self, workspace: str, embedding: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
+    ):
+        """Query similar document chunks using vector similarity"""
+        return self._query_lightrag_similarity(
+            "lightrag_doc_chunks", workspace, [embedding], top_k, doc_ids, threshold
+        )[0]
 
     def query_lightrag_vdb_entity_similarity(
         self, workspace: str, embedding: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
     ):
         """Query similar entities using vector similarity"""
-
-        def _query(session):
-            from sqlalchemy import text
-
-            # Convert embedding to PostgreSQL array format
-            embedding_string = ",".join(map(str, embedding))
-
-            if doc_ids:
-                # Query with document ID filter
-                sql = text(
-                    """
-                    WITH relevant_chunks AS (
-                        SELECT id as chunk_id
-                        FROM lightrag_doc_chunks
-                        WHERE workspace = :workspace AND full_doc_id = ANY(:doc_ids)
-                    )
-                    SELECT entity_name, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at,
-                           1 - (content_vector <=> '[:embedding]'::vector) as distance
-                    FROM lightrag_vdb_entity e
-                    WHERE e.workspace = :workspace
-                    AND EXISTS (
-                        SELECT 1 FROM relevant_chunks rc 
-                        WHERE rc.chunk_id = ANY(e.chunk_ids)
-                    )
-                    AND 1 - (content_vector <=> '[:embedding]'::vector) > :threshold
-                    ORDER BY distance DESC
-                    LIMIT :top_k
-                """.replace(":embedding", embedding_string)
-                )
-
-                result = session.execute(
-                    sql, {"workspace": workspace, "doc_ids": doc_ids, "threshold": threshold, "top_k": top_k}
-                )
-            else:
-                # Query without document ID filter
-                sql = text(
-                    """
-                    SELECT entity_name, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at,
-                           1 - (content_vector <=> '[:embedding]'::vector) as distance
-                    FROM lightrag_vdb_entity
-                    WHERE workspace = :workspace
-                    AND 1 - (content_vector <=> '[:embedding]'::vector) > :threshold
-                    ORDER BY distance DESC
-                    LIMIT :top_k
-                """.replace(":embedding", embedding_string)
-                )
-
-                result = session.execute(sql, {"workspace": workspace, "threshold": threshold, "top_k": top_k})
-
-            # Properly convert SQLAlchemy Row objects to dictionaries
-            return [dict(row._mapping) for row in result]
-
-        return self._execute_query(_query)
+        return self._query_lightrag_similarity(
+            "lightrag_vdb_entity", workspace, [embedding], top_k, doc_ids, threshold
+        )[0]
 
     def query_lightrag_vdb_relation_similarity(
         self, workspace: str, embedding: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
     ):
         """Query similar relations using vector similarity"""
+        return self._query_lightrag_similarity(
+            "lightrag_vdb_relation", workspace, [embedding], top_k, doc_ids, threshold
+        )[0]
 
-        def _query(session):
-            from sqlalchemy import text
-
-            # Convert embedding to PostgreSQL array format
-            embedding_string = ",".join(map(str, embedding))
-
-            if doc_ids:
-                # Query with document ID filter
-                sql = text(
-                    """
-                    WITH relevant_chunks AS (
-                        SELECT id as chunk_id
-                        FROM lightrag_doc_chunks
-                        WHERE workspace = :workspace AND full_doc_id = ANY(:doc_ids)
-                    )
-                    SELECT source_id as src_id, target_id as tgt_id, 
-                           EXTRACT(EPOCH FROM create_time)::BIGINT as created_at,
-                           1 - (content_vector <=> '[:embedding]'::vector) as distance
-                    FROM lightrag_vdb_relation r
-                    WHERE r.workspace = :workspace
-                    AND EXISTS (
-                        SELECT 1 FROM relevant_chunks rc 
-                        WHERE rc.chunk_id = ANY(r.chunk_ids)
-                    )
-                    AND 1 - (content_vector <=> '[:embedding]'::vector) > :threshold
-                    ORDER BY distance DESC
-                    LIMIT :top_k
-                """.replace(":embedding", embedding_string)
-                )
+    def query_lightrag_doc_chunks_similarity_batch(
+        self, workspace: str, embeddings: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
+    ):
+        """Query similar document chunks for several query embeddings in one round trip, one result list per query"""
+        return self._query_lightrag_similarity("lightrag_doc_chunks", workspace, embeddings, top_k, doc_ids, threshold)
 
-                result = session.execute(
-                    sql, {"workspace": workspace, "doc_ids": doc_ids, "threshold": threshold, "top_k": top_k}
-                )
-            else:
-                # Query without document ID filter
-                sql = text(
-                    """
-                    SELECT source_id as src_id, target_id as tgt_id,
-                           EXTRACT(EPOCH FROM create_time)::BIGINT as created_at,
-                           1 - (content_vector <=> '[:embedding]'::vector) as distance
-                    FROM lightrag_vdb_relation
-                    WHERE workspace = :workspace
-                    AND 1 - (content_vector <=> '[:embedding]'::vector) > :threshold
-                    ORDER BY distance DESC
-                    LIMIT :top_k
-                """.replace(":embedding", embedding_string)
-                )
+    def query_lightrag_vdb_entity_similarity_batch(
+        self, workspace: str, embeddings: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
+    ):
+        """Query similar entities for several query embeddings in one round trip, one result list per query"""
+        return self._query_lightrag_similarity("lightrag_vdb_entity", workspace, embeddings, top_k, doc_ids, threshold)
+
+    def query_lightrag_vdb_relation_similarity_batch(
+        self, workspace: str, embeddings: list, top_k: int, doc_ids: list = None, threshold: float = 0.2
+    ):
+        """Query similar relations for several query embeddings in one round trip, one result list per query"""
+        return self._query_lightrag_similarity(
+            "lightrag_vdb_relation", workspace, embeddings, top_k, doc_ids, threshold
+        )
+
+    def _query_lightrag_similarity(
+        self, table: str, workspace: str, embeddings: list, top_k: int, doc_ids: list, threshold: float
+    ) -> list:
+        if not embeddings:
+            return []
+        query_vectors = [vector_literal(embedding) for embedding in embeddings]
+        dimension = vector_dimension(embeddings)
+        sql = text(build_similarity_sql(table, dimension, bool(doc_ids), batch=len(embeddings) > 1))
+        params = {"workspace": workspace, "top_k": top_k, "threshold": threshold}
+        if doc_ids:
+            params["doc_ids"] = doc_ids
+        if len(embeddings) > 1:
+            params["query_vectors"] = query_vectors
+        else:
+            params["query_vector"] = query_vectors[0]
 
-                result = session.execute(sql, {"workspace": workspace, "threshold": threshold, "top_k": top_k})
+        def _query(session):
+            if settings.lightrag_hnsw_ef_search > 0:
+                # Local to the current transaction
+                session.execute(
+                    text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                    {"ef_search": str(settings.lightrag_hnsw_ef_search)},
+                )
+            result = session.execute(sql, params)
 
-            # Properly convert SQLAlchemy Row objects to dictionaries
-            return [dict(row._mapping) for row in result]
+            results = [[] for _ in embeddings]
+            for row in result:
+                row = dict(row._mapping)
+                results[row.pop("query_index", 0)].append(row)
+            return results
 
         return self._execute_query(_query)
 
@@ -302,59 +302,91 @@ class SimpleSemanticSplitter:
         [" ", "\t"],
     ]
 
+    # Bound of the difference between the token count of a concatenation and the sum of the token counts of its
+    # two parts, e.g. when BPE merges differ across the boundary. Merges whose size is within this margin of
+    # `chunk_size` are counted exactly.
+    CONCAT_TOKEN_SLACK = 4
+
     def __init__(self, tokenizer: Callable[[str], List[int]]):
         self.tokenizer = tokenizer
 
     def split(self, s: str, chunk_size: int, chunk_overlap: int) -> list[str]:
         return self._recursive_split(s, chunk_size, chunk_overlap, 0)
 
+    def _count_tokens(self, s: str) -> int:
+        return len(self.tokenizer(s))
+
     def _fit(self, s: str, chunk_size: int) -> bool:
-        return len(self.tokenizer(s)) <= chunk_size
+        return self._count_tokens(s) <= chunk_size
 
     def _recursive_split(self, s: str, chunk_size: int, chunk_overlap: int, level: int) -> list[str]:
+        return [chunk for chunk, _, _ in self._split(s, chunk_size, chunk_overlap, level)]
+
+    def _split(self, s: str, chunk_size: int, chunk_overlap: int, level: int) -> list[tuple[str, int, int]]:
+        """Split `s` like `_recursive_split`, returning each chunk with lower and upper bounds of its token count"""
         if len(s) == 0:
             return []
-        if len(s) <= 1 or self._fit(s, chunk_size):
-            return [s]
+        tokens = self._count_tokens(s)
+        if len(s) <= 1 or tokens <= chunk_size:
+            return [(s, tokens, tokens)]
 
-        # No more separators can guide semantic segmentation, so split arbitrarily.
-        if level >= len(self.LEVELED_SEPARATORS):
-            p = len(s) // 2
-            left = self._recursive_split(s[:p], chunk_size, chunk_overlap, level + 1)
-            overlap = ""
-            if chunk_overlap > 0:
-                # Extract a substring with size `chunk_overlap` from the right side of the left part (`s[:p]`)
-                # to serve as `overlap`.
-                # However, `overlap` cannot be equal to `s[:p]`, otherwise the algorithm won't converge.
-                # Therefore, use the right half of `s[:p]` for splitting to ensure `overlap` is not equal to `s[:p]`.
-                mid = p // 2
-                if mid > 0:
-                    overlap = self._cut_right_side(s[:p][mid:], chunk_overlap)
-            right = self._recursive_split(overlap + s[p:], chunk_size, chunk_overlap, level + 1)
-            return left + right
+        # A level whose separators do not occur in `s` leaves it whole and merges the pieces from the levels
+        # below once more. Go straight to the first level that splits `s`, and repeat the merges of the skipped
+        # levels afterwards, stopping as soon as one changes nothing.
+        chunks = [s]
+        skipped_levels = 0
+        while level < len(self.LEVELED_SEPARATORS):
+            chunks = self._split_by_separators(s, self.LEVELED_SEPARATORS[level])
+            if len(chunks) > 1:
+                break
+            level += 1
+            skipped_levels += 1
 
+        if level >= len(self.LEVELED_SEPARATORS):
+            pieces = self._split_arbitrarily(s, chunk_size, chunk_overlap, level)
+        else:
+            pieces = []
+            for chunk in chunks:
+                # If a chunk `chunk` is larger than `chunk_size`, it will be further split into smaller pieces;
+                # otherwise, it remains unchanged.
+                pieces.extend(self._split(chunk, chunk_size, chunk_overlap, level + 1))
+            # Merge small pieces into larger chunks, ensuring they fit within `chunk_size`.
+            pieces = self._merge_pieces(pieces, chunk_size)
+
+        for _ in range(skipped_levels):
+            merged = self._merge_pieces(pieces, chunk_size)
+            if len(merged) == len(pieces):
+                break
+            pieces = merged
+        return pieces
+
+    def _split_by_separators(self, s: str, separators: list[str]) -> list[str]:
         chunks = [s]
-        for sep in self.LEVELED_SEPARATORS[level]:
+        for sep in separators:
             new_chunks = []
             for chunk in chunks:
                 parts = chunk.split(sep)
                 new_chunks.extend([part + sep for part in parts[:-1]])
                 new_chunks.append(parts[-1])
             chunks = new_chunks
-
-        new_chunks = []
-        for chunk in chunks:
-            # If a chunk `chunk` is larger than `chunk_size`, it will be further split into smaller pieces;
-            # otherwise, it remains unchanged.
-            parts = self._recursive_split(chunk, chunk_size, chunk_overlap, level + 1)
-            new_chunks.extend(parts)
-        chunks = new_chunks
-
-        # Merge small pieces into larger chunks, ensuring they fit within `chunk_size`.
-        chunks = self._merge_small_chunks(chunks, chunk_size)
-
         return chunks
 
+    def _split_arbitrarily(self, s: str, chunk_size: int, chunk_overlap: int, level: int) -> list[tuple[str, int, int]]:
+        # No more separators can guide semantic segmentation, so split arbitrarily.
+        p = len(s) // 2
+        left = self._split(s[:p], chunk_size, chunk_overlap, level + 1)
+        overlap = ""
+        if chunk_overlap > 0:
+            # Extract a substring with size `chunk_overlap` from the right side of the left part (`s[:p]`)
+            # to serve as `overlap`.
+            # However, `overlap` cannot be equal to `s[:p]`, otherwise the algorithm won't converge.
+            # Therefore, use the right half of `s[:p]` for splitting to ensure `overlap` is not equal to `s[:p]`.
+            mid = p // 2
+            if mid > 0:
+                overlap = self._cut_right_side(s[:p][mid:], chunk_overlap)
+        right = self._split(overlap + s[p:], chunk_size, chunk_overlap, level + 1)
+        return left + right
+
     def _cut_right_side(self, s: str, chunk_size: int) -> str:
         if len(s) == 0 or self._fit(s, chunk_size):
             return s
@@ -371,17 +403,39 @@ class SimpleSemanticSplitter:
         return s[left:]
 
     def _merge_small_chunks(self, chunks: list[str], chunk_size: int) -> list[str]:
-        merged_chunks = []
-        current_chunk = ""
+        pieces = []
         for chunk in chunks:
-            if len(current_chunk) == 0:
-                current_chunk = chunk
+            tokens = self._count_tokens(chunk)
+            pieces.append((chunk, tokens, tokens))
+        return [chunk for chunk, _, _ in self._merge_pieces(pieces, chunk_size)]
+
+    def _merge_pieces(self, pieces: list[tuple[str, int, int]], chunk_size: int) -> list[tuple[str, int, int]]:
+        """
+        Greedily merge consecutive pieces while the merged text fits within `chunk_size`.
+
+        Each piece comes with a lower and an upper bound of its token count. The text of the current chunk is
+        only tokenized when the bounds cannot tell whether the next piece fits, so that neither small pieces
+        (e.g. words) nor pieces that are far too large cost a tokenization of the whole chunk each.
+        """
+        merged = []
+        current: list[str] = []
+        current_len = 0
+        lower = upper = 0
+        for piece, piece_lower, piece_upper in pieces:
+            if current_len == 0:
+                current, current_len, lower, upper = [piece], len(piece), piece_lower, piece_upper
                 continue
-            if self._fit(current_chunk + chunk, chunk_size):
-                current_chunk += chunk
+            merged_lower = max(lower + piece_lower - self.CONCAT_TOKEN_SLACK, 0)
+            merged_upper = upper + piece_upper + self.CONCAT_TOKEN_SLACK
+            if merged_upper > chunk_size and merged_lower <= chunk_size:
+                merged_lower = merged_upper = self._count_tokens("".join(current) + piece)
+            if merged_upper <= chunk_size:
+                current.append(piece)
+                current_len += len(piece)
+                lower, upper = merged_lower, merged_upper
             else:
-                merged_chunks.append(current_chunk)
-                current_chunk = chunk
-        if len(current_chunk) > 0:
-            merged_chunks.append(current_chunk)
-        return merged_chunks
+                merged.append(("".join(current), lower, upper))
+                current, current_len, lower, upper = [piece], len(piece), piece_lower, piece_upper
+        if current_len > 0:
+            merged.append(("".join(current), lower, upper))
+        return merged
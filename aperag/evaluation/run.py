@@ -21,13 +21,15 @@ It loads datasets, calls bot APIs, and generates comprehensive reports using Rag
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import math
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 import pandas as pd
@@ -47,6 +49,37 @@ from ragas.metrics import (
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Metrics that only look at the retrieved contexts, usable in retrieval-only evaluations
+RETRIEVAL_METRICS = {"context_precision", "context_recall"}
+
+DEFAULT_SEARCH_REQUEST = {
+    "vector_search": {"topk": 5, "similarity": 0.2},
+    "fulltext_search": {"topk": 5},
+    "save_to_history": False,
+}
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of API calls shared by all evaluation workers"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 
 class EvaluationRunner:
     """Main class for running RAG evaluations"""
@@ -222,17 +255,22 @@ class EvaluationRunner:
 
         return dataset
 
-    async def _call_bot_api(self, bot_id: str, question: str) -> Dict[str, Any]:
-        """Call bot API and get response with context"""
-        import time
+    def _api_headers(self) -> Dict[str, str]:
+        api_token = self.config["api"].get("api_token") or os.environ.get("APERAG_API_TOKEN")
+        headers = {"Content-Type": "application/json"}
+        if api_token:
+            headers["Authorization"] = f"Bearer {api_token}"
+        return headers
 
+    async def _call_bot_api(
+        self, bot_id: str, question: str, client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """Call bot API and get response with context"""
         start_time = time.perf_counter()  # Use more precise timing
 
         try:
             # Use direct HTTP request instead of OpenAI client to handle ApeRAG's response format
-            api_config = self.config["api"]
-            base_url = api_config["base_url"]
-            api_token = api_config.get("api_token") or os.environ.get("APERAG_API_TOKEN")
+            base_url = self.config["api"]["base_url"]
 
             # Configure timeout
             advanced_config = self.config.get("advanced", {})
@@ -246,83 +284,83 @@ class EvaluationRunner:
             else:
                 chat_url = f"{base_url}/v1/chat/completions"
 
-            headers = {}
-            if api_token:
-                headers["Authorization"] = f"Bearer {api_token}"
-            headers["Content-Type"] = "application/json"
+            headers = self._api_headers()
 
             request_body = {"messages": [{"role": "user", "content": question}], "model": "aperag", "stream": False}
 
             params = {"bot_id": bot_id}
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            if client is None:
+                async with httpx.AsyncClient(timeout=timeout) as own_client:
+                    response = await own_client.post(chat_url, headers=headers, json=request_body, params=params)
+            else:
                 response = await client.post(chat_url, headers=headers, json=request_body, params=params)
-                response.raise_for_status()
+            response.raise_for_status()
 
-                # Calculate response time with higher precision
-                end_time = time.perf_counter()
-                response_time = round(end_time - start_time, 3)  # Round to 3 decimal places
-
-                logger.debug(f"API call took {response_time:.3f} seconds")
-
-                # Parse response
-                response_data = response.json()
-
-                # Check for API error format
-                if "error" in response_data:
-                    error_msg = response_data.get("error", {}).get("message", "Unknown API error")
-                    logger.error(f"API returned error: {error_msg}")
-                    return {"response": "", "context": [], "error": error_msg, "response_time": response_time}
-
-                # Extract content from OpenAI-compatible response
-                choices = response_data.get("choices", [])
-                if not choices:
-                    logger.warning("No choices in API response")
-                    return {
-                        "response": "",
-                        "context": [],
-                        "error": "No response content",
-                        "response_time": response_time,
-                    }
-
-                raw_content = choices[0].get("message", {}).get("content", "")
-                logger.debug(f"Raw API response content: {raw_content[:200]}...")
-
-                # Parse content with |DOC_QA_REFERENCES| separator
-                if "|DOC_QA_REFERENCES|" in raw_content:
-                    parts = raw_content.split("|DOC_QA_REFERENCES|", 1)
-                    response_text = parts[0].strip()
-                    context_text = parts[1].strip() if len(parts) > 1 else ""
-
-                    # Parse context JSON
-                    context_data = []
-                    if context_text:
-                        try:
-                            # Try to parse as JSON
-                            parsed_context = json.loads(context_text)
-
-                            # Handle both single object and array
-                            if isinstance(parsed_context, list):
-                                context_data = parsed_context
-                            elif isinstance(parsed_context, dict):
-                                context_data = [parsed_context]
-
-                            logger.debug(f"Successfully parsed context: {len(context_data)} items")
-
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse context JSON: {e}")
-                            # Keep as string if parsing fails
-                            context_data = [{"text": context_text}]
-
-                    return {
-                        "response": response_text,
-                        "context": context_data,  # Keep as parsed object, not string
-                        "error": None,
-                        "response_time": response_time,
-                    }
-                else:
-                    # No separator, treat whole content as response
-                    return {"response": raw_content, "context": [], "error": None, "response_time": response_time}
+            # Calculate response time with higher precision
+            end_time = time.perf_counter()
+            response_time = round(end_time - start_time, 3)  # Round to 3 decimal places
+
+            logger.debug(f"API call took {response_time:.3f} seconds")
+
+            # Parse response
+            response_data = response.json()
+
+            # Check for API error format
+            if "error" in response_data:
+                error_msg = response_data.get("error", {}).get("message", "Unknown API error")
+                logger.error(f"API returned error: {error_msg}")
+                return {"response": "", "context": [], "error": error_msg, "response_time": response_time}
+
+            # Extract content from OpenAI-compatible response
+            choices = response_data.get("choices", [])
+            if not choices:
+                logger.warning("No choices in API response")
+                return {
+                    "response": "",
+                    "context": [],
+                    "error": "No response content",
+                    "response_time": response_time,
+                }
+
+            raw_content = choices[0].get("message", {}).get("content", "")
+            logger.debug(f"Raw API response content: {raw_content[:200]}...")
+
+            # Parse content with |DOC_QA_REFERENCES| separator
+            if "|DOC_QA_REFERENCES|" in raw_content:
+                parts = raw_content.split("|DOC_QA_REFERENCES|", 1)
+                response_text = parts[0].strip()
+                context_text = parts[1].strip() if len(parts) > 1 else ""
+
+                # Parse context JSON
+                context_data = []
+                if context_text:
+                    try:
+                        # Try to parse as JSON
+                        parsed_context = json.loads(context_text)
+
+                        # Handle both single object and array
+                        if isinstance(parsed_context, list):
+                            context_data = parsed_context
+                        elif isinstance(parsed_context, dict):
+                            context_data = [parsed_context]
+
+                        logger.debug(f"Successfully parsed context: {len(context_data)} items")
+
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Failed to parse context JSON: {e}")
+                        # Keep as string if parsing fails
+                        context_data = [{"text": context_text}]
+
+                return {
+                    "response": response_text,
+                    "context": context_data,  # Keep as parsed object, not string
+                    "error": None,
+                    "response_time": response_time,
+                }
+            else:
+                # No separator, treat whole content as response
+                return {"response": raw_content, "context": [], "error": None, "response_time": response_time}
 
         except httpx.HTTPStatusError as e:
             end_time = time.perf_counter()
@@ -337,53 +375,185 @@ class EvaluationRunner:
             logger.error(f"API call error: {error_msg}")
             return {"response": "", "context": [], "error": error_msg, "response_time": response_time}
 
-    async def _process_dataset(self, bot_id: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Process dataset and get bot responses"""
-        results = []
-        total = len(df)
-
-        # Get advanced settings
+    async def _call_search_api(
+        self, collection_ids: List[str], question: str, client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """Call the search API of the collections, returning the retrieved contexts without generating an answer"""
         advanced_config = self.config.get("advanced", {})
-        request_delay = advanced_config.get("request_delay", 0)
+        if client is None:
+            async with httpx.AsyncClient(timeout=advanced_config.get("request_timeout", 30)) as own_client:
+                return await self._call_search_api(collection_ids, question, own_client)
 
-        for idx, row in df.iterrows():
-            question = row["question"]
-            ground_truth = row["answer"]
+        start_time = time.perf_counter()
+        request_body = {**(advanced_config.get("search") or DEFAULT_SEARCH_REQUEST), "query": question}
+        try:
+            context_data = []
+            for collection_id in collection_ids:
+                url = f"{self.config['api']['base_url']}/collections/{collection_id}/searches"
+                response = await client.post(url, headers=self._api_headers(), json=request_body)
+                response.raise_for_status()
+                for item in response.json().get("items") or []:
+                    context_data.append(
+                        {
+                            "text": item.get("content") or "",
+                            "score": item.get("score"),
+                            "source": item.get("source"),
+                            "recall_type": item.get("recall_type"),
+                            "collection_id": collection_id,
+                        }
+                    )
+            response_time = round(time.perf_counter() - start_time, 3)
+            return {"response": "", "context": context_data, "error": None, "response_time": response_time}
+        except httpx.HTTPStatusError as e:
+            response_time = round(time.perf_counter() - start_time, 3)
+            error_msg = f"HTTP error {e.response.status_code}: {e.response.text}"
+            logger.error(f"Search API HTTP error: {error_msg}")
+            return {"response": "", "context": [], "error": error_msg, "response_time": response_time}
+        except Exception as e:
+            response_time = round(time.perf_counter() - start_time, 3)
+            error_msg = f"Search API call failed: {str(e)}"
+            logger.error(f"Search API call error: {error_msg}")
+            return {"response": "", "context": [], "error": error_msg, "response_time": response_time}
 
-            logger.info(f"Processing question {idx + 1}/{total}: {question[:50]}...")
+    def _checkpoint_path(self, task_config: Dict[str, Any]) -> Optional[Path]:
+        """Path of the JSONL checkpoint of a task, identified by its bot, dataset and mode"""
+        if not self.config.get("advanced", {}).get("checkpoint", True):
+            return None
+        key = json.dumps(
+            [
+                task_config["task_name"],
+                task_config["bot_id"],
+                task_config["dataset_path"],
+                task_config.get("max_samples"),
+                task_config.get("mode", "generation"),
+            ]
+        )
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return Path(task_config["report_dir"]) / "checkpoints" / f"{digest}.jsonl"
+
+    def _load_checkpoint(
+        self, checkpoint_path: Optional[Path], dataset: List[Dict[str, str]]
+    ) -> Tuple[Dict[int, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Load the successful results (by dataset index) and Ragas scores (by question) of an earlier run"""
+        results: Dict[int, Dict[str, Any]] = {}
+        scores: Dict[str, Dict[str, Any]] = {}
+        if checkpoint_path is None or not checkpoint_path.exists():
+            return results, scores
+
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line of an interrupted run may be incomplete
+                    continue
+                if record.get("type") == "result":
+                    index, result = record.get("index"), record.get("result") or {}
+                    if (
+                        isinstance(index, int)
+                        and 0 <= index < len(dataset)
+                        and dataset[index]["question"] == result.get("question")
+                        and not result.get("error")
+                    ):
+                        results[index] = result
+                elif record.get("type") == "ragas" and record.get("question"):
+                    scores[record["question"]] = record.get("scores") or {}
+
+        if results or scores:
+            logger.info(f"Resuming from {checkpoint_path}: {len(results)} answered, {len(scores)} scored")
+        return results, scores
+
+    def _append_checkpoint(self, checkpoint_path: Optional[Path], records: List[Dict[str, Any]]):
+        if checkpoint_path is None or not records:
+            return
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(checkpoint_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
 
-            # Call bot API
-            api_result = await self._call_bot_api(bot_id, question)
+    async def _process_dataset(
+        self,
+        dataset: List[Dict[str, str]],
+        call_api,
+        checkpoint_path: Optional[Path] = None,
+        done: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the responses of all questions with a pool of concurrent workers.
+
+        call_api(question, client) returns the API result of a question. Each result is appended to the
+        checkpoint as soon as it is available, results already in `done` are not requested again.
+        """
+        total = len(dataset)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        for index, result in (done or {}).items():
+            results[index] = result
 
-            # Log response time
-            response_time = api_result.get("response_time", 0)
-            if api_result.get("error"):
-                logger.info(f"Question {idx + 1}/{total} failed in {response_time:.2f}s: {api_result.get('error')}")
-            else:
-                logger.info(f"Question {idx + 1}/{total} completed in {response_time:.2f}s")
-
-            # Build result record
-            result = {
-                "question": question,
-                "ground_truth": ground_truth,
-                "response": api_result.get("response", ""),
-                "context": api_result.get("context", []),  # Keep as parsed object/list
-                "error": api_result.get("error"),
-                "response_time": response_time,
-            }
+        # Get advanced settings
+        advanced_config = self.config.get("advanced", {})
+        concurrency = max(int(advanced_config.get("concurrency", advanced_config.get("batch_size", 5))), 1)
+        requests_per_second = advanced_config.get("requests_per_second")
+        request_delay = advanced_config.get("request_delay", 0)
+        bucket = TokenBucket(float(requests_per_second)) if requests_per_second else None
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for index in range(total):
+            if results[index] is None:
+                pending.put_nowait(index)
+        completed = total - pending.qsize()
+        if completed:
+            logger.info(f"Skipping {completed}/{total} questions answered in an earlier run")
+
+        async def worker(client: httpx.AsyncClient):
+            nonlocal completed
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                item = dataset[index]
+                if bucket is not None:
+                    await bucket.acquire()
+
+                api_result = await call_api(item["question"], client)
+
+                # Build result record
+                result = {
+                    "question": item["question"],
+                    "ground_truth": item["answer"],
+                    "response": api_result.get("response", ""),
+                    "context": api_result.get("context", []),  # Keep as parsed object/list
+                    "error": api_result.get("error"),
+                    "response_time": api_result.get("response_time", 0),
+                }
+                results[index] = result
+                self._append_checkpoint(checkpoint_path, [{"type": "result", "index": index, "result": result}])
+
+                completed += 1
+                if result["error"]:
+                    logger.info(
+                        f"Question {index + 1} failed in {result['response_time']:.2f}s ({completed}/{total}): "
+                        f"{result['error']}"
+                    )
+                else:
+                    logger.info(
+                        f"Question {index + 1} completed in {result['response_time']:.2f}s ({completed}/{total})"
+                    )
 
-            results.append(result)
+                # Add delay between requests of a worker if configured
+                if request_delay > 0:
+                    await asyncio.sleep(request_delay)
 
-            # Add delay between requests if configured
-            if request_delay > 0:
-                await asyncio.sleep(request_delay)
+        timeout = advanced_config.get("request_timeout", 30)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+            await asyncio.gather(*(worker(client) for _ in range(min(concurrency, pending.qsize()))))
 
         return results
 
-    def _prepare_ragas_dataset(self, results: List[Dict]) -> Dataset:
+    def _prepare_ragas_dataset(self, results: List[Dict], require_response: bool = True) -> Dataset:
         """Prepare dataset for Ragas evaluation"""
         # Filter out failed requests
-        valid_results = [r for r in results if not r.get("error") and r.get("response")]
+        valid_results = [r for r in results if not r.get("error") and (r.get("response") or not require_response)]
 
         if not valid_results:
             logger.warning("No valid results found for Ragas evaluation")
@@ -835,32 +1005,13 @@ Ragas (Retrieval Augmented Generation Assessment) is a framework specifically de
 
         logger.info(f"Enhanced markdown report saved to {output_path}")
 
-    async def _run_ragas_evaluation(self, results: List[Dict], metrics: List[str]) -> Optional[List[Dict]]:
-        """Run Ragas evaluation on the results"""
-        if not metrics:
-            logger.warning("No metrics specified for Ragas evaluation")
-            return None
-
+    def _evaluate_ragas_batch(self, results: List[Dict], ragas_metrics, require_response: bool) -> Optional[List[Dict]]:
+        """Score one batch of results with Ragas, returning one record per result in the same order"""
         try:
-            # Prepare data for Ragas
-            logger.info("Preparing data for Ragas evaluation")
-            ragas_dataset = self._prepare_ragas_dataset(results)
-
-            # Debug: Check dataset content
-            logger.info(f"Ragas dataset prepared with {len(ragas_dataset)} samples")
+            ragas_dataset = self._prepare_ragas_dataset(results, require_response)
             if len(ragas_dataset) > 0:
                 logger.debug(f"Sample dataset entry: {dict(ragas_dataset[0])}")
 
-            ragas_metrics = self._get_metrics(metrics)
-            logger.info(f"Using Ragas metrics: {[str(m) for m in ragas_metrics]}")
-
-            # Check if we have valid data
-            if len(ragas_dataset) == 0:
-                logger.warning("Empty dataset for Ragas evaluation")
-                return None
-
-            # Run evaluation
-            logger.info("Starting Ragas evaluation...")
             if self.embeddings_for_eval is not None:
                 # Use both LLM and embeddings
                 eval_results = evaluate(
@@ -872,37 +1023,10 @@ Ragas (Retrieval Augmented Generation Assessment) is a framework specifically de
                 )
             else:
                 # Use only LLM, skip embedding-based metrics
-                logger.info("Using LLM-only evaluation (no embeddings available)")
                 eval_results = evaluate(
                     dataset=ragas_dataset, metrics=ragas_metrics, llm=self.llm_for_eval, raise_exceptions=False
                 )
-            logger.info("Ragas evaluation completed successfully")
-
-            # Convert to dict and return
-            results_dict = eval_results.to_pandas().to_dict("records")
-            logger.info(f"Ragas results converted to {len(results_dict)} records")
-
-            # Debug: Check for NaN values in results
-            nan_count = 0
-            total_metrics = 0
-            for record in results_dict:
-                for key, value in record.items():
-                    if isinstance(value, (int, float)):
-                        total_metrics += 1
-                        if math.isnan(value) or math.isinf(value):
-                            nan_count += 1
-                            logger.warning(
-                                f"Found NaN/Inf value for metric '{key}' in question: {record.get('user_input', record.get('question', 'Unknown'))[:50]}..."
-                            )
-
-            if nan_count > 0:
-                logger.warning(
-                    f"Found {nan_count} NaN/Inf values out of {total_metrics} total metric values. These will be handled safely in statistics calculation."
-                )
-            else:
-                logger.info("No NaN/Inf values found in Ragas results")
-
-            return results_dict
+            return eval_results.to_pandas().to_dict("records")
 
         except Exception as e:
             logger.error(f"Ragas evaluation failed with exception: {e}")
@@ -911,6 +1035,80 @@ Ragas (Retrieval Augmented Generation Assessment) is a framework specifically de
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None
 
+    async def _run_ragas_evaluation(
+        self,
+        results: List[Dict],
+        metrics: List[str],
+        require_response: bool = True,
+        checkpoint_path: Optional[Path] = None,
+        scored: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Optional[List[Dict]]:
+        """
+        Run Ragas evaluation on the results in batches of `advanced.ragas_batch_size`.
+
+        The scores of each batch are appended to the checkpoint; questions in `scored` were scored
+        by an earlier run and are not evaluated again.
+        """
+        if not metrics:
+            logger.warning("No metrics specified for Ragas evaluation")
+            return None
+
+        ragas_metrics = self._get_metrics(metrics)
+        logger.info(f"Using Ragas metrics: {[str(m) for m in ragas_metrics]}")
+        if not ragas_metrics:
+            return None
+        if self.embeddings_for_eval is None:
+            logger.info("Using LLM-only evaluation (no embeddings available)")
+
+        scored = dict(scored or {})
+        valid_results = [r for r in results if not r.get("error") and (r.get("response") or not require_response)]
+        pending = [r for r in valid_results if r["question"] not in scored]
+        batch_size = max(int(self.config.get("advanced", {}).get("ragas_batch_size", 50)), 1)
+
+        logger.info(
+            f"Starting Ragas evaluation of {len(pending)} samples ({len(valid_results) - len(pending)} already scored)"
+        )
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            records = self._evaluate_ragas_batch(batch, ragas_metrics, require_response)
+            if records is None:
+                continue
+            self._append_checkpoint(
+                checkpoint_path,
+                [{"type": "ragas", "question": r["question"], "scores": record} for r, record in zip(batch, records)],
+            )
+            for result, record in zip(batch, records):
+                scored[result["question"]] = record
+            logger.info(f"Ragas evaluated {min(start + batch_size, len(pending))}/{len(pending)} samples")
+
+        results_dict = [scored[r["question"]] for r in valid_results if r["question"] in scored]
+        if not results_dict:
+            logger.warning("No Ragas results available")
+            return None
+        logger.info(f"Ragas results converted to {len(results_dict)} records")
+
+        # Debug: Check for NaN values in results
+        nan_count = 0
+        total_metrics = 0
+        for record in results_dict:
+            for key, value in record.items():
+                if isinstance(value, (int, float)):
+                    total_metrics += 1
+                    if math.isnan(value) or math.isinf(value):
+                        nan_count += 1
+                        logger.warning(
+                            f"Found NaN/Inf value for metric '{key}' in question: {record.get('user_input', record.get('question', 'Unknown'))[:50]}..."
+                        )
+
+        if nan_count > 0:
+            logger.warning(
+                f"Found {nan_count} NaN/Inf values out of {total_metrics} total metric values. These will be handled safely in statistics calculation."
+            )
+        else:
+            logger.info("No NaN/Inf values found in Ragas results")
+
+        return results_dict
+
     async def _generate_reports(
         self,
         task_name: str,
@@ -1061,7 +1259,10 @@ Ragas (Retrieval Augmented Generation Assessment) is a framework specifically de
         dataset_path = task_config["dataset_path"]
         max_samples = task_config.get("max_samples")
         report_dir = task_config["report_dir"]
-        metrics = task_config.get("metrics", ["faithfulness", "answer_relevancy"])
+        mode = task_config.get("mode", "generation")
+        metrics = task_config.get(
+            "metrics", sorted(RETRIEVAL_METRICS) if mode == "retrieval" else ["faithfulness", "answer_relevancy"]
+        )
 
         logger.info(f"Starting evaluation task: {task_name}")
 
@@ -1070,43 +1271,38 @@ Ragas (Retrieval Augmented Generation Assessment) is a framework specifically de
         dataset = self._load_dataset(dataset_path, max_samples)
         logger.info(f"Loaded {len(dataset)} samples from dataset")
 
-        # Process questions
-        logger.info(f"Processing {len(dataset)} questions with bot {bot_id}")
-
-        # Get advanced config for batch processing and delays
-        advanced_config = self.config.get("advanced", {})
-        batch_size = advanced_config.get("batch_size", 5)
-        request_delay = advanced_config.get("request_delay", 1)
-
-        results = []
-        for i in range(0, len(dataset), batch_size):
-            batch = dataset[i : i + batch_size]
-            batch_tasks = [self._call_bot_api(bot_id, item["question"]) for item in batch]
-            batch_results = await asyncio.gather(*batch_tasks)
-
-            for j, result in enumerate(batch_results):
-                item = batch[j]
-                results.append(
-                    {
-                        "question": item["question"],
-                        "ground_truth": item["answer"],
-                        "response": result["response"],
-                        "context": result["context"],
-                        "response_time": result.get("response_time", 0),
-                        "error": result.get("error"),
-                    }
-                )
+        # Results of an interrupted run of the same task are reused unless resume is disabled
+        checkpoint_path = self._checkpoint_path(task_config)
+        done, scored = self._load_checkpoint(checkpoint_path, dataset) if task_config.get("resume", True) else ({}, {})
+        if checkpoint_path is not None and not done and not scored and checkpoint_path.exists():
+            checkpoint_path.unlink()
+
+        if mode == "retrieval":
+            # Retrieval-only evaluation calls the search API without generating answers
+            collection_ids = task_config.get("collection_ids")
+            if not collection_ids:
+                collection_ids = (await self._fetch_bot_details(bot_id)).get("collection_ids") or []
+            if not collection_ids:
+                raise ValueError(f"No collections to search for retrieval evaluation of bot {bot_id}")
+            skipped = [m for m in metrics if m not in RETRIEVAL_METRICS]
+            if skipped:
+                logger.warning(f"Skipping metrics {skipped} which need generated answers")
+            metrics = [m for m in metrics if m in RETRIEVAL_METRICS]
+            logger.info(f"Searching {len(dataset)} questions in collections {collection_ids}")
+
+            async def call_api(question, client):
+                return await self._call_search_api(collection_ids, question, client)
+        else:
+            logger.info(f"Processing {len(dataset)} questions with bot {bot_id}")
 
-            logger.info(f"Processed {min(i + batch_size, len(dataset))}/{len(dataset)} questions")
+            async def call_api(question, client):
+                return await self._call_bot_api(bot_id, question, client)
 
-            # Add delay between batches to respect rate limits
-            if i + batch_size < len(dataset) and request_delay > 0:
-                logger.debug(f"Waiting {request_delay} seconds before next batch...")
-                await asyncio.sleep(request_delay)
+        results = await self._process_dataset(dataset, call_api, checkpoint_path, done)
 
         # Run Ragas evaluation
         logger.info("Running Ragas evaluation")
-        ragas_results = await self._run_ragas_evaluation(results, metrics)
+        ragas_results = await self._run_ragas_evaluation(results, metrics, mode != "retrieval", checkpoint_path, scored)
 
         # Generate reports
         logger.info(f"Saving results to {report_dir}")
@@ -1115,6 +1311,10 @@ Ragas (Retrieval Augmented Generation Assessment) is a framework specifically de
             task_name, bot_id, dataset_path, timestamp, results, ragas_results, Path(report_dir)
         )
 
+        # The task is complete, the next run starts from scratch
+        if checkpoint_path is not None and checkpoint_path.exists():
+            checkpoint_path.unlink()
+
         logger.info(f"Evaluation task completed: {task_name}")
         return {"task_name": task_name, "results": results, "ragas_results": ragas_results}
 
@@ -37,6 +37,12 @@ class NodeNotFoundError(FlowError):
     pass
 
 
+class NodeTimeoutError(FlowError):
+    """Raised when a node does not finish within its timeout"""
+
+    pass
+
+
 class ValidationError(FlowError):
     """Raised when input validation fails"""
 
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from abc import ABC, abstractmethod
 from collections import deque
 from dataclasses import dataclass, field
@@ -31,6 +32,10 @@ class NodeInstance:
     input_values: dict = field(default_factory=dict)
     output_schema: dict = field(default_factory=dict)
     title: Optional[str] = None
+    # Seconds the node may run before it is cancelled (None = no limit)
+    timeout: Optional[float] = None
+    # If the node fails or times out, skip it instead of failing the flow
+    best_effort: bool = False
 
 
 @dataclass
@@ -57,8 +62,10 @@ class FlowInstance:
     def _topological_sort(self) -> List[str]:
         """Perform topological sort to detect cycles"""
         # Build dependency graph
+        successors: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
         in_degree = {node_id: 0 for node_id in self.nodes}
         for edge in self.edges:
+            successors[edge.source].append(edge.target)
             in_degree[edge.target] += 1
 
         # Topological sort
@@ -73,11 +80,10 @@ class FlowInstance:
             sorted_nodes.append(node_id)
 
             # Update in-degree of successor nodes
-            for edge in self.edges:
-                if edge.source == node_id:
-                    in_degree[edge.target] -= 1
-                    if in_degree[edge.target] == 0:
-                        queue.append(edge.target)
+            for target in successors[node_id]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
 
         if len(sorted_nodes) != len(self.nodes):
             raise CycleError("Flow contains cycles")
@@ -85,6 +91,45 @@ class FlowInstance:
         return sorted_nodes
 
 
+class QueryEmbeddingMemo:
+    """
+    Query embeddings shared by the nodes of one flow execution.
+
+    Search nodes running in parallel usually embed the same query with the same model; the
+    first caller starts the embedding and the others await it. Failed embeddings are not kept,
+    so a later caller retries.
+    """
+
+    def __init__(self):
+        self._embeddings: Dict[Tuple, asyncio.Future] = {}
+
+    @staticmethod
+    def _key(embedding_model, text: str) -> Tuple:
+        return (
+            getattr(embedding_model, "embedding_provider", None),
+            getattr(embedding_model, "model", None),
+            getattr(embedding_model, "api_base", None),
+            getattr(embedding_model, "multimodal", None),
+            text,
+        )
+
+    async def aembed_query(self, embedding_model, text: str) -> List[float]:
+        key = self._key(embedding_model, text)
+        future = self._embeddings.get(key)
+        if future is None:
+            future = asyncio.ensure_future(embedding_model.aembed_query(text))
+            self._embeddings[key] = future
+
+            def _forget_failure(done: asyncio.Future):
+                if done.cancelled() or done.exception() is not None:
+                    if self._embeddings.get(key) is done:
+                        del self._embeddings[key]
+
+            future.add_done_callback(_forget_failure)
+        # A cancelled node must not cancel the embedding other nodes are waiting for
+        return await asyncio.shield(future)
+
+
 @dataclass
 class ExecutionContext:
     """Context for flow execution, storing outputs and global state"""
@@ -92,6 +137,7 @@ class ExecutionContext:
     outputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     system_outputs: Dict[str, Any] = field(default_factory=dict)
     global_variables: Dict[str, Any] = field(default_factory=dict)
+    query_embeddings: QueryEmbeddingMemo = field(default_factory=QueryEmbeddingMemo)
 
     def get_input(self, node_id: str, field: str) -> Any:
         """Get input value for a node field"""
@@ -149,6 +195,7 @@ class SystemInput:
     chat_id: Optional[str] = None
     history: Optional[BaseChatMessageHistory] = None
     message_id: Optional[str] = None
+    query_embeddings: Optional[QueryEmbeddingMemo] = None
 
     def __init__(
         self,
@@ -156,12 +203,20 @@ class SystemInput:
         user: str,
         history: Optional[BaseChatMessageHistory] = None,
         message_id: Optional[str] = None,
+        query_embeddings: Optional[QueryEmbeddingMemo] = None,
         **kwargs,
     ):
         self.query = query
         self.user = user
         self.history = history
         self.message_id = message_id
+        self.query_embeddings = query_embeddings
         # Set additional attributes from kwargs
         for key, value in kwargs.items():
             setattr(self, key, value)
+
+    async def aembed_query(self, embedding_model, text: str) -> List[float]:
+        """Embed a query, sharing the result with the other nodes of the execution"""
+        if self.query_embeddings is None:
+            return await embedding_model.aembed_query(text)
+        return await self.query_embeddings.aembed_query(embedding_model, text)
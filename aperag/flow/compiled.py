@@ -0,0 +1,160 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, StrictUndefined, Template, TemplateSyntaxError
+
+import aperag.flow.runners  # noqa: F401
+from aperag.flow.base.models import NODE_RUNNER_REGISTRY, FlowInstance
+from aperag.flow.parser import FlowParser
+
+logger = logging.getLogger(__name__)
+
+# Shared by all flow executions; rendering compiled templates is thread-safe
+FLOW_JINJA_ENV = Environment(undefined=StrictUndefined)
+
+# Upper bound of cached flows, roughly one per active bot
+MAX_COMPILED_FLOWS = 256
+
+
+@dataclass
+class CompiledFlow:
+    """
+    A parsed and validated flow with everything FlowEngine derives from it before execution.
+
+    Compiled flows are shared by concurrent executions and must not be modified.
+    """
+
+    flow: FlowInstance
+    successors: Dict[str, List[str]]
+    in_degree: Dict[str, int]
+    end_nodes: List[str]
+    # Node type -> runner info (runner, input_model, output_model) from the registry
+    runner_infos: Dict[str, dict] = field(default_factory=dict)
+    # Template source -> compiled Jinja template, for templated input values
+    templates: Dict[str, Template] = field(default_factory=dict)
+
+
+def _is_variable_reference(value: str) -> bool:
+    value = value.strip()
+    return value.startswith("{{") and value.endswith("}}")
+
+
+def _collect_templates(value: Any, templates: Dict[str, Template]):
+    if isinstance(value, dict):
+        for item in value.values():
+            _collect_templates(item, templates)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_templates(item, templates)
+    elif isinstance(value, str) and not _is_variable_reference(value) and value not in templates:
+        try:
+            templates[value] = FLOW_JINJA_ENV.from_string(value)
+        except TemplateSyntaxError:
+            # Left to the engine, which reports it as an input error of the node when it runs
+            pass
+
+
+def build_adjacency(flow: FlowInstance) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Build successor lists and in-degrees in one pass over the edges"""
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in flow.nodes}
+    in_degree = {node_id: 0 for node_id in flow.nodes}
+    for edge in flow.edges:
+        successors[edge.source].append(edge.target)
+        in_degree[edge.target] += 1
+    return successors, in_degree
+
+
+def compile_flow(flow: FlowInstance) -> CompiledFlow:
+    """
+    Validate a flow and precompute its execution plan, runners and templates
+
+    Raises:
+        CycleError: If the flow contains cycles
+    """
+    flow.validate()
+    successors, in_degree = build_adjacency(flow)
+
+    runner_infos = {}
+    templates: Dict[str, Template] = {}
+    for node in flow.nodes.values():
+        runner_info = NODE_RUNNER_REGISTRY.get(node.type)
+        if runner_info is not None:
+            runner_infos[node.type] = runner_info
+        _collect_templates(node.input_values, templates)
+
+    return CompiledFlow(
+        flow=flow,
+        successors=successors,
+        in_degree=in_degree,
+        end_nodes=[node_id for node_id, targets in successors.items() if not targets],
+        runner_infos=runner_infos,
+        templates=templates,
+    )
+
+
+def flow_config_hash(flow_config: Any) -> str:
+    payload = flow_config if isinstance(flow_config, str) else json.dumps(flow_config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class CompiledFlowCache:
+    """LRU cache of compiled bot flows keyed by (bot id, flow config hash)"""
+
+    def __init__(self, max_size: int = MAX_COMPILED_FLOWS):
+        self.max_size = max_size
+        self._flows: "OrderedDict[Tuple[str, str], CompiledFlow]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._flows)
+
+    def get(self, bot_id: str, flow_config: Any) -> CompiledFlow:
+        """Get the compiled flow of a bot's flow config, parsing and compiling it on first use"""
+        key = (str(bot_id), flow_config_hash(flow_config))
+        with self._lock:
+            compiled = self._flows.get(key)
+            if compiled is not None:
+                self._flows.move_to_end(key)
+                return compiled
+
+        compiled = compile_flow(FlowParser.parse(flow_config))
+        with self._lock:
+            # Flows of the bot compiled from an older config are no longer used
+            for stale_key in [k for k in self._flows if k[0] == key[0] and k != key]:
+                del self._flows[stale_key]
+            self._flows[key] = compiled
+            self._flows.move_to_end(key)
+            while len(self._flows) > self.max_size:
+                self._flows.popitem(last=False)
+        return compiled
+
+    def invalidate(self, bot_id: Optional[str] = None):
+        """Drop the compiled flows of a bot, or all of them"""
+        with self._lock:
+            if bot_id is None:
+                self._flows.clear()
+                return
+            for key in [k for k in self._flows if k[0] == str(bot_id)]:
+                del self._flows[key]
+
+
+compiled_flow_cache = CompiledFlowCache()
@@ -15,14 +15,12 @@
 import asyncio
 import logging
 import uuid
-from collections import deque
-from typing import Any, AsyncGenerator, Dict, List, Set
-
-from jinja2 import Environment, StrictUndefined
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Union
 
 import aperag.flow.runners  # noqa: F401
-from aperag.flow.base.exceptions import CycleError, ValidationError
+from aperag.flow.base.exceptions import NodeTimeoutError, ValidationError
 from aperag.flow.base.models import NODE_RUNNER_REGISTRY, ExecutionContext, FlowInstance, NodeInstance, SystemInput
+from aperag.flow.compiled import FLOW_JINJA_ENV, CompiledFlow, build_adjacency, compile_flow
 from aperag.utils.utils import utc_now
 
 # Configure logging
@@ -76,8 +74,11 @@ class FlowEngine:
     def __init__(self):
         self.context = ExecutionContext()
         self.execution_id = None
+        # Best-effort nodes that failed or timed out; references to their outputs resolve to None
+        self.skipped_nodes: Set[str] = set()
         self._event_queue = asyncio.Queue()
-        self.jinja_env = Environment(undefined=StrictUndefined)
+        self.jinja_env = FLOW_JINJA_ENV
+        self.compiled: Optional[CompiledFlow] = None
 
     async def emit_event(self, event: FlowEvent):
         """Emit an event to all consumers"""
@@ -98,16 +99,21 @@ class FlowEngine:
         except asyncio.CancelledError:
             pass
 
-    async def execute_flow(self, flow: FlowInstance, initial_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def execute_flow(
+        self, flow: Union[FlowInstance, CompiledFlow], initial_data: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
         """Execute a flow instance with optional initial data
 
         Args:
-            flow: The flow instance to execute
+            flow: The flow instance to execute, or a compiled flow (see compiled_flow_cache)
             initial_data: Optional dictionary of initial global variable values
 
         Returns:
             Dictionary of final output values from the flow execution
         """
+        compiled = flow if isinstance(flow, CompiledFlow) else None
+        flow = compiled.flow if compiled else flow
+
         # Generate execution ID
         self.execution_id = str(uuid.uuid4())[:8]  # Use first 8 characters of UUID
         logger.info(
@@ -132,12 +138,9 @@ class FlowEngine:
                 for var_name, var_value in initial_data.items():
                     self.context.set_global(var_name, var_value)
 
-            # Build dependency graph and perform topological sort
-            sorted_nodes = self._topological_sort(flow)
-
-            # Execute nodes
-            for node_group in self._find_parallel_groups(flow, sorted_nodes):
-                await self._execute_node_group(flow, node_group)
+            # Detect cycles before running anything, then run nodes as their inputs become ready
+            self.compiled = compiled or compile_flow(flow)
+            await self._execute_dag(self.compiled)
 
             # Emit flow end event
             await self.emit_event(
@@ -166,94 +169,73 @@ class FlowEngine:
             )
             raise e
 
-    def _topological_sort(self, flow: FlowInstance) -> List[str]:
-        """Perform topological sort to detect cycles
-
-        Args:
-            flow: The flow instance
-
-        Returns:
-            Topologically sorted list of node IDs
-
-        Raises:
-            CycleError: If the flow contains cycles
+    async def _execute_dag(self, compiled: CompiledFlow):
         """
-        # Build dependency graph from edges
-        in_degree = {node_id: 0 for node_id in flow.nodes}
-        for edge in flow.edges:
-            in_degree[edge.target] += 1
-
-        # Start with nodes that have no dependencies
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
-        if len(queue) == 0:
-            raise CycleError("Flow contains cycles")
-
-        sorted_nodes = []
-
-        while queue:
-            node_id = queue.popleft()
-            sorted_nodes.append(node_id)
-
-            # Update in-degree of successor nodes
-            for edge in flow.edges:
-                if edge.source == node_id:
-                    in_degree[edge.target] -= 1
-                    if in_degree[edge.target] == 0:
-                        queue.append(edge.target)
-
-        if len(sorted_nodes) != len(flow.nodes):
-            raise CycleError("Flow contains cycles")
+        Execute the flow as a dataflow graph: each node starts as soon as all of its upstream
+        nodes have finished, instead of waiting for the whole previous level.
 
-        return sorted_nodes
+        A failing node cancels the nodes still running and fails the flow, unless it is
+        best effort (see _run_node).
+        """
+        successors = compiled.successors
+        waiting_on = dict(compiled.in_degree)
+        running: Dict[asyncio.Task, str] = {}
 
-    def _find_parallel_groups(self, flow: FlowInstance, sorted_nodes: List[str]) -> List[Set[str]]:
-        """Find groups of nodes that can be executed in parallel (level by level)
+        def start(node_id: str):
+            task = asyncio.create_task(self._run_node(compiled.flow.nodes[node_id]))
+            running[task] = node_id
 
-        Args:
-            flow: The flow instance
-            sorted_nodes: Topologically sorted list of node IDs
+        for node_id, degree in waiting_on.items():
+            if degree == 0:
+                start(node_id)
 
-        Returns:
-            List of node groups, where each group can be executed in parallel
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    task.result()
+                    for target in successors[node_id]:
+                        waiting_on[target] -= 1
+                        if waiting_on[target] == 0:
+                            start(target)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _run_node(self, node: NodeInstance) -> None:
         """
-        # Build in-degree map
-        in_degree = {node_id: 0 for node_id in flow.nodes}
-        for edge in flow.edges:
-            in_degree[edge.target] += 1
-
-        # Track processed nodes
-        processed = set()
-        groups = []
-
-        while len(processed) < len(sorted_nodes):
-            # Find all nodes with in-degree 0 and not processed
-            current_group = set(
-                node_id for node_id in sorted_nodes if in_degree[node_id] == 0 and node_id not in processed
+        Run a node with its timeout. A best-effort node that fails or times out is skipped:
+        the flow continues, and downstream references to its outputs resolve to None.
+        """
+        try:
+            if node.timeout:
+                try:
+                    await asyncio.wait_for(self._execute_node(node), timeout=node.timeout)
+                except asyncio.TimeoutError:
+                    error = NodeTimeoutError(f"Node {node.id} timed out after {node.timeout}s")
+                    await self.emit_event(
+                        FlowEvent(
+                            FlowEventType.NODE_ERROR,
+                            node.id,
+                            node.type,
+                            self.execution_id,
+                            {"node_type": node.type, "error": str(error)},
+                        )
+                    )
+                    raise error
+            else:
+                await self._execute_node(node)
+        except Exception as e:
+            if not node.best_effort:
+                raise
+            self.skipped_nodes.add(node.id)
+            logger.warning(
+                f"Skipping best-effort node {node.id}: {e}",
+                extra={"execution_id": self.execution_id},
             )
-            if not current_group:
-                break  # Should not happen if topological sort is correct
-            groups.append(current_group)
-            # Mark nodes as processed and update in-degree for successors
-            for node_id in current_group:
-                processed.add(node_id)
-                for edge in flow.edges:
-                    if edge.source == node_id:
-                        in_degree[edge.target] -= 1
-        return groups
-
-    async def _execute_node_group(self, flow: FlowInstance, node_group: Set[str]):
-        """Execute a group of nodes (possibly in parallel)"""
-        logger.info(f"Executing node group: {node_group}", extra={"execution_id": self.execution_id})
-        if len(node_group) == 1:
-            node_id = next(iter(node_group))
-            node = flow.nodes[node_id]
-            await self._execute_node(node)
-        else:
-            tasks = []
-            for node_id in node_group:
-                node = flow.nodes[node_id]
-                tasks.append(self._execute_node(node))
-            await asyncio.gather(*tasks)
 
     def _resolve_variable(self, expr: str, nodes_ctx: dict):
         """
@@ -267,6 +249,8 @@ class FlowEngine:
                 raise ValidationError(f"Invalid variable reference: ${{{{ {expr} }}}}")
             node_id = parts[1]
             field_path = parts[3:]
+            if node_id in self.skipped_nodes:
+                return None
             node_outputs = self.context.outputs.get(node_id, {})
             value = node_outputs
             for key in field_path:
@@ -305,7 +289,9 @@ class FlowEngine:
 
         # Otherwise, use jinja2 template rendering
         try:
-            template = self.jinja_env.from_string(value)
+            template = self.compiled.templates.get(value) if self.compiled else None
+            if template is None:
+                template = self.jinja_env.from_string(value)
             rendered = template.render(nodes=nodes_ctx)
         except Exception as e:
             raise ValidationError(f"Jinja2 render error in node '{node_id}': {e}")
@@ -381,14 +367,15 @@ class FlowEngine:
             user_input = input_model.model_validate(resolved_inputs)
         except Exception as e:
             raise ValidationError(f"Input validation error for node {node.id}: {e}")
-        sys_input = SystemInput(**self.context.global_variables)
+        sys_input = SystemInput(**self.context.global_variables, query_embeddings=self.context.query_embeddings)
         return user_input, sys_input
 
     async def _execute_node(self, node: NodeInstance) -> None:
         """
         Execute a single node using the provided context, using runner_info from registry.
         """
-        runner_info = NODE_RUNNER_REGISTRY.get(node.type)
+        runner_info = self.compiled.runner_infos.get(node.type) if self.compiled else None
+        runner_info = runner_info or NODE_RUNNER_REGISTRY.get(node.type)
         if not runner_info:
             raise ValidationError(f"Unknown node type: {node.type}")
         runner = runner_info["runner"]
@@ -438,9 +425,7 @@ class FlowEngine:
 
     def find_start_nodes(self, flow: FlowInstance) -> str:
         """Find all start nodes (nodes with in-degree == 0) in the flow"""
-        in_degree = {node_id: 0 for node_id in flow.nodes}
-        for edge in flow.edges:
-            in_degree[edge.target] += 1
+        _, in_degree = build_adjacency(flow)
         start_nodes = [node_id for node_id in flow.nodes if in_degree[node_id] == 0]
         if len(start_nodes) != 1:
             raise ValidationError("Flow must have exactly one start node")
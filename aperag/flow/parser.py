@@ -77,6 +77,9 @@ class FlowParser:
         )
         if "title" in node_data:
             node.title = node_data["title"]
+        if node_data.get("timeout") is not None:
+            node.timeout = float(node_data["timeout"])
+        node.best_effort = bool(node_data.get("best_effort", False))
         return node
 
     @staticmethod
@@ -73,7 +73,7 @@ class GraphSearchService:
         from aperag.graph import lightrag_manager
         from aperag.graph.lightrag import QueryParam
 
-        rag = await lightrag_manager.create_lightrag_instance(collection)
+        rag = await lightrag_manager.get_lightrag_instance(collection)
         param: QueryParam = QueryParam(
             mode="hybrid",
             only_need_context=True,
@@ -12,16 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import base64
+import hashlib
+import io
 import json
 import logging
+import math
+import re
+import threading
 import uuid
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 
 from litellm import BaseModel
+from PIL import Image
 from pydantic import Field
 
-from aperag.db.models import APIType
+from aperag.config import settings
+from aperag.db.models import APIType, LLMProviderModel
 from aperag.db.ops import async_db_ops
 from aperag.flow.base.models import BaseNodeRunner, SystemInput, register_node_runner
 from aperag.llm.completion.completion_service import CompletionService
@@ -31,10 +40,11 @@ from aperag.query.query import DocumentWithScore
 from aperag.schema.view_models import Reference
 from aperag.utils.constant import DOC_QA_REFERENCES
 from aperag.utils.history import BaseChatMessageHistory
+from aperag.utils.tokenizer import get_default_tokenizer
 
 logger = logging.getLogger(__name__)
 
-# Character to token estimation ratio for Chinese/mixed content
+# Character to token estimation ratio for Chinese/mixed content, used when no tokenizer is available
 # Conservative estimate: 1.5 characters = 1 token
 TOKEN_TO_CHAR_RATIO = 1.5
 
@@ -47,6 +57,16 @@ FALLBACK_MAX_CONTEXT_LENGTH = 50000
 # Max images to feed to LLM
 MAX_IMAGES_PER_QUERY = 5
 
+# Upper bound of cached document base paths, and of the total size of cached image data URIs
+MAX_CACHED_BASE_PATHS = 4096
+MAX_CACHED_IMAGE_BYTES = 64 * 1024 * 1024
+
+# Upper bound of cached per-chunk token counts
+MAX_CACHED_TOKEN_COUNTS = 8192
+
+# A sentence ends after terminal punctuation (Latin or CJK) or a line break
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?;。！？；\n])")
+
 
 async def add_human_message(history: BaseChatMessageHistory, message, message_id):
     if not message_id:
@@ -80,9 +100,269 @@ class LLMOutput(BaseModel):
     text: str
 
 
+class TokenCounter:
+    """Counts tokens with the default tokenizer, caching the counts of recently seen texts"""
+
+    def __init__(self, tokenizer: Optional[Callable[[str], List[int]]] = None, max_size: int = MAX_CACHED_TOKEN_COUNTS):
+        self._tokenizer = tokenizer
+        self.max_size = max_size
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _encode(self, text: str) -> int:
+        if self._tokenizer is None:
+            try:
+                self._tokenizer = get_default_tokenizer()
+            except Exception as e:
+                logger.warning(f"Tokenizer unavailable, estimating tokens from characters: {e}")
+                self._tokenizer = False
+        if not self._tokenizer:
+            return math.ceil(len(text) / TOKEN_TO_CHAR_RATIO)
+        return len(self._tokenizer(text))
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                return count
+
+        count = self._encode(text)
+        with self._lock:
+            self._counts[key] = count
+            while len(self._counts) > self.max_size:
+                self._counts.popitem(last=False)
+        return count
+
+
+token_counter = TokenCounter()
+
+
+def trim_to_sentences(text: str, max_tokens: int, counter: Optional[TokenCounter] = None) -> str:
+    """Return the longest run of whole leading sentences of text that fits in max_tokens"""
+    counter = counter or token_counter
+    ends = [m.start() for m in SENTENCE_END_PATTERN.finditer(text) if 0 < m.start() < len(text)]
+    lo, hi, best = 0, len(ends) - 1, ""
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        candidate = text[: ends[mid]]
+        if counter.count(candidate) <= max_tokens:
+            best = candidate
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+def pack_context(
+    docs: List[DocumentWithScore],
+    max_tokens: int,
+    trim_sentences: bool = False,
+    counter: Optional[TokenCounter] = None,
+) -> Tuple[str, List[Reference], int]:
+    """
+    Fit documents into a token budget, best scored first.
+
+    Documents that do not fit are skipped so smaller ones can still use the remaining budget;
+    with trim_sentences, the first one that does not fit is cut at a sentence boundary instead.
+
+    Returns:
+        Tuple of (context, references, context_tokens)
+    """
+    counter = counter or token_counter
+    # Stable sort keeps the incoming order (e.g. reranked) among equal or missing scores
+    ranked = sorted(docs, key=lambda doc: -doc.score if doc.score is not None else math.inf)
+    parts: List[str] = []
+    references: List[Reference] = []
+    used = 0
+    for doc in ranked:
+        if not doc.text:
+            continue
+        remaining = max_tokens - used
+        if remaining <= 0:
+            break
+        text = doc.text
+        tokens = counter.count(text)
+        if tokens > remaining:
+            if not trim_sentences:
+                continue
+            text = trim_to_sentences(text, remaining, counter)
+            if not text:
+                continue
+            tokens = counter.count(text)
+            # Trimmed text fills the budget, nothing else is worth trying
+            trim_sentences = False
+        parts.append(text)
+        references.append(Reference(text=text, metadata=doc.metadata, score=doc.score))
+        used += tokens
+    return "".join(parts), references, used
+
+
+def encode_image(image_bytes: bytes, mime_type: str, max_resolution: int = 0) -> str:
+    """Encode an image as a data URI, downscaling it to fit max_resolution pixels per side if set"""
+    if max_resolution > 0:
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as image:
+                if max(image.size) > max_resolution:
+                    image_format = image.format or "PNG"
+                    image.thumbnail((max_resolution, max_resolution))
+                    buffer = io.BytesIO()
+                    image.save(buffer, format=image_format)
+                    image_bytes = buffer.getvalue()
+                    mime_type = Image.MIME.get(image_format, mime_type)
+        except Exception as e:
+            logger.warning(f"Failed to downscale image, sending it unchanged: {e}")
+    encoded_string = base64.b64encode(image_bytes).decode("utf-8")
+    return f"data:{mime_type};base64,{encoded_string}"
+
+
+class ImageAssetLoader:
+    """
+    Loads the image assets of vision search results as data URIs, several at a time.
+
+    Document base paths and encoded images are cached across requests. Images are keyed by
+    asset path and object size, so a rewritten asset is never served from the cache.
+    """
+
+    def __init__(
+        self,
+        max_base_paths: int = MAX_CACHED_BASE_PATHS,
+        max_image_bytes: int = MAX_CACHED_IMAGE_BYTES,
+    ):
+        self.max_base_paths = max_base_paths
+        self.max_image_bytes = max_image_bytes
+        self._base_paths: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._images: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._image_bytes = 0
+        self._lock = threading.Lock()
+
+    async def _get_base_path(self, user: str, collection_id: str, document_id: str) -> Optional[str]:
+        # The user is part of the key, so a cached path never bypasses the document access check
+        key = (user, collection_id, document_id)
+        with self._lock:
+            base_path = self._base_paths.get(key)
+            if base_path is not None:
+                self._base_paths.move_to_end(key)
+                return base_path
+
+        doc = await async_db_ops.query_document(user=user, collection_id=collection_id, document_id=document_id)
+        if not doc:
+            logger.warning(f"Document not found for collection_id={collection_id}, document_id={document_id}")
+            return None
+        base_path = doc.object_store_base_path()
+        with self._lock:
+            self._base_paths[key] = base_path
+            while len(self._base_paths) > self.max_base_paths:
+                self._base_paths.popitem(last=False)
+        return base_path
+
+    def _get_cached_image(self, key: Tuple[str, int, int]) -> Optional[str]:
+        with self._lock:
+            image_uri = self._images.get(key)
+            if image_uri is not None:
+                self._images.move_to_end(key)
+            return image_uri
+
+    def _cache_image(self, key: Tuple[str, int, int], image_uri: str):
+        if len(image_uri) > self.max_image_bytes:
+            return
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = image_uri
+            self._image_bytes += len(image_uri)
+            while self._image_bytes > self.max_image_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._image_bytes -= len(evicted)
+
+    async def _load_asset(self, doc: DocumentWithScore, base_path: str, max_resolution: int) -> Optional[str]:
+        asset_id = doc.metadata["asset_id"]
+        mime_type = doc.metadata["mimetype"]
+        try:
+            asset_path = f"{base_path}/assets/{asset_id}"
+            object_store = get_async_object_store()
+            size = await object_store.get_obj_size(asset_path)
+            if size is None:
+                logger.warning(f"Image not found in object store at path: {asset_path}")
+                return None
+            key = (asset_path, size, max_resolution)
+            image_uri = self._get_cached_image(key)
+            if image_uri is not None:
+                return image_uri
+
+            image_stream_tuple = await object_store.get(asset_path)
+            if not image_stream_tuple:
+                logger.warning(f"Image not found in object store at path: {asset_path}")
+                return None
+            image_stream, _ = image_stream_tuple
+            image_bytes = b"".join([chunk async for chunk in image_stream])
+            image_uri = await asyncio.to_thread(encode_image, image_bytes, mime_type, max_resolution)
+            self._cache_image(key, image_uri)
+            return image_uri
+        except Exception as e:
+            logger.error(f"Failed to process image asset {asset_id}: {e}", exc_info=True)
+            return None
+
+    async def _get_base_paths(self, user: str, doc_keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        results = await asyncio.gather(*(self._get_base_path(user, *key) for key in doc_keys), return_exceptions=True)
+        base_paths = {}
+        for key, result in zip(doc_keys, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to query document {key[1]} of collection {key[0]}: {result}")
+            elif result:
+                base_paths[key] = result
+        return base_paths
+
+    async def load_images(
+        self, user: str, docs: List[DocumentWithScore], limit: int = MAX_IMAGES_PER_QUERY, max_resolution: int = 0
+    ) -> List[Tuple[DocumentWithScore, str]]:
+        """
+        Load up to limit images in the order of docs, skipping those that fail to load.
+
+        Docs are loaded concurrently in batches of the images still missing, so at most limit
+        fetches are in flight and no more than needed are made when all of them succeed.
+        """
+
+        def doc_key(doc: DocumentWithScore) -> Tuple[str, str]:
+            return doc.metadata.get("collection_id", None), doc.metadata.get("document_id", None)
+
+        pending = [
+            doc
+            for doc in docs
+            if doc.metadata.get("asset_id", None) and doc.metadata.get("mimetype", None) and all(doc_key(doc))
+        ]
+        loaded: List[Tuple[DocumentWithScore, str]] = []
+        while pending and len(loaded) < limit:
+            batch, pending = pending[: limit - len(loaded)], pending[limit - len(loaded) :]
+            # Images of the same document share one base path lookup
+            base_paths = await self._get_base_paths(user, list(dict.fromkeys(doc_key(doc) for doc in batch)))
+            batch = [doc for doc in batch if doc_key(doc) in base_paths]
+            image_uris = await asyncio.gather(
+                *(self._load_asset(doc, base_paths[doc_key(doc)], max_resolution) for doc in batch)
+            )
+            loaded.extend((doc, image_uri) for doc, image_uri in zip(batch, image_uris) if image_uri)
+        return loaded
+
+
+image_asset_loader = ImageAssetLoader()
+
+
+async def query_completion_model(model_service_provider: str, model_name: str) -> Optional[LLMProviderModel]:
+    try:
+        return await async_db_ops.query_llm_provider_model(
+            provider_name=model_service_provider, api=APIType.COMPLETION.value, model=model_name
+        )
+    except Exception:
+        return None
+
+
 async def calculate_model_token_limits(
     model_service_provider: str,
     model_name: str,
+    model_config: Optional[LLMProviderModel] = None,
 ) -> Tuple[int, int]:
     """
     Calculate input and output token limits based on three constraints:
@@ -94,24 +374,19 @@ async def calculate_model_token_limits(
     Args:
         model_service_provider: Model service provider name
         model_name: Model name
+        model_config: Model configuration if already loaded, queried otherwise
 
     Returns:
         Tuple of (max_input_tokens, final_output_tokens)
     """
     # Get model configuration to determine token limits
-    try:
-        model_config = await async_db_ops.query_llm_provider_model(
-            provider_name=model_service_provider, api=APIType.COMPLETION.value, model=model_name
-        )
-        if model_config:
-            context_window = model_config.context_window
-            max_input_tokens = model_config.max_input_tokens
-            max_output_tokens = model_config.max_output_tokens
-        else:
-            context_window = None
-            max_input_tokens = None
-            max_output_tokens = None
-    except Exception:
+    if model_config is None:
+        model_config = await query_completion_model(model_service_provider, model_name)
+    if model_config:
+        context_window = model_config.context_window
+        max_input_tokens = model_config.max_input_tokens
+        max_output_tokens = model_config.max_output_tokens
+    else:
         context_window = None
         max_input_tokens = None
         max_output_tokens = None
@@ -147,14 +422,12 @@ async def calculate_model_token_limits(
 async def is_vision_model(
     model_service_provider: str,
     model_name: str,
+    model_config: Optional[LLMProviderModel] = None,
 ) -> bool:
+    if model_config is None:
+        model_config = await query_completion_model(model_service_provider, model_name)
     try:
-        model_config = await async_db_ops.query_llm_provider_model(
-            provider_name=model_service_provider, api=APIType.COMPLETION.value, model=model_name
-        )
-        if model_config:
-            return model_config.has_tag("vision")
-        return False
+        return bool(model_config and model_config.has_tag("vision"))
     except Exception:
         return False
 
@@ -199,16 +472,23 @@ class LLMService:
         except Exception:
             raise Exception(f"LLMProvider {model_service_provider} not found")
 
-        # Calculate input and output limits based on model configuration
+        # Calculate input and output limits based on model configuration, loaded once per request
+        model_config = await query_completion_model(model_service_provider, model_name)
         max_input_tokens, max_output_tokens = await calculate_model_token_limits(
             model_service_provider=model_service_provider,
             model_name=model_name,
+            model_config=model_config,
         )
 
-        vision_model = await is_vision_model(model_service_provider, model_name)
+        vision_model = await is_vision_model(model_service_provider, model_name, model_config=model_config)
 
         # Build context and references from documents
-        max_input_chars = max_input_tokens * TOKEN_TO_CHAR_RATIO
+        prompt_tokens = token_counter.count(prompt_template) + token_counter.count(query)
+        if prompt_tokens > max_input_tokens:
+            raise Exception(
+                f"Prompt requires {prompt_tokens} tokens, which exceeds the calculated "
+                f"input limit of {max_input_tokens} tokens"
+            )
         context = ""
         references: List[Reference] = []
         image_docs: List[DocumentWithScore] = []
@@ -233,69 +513,28 @@ class LLMService:
                 else:
                     text_docs.append(doc)
 
-            for doc in text_docs:
-                # Estimate final prompt length: template + query + current context + new doc
-                estimated_prompt_length = len(prompt_template) + len(query) + len(context) + len(doc.text)
-                if estimated_prompt_length > max_input_chars:
-                    break
-                context += doc.text
-                ref_obj = Reference(text=doc.text, metadata=doc.metadata, score=doc.score)
-                references.append(ref_obj)
+            context, references, _ = pack_context(
+                text_docs,
+                max_input_tokens - prompt_tokens,
+                trim_sentences=settings.llm_context_trim_sentences,
+            )
 
         prompt = prompt_template.format(query=query, context=context)
-        if len(prompt) > max_input_chars:
-            raise Exception(
-                f"Prompt requires {len(prompt)} characters, which exceeds the calculated "
-                f"input limit of {max_input_chars} characters"
-            )
 
         images = []
         if vision_model and image_docs:
-            base_path_cache: Dict[Tuple[str, str], str] = {}
-            object_store = get_async_object_store()
-            for doc_with_score in image_docs:
-                asset_id = doc_with_score.metadata.get("asset_id", None)
-                mime_type = doc_with_score.metadata.get("mimetype", None)
-                coll_id = doc_with_score.metadata.get("collection_id", None)
-                doc_id = doc_with_score.metadata.get("document_id", None)
-                if not (asset_id and mime_type and coll_id and doc_id):
-                    continue
-
-                try:
-                    cache_key = (coll_id, doc_id)
-                    if cache_key in base_path_cache:
-                        base_path = base_path_cache[cache_key]
-                    else:
-                        doc = await async_db_ops.query_document(user=user, collection_id=coll_id, document_id=doc_id)
-                        if not doc:
-                            logger.warning(f"Document not found for collection_id={coll_id}, document_id={doc_id}")
-                            continue
-                        base_path = doc.object_store_base_path()
-                        base_path_cache[cache_key] = base_path
-
-                    asset_path = f"{base_path}/assets/{asset_id}"
-                    image_stream_tuple = await object_store.get(asset_path)
-                    if not image_stream_tuple:
-                        logger.warning(f"Image not found in object store at path: {asset_path}")
-                        continue
-
-                    image_stream, _ = image_stream_tuple
-                    image_bytes = b"".join([chunk async for chunk in image_stream])
-                    encoded_string = base64.b64encode(image_bytes).decode("utf-8")
-                    image_uri = f"data:{mime_type};base64,{encoded_string}"
-                    images.append(image_uri)
-                    ref_obj = Reference(
-                        text=doc_with_score.text,
-                        image_uri=image_uri,
-                        metadata=doc_with_score.metadata,
-                        score=doc_with_score.score,
-                    )
-                    references.append(ref_obj)
-
-                    if len(images) > MAX_IMAGES_PER_QUERY:
-                        break
-                except Exception as e:
-                    logger.error(f"Failed to process image asset {asset_id}: {e}", exc_info=True)
+            loaded_images = await image_asset_loader.load_images(
+                user, image_docs, MAX_IMAGES_PER_QUERY, settings.llm_image_max_resolution
+            )
+            for doc_with_score, image_uri in loaded_images:
+                images.append(image_uri)
+                ref_obj = Reference(
+                    text=doc_with_score.text,
+                    image_uri=image_uri,
+                    metadata=doc_with_score.metadata,
+                    score=doc_with_score.score,
+                )
+                references.append(ref_obj)
 
         cs = CompletionService(
             custom_llm_provider, model_name, base_url, api_key, temperature, max_output_tokens, vision=vision_model
@@ -22,8 +22,8 @@ from aperag.config import settings
 from aperag.context.context import ContextManager
 from aperag.db.models import Collection
 from aperag.db.ops import async_db_ops
-from aperag.flow.base.models import BaseNodeRunner, SystemInput, register_node_runner
-from aperag.llm.embed.base_embedding import get_collection_embedding_service_sync
+from aperag.flow.base.models import BaseNodeRunner, QueryEmbeddingMemo, SystemInput, register_node_runner
+from aperag.llm.embed.base_embedding import get_collection_embedding_service
 from aperag.llm.llm_error_types import (
     EmbeddingError,
     ProviderNotFoundError,
@@ -63,7 +63,13 @@ class SummarySearchService:
         self.repository = repository
 
     async def execute_summary_search(
-        self, user, query: str, top_k: int, similarity_threshold: float, collection_ids: List[str]
+        self,
+        user,
+        query: str,
+        top_k: int,
+        similarity_threshold: float,
+        collection_ids: List[str],
+        query_embeddings: Optional[QueryEmbeddingMemo] = None,
     ) -> List[DocumentWithScore]:
         """Execute summary search with given parameters"""
         collection = None
@@ -75,15 +81,18 @@ class SummarySearchService:
 
         try:
             collection_name = generate_vector_db_collection_name(collection.id)
-            embedding_model, vector_size = get_collection_embedding_service_sync(collection)
+            embedding_model, vector_size = await get_collection_embedding_service(collection)
             vectordb_ctx = json.loads(settings.vector_db_context)
             vectordb_ctx["collection"] = collection_name
             context_manager = ContextManager(collection_name, embedding_model, settings.vector_db_type, vectordb_ctx)
 
-            vector = embedding_model.embed_query(query)
+            if query_embeddings is not None:
+                vector = await query_embeddings.aembed_query(embedding_model, query)
+            else:
+                vector = await embedding_model.aembed_query(query)
 
             # Query vector database for summary vectors only
-            results = context_manager.query(
+            results = await context_manager.aquery(
                 query, score_threshold=similarity_threshold, topk=top_k, vector=vector, index_types=["summary"]
             )
 
@@ -129,6 +138,7 @@ class SummarySearchNodeRunner(BaseNodeRunner):
             top_k=ui.top_k,
             similarity_threshold=ui.similarity_threshold,
             collection_ids=ui.collection_ids or [],
+            query_embeddings=si.query_embeddings,
         )
 
         return SummarySearchOutput(docs=results), {}
@@ -22,8 +22,8 @@ from aperag.config import settings
 from aperag.context.context import ContextManager
 from aperag.db.models import Collection
 from aperag.db.ops import async_db_ops
-from aperag.flow.base.models import BaseNodeRunner, SystemInput, register_node_runner
-from aperag.llm.embed.base_embedding import get_collection_embedding_service_sync
+from aperag.flow.base.models import BaseNodeRunner, QueryEmbeddingMemo, SystemInput, register_node_runner
+from aperag.llm.embed.base_embedding import get_collection_embedding_service
 from aperag.llm.llm_error_types import (
     EmbeddingError,
     ProviderNotFoundError,
@@ -71,6 +71,7 @@ class VectorSearchService:
         similarity_threshold: float,
         collection_ids: List[str],
         chat_id: Optional[str] = None,
+        query_embeddings: Optional[QueryEmbeddingMemo] = None,
     ) -> List[DocumentWithScore]:
         """Execute vector search with given parameters"""
         collection = None
@@ -82,15 +83,18 @@ class VectorSearchService:
 
         try:
             collection_name = generate_vector_db_collection_name(collection.id)
-            embedding_model, vector_size = get_collection_embedding_service_sync(collection)
+            embedding_model, vector_size = await get_collection_embedding_service(collection)
             vectordb_ctx = json.loads(settings.vector_db_context)
             vectordb_ctx["collection"] = collection_name
             context_manager = ContextManager(collection_name, embedding_model, settings.vector_db_type, vectordb_ctx)
 
-            vector = embedding_model.embed_query(query)
+            if query_embeddings is not None:
+                vector = await query_embeddings.aembed_query(embedding_model, query)
+            else:
+                vector = await embedding_model.aembed_query(query)
 
             # Query vector database for vector and vision indexes only (excluding summary)
-            results = context_manager.query(
+            results = await context_manager.aquery(
                 query,
                 score_threshold=similarity_threshold,
                 topk=top_k,
@@ -145,5 +149,6 @@ class VectorSearchNodeRunner(BaseNodeRunner):
             similarity_threshold=ui.similarity_threshold,
             collection_ids=collection_ids,
             chat_id=chat_id,
+            query_embeddings=si.query_embeddings,
         )
         return VectorSearchOutput(docs=docs), {}
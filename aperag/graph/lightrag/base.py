@@ -446,6 +446,26 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             result[node_id] = edges if edges is not None else []
         return result
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Insert or update multiple nodes as a batch
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+        """
+        for node_id, node_data in nodes.items():
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(self, edges: dict[tuple[str, str], dict[str, str]]) -> None:
+        """Insert or update multiple edges as a batch
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+        """
+        for (src_id, tgt_id), edge_data in edges.items():
+            await self.upsert_edge(src_id, tgt_id, edge_data)
+
     @abstractmethod
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """Insert a new node or update an existing node in the graph.
@@ -522,6 +542,27 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             A list of all node labels in the graph, sorted alphabetically
         """
 
+    async def search_labels(self, query: str, mode: str = "fuzzy", limit: int = 50) -> list[str]:
+        """Search node labels.
+
+        Storages with a label index should override this; the default filters get_all_labels.
+
+        Args:
+            query: Text to search, an empty query matches all labels
+            mode: "prefix" for labels starting with the query, "fuzzy" for labels containing it
+            limit: Maximum number of labels to return
+
+        Returns:
+            Matching labels, labels starting with the query first
+        """
+        needle = query.lower()
+        labels = await self.get_all_labels()
+        prefixed = [label for label in labels if label.lower().startswith(needle)]
+        if mode == "prefix":
+            return prefixed[:limit]
+        contained = [label for label in labels if needle in label.lower() and not label.lower().startswith(needle)]
+        return (prefixed + contained)[:limit]
+
     @abstractmethod
     async def get_knowledge_graph(self, node_label: str, max_depth: int = 3, max_nodes: int = 1000) -> KnowledgeGraph:
         """
@@ -42,4 +42,5 @@ consistency and makes maintenance easier.
 # Default values for environment variables
 DEFAULT_MAX_TOKEN_SUMMARY = 500
 DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE = 10
+DEFAULT_MAX_PARALLEL_MERGE = 4
 DEFAULT_TIMEOUT = 150
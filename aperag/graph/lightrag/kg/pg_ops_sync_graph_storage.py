@@ -33,6 +33,9 @@ from ..base import BaseGraphStorage
 from ..types import KnowledgeGraph, KnowledgeGraphEdge, KnowledgeGraphNode
 from ..utils import logger
 
+# Max rows per INSERT statement, keeping bind parameters well below the PostgreSQL limit
+UPSERT_BATCH_SIZE = 1000
+
 
 @final
 @dataclass
@@ -235,6 +238,34 @@ class PGOpsSyncGraphStorage(BaseGraphStorage):
 
         return await asyncio.to_thread(_sync_get_nodes_edges_batch)
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Upsert multiple nodes using batched INSERT ... ON CONFLICT statements."""
+
+        def _sync_upsert_nodes_batch():
+            # Import here to avoid circular imports
+            from aperag.db.ops import db_ops
+
+            items = list(nodes.items())
+            for i in range(0, len(items), UPSERT_BATCH_SIZE):
+                db_ops.upsert_graph_nodes_batch(self.workspace, dict(items[i : i + UPSERT_BATCH_SIZE]))
+
+        await asyncio.to_thread(_sync_upsert_nodes_batch)
+        logger.debug(f"Batch upserted {len(nodes)} nodes")
+
+    async def upsert_edges_batch(self, edges: dict[tuple[str, str], dict[str, str]]) -> None:
+        """Upsert multiple edges using batched INSERT ... ON CONFLICT statements."""
+
+        def _sync_upsert_edges_batch():
+            # Import here to avoid circular imports
+            from aperag.db.ops import db_ops
+
+            items = list(edges.items())
+            for i in range(0, len(items), UPSERT_BATCH_SIZE):
+                db_ops.upsert_graph_edges_batch(self.workspace, dict(items[i : i + UPSERT_BATCH_SIZE]))
+
+        await asyncio.to_thread(_sync_upsert_edges_batch)
+        logger.debug(f"Batch upserted {len(edges)} edges")
+
     async def delete_node(self, node_id: str) -> None:
         """Delete a node and all its related edges in a single transaction."""
 
@@ -282,108 +313,56 @@ class PGOpsSyncGraphStorage(BaseGraphStorage):
 
         return await asyncio.to_thread(_sync_get_all_labels)
 
+    async def search_labels(self, query: str, mode: str = "fuzzy", limit: int = 50) -> list[str]:
+        """Search entity labels in the database with the trigram index."""
+
+        def _sync_search_labels():
+            # Import here to avoid circular imports
+            from aperag.db.ops import db_ops
+
+            return db_ops.search_graph_labels(self.workspace, query, mode, limit)
+
+        return await asyncio.to_thread(_sync_search_labels)
+
     async def get_knowledge_graph(self, node_label: str, max_depth: int = 3, max_nodes: int = 1000) -> KnowledgeGraph:
         """
         Get a connected subgraph of nodes matching the specified label.
 
-        Note: This is a simplified implementation that uses the existing Repository pattern.
-        For now, it only supports getting nodes by label pattern and their immediate connections.
-        Full graph traversal with max_depth would require additional Repository methods.
+        The traversal runs in the database as a bounded breadth-first search, see
+        GraphRepositoryMixin.get_graph_subgraph.
         """
 
         def _sync_get_knowledge_graph():
             # Import here to avoid circular imports
             from aperag.db.ops import db_ops
 
-            result = KnowledgeGraph()
-            MAX_GRAPH_NODES = max_nodes
-
-            # Get all labels first
-            all_labels = db_ops.get_all_graph_labels(self.workspace)
-
-            # Filter based on node_label pattern
-            if node_label == "*":
-                # Get all nodes (limited by max_nodes)
-                matching_labels = all_labels[:MAX_GRAPH_NODES]
-            else:
-                # Filter by pattern (similar to LIKE operation)
-                matching_labels = [label for label in all_labels if node_label in label]
-                if len(matching_labels) > MAX_GRAPH_NODES:
-                    matching_labels = matching_labels[:MAX_GRAPH_NODES]
-
-            # Get node details for each matching label using batch operation
-            if matching_labels:
-                nodes_data = db_ops.get_graph_nodes_batch(self.workspace, matching_labels)
-
-                for entity_id, node_data in nodes_data.items():
-                    # Assemble properties from individual fields
-                    properties = {
-                        "entity_id": node_data["entity_id"],
-                        "entity_type": node_data.get("entity_type"),
-                        "description": node_data.get("description"),
-                        "source_id": node_data.get("source_id"),
-                        "file_path": node_data.get("file_path"),
-                    }
-                    # Only include entity_name if it's different from entity_id and not None
-                    if "entity_name" in node_data and node_data["entity_name"] != entity_id:
-                        properties["entity_name"] = node_data["entity_name"]
-
-                    # Remove None values for cleaner output
-                    properties = {k: v for k, v in properties.items() if v is not None}
-
-                    result.nodes.append(
-                        KnowledgeGraphNode(
-                            id=entity_id,
-                            labels=[node_data.get("entity_type", entity_id)],
-                            properties=properties,
-                        )
-                    )
-
-                # Get edges between the selected nodes using batch operation
-                node_names = [node.id for node in result.nodes]
-                if node_names:
-                    nodes_edges = db_ops.get_graph_nodes_edges_batch(self.workspace, node_names)
-
-                    # Collect unique edge pairs that connect nodes in our result set
-                    edge_pairs_to_query = set()
-                    for source_node in node_names:
-                        edges = nodes_edges.get(source_node, [])
-                        for source_entity_id, target_entity_id in edges:
-                            # Only include edges between selected nodes
-                            if source_entity_id in node_names and target_entity_id in node_names:
-                                edge_pairs_to_query.add((source_entity_id, target_entity_id))
-
-                    # Get edge details in batch
-                    if edge_pairs_to_query:
-                        edges_data = db_ops.get_graph_edges_batch(self.workspace, list(edge_pairs_to_query))
-
-                        for (source_entity_id, target_entity_id), edge_data in edges_data.items():
-                            edge_id = f"{source_entity_id}-{target_entity_id}"
-
-                            # Assemble edge properties from individual fields
-                            edge_properties = {
-                                "weight": edge_data.get("weight", 0.0),
-                                "keywords": edge_data.get("keywords"),
-                                "description": edge_data.get("description"),
-                                "source_id": edge_data.get("source_id"),
-                                "file_path": edge_data.get("file_path"),
-                            }
-                            # Remove None values for cleaner output
-                            edge_properties = {k: v for k, v in edge_properties.items() if v is not None}
-
-                            result.edges.append(
-                                KnowledgeGraphEdge(
-                                    id=edge_id,
-                                    type="DIRECTED",
-                                    source=source_entity_id,
-                                    target=target_entity_id,
-                                    properties=edge_properties,
-                                )
-                            )
-
-            return result
-
-        result = await asyncio.to_thread(_sync_get_knowledge_graph)
+            return db_ops.get_graph_subgraph(self.workspace, node_label, max_depth, max_nodes)
+
+        subgraph = await asyncio.to_thread(_sync_get_knowledge_graph)
+
+        result = KnowledgeGraph(is_truncated=subgraph["is_truncated"])
+        for node_data in subgraph["nodes"]:
+            entity_id = node_data["entity_id"]
+            properties = {k: v for k, v in node_data.items() if k not in ("created_at", "degree")}
+            result.nodes.append(
+                KnowledgeGraphNode(
+                    id=entity_id,
+                    labels=[node_data.get("entity_type", entity_id)],
+                    properties=properties,
+                )
+            )
+        for edge_data in subgraph["edges"]:
+            source_entity_id, target_entity_id = edge_data["source"], edge_data["target"]
+            result.edges.append(
+                KnowledgeGraphEdge(
+                    id=f"{source_entity_id}-{target_entity_id}",
+                    type="DIRECTED",
+                    source=source_entity_id,
+                    target=target_entity_id,
+                    properties={k: v for k, v in edge_data.items() if k not in ("source", "target")},
+                )
+            )
+
         logger.info(f"Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}")
         return result
 
@@ -49,6 +49,7 @@ from typing import (
 
 from aperag.graph.lightrag.constants import (
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
+    DEFAULT_MAX_PARALLEL_MERGE,
     DEFAULT_MAX_TOKEN_SUMMARY,
 )
 from aperag.graph.lightrag.kg import (
@@ -115,6 +116,9 @@ class LightRAG:
         default=get_env_value("FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int)
     )
 
+    max_parallel_merge: int = field(default=get_env_value("MAX_PARALLEL_MERGE", DEFAULT_MAX_PARALLEL_MERGE, int))
+    """Maximum number of connected components merged concurrently (1 merges them one by one)."""
+
     # Text chunking
     # ---
 
@@ -358,6 +362,9 @@ class LightRAG:
         text = await self.chunk_entity_relation_graph.get_all_labels()
         return text
 
+    async def search_graph_labels(self, query: str, mode: str = "fuzzy", limit: int = 50) -> list[str]:
+        return await self.chunk_entity_relation_graph.search_labels(query, mode, limit)
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -400,59 +407,60 @@ class LightRAG:
 
     # ============= New Stateless Interfaces =============
 
-    def _find_connected_components(self, chunk_results: List[tuple[dict, dict]]) -> List[List[str]]:
+    def _group_by_connected_components(
+        self, chunk_results: List[tuple[dict, dict]]
+    ) -> List[tuple[List[str], List[tuple[dict, dict]]]]:
         """
-        Find connected components in the extracted entities and relationships.
+        Group the extracted entities and relationships by connected component.
+
+        Components are found with union-find, and every chunk result is split into per-component
+        parts in a single pass, so the cost is linear in the number of extracted items.
 
         Args:
             chunk_results: List of (nodes_dict, edges_dict) tuples from entity extraction
 
         Returns:
-            List of entity groups, where each group is a list of connected entity names
+            List of (entity names, chunk results) per component, in order of first appearance
         """
-        # Build adjacency list
-        adjacency: Dict[str, set[str]] = {}
+        parent: Dict[str, str] = {}
+
+        def find(entity_name: str) -> str:
+            root = entity_name
+            while parent[root] != root:
+                root = parent[root]
+            # Path compression
+            while parent[entity_name] != root:
+                parent[entity_name], entity_name = root, parent[entity_name]
+            return root
 
         for nodes, edges in chunk_results:
-            # Add all nodes to adjacency list
             for entity_name in nodes.keys():
-                if entity_name not in adjacency:
-                    adjacency[entity_name] = set()
-
-            # Add edges to create connections
+                parent.setdefault(entity_name, entity_name)
             for src, tgt in edges.keys():
-                if src not in adjacency:
-                    adjacency[src] = set()
-                if tgt not in adjacency:
-                    adjacency[tgt] = set()
-                adjacency[src].add(tgt)
-                adjacency[tgt].add(src)
-
-        # Find connected components using BFS
-        visited = set()
-        components = []
-
-        for node in adjacency:
-            if node not in visited:
-                # Start BFS from this node
-                component = []
-                queue = [node]
-                visited.add(node)
-
-                while queue:
-                    current = queue.pop(0)
-                    component.append(current)
-
-                    # Visit all neighbors
-                    for neighbor in adjacency.get(current, set()):
-                        if neighbor not in visited:
-                            visited.add(neighbor)
-                            queue.append(neighbor)
-
-                components.append(component)
-
-        self.lightrag_logger.debug(f"Found {len(components)} connected components from {len(adjacency)} entities")
-        return components
+                parent.setdefault(src, src)
+                parent.setdefault(tgt, tgt)
+                src_root, tgt_root = find(src), find(tgt)
+                if src_root != tgt_root:
+                    parent[tgt_root] = src_root
+
+        # Component entities and chunk results keyed by root, in order of first appearance
+        component_entities: Dict[str, List[str]] = {}
+        for entity_name in parent:
+            component_entities.setdefault(find(entity_name), []).append(entity_name)
+        component_chunk_results: Dict[str, List[tuple[dict, dict]]] = {root: [] for root in component_entities}
+
+        for nodes, edges in chunk_results:
+            parts: Dict[str, tuple[dict, dict]] = {}
+            for entity_name, entity_data in nodes.items():
+                parts.setdefault(find(entity_name), ({}, {}))[0][entity_name] = entity_data
+            for (src, tgt), edge_data in edges.items():
+                # Both endpoints of an edge always share a component
+                parts.setdefault(find(src), ({}, {}))[1][(src, tgt)] = edge_data
+            for root, part in parts.items():
+                component_chunk_results[root].append(part)
+
+        self.lightrag_logger.debug(f"Found {len(component_entities)} connected components from {len(parent)} entities")
+        return [(component_entities[root], component_chunk_results[root]) for root in component_entities]
 
     async def _grouping_process_chunk_results(
         self,
@@ -462,6 +470,10 @@ class LightRAG:
         """
         Process entities and relationships in groups based on connected components.
 
+        Components are disjoint, so up to max_parallel_merge of them are merged concurrently;
+        the per-entity and per-relation locks taken while merging still guard against other
+        documents updating the same entities.
+
         Args:
             chunk_results: List of (nodes_dict, edges_dict) from entity extraction
             collection_id: Optional collection ID for logging
@@ -469,7 +481,7 @@ class LightRAG:
         Returns:
             Dict with processing results
         """
-        components = self._find_connected_components(chunk_results)
+        components = self._group_by_connected_components(chunk_results)
 
         # Handle case where no entities were extracted
         if not components:
@@ -482,48 +494,19 @@ class LightRAG:
             }
 
         # Prepare component data for parallel processing
-        component_tasks = []
-
-        for i, component in enumerate(components):
-            # Create a set for quick lookup
-            component_entities = set(component)
-
-            # Filter chunk results for this component
-            component_chunk_results = []
-
-            for nodes, edges in chunk_results:
-                # Filter nodes belonging to this component
-                filtered_nodes = {
-                    entity_name: entity_data
-                    for entity_name, entity_data in nodes.items()
-                    if entity_name in component_entities
-                }
-
-                # Filter edges where both endpoints belong to this component
-                filtered_edges = {
-                    (src, tgt): edge_data
-                    for (src, tgt), edge_data in edges.items()
-                    if src in component_entities and tgt in component_entities
-                }
-
-                if filtered_nodes or filtered_edges:
-                    component_chunk_results.append((filtered_nodes, filtered_edges))
-
-            if not component_chunk_results:
-                continue
-
-            # Add task data for this component
-            component_tasks.append(
-                {
-                    "index": i,
-                    "component": component,
-                    "component_chunk_results": component_chunk_results,
-                    "total_components": len(components),
-                }
-            )
+        component_tasks = [
+            {
+                "index": i,
+                "component": component,
+                "component_chunk_results": component_chunk_results,
+                "total_components": len(components),
+            }
+            for i, (component, component_chunk_results) in enumerate(components)
+            if component_chunk_results
+        ]
 
-        # Process components concurrently with semaphore
-        semaphore = asyncio.Semaphore(1)
+        # Process components concurrently with a bounded number of merges in flight
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_merge))
 
         async def _process_component_with_semaphore(task_data):
             async with semaphore:
@@ -611,6 +594,7 @@ class LightRAG:
         file_paths: list[str] | None = None,
         split_by_character: str | None = None,
         split_by_character_only: bool = False,
+        chunk_lists: list[list[dict[str, Any]]] | None = None,
     ) -> dict[str, Any]:
         """
         Stateless document insertion and chunking - inserts documents and performs chunking in one step.
@@ -621,6 +605,8 @@ class LightRAG:
             file_paths: Optional list of file paths for citation
             split_by_character: Optional character to split by
             split_by_character_only: If True, only split by character
+            chunk_lists: Optional precomputed chunks per document (as returned by chunking_func),
+                which skips chunking for those documents
 
         Returns:
             Dict with document metadata and chunks
@@ -638,6 +624,8 @@ class LightRAG:
             raise ValueError("Number of file paths must match number of documents")
         if doc_ids and len(doc_ids) != len(documents):
             raise ValueError("Number of doc IDs must match number of documents")
+        if chunk_lists is not None and len(chunk_lists) != len(documents):
+            raise ValueError("Number of chunk lists must match number of documents")
 
         # Use default file paths if not provided
         if not file_paths:
@@ -653,21 +641,24 @@ class LightRAG:
 
         results = []
 
-        for doc_id, content, file_path in zip(doc_ids, documents, file_paths):
+        for idx, (doc_id, content, file_path) in enumerate(zip(doc_ids, documents, file_paths)):
             cleaned_content = clean_text(content)
 
             if not cleaned_content.strip():
                 raise ValueError(f"Document {doc_id} content is empty after cleaning")
 
-            # Perform chunking
-            chunk_list = self.chunking_func(
-                self.tokenizer,
-                cleaned_content,
-                split_by_character,
-                split_by_character_only,
-                self.chunk_overlap_token_size,
-                self.chunk_token_size,
-            )
+            # Perform chunking, unless the chunks were computed upstream
+            if chunk_lists is not None and chunk_lists[idx]:
+                chunk_list = chunk_lists[idx]
+            else:
+                chunk_list = self.chunking_func(
+                    self.tokenizer,
+                    cleaned_content,
+                    split_by_character,
+                    split_by_character_only,
+                    self.chunk_overlap_token_size,
+                    self.chunk_token_size,
+                )
 
             # Validate chunk_list format
             if not chunk_list:
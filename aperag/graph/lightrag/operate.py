@@ -39,6 +39,7 @@ import os
 import re
 import time
 from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
 from typing import Any, AsyncIterator
 
 from aperag.concurrent_control import get_or_create_lock
@@ -231,44 +232,17 @@ async def _handle_single_relationship_extraction(
     )
 
 
-async def _merge_nodes_then_upsert(
-    entity_name: str,
-    nodes_data: list[dict],
-    knowledge_graph_inst: BaseGraphStorage,
-    llm_model_func: callable,
-    tokenizer: Tokenizer,
-    llm_model_max_token_size: int,
-    summary_to_max_tokens: int,
-    language: str,
-    force_llm_summary_on_merge: int,
-    lightrag_logger: LightRAGLogger | None = None,
-    workspace: str = "",
-):
+def _merge_node_fragments(entity_name: str, nodes_data: list[dict], already_node: dict | None) -> tuple[dict, int, int]:
     """
-    Merge multiple entity nodes with the same name and upsert the result to knowledge graph.
-
-    This function handles entity deduplication by:
-    1. Retrieving existing entity data from knowledge graph
-    2. Merging existing data with new entity data
-    3. Determining the final entity properties through aggregation
-    4. Optionally using LLM to summarize lengthy descriptions
-    5. Upserting the merged entity back to knowledge graph
+    Merge new entity fragments with the existing entity, without summarizing the description.
 
     Args:
         entity_name: The name of the entity to merge
         nodes_data: List of new entity data dictionaries to merge
-        knowledge_graph_inst: Knowledge graph storage instance
-        llm_model_func: LLM function for description summarization
-        tokenizer: Tokenizer for text processing
-        llm_model_max_token_size: Maximum token size for LLM input
-        summary_to_max_tokens: Maximum tokens for summary output
-        language: Language for LLM summarization
-        force_llm_summary_on_merge: Threshold for triggering LLM summarization
-        lightrag_logger: Optional logger instance
-        workspace: Workspace identifier for lock creation
+        already_node: The entity currently stored in the knowledge graph, if any
 
     Returns:
-        dict: The merged node data that was upserted
+        tuple: (merged node data, total description fragments, new unique description fragments)
     """
 
     # 1. Initialize containers for collecting existing entity data
@@ -277,8 +251,7 @@ async def _merge_nodes_then_upsert(
     already_description = []
     already_file_paths = []
 
-    # 2. Retrieve existing entity from knowledge graph if it exists
-    already_node = await knowledge_graph_inst.get_node(entity_name)
+    # 2. Collect data of the existing entity
     if already_node:
         # 2.1. Collect existing entity type
         already_entity_types.append(already_node["entity_type"])
@@ -314,29 +287,6 @@ async def _merge_nodes_then_upsert(
     num_fragment = description.count(GRAPH_FIELD_SEP) + 1  # Total description fragments
     num_new_fragment = len(set([dp["description"] for dp in nodes_data]))  # New unique descriptions
 
-    # 5. Handle description summarization if there are multiple fragments
-    if num_fragment > 1:
-        # 5.1. Check if LLM summarization threshold is met
-        if num_fragment >= force_llm_summary_on_merge:
-            # 5.1.1. Log LLM summarization decision
-            lightrag_logger.log_entity_merge(entity_name, num_fragment, num_new_fragment, is_llm_summary=True)
-
-            # 5.1.2. Use LLM to summarize lengthy descriptions
-            description = await _handle_entity_relation_summary(
-                entity_name,
-                description,
-                llm_model_func,
-                tokenizer,
-                llm_model_max_token_size,
-                summary_to_max_tokens,
-                language,
-                lightrag_logger,
-            )
-        else:
-            # 5.2. Simple merge without LLM summarization (fragment count below threshold)
-            lightrag_logger.log_entity_merge(entity_name, num_fragment, num_new_fragment, is_llm_summary=False)
-
-    # 6. Create final node data structure
     node_data = dict(
         entity_id=entity_name,
         entity_type=entity_type,
@@ -345,63 +295,42 @@ async def _merge_nodes_then_upsert(
         file_path=file_path,
         created_at=int(time.time()),
     )
-
-    # 7. Upsert the merged entity to knowledge graph
-    await knowledge_graph_inst.upsert_node(
-        entity_name,
-        node_data=node_data,
-    )
-
-    # 8. Add entity_name to returned data and return the final merged entity
-    node_data["entity_name"] = entity_name
-    return node_data
+    return node_data, num_fragment, num_new_fragment
 
 
-async def _merge_edges_then_upsert(
-    src_id: str,
-    tgt_id: str,
-    edges_data: list[dict],
-    knowledge_graph_inst: BaseGraphStorage,
-    llm_model_func: callable,
-    tokenizer: Tokenizer,
-    llm_model_max_token_size: int,
-    summary_to_max_tokens: int,
-    language: str,
-    force_llm_summary_on_merge: int,
-    lightrag_logger: LightRAGLogger,
-    workspace: str = "",
-):
-    if src_id == tgt_id:
-        return None
+def _merge_edge_fragments(edges_data: list[dict], already_edge: dict | None) -> tuple[dict, int, int]:
+    """
+    Merge new relation fragments with the existing relation, without summarizing the description.
 
+    Returns:
+        tuple: (merged edge data, total description fragments, new unique description fragments)
+    """
     already_weights = []
     already_source_ids = []
     already_description = []
     already_keywords = []
     already_file_paths = []
 
-    if await knowledge_graph_inst.has_edge(src_id, tgt_id):
-        already_edge = await knowledge_graph_inst.get_edge(src_id, tgt_id)
-        # Handle the case where get_edge returns None or missing fields
-        if already_edge:
-            # Get weight with default 0.0 if missing
-            already_weights.append(already_edge.get("weight", 0.0))
+    # Handle the case where the edge does not exist or has missing fields
+    if already_edge:
+        # Get weight with default 0.0 if missing
+        already_weights.append(already_edge.get("weight", 0.0))
 
-            # Get source_id with empty string default if missing or None
-            if already_edge.get("source_id") is not None:
-                already_source_ids.extend(split_string_by_multi_markers(already_edge["source_id"], [GRAPH_FIELD_SEP]))
+        # Get source_id with empty string default if missing or None
+        if already_edge.get("source_id") is not None:
+            already_source_ids.extend(split_string_by_multi_markers(already_edge["source_id"], [GRAPH_FIELD_SEP]))
 
-            # Get file_path with empty string default if missing or None
-            if already_edge.get("file_path") is not None:
-                already_file_paths.extend(split_string_by_multi_markers(already_edge["file_path"], [GRAPH_FIELD_SEP]))
+        # Get file_path with empty string default if missing or None
+        if already_edge.get("file_path") is not None:
+            already_file_paths.extend(split_string_by_multi_markers(already_edge["file_path"], [GRAPH_FIELD_SEP]))
 
-            # Get description with empty string default if missing or None
-            if already_edge.get("description") is not None:
-                already_description.append(already_edge["description"])
+        # Get description with empty string default if missing or None
+        if already_edge.get("description") is not None:
+            already_description.append(already_edge["description"])
 
-            # Get keywords with empty string default if missing or None
-            if already_edge.get("keywords") is not None:
-                already_keywords.extend(split_string_by_multi_markers(already_edge["keywords"], [GRAPH_FIELD_SEP]))
+        # Get keywords with empty string default if missing or None
+        if already_edge.get("keywords") is not None:
+            already_keywords.extend(split_string_by_multi_markers(already_edge["keywords"], [GRAPH_FIELD_SEP]))
 
     # Process edges_data with None checks
     weight = sum([dp["weight"] for dp in edges_data] + already_weights)
@@ -429,64 +358,18 @@ async def _merge_edges_then_upsert(
         set([dp["file_path"] for dp in edges_data if dp.get("file_path")] + already_file_paths)
     )
 
-    for need_insert_id in [src_id, tgt_id]:
-        if not (await knowledge_graph_inst.has_node(need_insert_id)):
-            await knowledge_graph_inst.upsert_node(
-                need_insert_id,
-                node_data={
-                    "entity_id": need_insert_id,
-                    "source_id": source_id,
-                    "description": description,
-                    "entity_type": "UNKNOWN",
-                    "file_path": file_path,
-                    "created_at": int(time.time()),
-                },
-            )
-
     num_fragment = description.count(GRAPH_FIELD_SEP) + 1
     num_new_fragment = len(set([dp["description"] for dp in edges_data if dp.get("description")]))
 
-    if num_fragment > 1:
-        if num_fragment >= force_llm_summary_on_merge:
-            lightrag_logger.log_relation_merge(src_id, tgt_id, num_fragment, num_new_fragment, is_llm_summary=True)
-
-            description = await _handle_entity_relation_summary(
-                f"({src_id}, {tgt_id})",
-                description,
-                llm_model_func,
-                tokenizer,
-                llm_model_max_token_size,
-                summary_to_max_tokens,
-                language,
-                lightrag_logger,
-            )
-        else:
-            lightrag_logger.log_relation_merge(src_id, tgt_id, num_fragment, num_new_fragment, is_llm_summary=False)
-
-    await knowledge_graph_inst.upsert_edge(
-        src_id,
-        tgt_id,
-        edge_data=dict(
-            weight=weight,
-            description=description,
-            keywords=keywords,
-            source_id=source_id,
-            file_path=file_path,
-            created_at=int(time.time()),
-        ),
-    )
-
     edge_data = dict(
-        src_id=src_id,
-        tgt_id=tgt_id,
+        weight=weight,
         description=description,
         keywords=keywords,
         source_id=source_id,
         file_path=file_path,
         created_at=int(time.time()),
     )
-
-    return edge_data
+    return edge_data, num_fragment, num_new_fragment
 
 
 @timing_wrapper("merge_nodes_and_edges")
@@ -536,7 +419,14 @@ async def _merge_nodes_and_edges_impl(
     force_llm_summary_on_merge,
     lightrag_logger: LightRAGLogger,
 ) -> dict[str, int]:
-    """Internal implementation of merge_nodes_and_edges with fine-grained locking"""
+    """
+    Internal implementation of merge_nodes_and_edges with fine-grained locking.
+
+    All entities and relations of the chunk results are merged as one batch: the locks of every
+    entity and relation are taken (in sorted order, so concurrent merges cannot deadlock), the
+    existing nodes and edges are prefetched in one call each, fragments are merged in memory, the
+    needed LLM summaries run concurrently, and the results are written with batch upserts.
+    """
 
     # Extract language from addon_params
     language = addon_params.get("language", "English")
@@ -555,88 +445,130 @@ async def _merge_nodes_and_edges_impl(
             sorted_edge_key = tuple(sorted(edge_key))
             all_edges[sorted_edge_key].extend(edges)
 
-    # Process entities with fine-grained locking
-    entity_count = 0
+    # Self-loops are never stored
+    all_edges = {edge_key: edges for edge_key, edges in all_edges.items() if edge_key[0] != edge_key[1]}
 
-    for entity_name, entities in all_nodes.items():
-        # Create lock for this specific entity
-        entity_lock = get_or_create_lock(f"entity:{entity_name}:{workspace}")
+    lock_names = sorted(
+        [f"entity:{entity_name}:{workspace}" for entity_name in all_nodes]
+        + [f"relationship:{src_id}:{tgt_id}:{workspace}" for src_id, tgt_id in all_edges]
+    )
 
-        async with entity_lock:
-            # Process and update entity in graph db
-            entity_data = await _merge_nodes_then_upsert(
-                entity_name,
-                entities,
-                knowledge_graph_inst,
-                llm_model_func,
-                tokenizer,
-                llm_model_max_token_size,
-                summary_to_max_tokens,
-                language,  # Pass language instead of addon_params
-                force_llm_summary_on_merge,
-                lightrag_logger,
-                workspace,
+    async with AsyncExitStack() as stack:
+        for lock_name in lock_names:
+            await stack.enter_async_context(get_or_create_lock(lock_name))
+
+        # 1. Prefetch existing entities (including relation endpoints) and relations
+        node_ids = set(all_nodes)
+        for src_id, tgt_id in all_edges:
+            node_ids.update((src_id, tgt_id))
+        existing_nodes = await knowledge_graph_inst.get_nodes_batch(list(node_ids)) if node_ids else {}
+        existing_edges = (
+            await knowledge_graph_inst.get_edges_batch([{"src": src, "tgt": tgt} for src, tgt in all_edges])
+            if all_edges
+            else {}
+        )
+
+        # 2. Merge fragments in memory
+        merged_nodes = {}
+        node_fragments = {}
+        for entity_name, entities in all_nodes.items():
+            node_data, num_fragment, num_new_fragment = _merge_node_fragments(
+                entity_name, entities, existing_nodes.get(entity_name)
             )
+            merged_nodes[entity_name] = node_data
+            node_fragments[entity_name] = (num_fragment, num_new_fragment)
+
+        merged_edges = {}
+        edge_fragments = {}
+        placeholder_nodes = {}
+        for edge_key, edges in all_edges.items():
+            edge_data, num_fragment, num_new_fragment = _merge_edge_fragments(edges, existing_edges.get(edge_key))
+            merged_edges[edge_key] = edge_data
+            edge_fragments[edge_key] = (num_fragment, num_new_fragment)
+            # Relation endpoints that are neither extracted nor stored get a placeholder entity
+            for node_id in edge_key:
+                if node_id in merged_nodes or node_id in existing_nodes or node_id in placeholder_nodes:
+                    continue
+                placeholder_nodes[node_id] = {
+                    "entity_id": node_id,
+                    "source_id": edge_data["source_id"],
+                    "description": edge_data["description"],
+                    "entity_type": "UNKNOWN",
+                    "file_path": edge_data["file_path"],
+                    "created_at": int(time.time()),
+                }
 
-            # Update entity in vector db immediately under the same lock
-            if entity_vdb is not None and entity_data:
-                vdb_data = {
-                    compute_mdhash_id(entity_data["entity_name"], prefix="ent-", workspace=workspace): {
-                        "entity_name": entity_data["entity_name"],
-                        "entity_type": entity_data["entity_type"],
-                        "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
-                        "source_id": entity_data["source_id"],
-                        "file_path": entity_data.get("file_path", "unknown_source"),
+        # 3. Summarize lengthy descriptions concurrently
+        async def _summarize(name: str, data: dict, num_fragment: int, num_new_fragment: int, is_relation: bool):
+            if num_fragment <= 1:
+                return
+            is_llm_summary = num_fragment >= force_llm_summary_on_merge
+            if is_relation:
+                lightrag_logger.log_relation_merge(
+                    name[0], name[1], num_fragment, num_new_fragment, is_llm_summary=is_llm_summary
+                )
+                summary_name = f"({name[0]}, {name[1]})"
+            else:
+                lightrag_logger.log_entity_merge(name, num_fragment, num_new_fragment, is_llm_summary=is_llm_summary)
+                summary_name = name
+            if is_llm_summary:
+                data["description"] = await _handle_entity_relation_summary(
+                    summary_name,
+                    data["description"],
+                    llm_model_func,
+                    tokenizer,
+                    llm_model_max_token_size,
+                    summary_to_max_tokens,
+                    language,
+                    lightrag_logger,
+                )
+
+        await asyncio.gather(
+            *[
+                _summarize(entity_name, merged_nodes[entity_name], *node_fragments[entity_name], is_relation=False)
+                for entity_name in merged_nodes
+            ],
+            *[
+                _summarize(edge_key, merged_edges[edge_key], *edge_fragments[edge_key], is_relation=True)
+                for edge_key in merged_edges
+            ],
+        )
+
+        # 4. Write graph rows; entities first, since relations may require their endpoints to exist
+        await knowledge_graph_inst.upsert_nodes_batch({**placeholder_nodes, **merged_nodes})
+        await knowledge_graph_inst.upsert_edges_batch(merged_edges)
+
+        # 5. Embed and write all vector db rows in one upsert per storage
+        if entity_vdb is not None and merged_nodes:
+            await entity_vdb.upsert(
+                {
+                    compute_mdhash_id(entity_name, prefix="ent-", workspace=workspace): {
+                        "entity_name": entity_name,
+                        "entity_type": node_data["entity_type"],
+                        "content": f"{entity_name}\n{node_data['description']}",
+                        "source_id": node_data["source_id"],
+                        "file_path": node_data.get("file_path", "unknown_source"),
                     }
+                    for entity_name, node_data in merged_nodes.items()
                 }
-                await entity_vdb.upsert(vdb_data)
-
-            entity_count += 1
-
-    # Process relationships with fine-grained locking
-    relation_count = 0
-
-    for edge_key, edges in all_edges.items():
-        # Create lock for this specific relationship
-        # Sort edge key to ensure consistent lock naming
-        sorted_edge_key = tuple(sorted(edge_key))
-        relationship_lock = get_or_create_lock(f"relationship:{sorted_edge_key[0]}:{sorted_edge_key[1]}:{workspace}")
-
-        async with relationship_lock:
-            # Process and update relationship in graph db
-            edge_data = await _merge_edges_then_upsert(
-                edge_key[0],
-                edge_key[1],
-                edges,
-                knowledge_graph_inst,
-                llm_model_func,
-                tokenizer,
-                llm_model_max_token_size,
-                summary_to_max_tokens,
-                language,  # Pass language instead of addon_params
-                force_llm_summary_on_merge,
-                lightrag_logger,
-                workspace,
             )
 
-            # Update relationship in vector db immediately under the same lock
-            if relationships_vdb is not None and edge_data is not None:
-                vdb_data = {
-                    compute_mdhash_id(edge_data["src_id"] + edge_data["tgt_id"], prefix="rel-", workspace=workspace): {
-                        "src_id": edge_data["src_id"],
-                        "tgt_id": edge_data["tgt_id"],
+        if relationships_vdb is not None and merged_edges:
+            await relationships_vdb.upsert(
+                {
+                    compute_mdhash_id(src_id + tgt_id, prefix="rel-", workspace=workspace): {
+                        "src_id": src_id,
+                        "tgt_id": tgt_id,
                         "keywords": edge_data["keywords"],
-                        "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
+                        "content": f"{src_id}\t{tgt_id}\n{edge_data['keywords']}\n{edge_data['description']}",
                         "source_id": edge_data["source_id"],
                         "file_path": edge_data.get("file_path", "unknown_source"),
                     }
+                    for (src_id, tgt_id), edge_data in merged_edges.items()
                 }
-                await relationships_vdb.upsert(vdb_data)
-
-            if edge_data is not None:
-                relation_count += 1
+            )
 
-    return {"entity_count": entity_count, "relation_count": relation_count}
+    return {"entity_count": len(merged_nodes), "relation_count": len(merged_edges)}
 
 
 @timing_wrapper("extract_entities")
@@ -13,16 +13,23 @@
 # limitations under the License.
 
 import asyncio
+import hashlib
 import logging
 import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import numpy
 
+from aperag.config import settings
 from aperag.db.models import Collection
 from aperag.db.ops import db_ops
 from aperag.graph.lightrag import LightRAG
-from aperag.graph.lightrag.utils import EmbeddingFunc
+from aperag.graph.lightrag.operate import chunking_by_token_size
+from aperag.graph.lightrag.utils import EmbeddingFunc, TiktokenTokenizer, clean_text
 from aperag.llm.embed.base_embedding import get_collection_embedding_service_sync
 from aperag.llm.llm_error_types import (
     EmbeddingError,
@@ -45,6 +52,7 @@ class LightRAGConfig:
     ENTITY_EXTRACT_MAX_GLEANING = 0
     SUMMARY_TO_MAX_TOKENS = 2000
     FORCE_LLM_SUMMARY_ON_MERGE = 10
+    MAX_PARALLEL_MERGE = 4
     EMBEDDING_MAX_TOKEN_SIZE = 8192
     # DEFAULT_LANGUAGE = "Simplified Chinese"
     DEFAULT_LANGUAGE = "The same language like input text"
@@ -59,7 +67,7 @@ class LightRAGError(Exception):
 async def create_lightrag_instance(collection: Collection) -> LightRAG:
     """
     Create a new LightRAG instance for the given collection.
-    Since LightRAG is now stateless, we create a fresh instance each time.
+    Most callers should use get_lightrag_instance, which reuses pooled instances.
     """
     collection_id = str(collection.id)
 
@@ -93,6 +101,7 @@ async def create_lightrag_instance(collection: Collection) -> LightRAG:
             entity_extract_max_gleaning=LightRAGConfig.ENTITY_EXTRACT_MAX_GLEANING,
             summary_to_max_tokens=LightRAGConfig.SUMMARY_TO_MAX_TOKENS,
             force_llm_summary_on_merge=LightRAGConfig.FORCE_LLM_SUMMARY_ON_MERGE,
+            max_parallel_merge=LightRAGConfig.MAX_PARALLEL_MERGE,
             addon_params={"language": LightRAGConfig.DEFAULT_LANGUAGE},
             kv_storage=kv_storage,
             vector_storage=vector_storage,
@@ -107,23 +116,191 @@ async def create_lightrag_instance(collection: Collection) -> LightRAG:
         raise LightRAGError(f"Failed to create LightRAG instance: {str(e)}") from e
 
 
+# --- Instance Pool ---
+
+STORAGE_ENV_VARS = ("GRAPH_INDEX_KV_STORAGE", "GRAPH_INDEX_VECTOR_STORAGE", "GRAPH_INDEX_GRAPH_STORAGE")
+
+
+def collection_config_hash(collection: Collection) -> str:
+    """Hash of everything create_lightrag_instance derives from the collection and environment"""
+    parts = [str(collection.user), collection.config or ""]
+    parts.extend(os.environ.get(var, "") for var in STORAGE_ENV_VARS)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class LightRAGInstancePool:
+    """
+    LRU pool of initialized LightRAG instances keyed by (collection id, config hash).
+
+    Building an instance resolves the embedding/LLM providers from the database and initializes
+    the storages, which is wasted work when the same collection is indexed or queried repeatedly.
+    Entries expire after `ttl` seconds so rotated provider keys are picked up, and a new config
+    hash for a collection evicts the instances built from its previous config.
+
+    A pool must only be used from one event loop; see get_lightrag_instance.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[LightRAG, float]]" = OrderedDict()
+        self._creating: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, collection: Collection) -> LightRAG:
+        key = (str(collection.id), collection_config_hash(collection))
+        rag = self._lookup(key)
+        if rag is not None:
+            return rag
+
+        lock = self._creating.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                rag = self._lookup(key)
+                if rag is None:
+                    rag = await create_lightrag_instance(collection)
+                    await self._put(key, rag)
+                return rag
+        finally:
+            if not lock.locked() and self._creating.get(key) is lock:
+                del self._creating[key]
+
+    async def invalidate(self, collection_id: str):
+        """Drop all instances of a collection"""
+        for key in [key for key in self._entries if key[0] == collection_id]:
+            await self._evict(key)
+
+    async def clear(self):
+        for key in list(self._entries):
+            await self._evict(key)
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[LightRAG]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        rag, created_at = entry
+        if time.monotonic() - created_at >= self.ttl:
+            return None
+        self._entries.move_to_end(key)
+        return rag
+
+    async def _put(self, key: Tuple[str, str], rag: LightRAG):
+        collection_id = key[0]
+        # Instances built from an older config of this collection (or expired ones) are stale
+        for stale_key in [k for k in self._entries if k[0] == collection_id]:
+            await self._evict(stale_key)
+        self._entries[key] = (rag, time.monotonic())
+        while len(self._entries) > self.max_size:
+            await self._evict(next(iter(self._entries)))
+
+    async def _evict(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        try:
+            await entry[0].finalize_storages()
+        except Exception as e:
+            logger.warning(f"Failed to finalize LightRAG instance for collection '{key[0]}': {e}")
+
+
+# One pool per event loop, since instances may hold loop-bound clients
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LightRAGInstancePool]" = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+_pools_pid = os.getpid()
+# Invalidation count per collection; each pool drops its instances when the count it last saw differs
+_invalidated: Dict[str, int] = {}
+_pool_generations: "weakref.WeakKeyDictionary[LightRAGInstancePool, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+
+def _get_pool() -> LightRAGInstancePool:
+    global _pools_pid
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # Forked worker: instances of the parent process must not be shared
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = LightRAGInstancePool(settings.lightrag_pool_size, settings.lightrag_pool_ttl)
+            _pools[loop] = pool
+            _pool_generations[pool] = {}
+        return pool
+
+
+async def get_lightrag_instance(collection: Collection) -> LightRAG:
+    """
+    Get an initialized LightRAG instance for the collection from the pool of the running loop.
+
+    Pooled instances are shared; callers must not finalize them. Falls back to a fresh
+    instance when pooling is disabled (LIGHTRAG_POOL_SIZE=0).
+    """
+    if settings.lightrag_pool_size <= 0:
+        return await create_lightrag_instance(collection)
+
+    pool = _get_pool()
+    collection_id = str(collection.id)
+    with _pools_lock:
+        generation = _invalidated.get(collection_id, 0)
+        seen = _pool_generations[pool]
+        stale = seen.get(collection_id, 0) != generation
+        seen[collection_id] = generation
+    if stale:
+        await pool.invalidate(collection_id)
+    return await pool.get(collection)
+
+
+def invalidate_lightrag_instances(collection_id: str):
+    """
+    Drop pooled instances of a collection in this process, e.g. after its config changed
+    or it was deleted. Pools of other event loops drop them on their next access.
+    """
+    with _pools_lock:
+        _invalidated[str(collection_id)] = _invalidated.get(str(collection_id), 0) + 1
+
+
 # --- Celery Support Functions ---
 
 
-def process_document_for_celery(collection: Collection, content: str, doc_id: str, file_path: str) -> Dict[str, Any]:
+def chunk_content_for_graph(content: str) -> List[Dict[str, Any]]:
+    """
+    Chunk document content exactly like LightRAG.ainsert_and_chunk_document does, so the chunks
+    can be computed once upstream and passed in.
+    """
+    cleaned_content = clean_text(content)
+    if not cleaned_content.strip():
+        return []
+    return chunking_by_token_size(
+        TiktokenTokenizer(),
+        cleaned_content,
+        overlap_token_size=LightRAGConfig.CHUNK_OVERLAP_TOKEN_SIZE,
+        max_token_size=LightRAGConfig.CHUNK_TOKEN_SIZE,
+    )
+
+
+def process_document_for_celery(
+    collection: Collection,
+    content: str,
+    doc_id: str,
+    file_path: str,
+    chunks: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
     """
     Process a document in a synchronous context (for Celery).
-    Creates a new event loop and LightRAG instance for each call.
+    Runs on the worker's long-lived event loop with a pooled LightRAG instance.
+    Precomputed chunks (see chunk_content_for_graph) skip chunking inside LightRAG.
     """
-    return _run_in_new_loop(_process_document_async(collection, content, doc_id, file_path))
+    return run_in_worker_loop(_process_document_async(collection, content, doc_id, file_path, chunks))
 
 
 def delete_document_for_celery(collection: Collection, doc_id: str) -> Dict[str, Any]:
     """
     Delete a document in a synchronous context (for Celery).
-    Creates a new event loop and LightRAG instance for each call.
+    Runs on the worker's long-lived event loop with a pooled LightRAG instance.
     """
-    return _run_in_new_loop(_delete_document_async(collection, doc_id))
+    return run_in_worker_loop(_delete_document_async(collection, doc_id))
 
 
 async def _process_document_async(
@@ -131,101 +308,96 @@ async def _process_document_async(
     content: str,
     doc_id: str,
     file_path: str,
+    chunks: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """Process document using LightRAG's stateless interfaces"""
-    rag = await create_lightrag_instance(collection)
-
-    try:
-        logger.info(f"Processing document {doc_id}")
-
-        if not content:
-            # The parser couldn't extract any text content from the document;
-            # it might be a purely image-based document.
-            return {
-                "status": "success",
-                "doc_id": doc_id,
-                "chunks_created": 0,
-                "entities_extracted": 0,
-                "relations_extracted": 0,
-            }
-
-        # Insert and chunk document
-        chunk_result = await rag.ainsert_and_chunk_document(
-            documents=[content], doc_ids=[doc_id], file_paths=[file_path]
-        )
-
-        results = chunk_result.get("results", [])
-        if not results:
-            return {
-                "status": "warning",
-                "doc_id": doc_id,
-                "message": "No processing results returned",
-                "chunks_created": 0,
-                "entities_extracted": 0,
-                "relations_extracted": 0,
-            }
-
-        # Process results
-        total_stats = {"chunks_created": 0, "entities_extracted": 0, "relations_extracted": 0, "documents": []}
-
-        for doc_result in results:
-            doc_result_id = doc_result.get("doc_id")
-            chunks_data = doc_result.get("chunks_data", {})
-            chunk_count = doc_result.get("chunk_count", 0)
-
-            if chunks_data:
-                # Build graph index
-                graph_result = await rag.aprocess_graph_indexing(chunks=chunks_data, collection_id=str(collection.id))
-
-                total_stats["chunks_created"] += chunk_count
-                total_stats["entities_extracted"] += graph_result.get("entities_extracted", 0)
-                total_stats["relations_extracted"] += graph_result.get("relations_extracted", 0)
-
-                total_stats["documents"].append(
-                    {
-                        "doc_id": doc_result_id,
-                        "chunks_created": chunk_count,
-                        "entities_extracted": graph_result.get("entities_extracted", 0),
-                        "relations_extracted": graph_result.get("relations_extracted", 0),
-                    }
-                )
+    rag = await get_lightrag_instance(collection)
+
+    logger.info(f"Processing document {doc_id}")
+
+    if not content:
+        # The parser couldn't extract any text content from the document;
+        # it might be a purely image-based document.
+        return {
+            "status": "success",
+            "doc_id": doc_id,
+            "chunks_created": 0,
+            "entities_extracted": 0,
+            "relations_extracted": 0,
+        }
+
+    # Insert and chunk document
+    chunk_result = await rag.ainsert_and_chunk_document(
+        documents=[content],
+        doc_ids=[doc_id],
+        file_paths=[file_path],
+        chunk_lists=[chunks] if chunks else None,
+    )
 
-        return {"status": "success", "doc_id": doc_id, **total_stats}
+    results = chunk_result.get("results", [])
+    if not results:
+        return {
+            "status": "warning",
+            "doc_id": doc_id,
+            "message": "No processing results returned",
+            "chunks_created": 0,
+            "entities_extracted": 0,
+            "relations_extracted": 0,
+        }
+
+    # Process results
+    total_stats = {"chunks_created": 0, "entities_extracted": 0, "relations_extracted": 0, "documents": []}
+
+    for doc_result in results:
+        doc_result_id = doc_result.get("doc_id")
+        chunks_data = doc_result.get("chunks_data", {})
+        chunk_count = doc_result.get("chunk_count", 0)
+
+        if chunks_data:
+            # Build graph index
+            graph_result = await rag.aprocess_graph_indexing(chunks=chunks_data, collection_id=str(collection.id))
+
+            total_stats["chunks_created"] += chunk_count
+            total_stats["entities_extracted"] += graph_result.get("entities_extracted", 0)
+            total_stats["relations_extracted"] += graph_result.get("relations_extracted", 0)
+
+            total_stats["documents"].append(
+                {
+                    "doc_id": doc_result_id,
+                    "chunks_created": chunk_count,
+                    "entities_extracted": graph_result.get("entities_extracted", 0),
+                    "relations_extracted": graph_result.get("relations_extracted", 0),
+                }
+            )
 
-    finally:
-        await rag.finalize_storages()
+    return {"status": "success", "doc_id": doc_id, **total_stats}
 
 
 async def _delete_document_async(collection: Collection, doc_id: str) -> Dict[str, Any]:
     """Delete a document from LightRAG"""
-    rag = await create_lightrag_instance(collection)
+    rag = await get_lightrag_instance(collection)
+    await rag.adelete_by_doc_id(str(doc_id))
+    logger.info(f"Deleted document {doc_id} from LightRAG")
+    return {"status": "success", "doc_id": doc_id, "message": "Document deleted successfully"}
 
-    try:
-        await rag.adelete_by_doc_id(str(doc_id))
-        logger.info(f"Deleted document {doc_id} from LightRAG")
-        return {"status": "success", "doc_id": doc_id, "message": "Document deleted successfully"}
-    finally:
-        await rag.finalize_storages()
 
+_worker_loop = threading.local()
 
-def _run_in_new_loop(coro: Awaitable) -> Any:
-    """Run an async function in a new event loop (for Celery compatibility)"""
-    loop = asyncio.new_event_loop()
-    try:
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(coro)
-    finally:
-        try:
-            pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
-            for task in pending:
-                task.cancel()
-            if pending:
-                loop.run_until_complete(asyncio.wait(pending, timeout=1.0))
-        except Exception:
-            pass
-        finally:
-            loop.close()
-            asyncio.set_event_loop(None)
+
+def run_in_worker_loop(coro: Awaitable) -> Any:
+    """
+    Run an async function on this thread's long-lived event loop (for Celery compatibility).
+
+    Reusing the loop across tasks keeps pooled LightRAG instances and their clients usable.
+    A forked child process gets a fresh loop instead of the inherited one.
+    """
+    loop = getattr(_worker_loop, "loop", None)
+    if loop is None or loop.is_closed() or getattr(_worker_loop, "pid", None) != os.getpid():
+        loop = asyncio.new_event_loop()
+        _worker_loop.loop = loop
+        _worker_loop.pid = os.getpid()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
 
 
 # --- Internal Helper Functions ---
@@ -0,0 +1,187 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Chunk artifacts shared by all indexers of a document.
+
+The parse stage rechunks a document once, counts the tokens of every chunk once, and stores the
+result next to `parsed.md` in the object store. Vector and fulltext indexers consume the same
+chunks, and the graph indexer consumes the LightRAG chunks computed in the same pass, so a
+document is never tokenized again by each index task (or by each retry of an index task).
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from aperag.config import settings
+from aperag.docparser.base import TextPart
+from aperag.docparser.chunking import rechunk
+from aperag.objectstore.base import get_object_store
+from aperag.utils.tokenizer import get_default_tokenizer
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ARTIFACT_NAME = "chunks.json"
+
+
+def compute_content_hash(doc_parts: List[Any]) -> str:
+    """Hash the text content and metadata of document parts, identifying a parsed document version"""
+    hasher = hashlib.sha256()
+    for part in doc_parts:
+        content = getattr(part, "content", None)
+        if not content:
+            continue
+        hasher.update(content.encode("utf-8"))
+        hasher.update(json.dumps(getattr(part, "metadata", None) or {}, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+@dataclass
+class ChunkArtifact:
+    """Chunks of one parsed document version"""
+
+    content_hash: str
+    chunk_size: int
+    chunk_overlap: int
+    # Rechunked text parts used by the vector and fulltext indexes: {"content", "metadata", "tokens"}
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    # LightRAG chunks of the document content, None if graph indexing was not requested
+    graph_chunks: Optional[List[Dict[str, Any]]] = None
+
+    def to_parts(self, extra_metadata: Optional[Dict[str, Any]] = None) -> List[TextPart]:
+        """Rebuild text parts from the chunks, copying metadata so consumers never share it"""
+        parts = []
+        for chunk in self.chunks:
+            metadata = dict(chunk.get("metadata") or {})
+            if extra_metadata:
+                metadata.update(extra_metadata)
+            parts.append(TextPart(content=chunk["content"], metadata=metadata))
+        return parts
+
+    def matches(self, content_hash: str, chunk_size: int, chunk_overlap: int) -> bool:
+        return (
+            self.content_hash == content_hash and self.chunk_size == chunk_size and self.chunk_overlap == chunk_overlap
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChunkArtifact":
+        return cls(
+            content_hash=data["content_hash"],
+            chunk_size=data["chunk_size"],
+            chunk_overlap=data["chunk_overlap"],
+            chunks=data.get("chunks") or [],
+            graph_chunks=data.get("graph_chunks"),
+        )
+
+
+def build_chunk_artifact(
+    doc_parts: List[Any],
+    content: str = "",
+    chunk_size: int = None,
+    chunk_overlap: int = None,
+    tokenizer=None,
+    include_graph_chunks: bool = False,
+) -> ChunkArtifact:
+    """
+    Rechunk document parts once and count the tokens of every chunk.
+
+    Args:
+        doc_parts: Parsed document parts
+        content: Full document content, used for the LightRAG chunks
+        chunk_size: Size for chunking text (defaults to settings.chunk_size)
+        chunk_overlap: Overlap size for chunking (defaults to settings.chunk_overlap_size)
+        tokenizer: Tokenizer to use (defaults to default tokenizer)
+        include_graph_chunks: Whether to also compute the LightRAG chunks of the content
+
+    Returns:
+        ChunkArtifact of the document
+    """
+    chunk_size = chunk_size or settings.chunk_size
+    chunk_overlap = chunk_overlap or settings.chunk_overlap_size
+    tokenizer = tokenizer or get_default_tokenizer()
+
+    text_parts = [part for part in doc_parts if getattr(part, "content", None)]
+    chunks = []
+    if text_parts:
+        for part in rechunk(text_parts, chunk_size, chunk_overlap, tokenizer):
+            if not part.content:
+                continue
+            chunks.append({"content": part.content, "metadata": part.metadata, "tokens": len(tokenizer(part.content))})
+
+    graph_chunks = None
+    if include_graph_chunks:
+        from aperag.graph.lightrag_manager import chunk_content_for_graph
+
+        graph_chunks = chunk_content_for_graph(content) if content else []
+
+    return ChunkArtifact(
+        content_hash=compute_content_hash(text_parts),
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        chunks=chunks,
+        graph_chunks=graph_chunks,
+    )
+
+
+def chunk_artifact_path(object_store_base_path: str) -> str:
+    return f"{object_store_base_path}/{CHUNK_ARTIFACT_NAME}"
+
+
+def save_chunk_artifact(path: str, artifact: ChunkArtifact):
+    data = json.dumps(artifact.to_dict(), ensure_ascii=False).encode("utf-8")
+    get_object_store().put(path, data)
+    logger.info(f"uploaded {len(artifact.chunks)} chunks to {path}, size: {len(data)}")
+
+
+def load_chunk_artifact(path: str) -> Optional[ChunkArtifact]:
+    """Load a chunk artifact, returning None if it does not exist or cannot be read"""
+    try:
+        stream = get_object_store().get(path)
+        if stream is None:
+            return None
+        with stream:
+            return ChunkArtifact.from_dict(json.loads(stream.read()))
+    except Exception as e:
+        logger.warning(f"Failed to load chunk artifact {path}: {e}")
+        return None
+
+
+def get_chunk_artifact(
+    path: Optional[str], doc_parts: List[Any], content: str = "", include_graph_chunks: bool = False
+) -> ChunkArtifact:
+    """
+    Get the chunk artifact of a parsed document.
+
+    The stored artifact is used when it belongs to the same document version and chunk settings,
+    otherwise the chunks are rebuilt from doc_parts (without overwriting the stored artifact).
+    """
+    chunk_size, chunk_overlap = settings.chunk_size, settings.chunk_overlap_size
+    if path:
+        artifact = load_chunk_artifact(path)
+        if artifact is not None and artifact.matches(compute_content_hash(doc_parts), chunk_size, chunk_overlap):
+            if include_graph_chunks and artifact.graph_chunks is None:
+                from aperag.graph.lightrag_manager import chunk_content_for_graph
+
+                artifact.graph_chunks = chunk_content_for_graph(content) if content else []
+            return artifact
+        logger.info(f"Chunk artifact {path} is missing or stale, rechunking document")
+    return build_chunk_artifact(
+        doc_parts, content, chunk_size, chunk_overlap, include_graph_chunks=include_graph_chunks
+    )
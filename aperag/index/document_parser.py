@@ -15,15 +15,20 @@
 import io
 import logging
 import mimetypes
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import pikepdf
-import pypdfium2 as pdfium
 
+from aperag.config import settings
 from aperag.docparser.base import AssetBinPart, MarkdownPart, PdfPart
 from aperag.docparser.doc_parser import DocParser
+from aperag.index.pdf_renderer import PdfPageRenderer, PdfRenderOptions
 from aperag.objectstore.base import get_object_store
+from aperag.schema.view_models import CollectionConfig
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +53,11 @@ class DocumentParser:
     MAX_EXTRACTED_SIZE = 5000 * 1024 * 1024  # 5 GB
 
     def parse_document(
-        self, filepath: str, file_metadata: Dict[str, Any], parser_config: Optional[Dict[str, Any]] = None
+        self,
+        filepath: str,
+        file_metadata: Dict[str, Any],
+        parser_config: Optional[Dict[str, Any]] = None,
+        render_pdf_pages: bool = True,
     ) -> List[Any]:
         """
         Parse document into parts using DocParser.
@@ -57,6 +66,7 @@ class DocumentParser:
             filepath: Path to the document file
             file_metadata: Metadata associated with the document
             parser_config: Configuration for the parser
+            render_pdf_pages: Whether to add the pages of PDF parts as image assets
 
         Returns:
             List of document parts (MarkdownPart, AssetBinPart, etc.)
@@ -99,44 +109,65 @@ class DocumentParser:
                     mime_type=mime_type,
                 )
                 parts.append(asset_part)
-        else:
+        elif render_pdf_pages:
             # Convert PdfPart to image assets
             pdf_parts = [p for p in parts if isinstance(p, PdfPart)]
-            for pdf_part in pdf_parts:
-                try:
-                    pdf_doc = pdfium.PdfDocument(pdf_part.data)
-                    for i, page in enumerate(pdf_doc):
-                        # Render page to a PIL image
-                        image = page.render(scale=1).to_pil()
-                        # Save image to a bytes buffer
-                        with io.BytesIO() as buffer:
-                            image.save(buffer, format="PNG")
-                            image_data = buffer.getvalue()
-
-                        # Create a new AssetBinPart for each page
+            pages = self.render_pdf_pages(pdf_parts, file_metadata, self.get_pdf_render_options())
+            parts.extend(sorted(pages, key=lambda p: p.metadata["page_idx"]))
+
+        logger.info(f"Parsed document {filepath} into {len(parts)} parts")
+        return parts
+
+    def get_pdf_render_options(self, collection_config: Optional[CollectionConfig] = None) -> PdfRenderOptions:
+        """Render options of PDF pages for a collection, pages with a text layer are only needed for vision"""
+        if collection_config is None:
+            return PdfRenderOptions(dpi=settings.pdf_render_dpi)
+        return PdfRenderOptions(
+            dpi=collection_config.pdf_render_dpi or settings.pdf_render_dpi,
+            skip_text_pages=settings.pdf_render_skip_text_pages and not collection_config.enable_vision,
+        )
+
+    def render_pdf_pages(
+        self,
+        pdf_parts: List[PdfPart],
+        file_metadata: Dict[str, Any],
+        options: PdfRenderOptions,
+        vision_index: bool = True,
+    ) -> Iterator[AssetBinPart]:
+        """
+        Render the pages of PDF parts to image assets, yielded as the pages finish rendering.
+
+        Pages are rendered by up to PDF_RENDER_WORKERS processes. Skipped pages yield nothing.
+        """
+        renderer = PdfPageRenderer(workers=min(settings.pdf_render_workers, os.cpu_count() or 1))
+        for pdf_part in pdf_parts:
+            try:
+                # The worker processes open the PDF by path
+                with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+                    pdf_file.write(pdf_part.data)
+                    pdf_file.flush()
+                    rendered = 0
+                    for page in renderer.render(pdf_file.name, options):
+                        if page.data is None:
+                            continue
                         metadata = file_metadata.copy()
                         metadata.update(
                             {
-                                "page_idx": i,
+                                "page_idx": page.index,
                                 "converted_from": "pdf",
-                                "vision_index": True,
+                                "vision_index": vision_index,
                             }
                         )
-                        asset_id = f"page_{i}.png"
-                        asset_part = AssetBinPart(
-                            asset_id=asset_id,
-                            data=image_data,
+                        rendered += 1
+                        yield AssetBinPart(
+                            asset_id=f"page_{page.index}.png",
+                            data=page.data,
                             metadata=metadata,
                             mime_type="image/png",
                         )
-                        parts.append(asset_part)
-
-                    logger.info(f"Converted {len(pdf_doc)} pages from a PDF part to image assets.")
-                except Exception as e:
-                    logger.warning(f"Failed to convert PDF part to images: {e}", exc_info=True)
-
-        logger.info(f"Parsed document {filepath} into {len(parts)} parts")
-        return parts
+                logger.info(f"Converted {rendered} pages from a PDF part to image assets.")
+            except Exception as e:
+                logger.warning(f"Failed to convert PDF part to images: {e}", exc_info=True)
 
     def linearize_pdf(self, data: bytes) -> bytes:
         with pikepdf.open(io.BytesIO(data)) as pdf:
@@ -144,13 +175,20 @@ class DocumentParser:
                 pdf.save(buffer, linearize=True)
                 return buffer.getvalue()
 
-    def save_processed_content_and_assets(self, doc_parts: List[Any], object_store_base_path: Optional[str]) -> str:
+    def save_processed_content_and_assets(
+        self,
+        doc_parts: List[Any],
+        object_store_base_path: Optional[str],
+        page_assets: Iterable[AssetBinPart] = (),
+    ) -> str:
         """
         Save processed content and assets to object storage.
 
         Args:
             doc_parts: List of document parts from DocParser
             object_store_base_path: Base path for object storage, if None, skip saving
+            page_assets: Rendered PDF pages, uploaded as they come. Like other assets, they are only
+                kept in doc_parts if they are meant for the vision index.
 
         Returns:
             Full markdown content of the document
@@ -190,26 +228,58 @@ class DocumentParser:
 
             # Save assets
             to_be_deleted = []
-            asset_count = 0
-            for part in doc_parts:
-                if not isinstance(part, AssetBinPart):
-                    continue
-                if not part.metadata.get("vision_index"):
-                    to_be_deleted.append(part)
-
-                asset_upload_path = f"{base_path}/assets/{part.asset_id}"
-                obj_store.put(asset_upload_path, part.data)
-                asset_count += 1
-                logger.info(f"uploaded asset to {asset_upload_path}, size: {len(part.data)}")
+            existing_assets = [part for part in doc_parts if isinstance(part, AssetBinPart)]
+
+            def assets_to_upload():
+                for part in existing_assets:
+                    if not part.metadata.get("vision_index"):
+                        to_be_deleted.append(part)
+                    yield part
+                for part in page_assets:
+                    if part.metadata.get("vision_index"):
+                        doc_parts.append(part)
+                    yield part
+
+            asset_count = self.upload_assets(obj_store, base_path, assets_to_upload())
 
             if to_be_deleted:
                 for part in to_be_deleted:
                     doc_parts.remove(part)
 
             logger.info(f"Saved {asset_count} assets to object storage")
+        else:
+            doc_parts.extend(page_assets)
 
         return content
 
+    def upload_assets(self, obj_store, base_path: str, assets: Iterable[AssetBinPart]) -> int:
+        """
+        Upload assets with up to ASSET_UPLOAD_CONCURRENCY uploads in flight.
+
+        `assets` is consumed no faster than the uploads complete, so the data of streamed assets is
+        released once uploaded.
+        """
+        concurrency = max(settings.asset_upload_concurrency, 1)
+
+        def upload(part: AssetBinPart):
+            asset_upload_path = f"{base_path}/assets/{part.asset_id}"
+            obj_store.put(asset_upload_path, part.data)
+            logger.info(f"uploaded asset to {asset_upload_path}, size: {len(part.data)}")
+
+        asset_count = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            pending = set()
+            for part in assets:
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(pool.submit(upload, part))
+                asset_count += 1
+            for future in pending:
+                future.result()
+        return asset_count
+
     def extract_content_from_parts(self, doc_parts: List[Any]) -> str:
         """
         Extract content from document parts when no MarkdownPart is available.
@@ -241,6 +311,7 @@ class DocumentParser:
         file_metadata: Dict[str, Any],
         object_store_base_path: Optional[str] = None,
         parser_config: Optional[Dict[str, Any]] = None,
+        collection_config: Optional[CollectionConfig] = None,
     ) -> DocumentParsingResult:
         """
         Complete document parsing workflow
@@ -250,16 +321,28 @@ class DocumentParser:
             file_metadata: Metadata associated with the document
             object_store_base_path: Base path for object storage
             parser_config: Configuration for the parser
+            collection_config: Configuration of the document's collection, for rendering PDF pages
 
         Returns:
             DocumentParsingResult containing parsed parts and content
         """
         try:
             # Parse document into parts
-            doc_parts = self.parse_document(filepath, file_metadata, parser_config)
+            doc_parts = self.parse_document(filepath, file_metadata, parser_config, render_pdf_pages=False)
+
+            # PDF pages are rendered while the assets are uploaded, and only kept for the vision index
+            page_assets = ()
+            if not is_image_file(Path(filepath).suffix):
+                vision_index = collection_config is None or bool(collection_config.enable_vision)
+                page_assets = self.render_pdf_pages(
+                    [p for p in doc_parts if isinstance(p, PdfPart)],
+                    file_metadata or {},
+                    self.get_pdf_render_options(collection_config),
+                    vision_index=vision_index,
+                )
 
             # Save processed content and assets to object storage
-            content = self.save_processed_content_and_assets(doc_parts, object_store_base_path)
+            content = self.save_processed_content_and_assets(doc_parts, object_store_base_path, page_assets)
 
             return DocumentParsingResult(doc_parts=doc_parts, content=content, metadata={"parts_count": len(doc_parts)})
 
@@ -18,12 +18,13 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from elasticsearch import AsyncElasticsearch, Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch, helpers
 
 from aperag.config import settings
 from aperag.db.ops import db_ops
 from aperag.docparser.chunking import rechunk
 from aperag.index.base import BaseIndexer, IndexResult, IndexType
+from aperag.index.chunk_artifact import ChunkArtifact
 from aperag.llm.completion.completion_service import CompletionService
 from aperag.query.query import DocumentWithScore
 from aperag.utils.tokenizer import get_default_tokenizer
@@ -31,6 +32,10 @@ from aperag.utils.utils import generate_fulltext_index_name
 
 logger = logging.getLogger(__name__)
 
+# Limits for the failed chunks reported in IndexResult metadata
+MAX_REPORTED_FAILED_CHUNKS = 20
+MAX_FAILED_CHUNK_ERROR_LENGTH = 500
+
 
 def _create_es_client_config() -> Dict[str, Any]:
     """Create common ES client configuration"""
@@ -68,33 +73,122 @@ class FulltextIndexer(BaseIndexer):
         return chunk_content, title_text, chunk_metadata
 
     def _process_chunks(
-        self, document_id: int, doc_parts: List[Any], document_name: str, index_name: str
-    ) -> Tuple[int, int]:
-        """Process and insert all chunks for a document. Returns (chunk_count, total_content_length)"""
-        chunk_count = 0
-        total_content_length = 0
-
-        chunk_size = settings.chunk_size
-        chunk_overlap_size = settings.chunk_overlap_size
-        tokenizer = get_default_tokenizer()
+        self,
+        document_id: int,
+        doc_parts: List[Any],
+        document_name: str,
+        index_name: str,
+        chunk_artifact: Optional[ChunkArtifact] = None,
+    ) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """
+        Process and bulk insert all chunks for a document.
+
+        Chunks come from the document's chunk artifact when provided, otherwise doc_parts are rechunked.
+        Returns (chunk_count, total_content_length, failed_chunks), where chunk_count only
+        counts chunks that were indexed successfully.
+        """
+        if not self.es.indices.exists(index=index_name).body:
+            logger.warning("index %s not exists", index_name)
+            return 0, 0, []
+
+        if chunk_artifact is not None:
+            chunked_parts = chunk_artifact.to_parts()
+        else:
+            chunk_size = settings.chunk_size
+            chunk_overlap_size = settings.chunk_overlap_size
+            tokenizer = get_default_tokenizer()
 
-        # Rechunk the document parts (resulting in text parts)
-        # After rechunk(), parts only contains TextPart
-        chunked_parts = rechunk(doc_parts, chunk_size, chunk_overlap_size, tokenizer)
+            # Rechunk the document parts (resulting in text parts)
+            # After rechunk(), parts only contains TextPart
+            chunked_parts = rechunk(doc_parts, chunk_size, chunk_overlap_size, tokenizer)
 
+        actions = []
+        content_lengths = {}
         for chunk_idx, part in enumerate(chunked_parts):
             chunk_content, title_text, chunk_metadata = self._extract_chunk_data(part)
             if not chunk_content:
                 continue
 
             chunk_id = f"{document_id}_{chunk_idx}"
-            self._insert_chunk(
-                index_name, chunk_id, document_id, document_name, chunk_content, title_text, chunk_metadata
+            actions.append(
+                {
+                    "_index": index_name,
+                    "_id": chunk_id,
+                    "_source": self._build_chunk_doc(
+                        chunk_id, document_id, document_name, chunk_content, title_text, chunk_metadata
+                    ),
+                }
+            )
+            content_lengths[chunk_id] = len(chunk_content)
+
+        if not actions:
+            return 0, 0, []
+
+        min_chunks = settings.es_bulk_disable_refresh_min_chunks
+        refresh_disabled, previous_refresh_interval = False, None
+        if min_chunks > 0 and len(actions) >= min_chunks:
+            refresh_disabled, previous_refresh_interval = self._disable_refresh(index_name)
+        try:
+            failed_chunks = self._bulk_index(actions)
+        finally:
+            # Only the call that disabled refresh restores it
+            if refresh_disabled:
+                self._restore_refresh(index_name, previous_refresh_interval)
+
+        failed_ids = {failed["chunk_id"] for failed in failed_chunks}
+        chunk_count = len(actions) - len(failed_ids)
+        total_content_length = sum(length for chunk_id, length in content_lengths.items() if chunk_id not in failed_ids)
+        if failed_chunks:
+            logger.warning(
+                f"Failed to index {len(failed_chunks)} of {len(actions)} chunks for document {document_id} "
+                f"into index {index_name}"
             )
-            chunk_count += 1
-            total_content_length += len(chunk_content)
+        return chunk_count, total_content_length, failed_chunks
+
+    def _bulk_index(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send index actions through the bulk API and return the chunks that failed"""
+        failed_chunks = []
+        for ok, item in helpers.streaming_bulk(
+            self.es,
+            actions,
+            chunk_size=settings.es_bulk_chunk_size,
+            max_chunk_bytes=settings.es_bulk_max_chunk_bytes,
+            raise_on_error=False,
+            raise_on_exception=False,
+            max_retries=settings.es_max_retries,
+        ):
+            if ok:
+                continue
+            info = item.get("index", {})
+            failed_chunks.append({"chunk_id": info.get("_id"), "error": str(info.get("error", "unknown error"))})
+        return failed_chunks
+
+    def _disable_refresh(self, index: str) -> Tuple[bool, Optional[str]]:
+        """
+        Disable periodic refresh of an index.
+
+        Returns (disabled, previous_refresh_interval). Nothing is changed if the current settings
+        cannot be read, or if refresh is already disabled (e.g. by a concurrent bulk load into the
+        same collection index), so the caller must only restore refresh when disabled is True.
+        """
+        try:
+            resp = self.es.indices.get_settings(index=index, name="index.refresh_interval")
+            previous = resp.body.get(index, {}).get("settings", {}).get("index", {}).get("refresh_interval")
+            if previous == "-1":
+                return False, None
+            self.es.indices.put_settings(index=index, settings={"index": {"refresh_interval": "-1"}})
+            return True, previous
+        except Exception as e:
+            logger.warning(f"Failed to disable refresh for index {index}: {str(e)}")
+            return False, None
 
-        return chunk_count, total_content_length
+    def _restore_refresh(self, index: str, refresh_interval: Optional[str]):
+        """Restore the refresh interval of an index and make bulk indexed chunks searchable"""
+        try:
+            self.es.indices.put_settings(index=index, settings={"index": {"refresh_interval": refresh_interval}})
+            self.es.indices.refresh(index=index)
+        except Exception as e:
+            logger.warning(f"Failed to restore refresh for index {index}: {str(e)}")
 
     def _create_success_result(
         self,
@@ -103,17 +197,28 @@ class FulltextIndexer(BaseIndexer):
         chunk_count: int,
         total_content_length: int,
         operation: str = "created",
+        failed_chunks: Optional[List[Dict[str, Any]]] = None,
     ) -> IndexResult:
-        """Create a success IndexResult with chunk statistics"""
+        """Create an IndexResult with chunk statistics, failing only if no chunk could be indexed"""
+        failed_chunks = failed_chunks or []
+        success = chunk_count > 0 or not failed_chunks
+        # Results end up in the Celery result backend, so only keep a short sample of the failures
+        failed_sample = [
+            {"chunk_id": failed["chunk_id"], "error": failed["error"][:MAX_FAILED_CHUNK_ERROR_LENGTH]}
+            for failed in failed_chunks[:MAX_REPORTED_FAILED_CHUNKS]
+        ]
         return IndexResult(
-            success=True,
+            success=success,
             index_type=self.index_type,
             data={"index_name": index_name, "document_name": document_name, "chunk_count": chunk_count},
+            error=None if success else f"All {len(failed_chunks)} chunks failed to index: {failed_sample[0]['error']}",
             metadata={
                 "total_content_length": total_content_length,
                 "chunk_count": chunk_count,
                 "avg_chunk_length": total_content_length // chunk_count if chunk_count > 0 else 0,
                 "operation": operation,
+                "failed_chunk_count": len(failed_chunks),
+                "failed_chunks": failed_sample,
             },
         )
 
@@ -136,10 +241,14 @@ class FulltextIndexer(BaseIndexer):
                 raise Exception(f"Document {document_id} not found")
 
             index_name = generate_fulltext_index_name(collection.id)
-            chunk_count, total_content_length = self._process_chunks(document_id, doc_parts, document.name, index_name)
+            chunk_count, total_content_length, failed_chunks = self._process_chunks(
+                document_id, doc_parts, document.name, index_name, kwargs.get("chunk_artifact")
+            )
 
             logger.info(f"Fulltext index created for document {document_id} with {chunk_count} chunks")
-            return self._create_success_result(index_name, document.name, chunk_count, total_content_length, "created")
+            return self._create_success_result(
+                index_name, document.name, chunk_count, total_content_length, "created", failed_chunks
+            )
 
         except Exception as e:
             logger.error(f"Fulltext index creation failed for document {document_id}: {str(e)}")
@@ -168,12 +277,12 @@ class FulltextIndexer(BaseIndexer):
 
             # Create new chunks if there are doc_parts
             if doc_parts:
-                chunk_count, total_content_length = self._process_chunks(
-                    document_id, doc_parts, document.name, index_name
+                chunk_count, total_content_length, failed_chunks = self._process_chunks(
+                    document_id, doc_parts, document.name, index_name, kwargs.get("chunk_artifact")
                 )
                 logger.info(f"Fulltext index updated for document {document_id} with {chunk_count} chunks")
                 return self._create_success_result(
-                    index_name, document.name, chunk_count, total_content_length, "updated"
+                    index_name, document.name, chunk_count, total_content_length, "updated", failed_chunks
                 )
             else:
                 return IndexResult(
@@ -226,22 +335,17 @@ class FulltextIndexer(BaseIndexer):
             logger.error(f"Failed to remove chunks for document {doc_id} from index {index}: {str(e)}")
             return 0
 
-    def _insert_chunk(
-        self,
-        index: str,
+    @staticmethod
+    def _build_chunk_doc(
         chunk_id: str,
         doc_id: int,
         doc_name: str,
         content: str,
         title_text: str = "",
         metadata: Dict[str, Any] = None,
-    ):
-        """Insert a document chunk into the fulltext index"""
-        if not self.es.indices.exists(index=index).body:
-            logger.warning("index %s not exists", index)
-            return
-
-        doc = {
+    ) -> Dict[str, Any]:
+        """Build the ES source document for a chunk"""
+        return {
             "document_id": doc_id,
             "chunk_id": chunk_id,
             "name": doc_name,
@@ -249,7 +353,6 @@ class FulltextIndexer(BaseIndexer):
             "title": title_text,
             "metadata": metadata or {},
         }
-        self.es.index(index=index, id=chunk_id, document=doc)
 
     async def search_document(
         self, index: str, keywords: List[str], topk=3, chat_id: str = None
@@ -0,0 +1,130 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Render PDF pages to PNG images in a process pool.
+
+Pages are yielded as soon as they are rendered, with a bounded number of pages in flight, so that the
+images of a long scan are never all held in memory at once. Worker processes open the PDF from a file
+path, so the document itself is not copied to them.
+"""
+
+import io
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+import pypdfium2 as pdfium
+
+logger = logging.getLogger(__name__)
+
+# pdfium renders pages at 72 DPI with scale 1
+PDF_BASE_DPI = 72
+
+
+@dataclass
+class PdfRenderOptions:
+    dpi: int = PDF_BASE_DPI
+    # Do not render pages that already have a text layer
+    skip_text_pages: bool = False
+
+
+@dataclass
+class RenderedPage:
+    index: int
+    # PNG image, None if the page was skipped
+    data: Optional[bytes]
+
+
+def page_has_text(page: pdfium.PdfPage) -> bool:
+    textpage = page.get_textpage()
+    try:
+        return textpage.count_chars() > 0 and bool(textpage.get_text_range().strip())
+    finally:
+        textpage.close()
+
+
+def render_page(pdf: pdfium.PdfDocument, index: int, options: PdfRenderOptions) -> RenderedPage:
+    page = pdf[index]
+    try:
+        if options.skip_text_pages and page_has_text(page):
+            return RenderedPage(index=index, data=None)
+        bitmap = page.render(scale=options.dpi / PDF_BASE_DPI)
+        try:
+            with io.BytesIO() as buffer:
+                bitmap.to_pil().save(buffer, format="PNG")
+                return RenderedPage(index=index, data=buffer.getvalue())
+        finally:
+            bitmap.close()
+    finally:
+        page.close()
+
+
+# The document opened by each worker process
+_worker_pdf: Optional[pdfium.PdfDocument] = None
+
+
+def _init_worker(path: str):
+    global _worker_pdf
+    _worker_pdf = pdfium.PdfDocument(path)
+
+
+def _render_in_worker(index: int, options: PdfRenderOptions) -> RenderedPage:
+    return render_page(_worker_pdf, index, options)
+
+
+class PdfPageRenderer:
+    """Renders the pages of a PDF file, in a process pool if `workers` > 1"""
+
+    def __init__(self, workers: int = 1, max_pending: Optional[int] = None):
+        self.workers = workers
+        # Pages submitted to the pool but not yet consumed
+        self.max_pending = max_pending or 2 * max(workers, 1)
+
+    def render(self, path: str, options: PdfRenderOptions) -> Iterator[RenderedPage]:
+        """Yield the pages of the PDF at `path` in the order they finish rendering"""
+        pdf = pdfium.PdfDocument(path)
+        page_count = len(pdf)
+        if self.workers <= 1 or page_count <= 1:
+            try:
+                for index in range(page_count):
+                    yield render_page(pdf, index, options)
+            finally:
+                pdf.close()
+            return
+
+        # Only the worker processes need the document from here on
+        pdf.close()
+        yield from self._render_in_pool(path, page_count, options)
+
+    def _render_in_pool(self, path: str, page_count: int, options: PdfRenderOptions) -> Iterator[RenderedPage]:
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, page_count),
+            initializer=_init_worker,
+            initargs=(path,),
+        )
+        pending: Dict[Future, int] = {}
+        next_index = 0
+        try:
+            while next_index < page_count or pending:
+                while next_index < page_count and len(pending) < self.max_pending:
+                    pending[executor.submit(_render_in_worker, next_index, options)] = next_index
+                    next_index += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
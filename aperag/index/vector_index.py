@@ -47,7 +47,7 @@ class VectorIndexer(BaseIndexer):
             content: Document content
             doc_parts: Parsed document parts
             collection: Collection object
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters, `chunk_artifact` provides the document's shared chunks
 
         Returns:
             IndexResult: Result of vector index creation
@@ -67,6 +67,8 @@ class VectorIndexer(BaseIndexer):
                 if not hasattr(part, "metadata"):
                     part.metadata = {}
                 part.metadata["indexer"] = "vector"
+            chunk_artifact = kwargs.get("chunk_artifact")
+            chunked_parts = chunk_artifact.to_parts({"indexer": "vector"}) if chunk_artifact else None
 
             # Generate embeddings and store in vector database
             ctx_ids = create_embeddings_and_store(
@@ -76,6 +78,7 @@ class VectorIndexer(BaseIndexer):
                 chunk_size=settings.chunk_size,
                 chunk_overlap=settings.chunk_overlap_size,
                 tokenizer=get_default_tokenizer(),
+                chunked_parts=chunked_parts,
             )
 
             logger.info(f"Vector index created for document {document_id}: {len(ctx_ids)} vectors")
@@ -107,7 +110,7 @@ class VectorIndexer(BaseIndexer):
             content: Document content
             doc_parts: Parsed document parts
             collection: Collection object
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters, `chunk_artifact` provides the document's shared chunks
 
         Returns:
             IndexResult: Result of vector index update
@@ -148,6 +151,8 @@ class VectorIndexer(BaseIndexer):
                 if not hasattr(part, "metadata"):
                     part.metadata = {}
                 part.metadata["indexer"] = "vector"
+            chunk_artifact = kwargs.get("chunk_artifact")
+            chunked_parts = chunk_artifact.to_parts({"indexer": "vector"}) if chunk_artifact else None
 
             # Create new vectors
             embedding_model, vector_size = get_collection_embedding_service_sync(collection)
@@ -158,6 +163,7 @@ class VectorIndexer(BaseIndexer):
                 chunk_size=settings.chunk_size,
                 chunk_overlap=settings.chunk_overlap_size,
                 tokenizer=get_default_tokenizer(),
+                chunked_parts=chunked_parts,
             )
 
             logger.info(f"Vector index updated for document {document_id}: {len(ctx_ids)} vectors")
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 # -*- coding: utf-8 -*-
+import asyncio
 import logging
 from threading import Lock
 
@@ -225,3 +226,13 @@ def get_collection_embedding_service_sync(collection) -> tuple[EmbeddingService,
                 "model": embedding_model_name,
             },
         ) from e
+
+
+async def get_collection_embedding_service(collection) -> tuple[EmbeddingService, int]:
+    """
+    Get embedding service for a collection without blocking the event loop.
+
+    The provider lookups and the first dimension probe of a model are blocking calls,
+    so they run in a worker thread. See get_collection_embedding_service_sync.
+    """
+    return await asyncio.to_thread(get_collection_embedding_service_sync, collection)
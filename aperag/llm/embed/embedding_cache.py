@@ -0,0 +1,191 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Content-addressed embedding cache.
+
+Embeddings are cached per text, keyed on the embedding deployment (provider, model, API base and
+multimodal flag) plus sha256(text), so re-indexing a document only embeds the chunks that actually
+changed. Lookups go through two tiers:
+
+- A process-local LRU, which serves repeated texts without any network round trip
+- Redis (EMBEDDING_CACHE_REDIS_URL), which is shared by all API and Celery worker processes
+
+Vectors are stored as packed float32 bytes. Redis failures are logged and treated as misses,
+so the cache can never break embedding.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import redis
+
+from aperag.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "aperag:embedding"
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    return np.frombuffer(data, dtype=np.float32).tolist()
+
+
+def make_cache_namespace(provider: str, model: str, api_base: Optional[str], multimodal: bool = False) -> str:
+    """Build the key namespace of an embedding deployment"""
+    base_digest = hashlib.sha256((api_base or "").encode("utf-8")).hexdigest()[:12]
+    return f"{provider}:{model}:{base_digest}:{'mm' if multimodal else 'text'}"
+
+
+class _LRUCache:
+    """Thread-safe LRU of packed vectors"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+
+class EmbeddingCache:
+    """Two-tier (local LRU + Redis) cache of embedding vectors keyed by content hash"""
+
+    def __init__(self, local_max_size: int, ttl: int, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self._local = _LRUCache(local_max_size)
+        self._redis: Optional[redis.Redis] = None
+        self._redis_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{_KEY_PREFIX}:{namespace}:{digest}"
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if not self.redis_url:
+            return None
+        if self._redis is None:
+            with self._redis_lock:
+                if self._redis is None:
+                    # Vectors are binary, so this client must not decode responses like the shared one does
+                    self._redis = redis.Redis.from_url(
+                        self.redis_url,
+                        decode_responses=False,
+                        socket_connect_timeout=5,
+                        socket_timeout=5,
+                    )
+        return self._redis
+
+    def get_many(self, namespace: str, texts: Sequence[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached vectors for texts of an embedding deployment.
+
+        Returns:
+            Mapping of input index to vector, containing only the cache hits
+        """
+        keys = [self.make_key(namespace, text) for text in texts]
+        found: Dict[int, List[float]] = {}
+        remote_indices = []
+        for idx, key in enumerate(keys):
+            packed = self._local.get(key)
+            if packed is not None:
+                found[idx] = unpack_vector(packed)
+            else:
+                remote_indices.append(idx)
+
+        client = self._get_redis()
+        if remote_indices and client is not None:
+            try:
+                values = client.mget([keys[idx] for idx in remote_indices])
+                for idx, packed in zip(remote_indices, values):
+                    if packed is None:
+                        continue
+                    self._local.put(keys[idx], packed)
+                    found[idx] = unpack_vector(packed)
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed, treating as miss: {e}")
+
+        return found
+
+    def put_many(self, namespace: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> List[bytes]:
+        """
+        Store vectors for texts in both cache tiers.
+
+        Returns:
+            The packed vectors, in input order
+        """
+        items = {}
+        packed_vectors = []
+        for text, vector in zip(texts, vectors):
+            key = self.make_key(namespace, text)
+            packed = pack_vector(vector)
+            self._local.put(key, packed)
+            items[key] = packed
+            packed_vectors.append(packed)
+
+        client = self._get_redis()
+        if not items or client is None:
+            return packed_vectors
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, packed in items.items():
+                pipe.set(key, packed, ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to write {len(items)} vectors to embedding cache: {e}")
+        return packed_vectors
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache, or None if it is disabled"""
+    global _embedding_cache
+    if not settings.embedding_cache_enabled:
+        return None
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    local_max_size=settings.embedding_cache_local_size,
+                    ttl=settings.embedding_cache_ttl,
+                    redis_url=settings.embedding_cache_redis_url or None,
+                )
+    return _embedding_cache
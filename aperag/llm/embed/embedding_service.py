@@ -21,6 +21,7 @@ from typing import Dict, List, Sequence, Tuple
 
 import litellm
 
+from aperag.llm.embed.embedding_cache import get_embedding_cache, make_cache_namespace, unpack_vector
 from aperag.llm.llm_error_types import (
     BatchProcessingError,
     EmbeddingError,
@@ -75,44 +76,26 @@ class EmbeddingService:
         try:
             # Clean contents by replacing newlines with spaces
             clean_contents = [t.replace("\n", " ") if t and t.strip() else " " for t in contents]
-            # Determine batch size (use max_chunks or process all at once if not set)
-            batch_size = self.max_chunks or len(clean_contents)
-
-            # Store results with original indices to ensure correct ordering
-            results_dict: Dict[int, List[float]] = {}
-
-            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-                futures = []
-
-                # Submit batches for processing with their starting indices
-                for start in range(0, len(clean_contents), batch_size):
-                    batch = clean_contents[start : start + batch_size]
-                    # Pass both the batch and starting index to track position
-                    future = pool.submit(self._embed_batch_with_indices, batch, start)
-                    futures.append(future)
-
-                # Process completed futures and store results by index
-                failed_batches = []
-                for future in as_completed(futures):
-                    try:
-                        # Get results with their original indices
-                        batch_results = future.result()
-                        for idx, embedding in batch_results:
-                            results_dict[idx] = embedding
-                    except Exception as e:
-                        failed_batches.append(str(e))
-                        logger.error(f"Batch processing failed: {e}")
-
-                if failed_batches:
-                    raise BatchProcessingError(
-                        batch_size=batch_size,
-                        reason=f"Failed to process {len(failed_batches)} batches: {failed_batches[:3]} "
-                        f"contents: {contents}",
-                    )
-
-            # Reconstruct the result list in the original order
-            results = [results_dict[i] for i in range(len(clean_contents))]
-            return results
+
+            cache = get_embedding_cache() if self.caching else None
+            if cache is None:
+                return self._embed_contents(clean_contents, contents, litellm_caching=self.caching)
+
+            # Only send cache misses to the provider, each distinct text once. The per-text cache
+            # supersedes litellm's whole-batch cache, so the latter is bypassed for these calls.
+            namespace = self._cache_namespace()
+            cached = cache.get_many(namespace, clean_contents)
+            missing_texts = list(dict.fromkeys(t for i, t in enumerate(clean_contents) if i not in cached))
+            embedded = {}
+            if missing_texts:
+                missing_vectors = self._embed_contents(missing_texts, contents, litellm_caching=False)
+                packed_vectors = cache.put_many(namespace, missing_texts, missing_vectors)
+                # Return misses with the same float32 precision as hits, so results never depend on cache state
+                embedded = {text: unpack_vector(packed) for text, packed in zip(missing_texts, packed_vectors)}
+            logger.debug(
+                f"Embedding cache: {len(cached)} hits, {len(missing_texts)} texts sent to {self.embedding_provider}"
+            )
+            return [cached[i] if i in cached else embedded[t] for i, t in enumerate(clean_contents)]
         except (EmptyTextError, BatchProcessingError, EmbeddingError):
             # Re-raise our custom embedding errors
             raise
@@ -120,6 +103,52 @@ class EmbeddingService:
             logger.error(f"Document embedding failed: {str(e)}")
             raise wrap_litellm_error(e, "embedding", self.embedding_provider, self.model) from e
 
+    def _cache_namespace(self) -> str:
+        """Identify the embedding deployment, so endpoints sharing a provider and model name never share vectors"""
+        return make_cache_namespace(self.embedding_provider, self.model, self.api_base, self.multimodal)
+
+    def _embed_contents(
+        self, clean_contents: List[str], contents: List[str], litellm_caching: bool
+    ) -> List[List[float]]:
+        """Embed cleaned contents in parallel batches, preserving input order"""
+        # Determine batch size (use max_chunks or process all at once if not set)
+        batch_size = self.max_chunks or len(clean_contents)
+
+        # Store results with original indices to ensure correct ordering
+        results_dict: Dict[int, List[float]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = []
+
+            # Submit batches for processing with their starting indices
+            for start in range(0, len(clean_contents), batch_size):
+                batch = clean_contents[start : start + batch_size]
+                # Pass both the batch and starting index to track position
+                future = pool.submit(self._embed_batch_with_indices, batch, start, litellm_caching)
+                futures.append(future)
+
+            # Process completed futures and store results by index
+            failed_batches = []
+            for future in as_completed(futures):
+                try:
+                    # Get results with their original indices
+                    batch_results = future.result()
+                    for idx, embedding in batch_results:
+                        results_dict[idx] = embedding
+                except Exception as e:
+                    failed_batches.append(str(e))
+                    logger.error(f"Batch processing failed: {e}")
+
+            if failed_batches:
+                raise BatchProcessingError(
+                    batch_size=batch_size,
+                    reason=f"Failed to process {len(failed_batches)} batches: {failed_batches[:3]} "
+                    f"contents: {contents}",
+                )
+
+        # Reconstruct the result list in the original order
+        return [results_dict[i] for i in range(len(clean_contents))]
+
     async def aembed_documents(self, contents: List[str]) -> List[List[float]]:
         return await asyncio.to_thread(self.embed_documents, contents)
 
@@ -151,10 +180,12 @@ class EmbeddingService:
     def is_multimodal(self) -> bool:
         return self.multimodal
 
-    def _embed_batch_with_indices(self, batch: Sequence[str], start_idx: int) -> List[Tuple[int, List[float]]]:
+    def _embed_batch_with_indices(
+        self, batch: Sequence[str], start_idx: int, caching: bool = True
+    ) -> List[Tuple[int, List[float]]]:
         """Process a batch of texts and return embeddings with their original indices."""
         try:
-            embeddings = self._embed_batch(batch)
+            embeddings = self._embed_batch(batch, caching=caching)
             # Return each embedding with its corresponding index in the original list
             return [(start_idx + i, embedding) for i, embedding in enumerate(embeddings)]
         except Exception as e:
@@ -162,12 +193,13 @@ class EmbeddingService:
             # Convert litellm errors for batch processing
             raise wrap_litellm_error(e, "embedding", self.embedding_provider, self.model) from e
 
-    def _embed_batch(self, batch: Sequence[str]) -> List[List[float]]:
+    def _embed_batch(self, batch: Sequence[str], caching: bool = True) -> List[List[float]]:
         """
         Embed a batch of contents using litellm.
 
         Args:
             batch: Sequence of contents to embed
+            caching: Whether litellm's batch-level response cache may be used
 
         Returns:
             List of embedding vectors
@@ -183,7 +215,7 @@ class EmbeddingService:
                 api_base=self.api_base,
                 api_key=self.api_key,
                 input=list(batch),
-                caching=self.caching,
+                caching=self.caching and caching,
             )
 
             if not response or "data" not in response:
@@ -16,7 +16,7 @@
 # -*- coding: utf-8 -*-
 # import faulthandler
 import logging
-from typing import List
+from typing import List, Optional
 
 from langchain_core.embeddings import Embeddings
 from llama_index.core.schema import BaseNode, TextNode
@@ -39,6 +39,7 @@ def create_embeddings_and_store(
     chunk_size: int = None,
     chunk_overlap: int = None,
     tokenizer=None,
+    chunked_parts: Optional[List[Part]] = None,
 ) -> List[str]:
     """
     Processes document parts, rechunks content, generates embeddings,
@@ -51,23 +52,26 @@ def create_embeddings_and_store(
         chunk_size: Size for chunking text (defaults to settings.chunk_size)
         chunk_overlap: Overlap size for chunking (defaults to settings.chunk_overlap_size)
         tokenizer: Tokenizer to use (defaults to default tokenizer)
+        chunked_parts: Already rechunked parts (e.g. from the document's chunk artifact),
+            which skips rechunking `parts`
 
     Returns:
         List[str]: A list of vector store IDs
     """
-    if not parts:
-        return []
+    if chunked_parts is None:
+        if not parts:
+            return []
 
-    # Initialize parameters with defaults
-    chunk_size = chunk_size or settings.chunk_size
-    chunk_overlap = chunk_overlap or settings.chunk_overlap_size
-    tokenizer = tokenizer or get_default_tokenizer()
+        # Initialize parameters with defaults
+        chunk_size = chunk_size or settings.chunk_size
+        chunk_overlap = chunk_overlap or settings.chunk_overlap_size
+        tokenizer = tokenizer or get_default_tokenizer()
 
-    nodes: List[BaseNode] = []
+        # 1. Rechunk the document parts (resulting in text parts)
+        # After rechunk(), parts only contains TextPart
+        chunked_parts = rechunk(parts, chunk_size, chunk_overlap, tokenizer)
 
-    # 1. Rechunk the document parts (resulting in text parts)
-    # After rechunk(), parts only contains TextPart
-    chunked_parts = rechunk(parts, chunk_size, chunk_overlap, tokenizer)
+    nodes: List[BaseNode] = []
 
     # 2. Process each text chunk
     for part in chunked_parts:
@@ -106,6 +110,9 @@ def create_embeddings_and_store(
         # 2.4 Create TextNode
         nodes.append(TextNode(text=text, metadata=metadata))
 
+    if not nodes:
+        return []
+
     # 3. Generate embeddings for text chunks
     texts = [node.get_content() for node in nodes]
     vectors = embedding_model.embed_documents(texts)
@@ -26,6 +26,6 @@ Features:
 - Resource and prompt providers
 """
 
-from .server import mcp_server
+from .server import enable_in_process_mode, mcp_server
 
-__all__ = ["mcp_server"]
+__all__ = ["mcp_server", "enable_in_process_mode"]
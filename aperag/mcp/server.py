@@ -12,16 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
 import logging
 import os
-from typing import Any, Dict
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 import httpx
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_http_headers
 
 # Import view models for type safety
-from aperag.schema.view_models import CollectionViewList, SearchResult, WebReadResponse, WebSearchResponse
+from aperag.schema.view_models import (
+    CollectionViewList,
+    SearchRequest,
+    SearchResult,
+    WebReadResponse,
+    WebSearchResponse,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +40,85 @@ mcp_server = FastMCP("ApeRAG")
 # Base URL for internal API calls
 API_BASE_URL = "http://localhost:8000"
 
+# Connection pool of the client calling the API, connections are kept alive between tool calls
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+
+# Set when the MCP server is served by the API application itself, see enable_in_process_mode
+_in_process = False
+
+# One API client per event loop, httpx clients cannot be shared between loops
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def enable_in_process_mode(enabled: bool = True):
+    """
+    Let the search tools call the search services directly instead of the REST API.
+
+    Only enable this when the MCP server runs in the same process as the API.
+    """
+    global _in_process
+    _in_process = enabled
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the pooled keep-alive client of the current event loop for calls to the API"""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(base_url=API_BASE_URL, limits=HTTP_POOL_LIMITS)
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """Close the API client of the current event loop"""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def get_api_key_user_id(api_key: str) -> Optional[str]:
+    """Resolve an API key to its user the same way the API authenticates it"""
+    from aperag.config import get_async_session
+    from aperag.views.auth import get_api_key_user
+
+    async for session in get_async_session():
+        user = await get_api_key_user(session, api_key)
+        return str(user.id) if user else None
+    return None
+
+
+def limit_search_result(search_result: SearchResult, topk: int) -> Dict[str, Any]:
+    # Ensure returned results don't exceed topk limit
+    # This provides additional protection in case HTTP API doesn't apply global limit
+    if search_result.items and len(search_result.items) > topk:
+        search_result.items = search_result.items[:topk]
+        # Update ranks if they exist
+        for i, item in enumerate(search_result.items):
+            if item.rank is not None:
+                item.rank = i + 1
+
+    return search_result.model_dump()
+
+
+async def search_in_process(
+    api_key: str, search: Callable[[str], Awaitable[SearchResult]], topk: int, error_prefix: str
+) -> Dict[str, Any]:
+    """Run a search for the API key's user in this process, reporting errors like the API would"""
+    from aperag.exceptions import BusinessException
+
+    user_id = await get_api_key_user_id(api_key)
+    if not user_id:
+        return {"error": f"{error_prefix} failed: 401", "details": json.dumps({"detail": "Unauthorized"})}
+    try:
+        search_result = await search(user_id)
+    except BusinessException as e:
+        return {"error": f"{error_prefix} failed: {e.http_status.value}", "details": json.dumps(e.to_dict())}
+    except Exception as e:
+        logger.error(f"{error_prefix} failed: {e}", exc_info=True)
+        return {"error": f"{error_prefix} failed: 500", "details": str(e)}
+    return limit_search_result(search_result, topk)
+
 
 @mcp_server.tool
 async def list_collections() -> Dict[str, Any]:
@@ -46,21 +134,20 @@ async def list_collections() -> Dict[str, Any]:
     """
     try:
         api_key = get_api_key()
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{API_BASE_URL}/api/v1/collections", headers={"Authorization": f"Bearer {api_key}"}
-            )
-            if response.status_code == 200:
-                try:
-                    # Parse response using view model for type safety
-                    collection_list = CollectionViewList.model_validate(response.json())
-                    # Return the modified object using model_dump()
-                    return collection_list.model_dump()
-                except Exception as e:
-                    logger.error(f"Failed to parse collections response: {e}")
-                    return {"error": "Failed to parse collections response", "details": str(e)}
-            else:
-                return {"error": f"Failed to fetch collections: {response.status_code}", "details": response.text}
+        response = await get_http_client().get(
+            "/api/v1/collections", headers={"Authorization": f"Bearer {api_key}"}, timeout=30.0
+        )
+        if response.status_code == 200:
+            try:
+                # Parse response using view model for type safety
+                collection_list = CollectionViewList.model_validate(response.json())
+                # Return the modified object using model_dump()
+                return collection_list.model_dump()
+            except Exception as e:
+                logger.error(f"Failed to parse collections response: {e}")
+                return {"error": "Failed to parse collections response", "details": str(e)}
+        else:
+            return {"error": f"Failed to fetch collections: {response.status_code}", "details": response.text}
     except ValueError as e:
         return {"error": str(e)}
 
@@ -175,33 +262,33 @@ async def search_collection(
         if not any([use_vector_index, use_fulltext_index, use_graph_index, use_summary_index]):
             return {"error": "At least one search type must be enabled"}
 
-        # Use longer timeout for search operations (graph search can be time-consuming)
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/v1/collections/{collection_id}/searches",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json=search_data,
+        if _in_process:
+            from aperag.service.collection_service import collection_service
+
+            request = SearchRequest.model_validate(search_data)
+            return await search_in_process(
+                api_key,
+                lambda user_id: collection_service.create_search(user_id, collection_id, request),
+                topk,
+                "Search",
             )
-            if response.status_code == 200 or response.status_code == 201:
-                try:
-                    # Parse response using view model for type safety
-                    search_result = SearchResult.model_validate(response.json())
-
-                    # Ensure returned results don't exceed topk limit
-                    # This provides additional protection in case HTTP API doesn't apply global limit
-                    if search_result.items and len(search_result.items) > topk:
-                        search_result.items = search_result.items[:topk]
-                        # Update ranks if they exist
-                        for i, item in enumerate(search_result.items):
-                            if item.rank is not None:
-                                item.rank = i + 1
-
-                    return search_result.model_dump()
-                except Exception as e:
-                    logger.error(f"Failed to parse search response: {e}")
-                    return {"error": "Failed to parse search response", "details": str(e)}
-            else:
-                return {"error": f"Search failed: {response.status_code}", "details": response.text}
+
+        # Use longer timeout for search operations (graph search can be time-consuming)
+        response = await get_http_client().post(
+            f"/api/v1/collections/{collection_id}/searches",
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            json=search_data,
+            timeout=120.0,
+        )
+        if response.status_code == 200 or response.status_code == 201:
+            try:
+                # Parse response using view model for type safety
+                return limit_search_result(SearchResult.model_validate(response.json()), topk)
+            except Exception as e:
+                logger.error(f"Failed to parse search response: {e}")
+                return {"error": "Failed to parse search response", "details": str(e)}
+        else:
+            return {"error": f"Search failed: {response.status_code}", "details": response.text}
     except ValueError as e:
         return {"error": str(e)}
 
@@ -264,33 +351,33 @@ async def search_chat_files(
         if not any([use_vector_index, use_fulltext_index]):
             return {"error": "At least one search type must be enabled"}
 
-        # Use longer timeout for search operations
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/v1/chats/{chat_id}/search",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json=search_data,
+        if _in_process:
+            from aperag.service.chat_collection_service import chat_collection_service
+
+            request = SearchRequest.model_validate(search_data)
+            return await search_in_process(
+                api_key,
+                lambda user_id: chat_collection_service.search_chat_files(user_id, chat_id, request),
+                topk,
+                "Chat search",
             )
-            if response.status_code == 200 or response.status_code == 201:
-                try:
-                    # Parse response using view model for type safety
-                    search_result = SearchResult.model_validate(response.json())
-
-                    # Ensure returned results don't exceed topk limit
-                    # This provides additional protection in case HTTP API doesn't apply global limit
-                    if search_result.items and len(search_result.items) > topk:
-                        search_result.items = search_result.items[:topk]
-                        # Update ranks if they exist
-                        for i, item in enumerate(search_result.items):
-                            if item.rank is not None:
-                                item.rank = i + 1
-
-                    return search_result.model_dump()
-                except Exception as e:
-                    logger.error(f"Failed to parse chat search response: {e}")
-                    return {"error": "Failed to parse chat search response", "details": str(e)}
-            else:
-                return {"error": f"Chat search failed: {response.status_code}", "details": response.text}
+
+        # Use longer timeout for search operations
+        response = await get_http_client().post(
+            f"/api/v1/chats/{chat_id}/search",
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            json=search_data,
+            timeout=120.0,
+        )
+        if response.status_code == 200 or response.status_code == 201:
+            try:
+                # Parse response using view model for type safety
+                return limit_search_result(SearchResult.model_validate(response.json()), topk)
+            except Exception as e:
+                logger.error(f"Failed to parse chat search response: {e}")
+                return {"error": "Failed to parse chat search response", "details": str(e)}
+        else:
+            return {"error": f"Chat search failed: {response.status_code}", "details": response.text}
     except ValueError as e:
         return {"error": str(e)}
 
@@ -345,22 +432,22 @@ async def web_search(
             search_data["search_llms_txt"] = search_llms_txt.strip()
 
         # Use longer timeout for web search operations
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/v1/web/search",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json=search_data,
-            )
-            if response.status_code == 200:
-                try:
-                    # Parse response using view model for type safety
-                    search_response = WebSearchResponse.model_validate(response.json())
-                    return search_response.model_dump()
-                except Exception as e:
-                    logger.error(f"Failed to parse web search response: {e}")
-                    return {"error": "Failed to parse web search response", "details": str(e)}
-            else:
-                return {"error": f"Web search failed: {response.status_code}", "details": response.text}
+        response = await get_http_client().post(
+            "/api/v1/web/search",
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            json=search_data,
+            timeout=90.0,
+        )
+        if response.status_code == 200:
+            try:
+                # Parse response using view model for type safety
+                search_response = WebSearchResponse.model_validate(response.json())
+                return search_response.model_dump()
+            except Exception as e:
+                logger.error(f"Failed to parse web search response: {e}")
+                return {"error": "Failed to parse web search response", "details": str(e)}
+        else:
+            return {"error": f"Web search failed: {response.status_code}", "details": response.text}
     except ValueError as e:
         return {"error": str(e)}
 
@@ -402,22 +489,22 @@ async def web_read(
         }
 
         # Use longer timeout for web content reading operations
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{API_BASE_URL}/api/v1/web/read",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json=read_data,
-            )
-            if response.status_code == 200:
-                try:
-                    # Parse response using view model for type safety
-                    read_response = WebReadResponse.model_validate(response.json())
-                    return read_response.model_dump()
-                except Exception as e:
-                    logger.error(f"Failed to parse web read response: {e}")
-                    return {"error": "Failed to parse web read response", "details": str(e)}
-            else:
-                return {"error": f"Web read failed: {response.status_code}", "details": response.text}
+        response = await get_http_client().post(
+            "/api/v1/web/read",
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            json=read_data,
+            timeout=60.0,
+        )
+        if response.status_code == 200:
+            try:
+                # Parse response using view model for type safety
+                read_response = WebReadResponse.model_validate(response.json())
+                return read_response.model_dump()
+            except Exception as e:
+                logger.error(f"Failed to parse web read response: {e}")
+                return {"error": "Failed to parse web read response", "details": str(e)}
+        else:
+            return {"error": f"Web read failed: {response.status_code}", "details": response.text}
     except ValueError as e:
         return {"error": str(e)}
 
@@ -706,4 +793,4 @@ def get_api_key() -> str:
 
 
 # Export the server instance
-__all__ = ["mcp_server"]
+__all__ = ["mcp_server", "enable_in_process_mode"]
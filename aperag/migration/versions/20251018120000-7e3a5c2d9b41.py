@@ -0,0 +1,64 @@
+"""Create HNSW indexes on the LightRAG vector tables
+
+Revision ID: 7e3a5c2d9b41
+Revises: d112e0332219
+Create Date: 2025-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from aperag.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3a5c2d9b41'
+down_revision: Union[str, None] = 'd112e0332219'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIGHTRAG_VECTOR_TABLES = ("lightrag_doc_chunks", "lightrag_vdb_entity", "lightrag_vdb_relation")
+
+# pgvector can index vector columns of at most 2000 dimensions with HNSW
+HNSW_MAX_DIMENSIONS = 2000
+
+
+def _index_dimensions(table: str) -> list[int]:
+    """Dimensions from LIGHTRAG_VECTOR_INDEX_DIMENSIONS plus those of the vectors already stored"""
+    dimensions = {int(d) for d in settings.lightrag_vector_index_dimensions.split(",") if d.strip()}
+    rows = op.get_bind().execute(
+        sa.text(f"SELECT DISTINCT vector_dims(content_vector) FROM {table} WHERE content_vector IS NOT NULL")
+    )
+    dimensions.update(row[0] for row in rows)
+    skipped = sorted(d for d in dimensions if d > HNSW_MAX_DIMENSIONS)
+    if skipped:
+        print(f"Skipping HNSW indexes on {table} for dimensions {skipped}, above {HNSW_MAX_DIMENSIONS}")
+    return sorted(d for d in dimensions if 0 < d <= HNSW_MAX_DIMENSIONS)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # content_vector has no fixed dimension, so each dimension gets a partial expression index. The
+    # expression and predicate must match build_similarity_sql in aperag/db/repositories/lightrag.py.
+    plan = {table: _index_dimensions(table) for table in LIGHTRAG_VECTOR_TABLES}
+    with op.get_context().autocommit_block():
+        for table, dimensions in plan.items():
+            for dimension in dimensions:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_hnsw_{dimension} ON {table} "
+                    f"USING hnsw ((content_vector::vector({dimension})) vector_cosine_ops) "
+                    f"WHERE vector_dims(content_vector) = {dimension}"
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in LIGHTRAG_VECTOR_TABLES:
+        rows = op.get_bind().execute(
+            sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :table AND indexname LIKE :pattern"),
+            {"table": table, "pattern": f"idx_{table}_hnsw_%"},
+        )
+        for (index_name,) in rows.fetchall():
+            op.execute(f"DROP INDEX IF EXISTS {index_name}")
@@ -0,0 +1,32 @@
+"""Add a trigram index for graph label search
+
+Revision ID: a41d7c6e0f58
+Revises: 7e3a5c2d9b41
+Create Date: 2025-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d7c6e0f58'
+down_revision: Union[str, None] = '7e3a5c2d9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lightrag_nodes_entity_id_trgm "
+            "ON lightrag_graph_nodes USING gin (entity_id gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_lightrag_nodes_entity_id_trgm', table_name='lightrag_graph_nodes')
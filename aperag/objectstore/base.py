@@ -111,6 +111,19 @@ class ObjectStore(ABC):
         """
         ...
 
+    def local_path(self, path: str) -> str | None:
+        """
+        Gets the path of an object on the local file system, for stores keeping objects there.
+
+        Args:
+            path: The path of the object.
+
+        Returns:
+            The local file path, or None if the object does not exist or is not stored locally.
+            The file belongs to the store and must not be modified or removed by the caller.
+        """
+        return None
+
 
 class AsyncObjectStore(ABC):
     """Abstract base class for asynchronous object storage operations."""
@@ -173,6 +186,19 @@ class AsyncObjectStore(ABC):
         """
         ...
 
+    async def local_path(self, path: str) -> str | None:
+        """
+        Asynchronously gets the path of an object on the local file system, for stores keeping objects there.
+
+        Args:
+            path: The path of the object.
+
+        Returns:
+            The local file path, which can be served directly (e.g. with a FileResponse), or None if the
+            object does not exist or is not stored locally.
+        """
+        return None
+
     @abstractmethod
     async def obj_exists(self, path: str) -> bool:
         """
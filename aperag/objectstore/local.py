@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import io
 import logging
 import os
@@ -19,7 +20,6 @@ import shutil
 from pathlib import Path
 from typing import IO, AsyncIterator, Tuple
 
-from asgiref.sync import sync_to_async
 from pydantic import BaseModel
 
 from aperag.objectstore.base import AsyncObjectStore, ObjectStore
@@ -185,6 +185,14 @@ class Local(ObjectStore):
             )
             return None
 
+    def local_path(self, path: str) -> str | None:
+        try:
+            full_path = self._resolve_object_path(path)
+        except ValueError:  # From _resolve_object_path for invalid paths
+            logger.warning(f"Invalid path provided for local_path: {path}")
+            return None
+        return str(full_path) if full_path.is_file() else None
+
     def get_obj_size(self, path: str) -> int | None:
         try:
             full_path = self._resolve_object_path(path)
@@ -345,70 +353,93 @@ class Local(ObjectStore):
 
 
 class AsyncLocal(AsyncObjectStore):
-    """Asynchronous wrapper for the Local object store."""
+    """
+    Asynchronous local object store.
 
-    def __init__(self, cfg: LocalConfig):
+    File system calls run in the default thread pool with asyncio.to_thread, one call per operation
+    and per chunk of a stream, so concurrent requests are not serialized on a single thread.
+    """
+
+    def __init__(self, cfg: LocalConfig, chunk_size: int = 1024 * 1024):
         self._sync_store = Local(cfg)
-        self.chunk_size = 32 * 1024
+        self.chunk_size = chunk_size
 
     async def put(self, path: str, data: bytes | IO[bytes]):
-        return await sync_to_async(self._sync_store.put)(path=path, data=data)
+        return await asyncio.to_thread(self._sync_store.put, path, data)
 
-    async def get(self, path: str) -> Tuple[AsyncIterator[bytes], int] | None:
-        # First, get the size and a sync stream handle without blocking
-        size = await sync_to_async(self._sync_store.get_obj_size)(path=path)
-        if size is None:
+    def _open_range(self, path: str, start: int, end: int | None) -> Tuple[IO[bytes] | None, int] | None:
+        """Open an object positioned at start, returning the handle and the length to read"""
+        try:
+            full_path = self._sync_store._resolve_object_path(path)
+        except ValueError:  # Path validation error
             return None
 
-        stream_handle = await sync_to_async(self._sync_store.get)(path=path)
-        if stream_handle is None:
-            # This case should be rare if size is not None, but handle it for safety
+        try:
+            file_handle = full_path.open("rb")
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to open object at {path} for streaming: {e}")
             return None
 
-        # Now, return an async generator that wraps the sync stream
-        async def generator():
-            try:
-                while True:
-                    chunk = await sync_to_async(stream_handle.read)(self.chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
-            finally:
-                await sync_to_async(stream_handle.close)()
+        try:
+            file_size = os.fstat(file_handle.fileno()).st_size
+            if start == 0 and end is None:
+                return file_handle, file_size
+            if start < 0 or start >= file_size:
+                raise ValueError("Start position is out of file bounds.")
+            actual_end = file_size - 1 if end is None or end >= file_size else end
+            content_length = actual_end - start + 1
+            if content_length <= 0:
+                file_handle.close()
+                return None, 0
+            file_handle.seek(start)
+            return file_handle, content_length
+        except BaseException:
+            file_handle.close()
+            raise
 
-        return generator(), size
+    async def _iter_file(self, file_handle: IO[bytes] | None, length: int) -> AsyncIterator[bytes]:
+        if file_handle is None:
+            return
+        try:
+            remaining = length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(file_handle.read, min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            file_handle.close()
+
+    async def get(self, path: str) -> Tuple[AsyncIterator[bytes], int] | None:
+        opened = await asyncio.to_thread(self._open_range, path, 0, None)
+        if opened is None:
+            return None
+        file_handle, size = opened
+        return self._iter_file(file_handle, size), size
 
     async def get_obj_size(self, path: str) -> int | None:
-        return await sync_to_async(self._sync_store.get_obj_size)(path=path)
+        return await asyncio.to_thread(self._sync_store.get_obj_size, path)
+
+    async def local_path(self, path: str) -> str | None:
+        return await asyncio.to_thread(self._sync_store.local_path, path)
 
     async def stream_range(
         self, path: str, start: int, end: int | None = None
     ) -> Tuple[AsyncIterator[bytes], int] | None:
-        # Get the ranged stream and content length synchronously first
-        range_info = await sync_to_async(self._sync_store.stream_range)(path=path, start=start, end=end)
-        if range_info is None:
+        opened = await asyncio.to_thread(self._open_range, path, start, end)
+        if opened is None:
             return None
-
-        stream_handle, content_length = range_info
-
-        # Define an async generator to wrap the synchronous ranged stream
-        async def generator():
-            try:
-                while True:
-                    chunk = await sync_to_async(stream_handle.read)(self.chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
-            finally:
-                await sync_to_async(stream_handle.close)()
-
-        return generator(), content_length
+        file_handle, content_length = opened
+        return self._iter_file(file_handle, content_length), content_length
 
     async def obj_exists(self, path: str) -> bool:
-        return await sync_to_async(self._sync_store.obj_exists)(path=path)
+        return await asyncio.to_thread(self._sync_store.obj_exists, path)
 
     async def delete(self, path: str):
-        return await sync_to_async(self._sync_store.delete)(path=path)
+        return await asyncio.to_thread(self._sync_store.delete, path)
 
     async def delete_objects_by_prefix(self, path_prefix: str):
-        return await sync_to_async(self._sync_store.delete_objects_by_prefix)(path_prefix=path_prefix)
+        return await asyncio.to_thread(self._sync_store.delete_objects_by_prefix, path_prefix)
@@ -85,6 +85,10 @@ class CollectionConfig(BaseModel):
     enable_vision: Optional[bool] = Field(
         False, description='Whether to enable vision index'
     )
+    pdf_render_dpi: Optional[conint(ge=36, le=600)] = Field(
+        None,
+        description='Resolution of the images PDF pages are rendered to, defaults to PDF_RENDER_DPI',
+    )
     embedding: Optional[ModelSpec] = None
     completion: Optional[ModelSpec] = None
     path: Optional[str] = Field(None, description='Path for local and ftp sources')
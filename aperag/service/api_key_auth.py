@@ -0,0 +1,172 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import inspect, update
+from sqlalchemy.orm import make_transient_to_detached
+
+from aperag.config import get_async_session, settings
+from aperag.db.models import ApiKey, User
+from aperag.utils.utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of cached API keys
+MAX_CACHED_API_KEYS = 10000
+
+
+def hash_api_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def snapshot_user(user: User) -> User:
+    """Copy the column values of a loaded user into a detached instance, shareable between sessions"""
+    snapshot = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+@dataclass
+class CachedApiKey:
+    api_key_id: str
+    user: User
+    expires_at: float
+
+
+class ApiKeyAuthCache:
+    """
+    TTL cache of active API keys and their active users, keyed by the hash of the key.
+
+    Entries are dropped when their key is deleted or their user is removed in this process;
+    other processes see such changes once the entry expires.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_API_KEYS):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, CachedApiKey]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedApiKey]:
+        key_hash = hash_api_key(key)
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key_hash]
+                return None
+            self._entries.move_to_end(key_hash)
+            return entry
+
+    def put(self, key: str, api_key_id: str, user: User):
+        ttl = settings.api_key_cache_ttl
+        if ttl <= 0:
+            return
+        entry = CachedApiKey(api_key_id=api_key_id, user=snapshot_user(user), expires_at=time.monotonic() + ttl)
+        key_hash = hash_api_key(key)
+        with self._lock:
+            self._entries[key_hash] = entry
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, api_key_id: Optional[str] = None, user_id: Optional[str] = None):
+        """Drop the entries of an API key or of all keys of a user, or everything if neither is given"""
+        with self._lock:
+            if api_key_id is None and user_id is None:
+                self._entries.clear()
+                return
+            stale = [
+                key_hash
+                for key_hash, entry in self._entries.items()
+                if (api_key_id is not None and entry.api_key_id == str(api_key_id))
+                or (user_id is not None and str(entry.user.id) == str(user_id))
+            ]
+            for key_hash in stale:
+                del self._entries[key_hash]
+
+
+class ApiKeyUsageRecorder:
+    """Collects API key last-used times in memory and writes them in batches from a background task"""
+
+    def __init__(self):
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, api_key_id: str):
+        with self._lock:
+            self._pending[str(api_key_id)] = utc_now()
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.api_key_last_used_flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Failed to flush API key last used times: {e}")
+
+    async def flush(self):
+        """Write the pending last-used times in one batched UPDATE"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            async for session in get_async_session():
+                await session.execute(
+                    update(ApiKey), [{"id": key_id, "last_used_at": used_at} for key_id, used_at in pending.items()]
+                )
+                await session.commit()
+        except Exception:
+            # Keep the times for the next flush, unless the key was used again meanwhile
+            with self._lock:
+                for key_id, used_at in pending.items():
+                    self._pending.setdefault(key_id, used_at)
+            raise
+
+    async def stop(self):
+        """Stop the background task and write what is still pending"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await self.flush()
+
+
+api_key_auth_cache = ApiKeyAuthCache()
+api_key_usage_recorder = ApiKeyUsageRecorder()
@@ -21,6 +21,7 @@ from aperag.db.ops import AsyncDatabaseOps, async_db_ops
 from aperag.exceptions import ResourceNotFoundException
 from aperag.schema.view_models import ApiKey as ApiKeyModel
 from aperag.schema.view_models import ApiKeyCreate, ApiKeyList, ApiKeyUpdate
+from aperag.service.api_key_auth import api_key_auth_cache
 
 
 class ApiKeyService:
@@ -72,6 +73,7 @@ class ApiKeyService:
 
         # For single operations, use DatabaseOps directly
         result = await self.db_ops.delete_api_key(user, apikey_id)
+        api_key_auth_cache.invalidate(api_key_id=apikey_id)
         return result
 
     async def update_api_key(self, user: str, apikey_id: str, api_key_update: ApiKeyUpdate) -> Optional[ApiKeyModel]:
@@ -12,20 +12,138 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import logging
 import re
+import threading
 import uuid
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
 
-from sqlalchemy import and_, desc, select
+from sqlalchemy import and_, desc, insert, select
 
-from aperag.config import get_async_session
+from aperag.config import get_async_session, settings
 from aperag.db.models import AuditLog, AuditResource
+from aperag.utils.utils import utc_now
 
 logger = logging.getLogger(__name__)
 
+# Request and response payloads may be given as callables, evaluated by the writer off the request path
+AuditPayload = Union[Dict[str, Any], Callable[[], Any], None]
+
+
+class AuditWriter:
+    """
+    Bounded in-memory queue of audit events, written with multi-row INSERTs by a background task.
+
+    A batch is written once the queue holds audit_batch_size events or audit_flush_interval has
+    passed. When the queue is full new events are dropped and counted instead of slowing down requests.
+    """
+
+    def __init__(self, prepare_row: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self._prepare_row = prepare_row
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": len(self._queue), "written": self.written, "dropped": self.dropped, "failed": self.failed}
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for writing, returns False if it was dropped because the queue is full"""
+        with self._lock:
+            if len(self._queue) >= settings.audit_queue_size:
+                self.dropped += 1
+                dropped = self.dropped
+            else:
+                self._queue.append(event)
+                dropped = 0
+            queued = len(self._queue)
+        if dropped:
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(f"Audit queue is full, {dropped} audit events dropped so far")
+            return False
+        self._ensure_flusher()
+        if queued >= settings.audit_batch_size:
+            self._wakeup.set()
+        return True
+
+    def _ensure_flusher(self):
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run(self._wakeup))
+
+    async def _run(self, wakeup: asyncio.Event):
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=settings.audit_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush audit logs: {e}")
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            size = min(max(settings.audit_batch_size, 1), len(self._queue))
+            return [self._queue.popleft() for _ in range(size)]
+
+    def _prepare_rows(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows = []
+        for event in events:
+            try:
+                rows.append(self._prepare_row(event))
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Failed to prepare audit log: {e}")
+        return rows
+
+    async def flush(self):
+        """Write all queued events, one multi-row INSERT per batch"""
+        while True:
+            events = self._take_batch()
+            if not events:
+                return
+            # Payload extraction and JSON serialization run in a worker thread
+            rows = await asyncio.to_thread(self._prepare_rows, events)
+            if not rows:
+                continue
+            try:
+                async for session in get_async_session():
+                    await session.execute(insert(AuditLog).values(rows))
+                    await session.commit()
+            except Exception as e:
+                # Audit is best effort: the batch is lost, later events are kept for the next flush
+                self.failed += len(rows)
+                logger.error(f"Failed to write {len(rows)} audit logs: {e}")
+                return
+            self.written += len(rows)
+
+    async def stop(self):
+        """Stop the background task and write what is still queued"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await self.flush()
+
 
 class AuditService:
     """Service for handling audit logs"""
@@ -44,6 +162,7 @@ class AuditService:
             "private_key",
             "credential",
         }
+        self.writer = AuditWriter(self._prepare_row)
 
     def _filter_sensitive_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Filter sensitive information from data"""
@@ -89,6 +208,16 @@ class AuditService:
             logger.warning(f"Failed to serialize data: {e}")
             return str(data)
 
+    def _prepare_row(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a queued audit event into an audit_log row, evaluating and serializing its payloads"""
+        row = dict(event)
+        for field in ("request_data", "response_data"):
+            data = row[field]
+            if callable(data):
+                data = data()
+            row[field] = self._safe_json_serialize(data)
+        return row
+
     def extract_resource_id_from_path(self, path: str, resource_type: AuditResource) -> Optional[str]:
         """Extract resource ID from path - called during query time"""
         try:
@@ -127,49 +256,39 @@ class AuditService:
         status_code: int,
         start_time: int,
         end_time: Optional[int] = None,
-        request_data: Optional[Dict[str, Any]] = None,
-        response_data: Optional[Dict[str, Any]] = None,
+        request_data: AuditPayload = None,
+        response_data: AuditPayload = None,
         error_message: Optional[str] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         request_id: Optional[str] = None,
     ):
-        """Log an audit entry"""
+        """Queue an audit entry, written to the database in the background"""
         if not self.enabled:
             return
 
         try:
-            # Create audit log entry
-            audit_log = AuditLog(
-                id=str(uuid.uuid4()),
-                user_id=user_id,
-                username=username,
-                resource_type=resource_type,
-                api_name=api_name,
-                http_method=http_method,
-                path=path,
-                status_code=status_code,
-                start_time=start_time,
-                end_time=end_time,
-                request_data=self._safe_json_serialize(request_data),
-                response_data=self._safe_json_serialize(response_data),
-                error_message=error_message,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_id=request_id or str(uuid.uuid4()),
+            self.writer.submit(
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "username": username,
+                    "resource_type": resource_type,
+                    "api_name": api_name,
+                    "http_method": http_method,
+                    "path": path,
+                    "status_code": status_code,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "request_data": request_data,
+                    "response_data": response_data,
+                    "error_message": error_message,
+                    "ip_address": ip_address,
+                    "user_agent": user_agent,
+                    "request_id": request_id or str(uuid.uuid4()),
+                    "gmt_created": utc_now(),
+                }
             )
-
-            # Save to database with proper session management
-            async def _save_audit_log(session):
-                session.add(audit_log)
-                await session.commit()
-                return audit_log
-
-            # Use get_async_session with proper session management
-            async for session in get_async_session():
-                await _save_audit_log(session)
-                break  # Only process one session
-
         except Exception as e:
             logger.error(f"Failed to log audit: {e}")
 
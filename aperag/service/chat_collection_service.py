@@ -17,10 +17,13 @@ from typing import Optional
 
 from aperag.db.models import Collection, CollectionStatus, CollectionType, User
 from aperag.db.ops import async_db_ops
+from aperag.exceptions import ResourceNotFoundException
 from aperag.schema.view_models import (
     CollectionConfig,
     CollectionCreate,
     ModelSpec,
+    SearchRequest,
+    SearchResult,
     TagFilterCondition,
     TagFilterRequest,
 )
@@ -161,6 +164,33 @@ class ChatCollectionService:
         collection = await self.get_user_chat_collection(user_id)
         return collection.id if collection else None
 
+    async def search_chat_files(self, user_id: str, chat_id: str, data: SearchRequest) -> SearchResult:
+        """Search the files uploaded to a chat, within the user's chat collection"""
+        chat_collection_id = await self.get_user_chat_collection_id(user_id)
+        if not chat_collection_id:
+            raise ResourceNotFoundException("Chat collection")
+
+        items, _ = await collection_service.execute_search_flow(
+            data=data,
+            collection_id=chat_collection_id,
+            search_user_id=user_id,
+            chat_id=chat_id,  # Add chat_id for filtering in chat searches
+            flow_name="chat_search",
+            flow_title="Chat Search",
+        )
+
+        # Return search result without saving to database for chat searches
+        return SearchResult(
+            id=None,  # No ID since not saved
+            query=data.query,
+            vector_search=data.vector_search,
+            fulltext_search=data.fulltext_search,
+            graph_search=data.graph_search,
+            summary_search=data.summary_search,
+            items=items,
+            created=None,  # No creation time since not saved
+        )
+
 
 # Create a global service instance
 chat_collection_service = ChatCollectionService()
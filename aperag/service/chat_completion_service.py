@@ -23,8 +23,8 @@ from typing import Any, AsyncGenerator, Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from aperag.db.ops import AsyncDatabaseOps, async_db_ops
+from aperag.flow.compiled import compiled_flow_cache
 from aperag.flow.engine import FlowEngine
-from aperag.flow.parser import FlowParser
 
 logger = logging.getLogger(__name__)
 
@@ -142,7 +142,7 @@ class ChatCompletionService:
         if not flow_config:
             return None, OpenAIFormatter.format_error("Bot flow config not found")
 
-        flow = FlowParser.parse(flow_config)
+        flow = compiled_flow_cache.get(bot.id, flow_config)
         engine = FlowEngine()
         initial_data = {
             "query": api_request.messages[-1]["content"],
@@ -158,7 +158,7 @@ class ChatCompletionService:
             return None, OpenAIFormatter.format_error(str(e))
 
         async_generator = None
-        nodes = engine.find_end_nodes(flow)
+        nodes = flow.end_nodes
         for node in nodes:
             async_generator = system_outputs[node].get("async_generator")
             if async_generator:
@@ -25,8 +25,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from aperag.db import models as db_models
 from aperag.db.ops import AsyncDatabaseOps, async_db_ops
 from aperag.exceptions import ChatNotFoundException, ResourceNotFoundException
+from aperag.flow.compiled import compiled_flow_cache
 from aperag.flow.engine import FlowEngine
-from aperag.flow.parser import FlowParser
 from aperag.schema import view_models
 from aperag.schema.view_models import Chat, ChatDetails
 from aperag.utils.constant import DOC_QA_REFERENCES, DOCUMENT_URLS
@@ -313,7 +313,7 @@ class ChatService:
             return FrontendFormatter.format_error("Bot flow config not found")
 
         try:
-            flow = FlowParser.parse(flow_config)
+            flow = compiled_flow_cache.get(bot.id, flow_config)
             engine = FlowEngine()
 
             # Prepare initial data for flow execution
@@ -336,7 +336,7 @@ class ChatService:
 
             # Find the async generator from flow outputs
             async_generator = None
-            nodes = engine.find_end_nodes(flow)
+            nodes = flow.end_nodes
             for node in nodes:
                 async_generator = system_outputs[node].get("async_generator")
                 if async_generator:
@@ -378,15 +378,9 @@ class ChatService:
         """Handle message feedback for chat messages"""
         # Get message from Redis history to validate it exists and get context
         history = RedisChatMessageHistory(chat_id, redis_client=get_async_redis_client())
-        ai_msg = None
-        human_msg = None
-        for message in await history.messages:
-            if message.message_id != message_id:
-                continue
-            if message.role == "ai":
-                ai_msg = message
-            if message.role == "human":
-                human_msg = message
+        turn = await history.get_messages_by_id(message_id)
+        ai_msg = turn.get("ai")
+        human_msg = turn.get("human")
 
         if not ai_msg:
             raise ResourceNotFoundException("AI Message", message_id)
@@ -475,7 +469,7 @@ class ChatService:
                         await websocket.send_text(fail_response(message_id, "Bot flow config not found"))
                         continue
 
-                    flow = FlowParser.parse(flow_config)
+                    flow = compiled_flow_cache.get(bot.id, flow_config)
                     engine = FlowEngine()
 
                     # Prepare initial data for flow execution
@@ -496,7 +490,7 @@ class ChatService:
 
                     # Find the async generator from flow outputs
                     async_generator = None
-                    nodes = engine.find_end_nodes(flow)
+                    nodes = flow.end_nodes
                     for node in nodes:
                         async_generator = system_outputs[node].get("async_generator")
                         if async_generator:
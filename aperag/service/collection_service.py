@@ -18,11 +18,13 @@ from typing import List, Optional, Tuple
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from aperag.config import settings
 from aperag.db import models as db_models
 from aperag.db.ops import AsyncDatabaseOps, async_db_ops
 from aperag.exceptions import ValidationException
 from aperag.flow.base.models import Edge, FlowInstance, NodeInstance
 from aperag.flow.engine import FlowEngine
+from aperag.graph import lightrag_manager
 from aperag.schema import view_models
 from aperag.schema.utils import dumpCollectionConfig, parseCollectionConfig
 from aperag.schema.view_models import (
@@ -237,6 +239,9 @@ class CollectionService:
         if not updated_instance:
             raise CollectionNotFoundException(collection_id)
 
+        # Pooled LightRAG instances were built from the previous config
+        lightrag_manager.invalidate_lightrag_instances(collection_id)
+
         return await self.build_collection_response(updated_instance)
 
     async def delete_collection(self, user: str, collection_id: str) -> Optional[view_models.Collection]:
@@ -283,6 +288,7 @@ class CollectionService:
 
         if deleted_instance:
             # Clean up related resources
+            lightrag_manager.invalidate_lightrag_instances(collection_id)
             collection_delete_task.delay(collection_id)
             return await self.build_collection_response(deleted_instance)
 
@@ -373,10 +379,13 @@ class CollectionService:
             if chat_id:
                 input_values["chat_id"] = chat_id
 
+            # Graph search is the slowest branch; the merge continues without it if it fails or is too slow
             nodes["graph_search"] = NodeInstance(
                 id="graph_search",
                 type="graph_search",
                 input_values=input_values,
+                timeout=settings.search_graph_timeout or None,
+                best_effort=True,
             )
             merge_node_values["graph_search_docs"] = "{{ nodes.graph_search.output.docs }}"
             edges.append(Edge(source="graph_search", target=merge_node_id))
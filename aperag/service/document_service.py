@@ -12,15 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import logging
 import mimetypes
 import os
 import re
-from typing import List
+from typing import IO, List
 
 from fastapi import HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -50,7 +51,7 @@ from aperag.utils.pagination import (
     SortParams,
 )
 from aperag.utils.uncompress import SUPPORTED_COMPRESSED_EXTENSIONS
-from aperag.utils.utils import calculate_file_hash, generate_vector_db_collection_name, utc_now
+from aperag.utils.utils import calculate_file_hash, calculate_stream_hash, generate_vector_db_collection_name, utc_now
 from aperag.vectorstore.connector import VectorStoreConnectorAdaptor
 
 logger = logging.getLogger(__name__)
@@ -116,6 +117,10 @@ class DocumentService:
 
         return file_suffix
 
+    async def _hash_upload(self, file: UploadFile) -> str:
+        """Hash an upload chunk by chunk from its spooled temporary file, off the event loop"""
+        return await asyncio.to_thread(calculate_stream_hash, file.file)
+
     async def _check_duplicate_document(
         self, user: str, collection_id: str, filename: str, file_hash: str
     ) -> db_models.Document | None:
@@ -207,17 +212,21 @@ class DocumentService:
         size: int,
         status: db_models.DocumentStatus,
         file_suffix: str,
-        file_content: bytes,
+        file_content: bytes | IO[bytes],
         custom_metadata: dict = None,
         content_hash: str = None,
     ) -> db_models.Document:
         """
         Create a document record in database and upload file to object store.
+        File objects are streamed to the object store without being read into memory.
         Returns the created document instance.
         """
         # Calculate file hash if not provided
         if content_hash is None:
-            content_hash = calculate_file_hash(file_content)
+            if isinstance(file_content, bytes):
+                content_hash = calculate_file_hash(file_content)
+            else:
+                content_hash = await asyncio.to_thread(calculate_stream_hash, file_content)
 
         # Create document in database
         document_instance = db_models.Document(
@@ -235,6 +244,8 @@ class DocumentService:
         # Upload to object store
         async_obj_store = get_async_object_store()
         upload_path = f"{document_instance.object_store_base_path()}/original{file_suffix}"
+        if not isinstance(file_content, bytes):
+            file_content.seek(0)
         await async_obj_store.put(upload_path, file_content)
 
         # Update document with object path and custom metadata
@@ -381,28 +392,23 @@ class DocumentService:
         # Validate collection
         collection = await self._validate_collection(user, collection_id)
 
-        # Prepare file data and validate all files before starting any database operations
-        file_data = []
-        for item in files:
-            file_suffix = self._validate_file(item.filename, item.size)
-
-            # Read file content from UploadFile
-            file_content = await item.read()
-            # Reset file pointer for potential future use
-            await item.seek(0)
-
-            # Calculate original file hash for duplicate detection
-            file_hash = calculate_file_hash(file_content)
-
-            file_data.append(
-                {
-                    "filename": item.filename,
-                    "size": item.size,
-                    "suffix": file_suffix,
-                    "content": file_content,
-                    "file_hash": file_hash,
-                }
-            )
+        # Validate all files before starting any database operations
+        file_suffixes = [self._validate_file(item.filename, item.size) for item in files]
+
+        # Calculate original file hashes for duplicate detection. Uploads are spooled to temporary
+        # files by the framework and are hashed and later uploaded from there, never read into memory.
+        file_hashes = await asyncio.gather(*(self._hash_upload(item) for item in files))
+
+        file_data = [
+            {
+                "filename": item.filename,
+                "size": item.size,
+                "suffix": file_suffix,
+                "content": item.file,
+                "file_hash": file_hash,
+            }
+            for item, file_suffix, file_hash in zip(files, file_suffixes, file_hashes)
+        ]
 
         # Process all files in a single transaction for atomicity
         async def _create_documents_atomically(session):
@@ -957,10 +963,7 @@ class DocumentService:
                 md_obj_result = await async_obj_store.get(markdown_path)
                 if md_obj_result:
                     md_stream, _ = md_obj_result
-                    content = b""
-                    async for data in md_stream:
-                        content += data
-                    markdown_content = content.decode("utf-8")
+                    markdown_content = b"".join([data async for data in md_stream]).decode("utf-8")
             except Exception:
                 logger.warning(f"Could not find or read markdown file at {markdown_path}")
 
@@ -1026,6 +1029,13 @@ class DocumentService:
                     content_type = "application/octet-stream"
                 headers["Content-Type"] = content_type
 
+                # Objects stored on the local file system are served by FileResponse, which handles
+                # Range requests itself and can hand the file to the server (pathsend) instead of
+                # pumping bytes through Python
+                local_path = await async_obj_store.local_path(full_path)
+                if local_path is not None:
+                    return FileResponse(local_path, media_type=content_type)
+
                 if range_header:
                     # For range requests, we need the total size first.
                     total_size = await async_obj_store.get_obj_size(full_path)
@@ -1063,6 +1073,8 @@ class DocumentService:
                 headers["Content-Length"] = str(file_size)
                 return StreamingResponse(data_stream, headers=headers)
 
+            except HTTPException:
+                raise
             except Exception as e:
                 logger.error(f"Failed to get object for document {document_id} at path {full_path}: {e}", exc_info=True)
                 raise HTTPException(status_code=500, detail="Failed to get object from store")
@@ -1080,12 +1092,8 @@ class DocumentService:
         # Validate file
         file_suffix = self._validate_file(file.filename, file.size)
 
-        # Read file content
-        file_content = await file.read()
-        await file.seek(0)
-
-        # Calculate original file hash for duplicate detection
-        file_hash = calculate_file_hash(file_content)
+        # Calculate original file hash for duplicate detection, streaming the spooled upload
+        file_hash = await self._hash_upload(file)
 
         async def _upload_document_atomically(session):
             # Check for duplicate document (same name and hash)
@@ -1112,7 +1120,7 @@ class DocumentService:
                 size=file.size,
                 status=db_models.DocumentStatus.UPLOADED,  # Temporary status
                 file_suffix=file_suffix,
-                file_content=file_content,
+                file_content=file.file,
                 content_hash=file_hash,
             )
 
@@ -22,8 +22,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from aperag.db.ops import AsyncDatabaseOps, async_db_ops
 from aperag.exceptions import ResourceNotFoundException
+from aperag.flow.compiled import compiled_flow_cache
 from aperag.flow.engine import FlowEngine
-from aperag.flow.parser import FlowParser
 from aperag.schema import view_models
 
 logger = logging.getLogger(__name__)
@@ -63,7 +63,7 @@ class FlowService:
 
         _, system_outputs = await flow_task
         node_id = ""
-        nodes = engine.find_end_nodes(flow)
+        nodes = flow.end_nodes
         async_generator = None
         for node in nodes:
             async_generator = system_outputs[node].get("async_generator")
@@ -96,7 +96,7 @@ class FlowService:
         if not flow_config:
             raise ValueError("Bot flow config not found")
 
-        flow = FlowParser.parse(flow_config)
+        flow = compiled_flow_cache.get(bot.id, flow_config)
         engine = FlowEngine()
         initial_data = {"query": debug.query, "user": user}
         task = asyncio.create_task(engine.execute_flow(flow, initial_data))
@@ -143,6 +143,7 @@ class FlowService:
         if not updated_bot:
             raise ResourceNotFoundException("Bot", bot_id)
 
+        compiled_flow_cache.invalidate(bot_id)
         return flow
 
 
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from aperag.concurrent_control import get_or_create_lock, lock_context
 from aperag.db.models import MergeSuggestionStatus
@@ -26,6 +26,9 @@ from aperag.utils.utils import utc_now
 
 logger = logging.getLogger(__name__)
 
+# Labels returned by a label search without an explicit limit
+DEFAULT_LABEL_SEARCH_LIMIT = 50
+
 
 class GraphService:
     """Service for knowledge graph operations"""
@@ -36,16 +39,23 @@ class GraphService:
         self.collection_service = collection_service
         self.db_ops = async_db_ops
 
-    async def get_graph_labels(self, user_id: str, collection_id: str) -> view_models.GraphLabelsResponse:
-        """Get available node labels in the knowledge graph"""
+    async def get_graph_labels(
+        self,
+        user_id: str,
+        collection_id: str,
+        query: Optional[str] = None,
+        mode: str = "fuzzy",
+        limit: Optional[int] = None,
+    ) -> view_models.GraphLabelsResponse:
+        """Get available node labels in the knowledge graph, all of them unless a query or limit is given"""
         db_collection = await self._get_and_validate_collection(user_id, collection_id)
 
-        rag = await lightrag_manager.create_lightrag_instance(db_collection)
-        try:
+        rag = await lightrag_manager.get_lightrag_instance(db_collection)
+        if query is None and limit is None:
             labels = await rag.get_graph_labels()
-            return view_models.GraphLabelsResponse(labels=labels)
-        finally:
-            await rag.finalize_storages()
+        else:
+            labels = await rag.search_graph_labels(query or "", mode, limit or DEFAULT_LABEL_SEARCH_LIMIT)
+        return view_models.GraphLabelsResponse(labels=labels)
 
     def _optimize_graph_for_visualization(self, nodes, edges, max_nodes):
         """Optimize graph by selecting well-connected nodes"""
@@ -82,40 +92,37 @@ class GraphService:
         """Get knowledge graph with overview or subgraph mode"""
         db_collection = await self._get_and_validate_collection(user_id, collection_id)
 
-        rag = await lightrag_manager.create_lightrag_instance(db_collection)
-        try:
-            # Determine query parameters
-            if not label or label == "*":
-                node_label, query_max_nodes = "*", max_nodes * 2
-                mode_description = "overview"
-            else:
-                node_label, query_max_nodes = label, max_nodes
-                mode_description = f"subgraph from '{label}'"
-
-            # Get knowledge graph
-            kg: KnowledgeGraph = await rag.get_knowledge_graph(
-                node_label=node_label,
-                max_depth=max_depth,
-                max_nodes=query_max_nodes,
-            )
+        rag = await lightrag_manager.get_lightrag_instance(db_collection)
+        # Determine query parameters
+        if not label or label == "*":
+            node_label, query_max_nodes = "*", max_nodes * 2
+            mode_description = "overview"
+        else:
+            node_label, query_max_nodes = label, max_nodes
+            mode_description = f"subgraph from '{label}'"
+
+        # Get knowledge graph
+        kg: KnowledgeGraph = await rag.get_knowledge_graph(
+            node_label=node_label,
+            max_depth=max_depth,
+            max_nodes=query_max_nodes,
+        )
 
-            # Optimize if needed
-            if (not label or label == "*") and len(kg.nodes) > max_nodes:
-                optimized_nodes, optimized_edges = self._optimize_graph_for_visualization(kg.nodes, kg.edges, max_nodes)
-                is_truncated = True
-            else:
-                optimized_nodes, optimized_edges = kg.nodes, kg.edges
-                is_truncated = getattr(kg, "is_truncated", False)
+        # Optimize if needed
+        if (not label or label == "*") and len(kg.nodes) > max_nodes:
+            optimized_nodes, optimized_edges = self._optimize_graph_for_visualization(kg.nodes, kg.edges, max_nodes)
+            is_truncated = True
+        else:
+            optimized_nodes, optimized_edges = kg.nodes, kg.edges
+            is_truncated = getattr(kg, "is_truncated", False)
 
-            result = self._convert_graph_to_dict(optimized_nodes, optimized_edges, is_truncated)
+        result = self._convert_graph_to_dict(optimized_nodes, optimized_edges, is_truncated)
 
-            logger.info(
-                f"Retrieved {mode_description} graph for collection {collection_id}: "
-                f"{len(result['nodes'])} nodes, {len(result['edges'])} edges"
-            )
-            return result
-        finally:
-            await rag.finalize_storages()
+        logger.info(
+            f"Retrieved {mode_description} graph for collection {collection_id}: "
+            f"{len(result['nodes'])} nodes, {len(result['edges'])} edges"
+        )
+        return result
 
     def _convert_graph_to_dict(self, nodes, edges, is_truncated=False) -> Dict[str, Any]:
         """Convert LightRAG graph objects to dictionary format"""
@@ -272,16 +279,13 @@ class GraphService:
         db_collection = await self._get_and_validate_collection(user_id, collection_id)
 
         # Generate suggestions using LightRAG
-        rag = await lightrag_manager.create_lightrag_instance(db_collection)
-        try:
-            llm_result = await rag.agenerate_merge_suggestions(
-                max_suggestions=max_suggestions,
-                entity_types=None,  # Default to None (consider all entity types)
-                debug_mode=False,  # Default to False
-                max_concurrent_llm_calls=max_concurrent_llm_calls,
-            )
-        finally:
-            await rag.finalize_storages()
+        rag = await lightrag_manager.get_lightrag_instance(db_collection)
+        llm_result = await rag.agenerate_merge_suggestions(
+            max_suggestions=max_suggestions,
+            entity_types=None,  # Default to None (consider all entity types)
+            debug_mode=False,  # Default to False
+            max_concurrent_llm_calls=max_concurrent_llm_calls,
+        )
 
         # Prepare suggestion data for storage
         suggestion_data = [
@@ -398,19 +402,16 @@ class GraphService:
         target_entity_data: dict[str, Any] | None,
     ) -> dict[str, Any]:
         """Execute the actual node merge operation"""
-        rag = await lightrag_manager.create_lightrag_instance(db_collection)
-        try:
-            result = await rag.amerge_nodes(
-                entity_ids=entity_ids,
-                target_entity_data=target_entity_data,
-            )
+        rag = await lightrag_manager.get_lightrag_instance(db_collection)
+        result = await rag.amerge_nodes(
+            entity_ids=entity_ids,
+            target_entity_data=target_entity_data,
+        )
 
-            # Add entity_ids to result for consistency
-            result["entity_ids"] = entity_ids
+        # Add entity_ids to result for consistency
+        result["entity_ids"] = entity_ids
 
-            return result
-        finally:
-            await rag.finalize_storages()
+        return result
 
     async def _get_and_validate_collection(self, user_id: str, collection_id: str):
         """Get collection and validate knowledge graph is enabled"""
@@ -434,12 +435,9 @@ class GraphService:
         """Export collection knowledge graph data in KG-Eval framework format"""
         db_collection = await self._get_and_validate_collection(user_id, collection_id)
 
-        rag = await lightrag_manager.create_lightrag_instance(db_collection)
-        try:
-            result = await rag.export_for_kg_eval(sample_size=sample_size, include_source_texts=include_source_texts)
-            return result
-        finally:
-            await rag.finalize_storages()
+        rag = await lightrag_manager.get_lightrag_instance(db_collection)
+        result = await rag.export_for_kg_eval(sample_size=sample_size, include_source_texts=include_source_texts)
+        return result
 
 
 # Global service instance
@@ -43,12 +43,14 @@ class LocalDocument(BaseModel):
     path: str - path of the document on the local file system
     size: int - size of the document in bytes
     metadata: Dict[str, Any] - metadata of the document
+    is_temp: bool - whether path is a temporary copy made for processing
     """
 
     name: str
     path: str
     size: Optional[int] = None
     metadata: Dict[str, Any] = {}
+    is_temp: bool = False
 
 
 class CustomSourceInitializationError(Exception):
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import shutil
+import tempfile
 from typing import Any, Dict, Iterator
 
 from aperag.objectstore.base import get_object_store
@@ -33,14 +35,25 @@ class UploadSource(Source):
         if not obj_path:
             raise Exception("empty object path")
         obj_store = get_object_store()
+        metadata["name"] = name
+
+        # Objects of the local object store are parsed in place
+        local_path = obj_store.local_path(obj_path)
+        if local_path is not None:
+            return LocalDocument(name=name, path=local_path, metadata=metadata)
+
         obj = obj_store.get(obj_path)
         if obj is None:
             raise Exception(f"object '{obj_path}' is not found")
         with gen_temporary_file(name) as temp_file, obj:
             shutil.copyfileobj(obj, temp_file)
             filepath = temp_file.name
-        metadata["name"] = name
-        return LocalDocument(name=name, path=filepath, metadata=metadata)
+        return LocalDocument(name=name, path=filepath, metadata=metadata, is_temp=True)
+
+    def cleanup_document(self, filepath: str):
+        # Only temporary copies are removed, never the files of the local object store
+        if os.path.dirname(os.path.abspath(filepath)) == os.path.abspath(tempfile.gettempdir()):
+            os.remove(filepath)
 
     def sync_enabled(self):
         return False
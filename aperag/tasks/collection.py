@@ -183,6 +183,7 @@ class CollectionTask:
 
         # Execute async deletion
         async_to_sync(_delete_lightrag)()
+        lightrag_manager.invalidate_lightrag_instances(str(collection.id))
 
         return deletion_stats
 
@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Optional, Tuple
 
 from aperag.db.models import DocumentIndexType
 from aperag.tasks.models import IndexTaskResult, LocalDocumentInfo, ParsedDocumentData
+from aperag.tasks.parsed_artifact import ParsedDataRef, store_parsed_data
 from aperag.tasks.utils import parse_document_content
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,23 @@ class DocumentIndexTask:
         Returns:
             ParsedDocumentData containing all parsed information
         """
+        parsed_data, _ = self._parse_document(document_id)
+        return parsed_data
+
+    def parse_document_to_artifact(self, document_id: str) -> ParsedDataRef:
+        """
+        Parse document content and store it in the object store for the index tasks
+
+        Args:
+            document_id: Document ID to parse
+
+        Returns:
+            ParsedDataRef pointing to the stored ParsedDocumentData
+        """
+        parsed_data, document = self._parse_document(document_id)
+        return store_parsed_data(parsed_data, document.object_store_base_path())
+
+    def _parse_document(self, document_id: str) -> Tuple[ParsedDocumentData, Any]:
         logger.info(f"Parsing document {document_id}")
 
         from aperag.tasks.utils import get_document_and_collection
@@ -44,14 +63,44 @@ class DocumentIndexTask:
         content, doc_parts, local_doc = parse_document_content(document, collection)
 
         local_doc_info = LocalDocumentInfo(path=local_doc.path, is_temp=getattr(local_doc, "is_temp", False))
+        chunks_path = self._save_chunk_artifact(document, collection, content, doc_parts)
 
-        return ParsedDocumentData(
+        parsed_data = ParsedDocumentData(
             document_id=document_id,
             collection_id=collection.id,
             content=content,
             doc_parts=doc_parts,
             file_path=local_doc.path,
             local_doc_info=local_doc_info,
+            chunks_path=chunks_path,
+        )
+        return parsed_data, document
+
+    def _save_chunk_artifact(self, document, collection, content: str, doc_parts) -> Optional[str]:
+        """
+        Rechunk the parsed document once for all indexers and store the chunks next to parsed.md.
+
+        Returns the artifact path, or None if it could not be stored (indexers then rechunk themselves).
+        """
+        from aperag.index.chunk_artifact import build_chunk_artifact, chunk_artifact_path, save_chunk_artifact
+        from aperag.index.graph_index import graph_indexer
+
+        try:
+            artifact = build_chunk_artifact(
+                doc_parts, content, include_graph_chunks=graph_indexer.is_enabled(collection)
+            )
+            path = chunk_artifact_path(document.object_store_base_path())
+            save_chunk_artifact(path, artifact)
+            return path
+        except Exception as e:
+            logger.warning(f"Failed to create chunk artifact for document {document.id}: {e}", exc_info=True)
+            return None
+
+    def _get_chunk_artifact(self, parsed_data: ParsedDocumentData, include_graph_chunks: bool = False):
+        from aperag.index.chunk_artifact import get_chunk_artifact
+
+        return get_chunk_artifact(
+            parsed_data.chunks_path, parsed_data.doc_parts, parsed_data.content, include_graph_chunks
         )
 
     def create_index(self, document_id: str, index_type: str, parsed_data: ParsedDocumentData) -> IndexTaskResult:
@@ -83,6 +132,7 @@ class DocumentIndexTask:
                     doc_parts=parsed_data.doc_parts,
                     collection=collection,
                     file_path=parsed_data.file_path,
+                    chunk_artifact=self._get_chunk_artifact(parsed_data),
                 )
                 if not result.success:
                     raise Exception(result.error)
@@ -97,6 +147,7 @@ class DocumentIndexTask:
                     doc_parts=parsed_data.doc_parts,
                     collection=collection,
                     file_path=parsed_data.file_path,
+                    chunk_artifact=self._get_chunk_artifact(parsed_data),
                 )
                 if not result.success:
                     raise Exception(result.error)
@@ -111,11 +162,13 @@ class DocumentIndexTask:
                 else:
                     from aperag.graph.lightrag_manager import process_document_for_celery
 
+                    chunk_artifact = self._get_chunk_artifact(parsed_data, include_graph_chunks=True)
                     result = process_document_for_celery(
                         collection=collection,
                         content=parsed_data.content,
                         doc_id=document_id,
                         file_path=parsed_data.file_path,
+                        chunks=chunk_artifact.graph_chunks,
                     )
                     if result.get("status") != "success":
                         error_msg = result.get("message", "Unknown error")
@@ -273,6 +326,7 @@ class DocumentIndexTask:
                     doc_parts=parsed_data.doc_parts,
                     collection=collection,
                     file_path=parsed_data.file_path,
+                    chunk_artifact=self._get_chunk_artifact(parsed_data),
                 )
                 if not result.success:
                     raise Exception(result.error)
@@ -287,6 +341,7 @@ class DocumentIndexTask:
                     doc_parts=parsed_data.doc_parts,
                     collection=collection,
                     file_path=parsed_data.file_path,
+                    chunk_artifact=self._get_chunk_artifact(parsed_data),
                 )
                 if not result.success:
                     raise Exception(result.error)
@@ -301,11 +356,13 @@ class DocumentIndexTask:
                 else:
                     from aperag.graph.lightrag_manager import process_document_for_celery
 
+                    chunk_artifact = self._get_chunk_artifact(parsed_data, include_graph_chunks=True)
                     result = process_document_for_celery(
                         collection=collection,
                         content=parsed_data.content,
                         doc_id=document_id,
                         file_path=parsed_data.file_path,
+                        chunks=chunk_artifact.graph_chunks,
                     )
                     if result.get("status") != "success":
                         error_msg = result.get("message", "Unknown error")
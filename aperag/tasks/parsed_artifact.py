@@ -0,0 +1,129 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parsed document artifacts passed to index tasks by reference.
+
+The parse task stores the serialized ParsedDocumentData in the object store as zlib-compressed
+JSON and only sends a small reference (key + version) through the Celery broker. Index tasks
+load the artifact when they actually run, so the full content and base64 image assets are no
+longer copied into every task of the index group/chord.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import mmap
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from aperag.config import settings
+from aperag.objectstore.base import get_object_store
+from aperag.tasks.models import ParsedDocumentData
+
+logger = logging.getLogger(__name__)
+
+PARSED_ARTIFACT_DIR = "parsed_data"
+PARSED_ARTIFACT_MAGIC = b"APERAG-PD1\n"
+PARSED_DATA_REF_TYPE = "parsed_data_ref"
+
+
+@dataclass
+class ParsedDataRef:
+    """Reference to a stored ParsedDocumentData"""
+
+    document_id: str
+    key: str
+    version: str
+    size: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": PARSED_DATA_REF_TYPE, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ParsedDataRef":
+        return cls(
+            document_id=data["document_id"],
+            key=data["key"],
+            version=data["version"],
+            size=data.get("size", 0),
+        )
+
+    @staticmethod
+    def is_ref(data: Dict[str, Any]) -> bool:
+        return isinstance(data, dict) and data.get("type") == PARSED_DATA_REF_TYPE
+
+
+def encode_parsed_data(parsed_data: ParsedDocumentData) -> bytes:
+    payload = json.dumps(parsed_data.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return PARSED_ARTIFACT_MAGIC + zlib.compress(payload, 1)
+
+
+def decode_parsed_data(data) -> ParsedDocumentData:
+    """Decode an artifact from bytes or any buffer (e.g. a memory map)"""
+    with memoryview(data) as view:
+        if view[: len(PARSED_ARTIFACT_MAGIC)].tobytes() != PARSED_ARTIFACT_MAGIC:
+            raise ValueError("Not a parsed document artifact")
+        payload = zlib.decompress(view[len(PARSED_ARTIFACT_MAGIC) :])
+    return ParsedDocumentData.from_dict(json.loads(payload))
+
+
+def store_parsed_data(parsed_data: ParsedDocumentData, object_store_base_path: str) -> ParsedDataRef:
+    """
+    Store parsed data under the document's object store path.
+
+    Artifacts are immutable and named by the hash of their content. Artifacts of earlier parses
+    are removed first; index tasks still holding such a reference are stale and get skipped by
+    their version check.
+    """
+    data = encode_parsed_data(parsed_data)
+    version = hashlib.sha256(data).hexdigest()[:16]
+    prefix = f"{object_store_base_path}/{PARSED_ARTIFACT_DIR}/"
+    key = f"{prefix}{version}.bin"
+
+    obj_store = get_object_store()
+    obj_store.delete_objects_by_prefix(prefix)
+    obj_store.put(key, data)
+    logger.info(f"Stored parsed data of document {parsed_data.document_id} at {key}, size: {len(data)}")
+    return ParsedDataRef(document_id=parsed_data.document_id, key=key, version=version, size=len(data))
+
+
+def load_parsed_data(ref: ParsedDataRef) -> ParsedDocumentData:
+    """Load the parsed data a reference points to"""
+    stream = get_object_store().get(ref.key)
+    if stream is None:
+        raise FileNotFoundError(f"Parsed data {ref.key} of document {ref.document_id} not found")
+    with stream:
+        if settings.parsed_artifact_mmap and isinstance(stream, io.BufferedReader):
+            try:
+                with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return decode_parsed_data(mapped)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Failed to memory-map {ref.key}, reading it instead: {e}")
+                stream.seek(0)
+        return decode_parsed_data(stream.read())
+
+
+def resolve_parsed_data(payload: Dict[str, Any]) -> ParsedDocumentData:
+    """
+    Get ParsedDocumentData from an index task argument.
+
+    Accepts a ParsedDataRef dict, or serialized ParsedDocumentData sent by workflows that were
+    queued before parsed data was passed by reference.
+    """
+    if ParsedDataRef.is_ref(payload):
+        return load_parsed_data(ParsedDataRef.from_dict(payload))
+    return ParsedDocumentData.from_dict(payload)
@@ -32,7 +32,8 @@ def parse_document_content(document, collection) -> Tuple[str, List[Any], Any]:
     from aperag.source.base import get_source
 
     # Get document source and prepare local file
-    source = get_source(parseCollectionConfig(collection.config))
+    collection_config = parseCollectionConfig(collection.config)
+    source = get_source(collection_config)
     metadata = json.loads(document.doc_metadata or "{}")
     metadata["doc_id"] = document.id
     local_doc = source.prepare_document(name=document.name, metadata=metadata)
@@ -46,6 +47,7 @@ def parse_document_content(document, collection) -> Tuple[str, List[Any], Any]:
             local_doc.metadata,
             document.object_store_base_path(),
             global_settings,
+            collection_config=collection_config,
         )
 
         # Add chat metadata to all document parts if this is a chat upload
@@ -19,7 +19,7 @@ from typing import Any, Dict, Optional
 
 from fastapi import Request
 
-from aperag.service.audit_service import audit_service
+from aperag.service.audit_service import AuditPayload, audit_service
 
 logger = logging.getLogger(__name__)
 
@@ -193,11 +193,11 @@ async def _log_audit_async(
     start_time_ms: int,
     end_time_ms: int,
     status_code: int,
-    request_data: dict,
-    response_data: dict,
+    request_data: AuditPayload,
+    response_data: AuditPayload,
     error_message: str = None,
 ):
-    """Log audit information asynchronously"""
+    """Queue audit information; payloads given as callables are extracted by the audit writer"""
     try:
         # Get user info from request state
         user_id = getattr(request.state, "user_id", None)
@@ -206,26 +206,21 @@ async def _log_audit_async(
         # Extract client info
         ip_address, user_agent = _extract_client_info(request)
 
-        # Log audit in background
-        import asyncio
-
-        asyncio.create_task(
-            audit_service.log_audit(
-                user_id=user_id,
-                username=username,
-                resource_type=resource_type,
-                api_name=api_name,
-                http_method=request.method,
-                path=request.url.path,
-                status_code=status_code,
-                start_time=start_time_ms,
-                end_time=end_time_ms,
-                request_data=request_data,
-                response_data=response_data,
-                error_message=error_message,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
+        await audit_service.log_audit(
+            user_id=user_id,
+            username=username,
+            resource_type=resource_type,
+            api_name=api_name,
+            http_method=request.method,
+            path=request.url.path,
+            status_code=status_code,
+            start_time=start_time_ms,
+            end_time=end_time_ms,
+            request_data=request_data,
+            response_data=response_data,
+            error_message=error_message,
+            ip_address=ip_address,
+            user_agent=user_agent,
         )
     except Exception as audit_error:
         logger.error(f"Failed to log audit: {audit_error}")
@@ -269,13 +264,8 @@ def audit(resource_type: str, api_name: str = None):
                 # Record end time
                 end_time_ms = int(time.time() * 1000)
 
-                # Extract request data from function arguments (after parsing)
-                request_data = _extract_request_data_from_args(request, kwargs)
-
-                # Extract response data
-                response_data = _extract_response_data(response)
-
-                # Log audit asynchronously
+                # Request data comes from the parsed function arguments; both payloads are
+                # extracted and cleaned by the audit writer, not on the request path
                 await _log_audit_async(
                     request=request,
                     resource_type=resource_type,
@@ -283,8 +273,8 @@ def audit(resource_type: str, api_name: str = None):
                     start_time_ms=start_time_ms,
                     end_time_ms=end_time_ms,
                     status_code=200,  # Success
-                    request_data=request_data,
-                    response_data=response_data,
+                    request_data=functools.partial(_extract_request_data_from_args, request, kwargs),
+                    response_data=functools.partial(_extract_response_data, response),
                     error_message=None,
                 )
 
@@ -294,12 +284,6 @@ def audit(resource_type: str, api_name: str = None):
                 # Record end time for error case
                 end_time_ms = int(time.time() * 1000)
 
-                # Extract request data if possible
-                try:
-                    request_data = _extract_request_data_from_args(request, kwargs)
-                except Exception:
-                    request_data = {"method": request.method, "path": request.url.path}
-
                 # Log audit for error case
                 await _log_audit_async(
                     request=request,
@@ -308,7 +292,7 @@ def audit(resource_type: str, api_name: str = None):
                     start_time_ms=start_time_ms,
                     end_time_ms=end_time_ms,
                     status_code=500,  # Error
-                    request_data=request_data,
+                    request_data=functools.partial(_extract_request_data_from_args, request, kwargs),
                     response_data={"error": str(e)},
                     error_message=str(e),
                 )
@@ -150,26 +150,73 @@ class RedisChatMessageHistory:
         return self.key_prefix + self.session_id
 
     @property
-    async def messages(self) -> List[StoredChatMessage]:
-        """Retrieve the messages from Redis as StoredChatMessage objects"""
-        _items = await self.redis_client.lrange(self.key, 0, -1)
-        items = [json.loads(m.decode("utf-8")) for m in _items[::-1]]  # Reverse to get chronological order
+    def index_key(self) -> str:
+        """Hash mapping "<message_id>:<role>" to the message position, counted from the oldest message"""
+        return self.key + ":index"
+
+    def _parse_items(self, items) -> List[StoredChatMessage]:
         messages = []
         for item in items:
             try:
-                message = storage_dict_to_message(item)
+                message = storage_dict_to_message(json.loads(item.decode("utf-8")))
                 messages.append(message)
             except Exception as e:
                 logger.warning(f"Failed to parse message in history for {self.session_id}: {e}")
                 continue
         return messages
 
+    @property
+    async def messages(self) -> List[StoredChatMessage]:
+        """Retrieve the messages from Redis as StoredChatMessage objects"""
+        _items = await self.redis_client.lrange(self.key, 0, -1)
+        return self._parse_items(_items[::-1])  # Reverse to get chronological order
+
+    async def tail(self, n: int) -> List[StoredChatMessage]:
+        """Retrieve only the most recent n messages, in chronological order"""
+        if n <= 0:
+            return []
+        # Messages are pushed to the head of the list, so the newest ones come first
+        _items = await self.redis_client.lrange(self.key, 0, n - 1)
+        return self._parse_items(_items[::-1])
+
+    async def get_messages_by_id(self, message_id: str) -> Dict[str, StoredChatMessage]:
+        """
+        Find the messages of a conversation turn by message id, keyed by role ("human" / "ai").
+
+        Uses the message-id index, falling back to a full scan for turns written before the index existed.
+        """
+        roles = ["human", "ai"]
+        positions = await self.redis_client.hmget(self.index_key, [f"{message_id}:{role}" for role in roles])
+        found = {}
+        if all(position is not None for position in positions):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for position in positions:
+                # Positions count from the oldest message, which stays at the tail of the list
+                pipe.lindex(self.key, -int(position) - 1)
+            items = await pipe.execute()
+            for role, item in zip(roles, items):
+                messages = self._parse_items([item]) if item is not None else []
+                if messages and messages[0].message_id == message_id and messages[0].role == role:
+                    found[role] = messages[0]
+            if len(found) == len(roles):
+                return found
+
+        for message in await self.messages:
+            if message.message_id == message_id and message.role in roles:
+                found[message.role] = message
+        return found
+
     async def add_stored_message(self, message: StoredChatMessage) -> None:
         """Add a StoredChatMessage directly to Redis"""
         message_json = json.dumps(message_to_storage_dict(message))
-        await self.redis_client.lpush(self.key, message_json)
+        length = await self.redis_client.lpush(self.key, message_json)
+        pipe = self.redis_client.pipeline(transaction=False)
+        if message.message_id:
+            pipe.hset(self.index_key, f"{message.message_id}:{message.role}", length - 1)
         if self.ttl:
-            await self.redis_client.expire(self.key, self.ttl)
+            pipe.expire(self.key, self.ttl)
+            pipe.expire(self.index_key, self.ttl)
+        await pipe.execute()
 
     async def add_user_message(self, message: str, message_id: str, files: List[Dict[str, Any]] = None) -> None:
         """Add a user message using new format"""
@@ -207,7 +254,7 @@ class RedisChatMessageHistory:
 
     async def clear(self) -> None:
         """Clear session memory from Redis"""
-        await self.redis_client.delete(self.key)
+        await self.redis_client.delete(self.key, self.index_key)
 
     async def release_redis(self):
         await self.redis_client.close(close_connection_pool=True)
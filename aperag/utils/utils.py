@@ -16,6 +16,7 @@ import base64
 import hashlib
 import re
 from datetime import datetime, timezone
+from typing import IO
 
 from Crypto.Cipher import AES
 
@@ -166,3 +167,17 @@ def calculate_file_hash(file_content: bytes) -> str:
         Hexadecimal string of SHA-256 hash
     """
     return hashlib.sha256(file_content).hexdigest()
+
+
+def calculate_stream_hash(stream: IO[bytes], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calculate the SHA-256 hash of a seekable file object chunk by chunk, without loading it into memory.
+
+    The stream is rewound before and after hashing, so it can be uploaded afterwards.
+    """
+    hasher = hashlib.sha256()
+    stream.seek(0)
+    while chunk := stream.read(chunk_size):
+        hasher.update(chunk)
+    stream.seek(0)
+    return hasher.hexdigest()
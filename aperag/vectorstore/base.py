@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
@@ -18,6 +19,10 @@ class VectorStoreConnector(ABC):
     def search(self, query: QueryWithEmbedding, **kwargs) -> QueryResult:
         pass
 
+    async def asearch(self, query: QueryWithEmbedding, **kwargs) -> QueryResult:
+        """Search without blocking the event loop; connectors with an async client override this"""
+        return await asyncio.to_thread(self.search, query, **kwargs)
+
     @abstractmethod
     def delete(self, **delete_kwargs: Any):
         pass
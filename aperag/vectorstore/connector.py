@@ -1,4 +1,10 @@
-from typing import Any, Dict
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+# Upper bound of shared adaptors, roughly one per actively searched collection
+MAX_CACHED_ADAPTORS = 256
 
 
 class VectorStoreConnectorAdaptor:
@@ -14,3 +20,28 @@ class VectorStoreConnectorAdaptor:
                 self.connector = QdrantVectorStoreConnector(ctx, **kwargs)
             case _:
                 raise ValueError("unsupported vector store type:", vector_store_type)
+
+
+_adaptor_cache: "OrderedDict[Tuple[str, str], VectorStoreConnectorAdaptor]" = OrderedDict()
+_adaptor_cache_lock = threading.Lock()
+
+
+def get_vector_store_adaptor(vector_store_type, ctx: Dict[str, Any]) -> VectorStoreConnectorAdaptor:
+    """
+    Get a shared adaptor for the store type and context, so the clients (and their connection
+    pools) of a collection are created once per process instead of once per query.
+    """
+    key = (vector_store_type, json.dumps(ctx, sort_keys=True, default=str))
+    with _adaptor_cache_lock:
+        adaptor = _adaptor_cache.get(key)
+        if adaptor is not None:
+            _adaptor_cache.move_to_end(key)
+            return adaptor
+
+    adaptor = VectorStoreConnectorAdaptor(vector_store_type, dict(ctx))
+    with _adaptor_cache_lock:
+        adaptor = _adaptor_cache.setdefault(key, adaptor)
+        _adaptor_cache.move_to_end(key)
+        while len(_adaptor_cache) > MAX_CACHED_ADAPTORS:
+            _adaptor_cache.popitem(last=False)
+    return adaptor
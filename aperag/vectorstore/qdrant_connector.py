@@ -1,6 +1,8 @@
+import asyncio
 import json
 import logging
 import os
+import weakref
 from typing import Any, Dict
 
 import qdrant_client
@@ -29,6 +31,12 @@ class QdrantVectorStoreConnector(VectorStoreConnector):
         self.vector_size = ctx.get("vector_size", 1536)
         self.distance = ctx.get("distance", "Cosine")
 
+        self.client_kwargs = kwargs
+        # Async clients are bound to the event loop they were created on
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, qdrant_client.AsyncQdrantClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
         if self.url == ":memory:":
             self.client = qdrant_client.QdrantClient(":memory:")
         else:
@@ -48,23 +56,35 @@ class QdrantVectorStoreConnector(VectorStoreConnector):
             vectors_config=VectorParams(size=self.vector_size, distance=self.distance),
         )
 
-    def search(self, query: QueryWithEmbedding, **kwargs):
-        consistency = kwargs.get("consistency", "majority")
-        search_params = kwargs.get("search_params")
-        score_threshold = kwargs.get("score_threshold", 0.1)
-        filter_conditions = kwargs.get("filter")
+    def _get_async_client(self) -> qdrant_client.AsyncQdrantClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = qdrant_client.AsyncQdrantClient(
+                url=self.url,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                https=self.https,
+                timeout=self.timeout,
+                **self.client_kwargs,
+            )
+            self._async_clients[loop] = client
+        return client
 
-        hits = self.client.query_points(
+    def _query_points_kwargs(self, query: QueryWithEmbedding, **kwargs) -> Dict[str, Any]:
+        return dict(
             collection_name=self.collection_name,
             query=query.embedding,
             with_vectors=True,
             limit=query.top_k,
-            consistency=consistency,
-            search_params=search_params,
-            score_threshold=score_threshold,
-            query_filter=filter_conditions,
+            consistency=kwargs.get("consistency", "majority"),
+            search_params=kwargs.get("search_params"),
+            score_threshold=kwargs.get("score_threshold", 0.1),
+            query_filter=kwargs.get("filter"),
         )
 
+    def _to_query_result(self, query: QueryWithEmbedding, hits) -> QueryResult:
         results = [self._convert_scored_point_to_document_with_score(point) for point in hits.points]
         results = [result for result in results if result is not None]
 
@@ -73,6 +93,17 @@ class QdrantVectorStoreConnector(VectorStoreConnector):
             results=results,
         )
 
+    def search(self, query: QueryWithEmbedding, **kwargs):
+        hits = self.client.query_points(**self._query_points_kwargs(query, **kwargs))
+        return self._to_query_result(query, hits)
+
+    async def asearch(self, query: QueryWithEmbedding, **kwargs):
+        if self.url == ":memory:":
+            # An in-memory store lives in the sync client, which is not a network round trip
+            return self.search(query, **kwargs)
+        hits = await self._get_async_client().query_points(**self._query_points_kwargs(query, **kwargs))
+        return self._to_query_result(query, hits)
+
     def _convert_scored_point_to_document_with_score(self, scored_point: ScoredPoint) -> DocumentWithScore | None:
         try:
             payload = scored_point.payload or {}
@@ -28,11 +28,13 @@ from fastapi_users.db import SQLAlchemyUserDatabase
 from fastapi_users.router.oauth import get_oauth_router
 from httpx_oauth.clients.github import GitHubOAuth2
 from httpx_oauth.clients.google import GoogleOAuth2
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from aperag.config import AsyncSessionDep, settings
 from aperag.db.models import ApiKey, ApiKeyStatus, Invitation, OAuthAccount, Role, User
 from aperag.db.ops import async_db_ops
 from aperag.schema import view_models
+from aperag.service.api_key_auth import api_key_auth_cache, api_key_usage_recorder
 from aperag.utils.audit_decorator import audit
 from aperag.utils.utils import utc_now
 from aperag.views.utils import is_github_oauth_enabled, is_google_oauth_enabled
@@ -227,8 +229,6 @@ async def authenticate_websocket_user(websocket: WebSocket, user_manager: UserMa
 # --- API Key Authentication ---
 async def authenticate_api_key(request: Request, session: AsyncSessionDep) -> Optional[User]:
     """Authenticate using API Key from Authorization header"""
-    from sqlalchemy import select
-
     authorization: str = request.headers.get("Authorization")
     if not authorization:
         return None
@@ -238,22 +238,40 @@ async def authenticate_api_key(request: Request, session: AsyncSessionDep) -> Op
             return None
     except ValueError:
         return None
-    result = await session.execute(
-        select(ApiKey).where(
-            ApiKey.key == credentials, ApiKey.status == ApiKeyStatus.ACTIVE, ApiKey.gmt_deleted.is_(None)
+    return await get_api_key_user(session, credentials)
+
+
+async def get_api_key_user(session: AsyncSession, credentials: str) -> Optional[User]:
+    """Get the active user owning an active API key, recording the key as used"""
+    from sqlalchemy import select
+
+    cached = api_key_auth_cache.get(credentials)
+    if cached:
+        # Attach a copy of the cached user to this session without loading it again
+        user = await session.merge(cached.user, load=False)
+        api_key_id = cached.api_key_id
+    else:
+        result = await session.execute(
+            select(ApiKey).where(
+                ApiKey.key == credentials, ApiKey.status == ApiKeyStatus.ACTIVE, ApiKey.gmt_deleted.is_(None)
+            )
         )
-    )
-    api_key = result.scalars().first()
-    if not api_key:
-        return None  # Don't raise, just return None to allow other auth methods
-    result = await session.execute(
-        select(User).where(User.id == api_key.user, User.is_active.is_(True), User.gmt_deleted.is_(None))
-    )
-    user = result.scalars().first()
-    if user:
-        await api_key.update_last_used(session)
-        user._auth_method = "api_key"
-        user._api_key_id = api_key.id
+        api_key = result.scalars().first()
+        if not api_key:
+            return None  # Don't raise, just return None to allow other auth methods
+        result = await session.execute(
+            select(User).where(User.id == api_key.user, User.is_active.is_(True), User.gmt_deleted.is_(None))
+        )
+        user = result.scalars().first()
+        if not user:
+            return None
+        api_key_id = api_key.id
+        api_key_auth_cache.put(credentials, api_key_id, user)
+
+    # last_used_at is written in batches in the background, keeping authentication read-only
+    api_key_usage_recorder.record(api_key_id)
+    user._auth_method = "api_key"
+    user._api_key_id = api_key_id
     return user
 
 
@@ -630,4 +648,5 @@ async def delete_user_view(
     if target.id == user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     await async_db_ops.delete_user(session, target)
+    api_key_auth_cache.invalidate(user_id=target.id)
     return {"message": "User deleted successfully"}
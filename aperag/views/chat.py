@@ -24,7 +24,6 @@ from aperag.service.chat_collection_service import chat_collection_service
 from aperag.service.chat_document_service import chat_document_service
 from aperag.service.chat_service import chat_service_global
 from aperag.service.chat_title_service import chat_title_service
-from aperag.service.collection_service import collection_service
 from aperag.utils.audit_decorator import audit
 from aperag.views.auth import UserManager, authenticate_websocket_user, get_user_manager, optional_user, required_user
 
@@ -156,39 +155,12 @@ async def search_chat_files_view(
 ) -> view_models.SearchResult:
     """Search files within a specific chat using hybrid search capabilities"""
     try:
-        # Get user's chat collection
-        chat_collection_id = await chat_collection_service.get_user_chat_collection_id(str(user.id))
-        if not chat_collection_id:
-            raise HTTPException(status_code=404, detail="Chat collection not found")
-
         if not chat_id:
             raise HTTPException(status_code=400, detail="Chat ID is required")
 
-        # Execute search flow using the helper method from collection_service
-        items, _ = await collection_service.execute_search_flow(
-            data=data,
-            collection_id=chat_collection_id,
-            search_user_id=str(user.id),
-            chat_id=chat_id,  # Add chat_id for filtering in chat searches
-            flow_name="chat_search",
-            flow_title="Chat Search",
-        )
-
-        # Return search result without saving to database for chat searches
-        from aperag.schema.view_models import SearchResult
-
-        return SearchResult(
-            id=None,  # No ID since not saved
-            query=data.query,
-            vector_search=data.vector_search,
-            fulltext_search=data.fulltext_search,
-            graph_search=data.graph_search,
-            summary_search=data.summary_search,
-            items=items,
-            created=None,  # No creation time since not saved
-        )
+        return await chat_collection_service.search_chat_files(str(user.id), chat_id, data)
 
-    except HTTPException:
+    except (BusinessException, HTTPException):
         raise
     except Exception as e:
         logger.error(f"Failed to search chat files: {e}")
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import logging
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile
 
@@ -351,13 +351,21 @@ async def rebuild_failed_indexes_view(
 async def get_graph_labels_view(
     request: Request,
     collection_id: str,
+    q: Optional[str] = None,
+    mode: str = "fuzzy",
+    limit: Optional[int] = None,
     user: User = Depends(required_user),
 ) -> view_models.GraphLabelsResponse:
-    """Get all available node labels in the collection's knowledge graph"""
+    """Get the node labels in the collection's knowledge graph, or search them with q"""
     from aperag.service.graph_service import graph_service
 
+    if mode not in ("prefix", "fuzzy"):
+        raise HTTPException(status_code=400, detail="mode must be 'prefix' or 'fuzzy'")
+    if limit is not None and not (1 <= limit <= 1000):
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+
     try:
-        result = await graph_service.get_graph_labels(str(user.id), collection_id)
+        result = await graph_service.get_graph_labels(str(user.id), collection_id, q, mode, limit)
         return result
     except CollectionNotFoundException:
         raise HTTPException(status_code=404, detail="Collection not found")
@@ -29,6 +29,9 @@ parse_document_task -> trigger_indexing_workflow
 The `trigger_indexing_workflow` task receives parsed document data and dynamically creates
 the parallel index tasks, solving the static parameter passing limitation.
 
+Parsed document data is passed by reference: `parse_document_task` stores it in the object
+store and returns a small `ParsedDataRef`, which index tasks load lazily once they run.
+
 ## Task Hierarchy
 
 ### Core Tasks:
@@ -108,10 +111,10 @@ from aperag.tasks.collection import collection_task
 from aperag.tasks.document import document_index_task
 from aperag.tasks.models import (
     IndexTaskResult,
-    ParsedDocumentData,
     TaskStatus,
     WorkflowResult,
 )
+from aperag.tasks.parsed_artifact import resolve_parsed_data
 from aperag.tasks.utils import TaskConfig
 from aperag.utils.constant import IndexAction
 from config.celery import app
@@ -212,13 +215,13 @@ def parse_document_task(self, document_id: str, index_types: List[str]) -> dict:
         document_id: Document ID to parse
 
     Returns:
-        Serialized ParsedDocumentData
+        Serialized ParsedDataRef pointing to the stored ParsedDocumentData
     """
     try:
         logger.info(f"Starting to parse document {document_id}")
-        parsed_data = document_index_task.parse_document(document_id)
+        parsed_data_ref = document_index_task.parse_document_to_artifact(document_id)
         logger.info(f"Successfully parsed document {document_id}")
-        return parsed_data.to_dict()
+        return parsed_data_ref.to_dict()
     except Exception as e:
         error_msg = f"Failed to parse document {document_id}: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -231,14 +234,14 @@ def parse_document_task(self, document_id: str, index_types: List[str]) -> dict:
 
 
 @current_app.task(bind=True, base=BaseIndexTask, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
-def create_index_task(self, document_id: str, index_type: str, parsed_data_dict: dict, context: dict = None) -> dict:
+def create_index_task(self, document_id: str, index_type: str, parsed_data_ref: dict, context: dict = None) -> dict:
     """
     Create a single index for a document with distributed locking
 
     Args:
         document_id: Document ID to process
         index_type: Type of index to create ('vector', 'fulltext', 'graph')
-        parsed_data_dict: Serialized ParsedDocumentData from parse_document_task
+        parsed_data_ref: Serialized ParsedDataRef from parse_document_task
         context: Task context including index version
 
     Returns:
@@ -260,8 +263,8 @@ def create_index_task(self, document_id: str, index_type: str, parsed_data_dict:
         if skip_reason:
             return skip_reason
 
-        # Convert dict back to structured data
-        parsed_data = ParsedDocumentData.from_dict(parsed_data_dict)
+        # Load the parsed data only once the task is known to be relevant
+        parsed_data = resolve_parsed_data(parsed_data_ref)
 
         # Execute index creation
         result = document_index_task.create_index(document_id, index_type, parsed_data)
@@ -357,14 +360,14 @@ def delete_index_task(self, document_id: str, index_type: str) -> dict:
 
 
 @current_app.task(bind=True, base=BaseIndexTask, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
-def update_index_task(self, document_id: str, index_type: str, parsed_data_dict: dict, context: dict = None) -> dict:
+def update_index_task(self, document_id: str, index_type: str, parsed_data_ref: dict, context: dict = None) -> dict:
     """
     Update a single index for a document with distributed locking
 
     Args:
         document_id: Document ID to process
         index_type: Type of index to update ('vector', 'fulltext', 'graph')
-        parsed_data_dict: Serialized ParsedDocumentData from parse_document_task
+        parsed_data_ref: Serialized ParsedDataRef from parse_document_task
         context: Task context including index version
 
     Returns:
@@ -386,8 +389,8 @@ def update_index_task(self, document_id: str, index_type: str, parsed_data_dict:
         if skip_reason:
             return skip_reason
 
-        # Convert dict back to structured data
-        parsed_data = ParsedDocumentData.from_dict(parsed_data_dict)
+        # Load the parsed data only once the task is known to be relevant
+        parsed_data = resolve_parsed_data(parsed_data_ref)
 
         # Execute index update
         result = document_index_task.update_index(document_id, index_type, parsed_data)
@@ -418,15 +421,15 @@ def update_index_task(self, document_id: str, index_type: str, parsed_data_dict:
 # ========== Dynamic Workflow Orchestration Tasks ==========
 
 @current_app.task(bind=True)
-def trigger_create_indexes_workflow(self, parsed_data_dict: dict, document_id: str, index_types: List[str], context: dict = None) -> Any:
+def trigger_create_indexes_workflow(self, parsed_data_ref: dict, document_id: str, index_types: List[str], context: dict = None) -> Any:
     """
     Dynamic orchestration task for index creation workflow.
 
-    This task acts as a fan-out point, receiving parsed document data and dynamically
+    This task acts as a fan-out point, receiving a reference to the parsed document and dynamically
     creating parallel index creation tasks based on the actual parsed content.
 
     Args:
-        parsed_data_dict: Serialized ParsedDocumentData from parse_document_task
+        parsed_data_ref: Serialized ParsedDataRef from parse_document_task
         document_id: Document ID to process
         index_types: List of index types to create
 
@@ -438,7 +441,7 @@ def trigger_create_indexes_workflow(self, parsed_data_dict: dict, document_id: s
 
         # Dynamically create parallel index creation tasks
         parallel_index_tasks = group([
-            create_index_task.s(document_id, index_type, parsed_data_dict, context)
+            create_index_task.s(document_id, index_type, parsed_data_ref, context)
             for index_type in index_types
         ])
 
@@ -498,12 +501,12 @@ def trigger_delete_indexes_workflow(self, document_id: str, index_types: List[st
 
 
 @current_app.task(bind=True)
-def trigger_update_indexes_workflow(self, parsed_data_dict: dict, document_id: str, index_types: List[str], context: dict = None) -> Any:
+def trigger_update_indexes_workflow(self, parsed_data_ref: dict, document_id: str, index_types: List[str], context: dict = None) -> Any:
     """
     Dynamic orchestration task for index update workflow.
 
     Args:
-        parsed_data_dict: Serialized ParsedDocumentData from parse_document_task
+        parsed_data_ref: Serialized ParsedDataRef from parse_document_task
         document_id: Document ID to process
         index_types: List of index types to update
 
@@ -515,7 +518,7 @@ def trigger_update_indexes_workflow(self, parsed_data_dict: dict, document_id: s
 
         # Create parallel index update tasks
         parallel_update_tasks = group([
-            update_index_task.s(document_id, index_type, parsed_data_dict, context)
+            update_index_task.s(document_id, index_type, parsed_data_ref, context)
             for index_type in index_types
         ])
 
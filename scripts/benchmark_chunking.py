@@ -0,0 +1,137 @@
+# Copyright 2025 ApeCloud, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark SimpleSemanticSplitter on a synthetic markdown document.
+
+Compares the splitter with the reference implementation it replaced, which tokenized the whole current chunk
+for every piece it merged, and checks that both produce the same chunks.
+
+    python scripts/benchmark_chunking.py --size-mb 10 --chunk-size 400 --chunk-overlap 20
+"""
+
+import argparse
+import random
+import time
+
+from aperag.docparser.chunking import SimpleSemanticSplitter
+from aperag.utils.tokenizer import get_default_tokenizer
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which but have an they "
+    "you were her she there been one all we their has would when if so no will more can said what out up other "
+    "index vector graph document collection retrieval embedding chunk token separator parser storage query"
+).split()
+
+
+class ReferenceSemanticSplitter(SimpleSemanticSplitter):
+    """The splitter before merges were bounded: every merge and every level tokenizes the merged text"""
+
+    def _recursive_split(self, s: str, chunk_size: int, chunk_overlap: int, level: int) -> list[str]:
+        if len(s) == 0:
+            return []
+        if len(s) <= 1 or self._fit(s, chunk_size):
+            return [s]
+        if level >= len(self.LEVELED_SEPARATORS):
+            p = len(s) // 2
+            left = self._recursive_split(s[:p], chunk_size, chunk_overlap, level + 1)
+            overlap = ""
+            if chunk_overlap > 0 and p // 2 > 0:
+                overlap = self._cut_right_side(s[:p][p // 2 :], chunk_overlap)
+            right = self._recursive_split(overlap + s[p:], chunk_size, chunk_overlap, level + 1)
+            return left + right
+        chunks = []
+        for chunk in self._split_by_separators(s, self.LEVELED_SEPARATORS[level]):
+            chunks.extend(self._recursive_split(chunk, chunk_size, chunk_overlap, level + 1))
+        merged_chunks = []
+        current_chunk = ""
+        for chunk in chunks:
+            if len(current_chunk) == 0:
+                current_chunk = chunk
+            elif self._fit(current_chunk + chunk, chunk_size):
+                current_chunk += chunk
+            else:
+                merged_chunks.append(current_chunk)
+                current_chunk = chunk
+        if len(current_chunk) > 0:
+            merged_chunks.append(current_chunk)
+        return merged_chunks
+
+
+def generate_markdown(size: int, seed: int) -> str:
+    """Paragraphs, lists, long single-line paragraphs and code blocks, about `size` characters in total"""
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(5, 25))]
+        return " ".join(words).capitalize() + rng.choice([".", ".", "?", "!", ";", ","])
+
+    blocks = []
+    total = 0
+    while total < size:
+        kind = rng.random()
+        if kind < 0.05:
+            block = "#" * rng.randint(1, 3) + " " + sentence()
+        elif kind < 0.15:
+            block = "\n".join(f"- {sentence()}" for _ in range(rng.randint(2, 8)))
+        elif kind < 0.2:
+            block = "```\n" + "\n".join(f"value_{i} = compute({i}, '{rng.choice(WORDS)}')" for i in range(20)) + "\n```"
+        elif kind < 0.3:
+            # A long paragraph without line breaks, split at the sentence and word levels
+            block = " ".join(sentence() for _ in range(rng.randint(50, 200)))
+        else:
+            block = " ".join(sentence() for _ in range(rng.randint(2, 8)))
+        blocks.append(block)
+        total += len(block) + 2
+    return "\n\n".join(blocks)
+
+
+def run(splitter: SimpleSemanticSplitter, text: str, chunk_size: int, chunk_overlap: int):
+    start = time.perf_counter()
+    chunks = splitter.split(text, chunk_size, chunk_overlap)
+    return chunks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SimpleSemanticSplitter")
+    parser.add_argument("--size-mb", type=float, default=10, help="size of the synthetic document")
+    parser.add_argument("--chunk-size", type=int, default=400)
+    parser.add_argument("--chunk-overlap", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-reference", action="store_true", help="only time the current splitter")
+    args = parser.parse_args()
+
+    text = generate_markdown(int(args.size_mb * 1024 * 1024), args.seed)
+    size_mb = len(text.encode("utf-8")) / 1024 / 1024
+    tokenizer = get_default_tokenizer()
+    print(f"Document: {size_mb:.1f} MB, chunk size {args.chunk_size}, overlap {args.chunk_overlap}")
+
+    chunks, elapsed = run(SimpleSemanticSplitter(tokenizer), text, args.chunk_size, args.chunk_overlap)
+    print(f"SimpleSemanticSplitter: {len(chunks)} chunks in {elapsed:.2f}s ({size_mb / elapsed:.2f} MB/s)")
+
+    if not args.skip_reference:
+        reference_chunks, reference_elapsed = run(
+            ReferenceSemanticSplitter(tokenizer), text, args.chunk_size, args.chunk_overlap
+        )
+        print(
+            f"Reference splitter: {len(reference_chunks)} chunks in {reference_elapsed:.2f}s "
+            f"({size_mb / reference_elapsed:.2f} MB/s), speedup {reference_elapsed / elapsed:.1f}x"
+        )
+        if reference_chunks != chunks:
+            raise SystemExit("Chunk boundaries differ from the reference splitter")
+        print("Chunk boundaries are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Unit tests for the queued audit log writer and the audit decorator.
+"""
+
+import asyncio
+import json
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request
+from pydantic import BaseModel
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from aperag.config import get_async_session
+from aperag.db.models import AuditLog, AuditResource, Base
+from aperag.service import audit_service as audit_module
+from aperag.service.audit_service import AuditService
+from aperag.utils import audit_decorator
+from aperag.utils.audit_decorator import audit
+
+
+class CreateThing(BaseModel):
+    name: str
+    password: str
+
+
+@pytest.fixture
+def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    inserts = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts.append(statement.count("), (") + 1)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[AuditLog.__table__])
+
+    asyncio.run(setup())
+    service = AuditService()
+    with (
+        patch.object(audit_module, "get_async_session", partial(get_async_session, engine)),
+        patch.object(audit_decorator, "audit_service", service),
+    ):
+        yield engine, inserts, service
+    asyncio.run(engine.dispose())
+
+
+async def load_logs(engine):
+    async with sessionmaker(engine, class_=AsyncSession)() as session:
+        return (await session.execute(select(AuditLog).order_by(AuditLog.start_time))).scalars().all()
+
+
+def make_request(method="POST", path="/api/v1/collections"):
+    request = Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "headers": [(b"user-agent", b"pytest")],
+            "query_string": b"",
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+    request.state.user_id = "user-1"
+    request.state.username = "alice"
+    return request
+
+
+def log(service, index):
+    return service.log_audit(
+        user_id="user-1",
+        username="alice",
+        resource_type=AuditResource.COLLECTION,
+        api_name="CreateCollection",
+        http_method="POST",
+        path="/api/v1/collections",
+        status_code=200,
+        start_time=index,
+    )
+
+
+def test_decorated_endpoint_does_not_wait_for_the_database(db):
+    engine, inserts, service = db
+    calls = []
+
+    @audit(resource_type="collection", api_name="CreateThing")
+    async def create_thing(request: Request, data: CreateThing, user=None):
+        return {"id": "thing-1", "name": data.name}
+
+    original_extract = audit_decorator._extract_request_data_from_args
+
+    def extract(*args):
+        calls.append("extract")
+        return original_extract(*args)
+
+    async def run():
+        with (
+            patch.object(audit_module.settings, "audit_flush_interval", 60),
+            patch.object(audit_decorator, "_extract_request_data_from_args", extract),
+        ):
+            response = await create_thing(request=make_request(), data=CreateThing(name="a", password="p"))
+            written_before_flush = inserts[:]
+            extracted_before_flush = calls[:]
+            await service.writer.stop()
+        return response, written_before_flush, extracted_before_flush
+
+    response, written_before_flush, extracted_before_flush = asyncio.run(run())
+
+    assert response == {"id": "thing-1", "name": "a"}
+    assert written_before_flush == [] and extracted_before_flush == []
+    [row] = asyncio.run(load_logs(engine))
+    assert (row.api_name, row.http_method, row.status_code, row.username) == ("CreateThing", "POST", 200, "alice")
+    assert (row.ip_address, row.user_agent) == ("10.0.0.1", "pytest")
+    assert json.loads(row.request_data) == {"name": "a", "password": "***FILTERED***"}
+    assert json.loads(row.response_data) == {"id": "thing-1", "name": "a"}
+
+
+def test_failed_requests_are_audited_with_their_error(db):
+    engine, inserts, service = db
+
+    @audit(resource_type="collection")
+    async def delete_thing(request: Request):
+        raise ValueError("boom")
+
+    async def run():
+        with pytest.raises(ValueError):
+            await delete_thing(request=make_request("DELETE", "/api/v1/collections/c1"))
+        await service.writer.stop()
+
+    asyncio.run(run())
+
+    [row] = asyncio.run(load_logs(engine))
+    assert (row.api_name, row.status_code, row.error_message) == ("delete_thing", 500, "boom")
+
+
+def test_full_batches_are_written_with_multi_row_inserts(db):
+    engine, inserts, service = db
+
+    async def run():
+        with (
+            patch.object(audit_module.settings, "audit_batch_size", 2),
+            patch.object(audit_module.settings, "audit_flush_interval", 60),
+        ):
+            for i in range(4):
+                await log(service, i)
+            # Reaching the batch size wakes the writer without waiting for the interval
+            for _ in range(50):
+                if len(service.writer) == 0 and service.writer.written == 4:
+                    break
+                await asyncio.sleep(0.01)
+            await log(service, 4)
+            await service.writer.stop()
+
+    asyncio.run(run())
+
+    assert inserts == [2, 2, 1]
+    assert [row.start_time for row in asyncio.run(load_logs(engine))] == [0, 1, 2, 3, 4]
+    assert service.writer.stats() == {"queued": 0, "written": 5, "dropped": 0, "failed": 0}
+
+
+def test_partial_batches_are_written_after_the_interval(db):
+    engine, inserts, service = db
+
+    async def run():
+        with patch.object(audit_module.settings, "audit_flush_interval", 0.01):
+            await log(service, 0)
+            for _ in range(50):
+                if service.writer.written:
+                    break
+                await asyncio.sleep(0.01)
+            written = service.writer.written
+            await service.writer.stop()
+        return written
+
+    assert asyncio.run(run()) == 1
+    assert inserts == [1]
+
+
+def test_events_are_dropped_when_the_queue_is_full(db):
+    engine, inserts, service = db
+
+    async def run():
+        with (
+            patch.object(audit_module.settings, "audit_queue_size", 3),
+            patch.object(audit_module.settings, "audit_flush_interval", 60),
+        ):
+            for i in range(5):
+                await log(service, i)
+            stats = service.writer.stats()
+            await service.writer.stop()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats == {"queued": 3, "written": 0, "dropped": 2, "failed": 0}
+    assert [row.start_time for row in asyncio.run(load_logs(engine))] == [0, 1, 2]
+
+
+def test_write_failures_are_counted_and_do_not_reach_requests():
+    service = AuditService()
+
+    async def broken_session():
+        raise RuntimeError("database is down")
+        yield
+
+    async def run():
+        with (
+            patch.object(audit_module, "get_async_session", broken_session),
+            patch.object(audit_module.settings, "audit_flush_interval", 60),
+        ):
+            await log(service, 0)
+            await service.writer.stop()
+
+    asyncio.run(run())
+
+    assert service.writer.stats() == {"queued": 0, "written": 0, "dropped": 0, "failed": 1}
+
+
+def test_payload_callables_are_evaluated_when_preparing_rows():
+    service = AuditService()
+    row = service._prepare_row({"request_data": lambda: {"api_key": "sk-1", "name": "n"}, "response_data": None})
+
+    assert json.loads(row["request_data"]) == {"api_key": "***FILTERED***", "name": "n"}
+    assert row["response_data"] is None
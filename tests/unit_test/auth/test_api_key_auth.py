@@ -0,0 +1,143 @@
+"""
+Unit tests for cached API key authentication and batched last-used writes.
+"""
+
+import asyncio
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from aperag.config import get_async_session
+from aperag.db.models import ApiKey, ApiKeyStatus, Base, OAuthAccount, Role, User
+from aperag.service import api_key_auth
+from aperag.service.api_key_auth import ApiKeyAuthCache, ApiKeyUsageRecorder
+from aperag.views import auth
+
+
+@pytest.fixture
+def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all, tables=[User.__table__, OAuthAccount.__table__, ApiKey.__table__]
+            )
+        async with new_session(engine) as session:
+            session.add(User(id="user-1", username="alice", role=Role.ADMIN, hashed_password="x"))
+            session.add(ApiKey(id="key-1", key="sk-alice", user="user-1", status=ApiKeyStatus.ACTIVE))
+            await session.commit()
+
+    asyncio.run(setup())
+    statements.clear()
+    cache, recorder = ApiKeyAuthCache(), ApiKeyUsageRecorder()
+    with (
+        patch.object(auth, "api_key_auth_cache", cache),
+        patch.object(auth, "api_key_usage_recorder", recorder),
+        patch.object(api_key_auth, "get_async_session", partial(get_async_session, engine)),
+    ):
+        yield engine, statements, cache, recorder
+    asyncio.run(engine.dispose())
+
+
+def new_session(engine):
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)()
+
+
+async def authenticate(engine, key):
+    async with new_session(engine) as session:
+        user = await auth.get_api_key_user(session, key)
+        return (user.id, user.username, user.role, user._api_key_id) if user else None
+
+
+def test_repeated_authentication_is_served_from_the_cache(db):
+    engine, statements, cache, recorder = db
+
+    async def run():
+        first = await authenticate(engine, "sk-alice")
+        queries_after_first = list(statements)
+        second = await authenticate(engine, "sk-alice")
+        await recorder.stop()
+        return first, second, queries_after_first
+
+    first, second, queries_after_first = asyncio.run(run())
+
+    assert first == second == ("user-1", "alice", Role.ADMIN, "key-1")
+    assert queries_after_first == ["SELECT", "SELECT"]
+    # The second request needs no queries, and authentication itself never writes
+    assert statements == ["SELECT", "SELECT", "UPDATE"]
+
+
+def test_last_used_times_are_written_in_one_batch(db):
+    engine, statements, cache, recorder = db
+
+    async def run():
+        for _ in range(5):
+            await authenticate(engine, "sk-alice")
+        await recorder.flush()
+        async with new_session(engine) as session:
+            return (await session.execute(select(ApiKey.last_used_at))).scalar_one()
+
+    last_used_at = asyncio.run(run())
+
+    assert last_used_at is not None
+    assert statements.count("UPDATE") == 1
+
+
+def test_invalidated_keys_are_checked_again(db):
+    engine, statements, cache, recorder = db
+
+    async def run():
+        assert await authenticate(engine, "sk-alice")
+        async with new_session(engine) as session:
+            key = await session.get(ApiKey, "key-1")
+            key.status = ApiKeyStatus.DELETED
+            await session.commit()
+        cached = await authenticate(engine, "sk-alice")
+        cache.invalidate(api_key_id="key-1")
+        after_invalidation = await authenticate(engine, "sk-alice")
+        await recorder.stop()
+        return cached, after_invalidation
+
+    cached, after_invalidation = asyncio.run(run())
+
+    assert cached is not None
+    assert after_invalidation is None
+
+
+def test_entries_expire_and_unknown_keys_are_not_cached(db):
+    engine, statements, cache, recorder = db
+
+    async def run():
+        with patch.object(api_key_auth.time, "monotonic", return_value=1000.0):
+            await authenticate(engine, "sk-alice")
+        with patch.object(api_key_auth.time, "monotonic", return_value=1061.0):
+            assert cache.get("sk-alice") is None
+        assert await authenticate(engine, "sk-unknown") is None
+        await recorder.stop()
+
+    asyncio.run(run())
+
+    assert len(cache) == 0
+
+
+def test_invalidation_by_user_drops_all_their_keys():
+    cache = ApiKeyAuthCache()
+    alice, bob = User(id="user-1", username="alice"), User(id="user-2", username="bob")
+    cache.put("sk-a1", "key-1", alice)
+    cache.put("sk-a2", "key-2", alice)
+    cache.put("sk-b1", "key-3", bob)
+
+    cache.invalidate(user_id="user-1")
+
+    assert cache.get("sk-a1") is None and cache.get("sk-a2") is None
+    assert cache.get("sk-b1").api_key_id == "key-3"
@@ -0,0 +1,135 @@
+"""
+Unit tests for tail reads and message-id lookups of the Redis chat history.
+"""
+
+import asyncio
+
+from aperag.utils.history import RedisChatMessageHistory
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+class FakeRedis:
+    """The subset of redis.asyncio used by the chat history, recording list reads"""
+
+    def __init__(self):
+        self.lists = {}
+        self.hashes = {}
+        self.reads = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def lpush(self, key, value):
+        items = self.lists.setdefault(key, [])
+        items.insert(0, value.encode("utf-8"))
+        return len(items)
+
+    async def lrange(self, key, start, end):
+        self.reads.append(("lrange", start, end))
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start : end + 1]
+
+    async def lindex(self, key, index):
+        self.reads.append(("lindex", index))
+        items = self.lists.get(key, [])
+        return items[index] if -len(items) <= index < len(items) else None
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = str(value).encode("utf-8")
+
+    async def hmget(self, key, fields):
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.lists.pop(key, None)
+            self.hashes.pop(key, None)
+
+
+async def add_turns(history, count):
+    for i in range(count):
+        await history.add_user_message(f"question {i}", message_id=f"m{i}", files=[])
+        await history.add_ai_message(f"answer {i}", chat_id=history.session_id, message_id=f"m{i}")
+
+
+def test_tail_reads_only_the_last_messages():
+    redis = FakeRedis()
+    history = RedisChatMessageHistory("chat-1", redis_client=redis)
+
+    async def run():
+        await add_turns(history, 10)
+        return await history.tail(4), await history.tail(100), await history.tail(0)
+
+    tail, everything, nothing = asyncio.run(run())
+
+    assert [m.get_main_content() for m in tail] == ["question 8", "answer 8", "question 9", "answer 9"]
+    assert ("lrange", 0, 3) in redis.reads
+    assert len(everything) == 20
+    assert everything[0].get_main_content() == "question 0"
+    assert nothing == []
+
+
+def test_messages_are_found_through_the_index():
+    redis = FakeRedis()
+    history = RedisChatMessageHistory("chat-1", redis_client=redis)
+
+    async def run():
+        await add_turns(history, 5)
+        redis.reads.clear()
+        return await history.get_messages_by_id("m1")
+
+    turn = asyncio.run(run())
+
+    assert turn["human"].get_main_content() == "question 1"
+    assert turn["ai"].get_main_content() == "answer 1"
+    assert all(read[0] == "lindex" for read in redis.reads)
+
+
+def test_messages_written_before_the_index_are_found_by_scanning():
+    redis = FakeRedis()
+    history = RedisChatMessageHistory("chat-1", redis_client=redis)
+
+    async def run():
+        await add_turns(history, 3)
+        redis.hashes.clear()
+        return await history.get_messages_by_id("m2"), await history.get_messages_by_id("missing")
+
+    turn, missing = asyncio.run(run())
+
+    assert turn["ai"].get_main_content() == "answer 2"
+    assert missing == {}
+
+
+def test_clear_drops_the_index():
+    redis = FakeRedis()
+    history = RedisChatMessageHistory("chat-1", redis_client=redis)
+
+    async def run():
+        await add_turns(history, 2)
+        await history.clear()
+        await add_turns(history, 1)
+        return await history.get_messages_by_id("m0")
+
+    turn = asyncio.run(run())
+
+    assert turn["human"].get_main_content() == "question 0"
+    assert redis.hashes[history.index_key] == {"m0:human": b"0", "m0:ai": b"1"}
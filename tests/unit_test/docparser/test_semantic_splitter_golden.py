@@ -0,0 +1,72 @@
+"""
+Golden tests for SimpleSemanticSplitter: the chunk boundaries must stay identical to those recorded with the
+original implementation of the splitter.
+"""
+
+import hashlib
+import json
+import os
+
+import pytest
+
+from aperag.docparser.chunking import SimpleSemanticSplitter
+
+GOLDEN_FILE = os.path.join(os.path.dirname(__file__), "testdata", "semantic_splitter_golden.json")
+
+with open(GOLDEN_FILE, encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+
+def word_tokenizer(text):
+    return [len(word) for word in text.split()]
+
+
+def char_tokenizer(text):
+    return [ord(char) for char in text]
+
+
+def cl100k_tokenizer():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base").encode
+    except Exception as e:
+        pytest.skip(f"cl100k_base encoding is not available: {e}")
+
+
+TOKENIZERS = {"words": lambda: word_tokenizer, "chars": lambda: char_tokenizer, "cl100k_base": cl100k_tokenizer}
+
+
+def digest(chunks):
+    return hashlib.sha256("\0".join(chunks).encode()).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "case",
+    GOLDEN["cases"],
+    ids=[f"{c['text']}-{c['tokenizer']}-{c['chunk_size']}-{c['chunk_overlap']}" for c in GOLDEN["cases"]],
+)
+def test_chunk_boundaries_match_the_golden_output(case):
+    splitter = SimpleSemanticSplitter(TOKENIZERS[case["tokenizer"]]())
+
+    chunks = splitter.split(GOLDEN["texts"][case["text"]], case["chunk_size"], case["chunk_overlap"])
+
+    assert len(chunks) == case["chunks"]
+    assert digest(chunks) == case["sha256"]
+
+
+def test_merging_words_does_not_tokenize_the_chunk_for_each_word():
+    calls = []
+
+    def tokenizer(text):
+        calls.append(text)
+        return char_tokenizer(text)
+
+    text = " ".join(["word"] * 2000)
+    chunks = SimpleSemanticSplitter(tokenizer).split(text, 400, 0)
+
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 400 for chunk in chunks)
+    # Each word is counted once, the merged text only a few times per chunk, near its size limit
+    assert len(calls) < 2000 + 10 * len(chunks)
+    assert sum(len(text) for text in calls) < 10 * len(text)
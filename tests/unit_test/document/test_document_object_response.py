@@ -0,0 +1,95 @@
+"""
+Unit tests for serving document objects from the local object store with FileResponse.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from aperag.objectstore.local import AsyncLocal, LocalConfig
+from aperag.service import document_service as document_service_module
+from aperag.service.document_service import DocumentService
+
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeResult:
+    def __init__(self, document):
+        self.document = document
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.document
+
+
+@pytest.fixture
+def service(tmp_path):
+    document = SimpleNamespace(object_store_base_path=lambda: "user-1/col-1/doc-1")
+    session = SimpleNamespace(execute=AsyncMock(return_value=FakeResult(document)))
+    store = AsyncLocal(LocalConfig(root_dir=str(tmp_path)))
+    asyncio.run(store.put("user-1/col-1/doc-1/converted.pdf", CONTENT))
+
+    service = DocumentService()
+
+    async def execute_query(func):
+        return await func(session)
+
+    with (
+        patch.object(service.db_ops, "_execute_query", execute_query),
+        patch.object(document_service_module, "get_async_object_store", return_value=store),
+    ):
+        yield service, store
+
+
+def make_client(service):
+    app = FastAPI()
+
+    @app.get("/object")
+    async def get_object(request: Request):
+        return await service.get_document_object(
+            "user-1", "col-1", "doc-1", "converted.pdf", request.headers.get("range")
+        )
+
+    return TestClient(app)
+
+
+def test_local_objects_are_served_as_file_responses(service):
+    service, _ = service
+
+    response = asyncio.run(service.get_document_object("user-1", "col-1", "doc-1", "converted.pdf"))
+
+    assert isinstance(response, FileResponse)
+    assert response.media_type == "application/pdf"
+
+
+def test_file_responses_support_range_requests(service):
+    client = make_client(service[0])
+
+    full = client.get("/object")
+    partial = client.get("/object", headers={"Range": "bytes=100-199"})
+    unsatisfiable = client.get("/object", headers={"Range": f"bytes={len(CONTENT)}-"})
+
+    assert full.status_code == 200 and full.content == CONTENT
+    assert full.headers["accept-ranges"] == "bytes"
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[100:200]
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert unsatisfiable.status_code == 416
+
+
+def test_stores_without_local_files_stream_the_object(service):
+    service, store = service
+
+    with patch.object(store, "local_path", AsyncMock(return_value=None)):
+        response = asyncio.run(service.get_document_object("user-1", "col-1", "doc-1", "converted.pdf", "bytes=0-9"))
+
+    assert isinstance(response, StreamingResponse)
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 0-9/{len(CONTENT)}"
@@ -0,0 +1,147 @@
+"""
+Unit tests for streaming document uploads and parsing uploads in place from the local object store.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from aperag.objectstore.local import AsyncLocal, Local, LocalConfig
+from aperag.schema.view_models import Document
+from aperag.service import document_service as document_service_module
+from aperag.service.document_service import DocumentService
+from aperag.source import upload as upload_module
+from aperag.source.upload import UploadSource
+from aperag.utils.utils import calculate_file_hash, calculate_stream_hash
+
+CONTENT = b"%PDF-1.4 " + os.urandom(3 * 1024 * 1024)
+
+
+def make_upload(name="report.pdf", content=CONTENT):
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(content)
+    spooled.seek(0)
+    upload = UploadFile(file=spooled, size=len(content), filename=name, headers=Headers({}))
+
+    async def no_read(*args):
+        raise AssertionError("uploads must not be read into memory")
+
+    upload.read = no_read
+    return upload
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, obj):
+        obj.id = obj.id or "doc1"
+
+
+def test_stream_hash_matches_the_content_hash_and_rewinds():
+    stream = io.BytesIO(CONTENT)
+    stream.seek(100)
+
+    assert calculate_stream_hash(stream, chunk_size=4096) == calculate_file_hash(CONTENT)
+    assert stream.tell() == 0
+
+
+def test_create_documents_hashes_uploads_without_reading_them():
+    service = DocumentService()
+    uploads = [make_upload("a.pdf"), make_upload("b.pdf", b"%PDF-1.4 small")]
+    collection = SimpleNamespace(id="col1", config="{}")
+    created = []
+
+    async def create_record(**kwargs):
+        created.append(kwargs)
+        return SimpleNamespace(id=f"doc{len(created)}")
+
+    async def in_transaction(func):
+        return await func(FakeSession())
+
+    with (
+        patch.object(service, "_validate_collection", AsyncMock(return_value=collection)),
+        patch.object(service, "_validate_file", return_value=".pdf"),
+        patch.object(service, "_check_document_quotas", AsyncMock()),
+        patch.object(service, "_check_duplicate_document", AsyncMock(return_value=None)),
+        patch.object(service, "_create_document_record", create_record),
+        patch.object(service, "_build_document_response", AsyncMock(side_effect=lambda doc: Document(id=doc.id))),
+        patch.object(service.db_ops, "execute_with_transaction", in_transaction),
+        patch.object(document_service_module.document_index_manager, "create_or_update_document_indexes", AsyncMock()),
+        patch.object(document_service_module, "_trigger_index_reconciliation"),
+    ):
+        result = asyncio.run(service.create_documents("user1", "col1", uploads))
+
+    assert [doc.id for doc in result.items] == ["doc1", "doc2"]
+    assert [c["file_content"] for c in created] == [uploads[0].file, uploads[1].file]
+    assert created[0]["content_hash"] == hashlib.sha256(CONTENT).hexdigest()
+    assert created[1]["content_hash"] == hashlib.sha256(b"%PDF-1.4 small").hexdigest()
+
+
+def test_document_record_streams_the_upload_into_the_object_store(tmp_path):
+    store = AsyncLocal(LocalConfig(root_dir=str(tmp_path)))
+    upload = make_upload()
+    upload.file.read(10)  # A partially consumed upload is uploaded from its start
+
+    with patch.object(document_service_module, "get_async_object_store", return_value=store):
+        document = asyncio.run(
+            DocumentService()._create_document_record(
+                session=FakeSession(),
+                user="user1",
+                collection_id="col1",
+                filename="report.pdf",
+                size=len(CONTENT),
+                status=document_service_module.db_models.DocumentStatus.PENDING,
+                file_suffix=".pdf",
+                file_content=upload.file,
+            )
+        )
+
+    object_path = f"{document.object_store_base_path()}/original.pdf"
+    assert (tmp_path / object_path).read_bytes() == CONTENT
+    assert document.content_hash == calculate_file_hash(CONTENT)
+
+
+def test_uploads_are_parsed_in_place_from_the_local_object_store(tmp_path):
+    store = Local(LocalConfig(root_dir=str(tmp_path / "objects")))
+    store.put("user1/col1/doc1/original.pdf", CONTENT)
+    source = UploadSource(None)
+
+    with patch.object(upload_module, "get_object_store", return_value=store):
+        document = source.prepare_document("report.pdf", {"object_path": "user1/col1/doc1/original.pdf"})
+        source.cleanup_document(document.path)
+
+    assert document.path == store.local_path("user1/col1/doc1/original.pdf")
+    assert not document.is_temp
+    # The stored original is not removed as if it were a temporary copy
+    assert os.path.exists(document.path)
+
+
+def test_remote_uploads_are_copied_to_a_temporary_file(tmp_path):
+    local = Local(LocalConfig(root_dir=str(tmp_path)))
+    local.put("user1/col1/doc1/original.pdf", CONTENT)
+    # An object store without local files, like S3
+    remote = SimpleNamespace(local_path=lambda path: None, get=local.get)
+    source = UploadSource(None)
+
+    with patch.object(upload_module, "get_object_store", return_value=remote):
+        document = source.prepare_document("report.pdf", {"object_path": "user1/col1/doc1/original.pdf"})
+
+    assert document.is_temp
+    with open(document.path, "rb") as f:
+        assert f.read() == CONTENT
+    source.cleanup_document(document.path)
+    assert not os.path.exists(document.path)
@@ -0,0 +1,197 @@
+"""
+Unit tests for the concurrent, resumable evaluation runner.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pandas as pd
+
+from aperag.evaluation import run
+from aperag.evaluation.run import EvaluationRunner, TokenBucket
+
+
+def make_runner(tmp_path, **advanced):
+    runner = EvaluationRunner.__new__(EvaluationRunner)
+    runner.config = {"api": {"base_url": "http://aperag/api/v1", "api_token": "sk-test"}, "advanced": advanced}
+    runner.llm_for_eval = None
+    runner.embeddings_for_eval = None
+    return runner
+
+
+def make_dataset(n):
+    return [{"question": f"q{i}", "answer": f"a{i}"} for i in range(n)]
+
+
+def read_checkpoint(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class FakeRagasResult:
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def to_pandas(self):
+        return pd.DataFrame(
+            {"user_input": self.dataset["question"], "context_recall": [0.5] * len(self.dataset["question"])}
+        )
+
+
+def test_questions_are_answered_concurrently_in_dataset_order(tmp_path):
+    runner = make_runner(tmp_path, concurrency=3)
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    in_flight = 0
+    peak = 0
+
+    async def call_api(question, client):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 if question != "q0" else 0.03)
+        in_flight -= 1
+        return {"response": f"answer to {question}", "context": [], "error": None, "response_time": 0.01}
+
+    results = asyncio.run(runner._process_dataset(make_dataset(7), call_api, checkpoint))
+
+    assert peak == 3
+    assert [r["question"] for r in results] == [f"q{i}" for i in range(7)]
+    assert results[0]["response"] == "answer to q0"
+    assert sorted(record["index"] for record in read_checkpoint(checkpoint)) == list(range(7))
+
+
+def test_interrupted_run_resumes_from_the_checkpoint(tmp_path):
+    runner = make_runner(tmp_path, concurrency=2)
+    dataset = make_dataset(4)
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    ok = {"question": "q0", "ground_truth": "a0", "response": "r0", "context": [], "error": None, "response_time": 1}
+    failed = dict(ok, question="q1", ground_truth="a1", response="", error="timeout")
+    stale = dict(ok, question="something else")
+    checkpoint.write_text(
+        "\n".join(
+            [
+                json.dumps({"type": "result", "index": 0, "result": ok}),
+                json.dumps({"type": "result", "index": 1, "result": failed}),
+                json.dumps({"type": "result", "index": 2, "result": stale}),
+                json.dumps({"type": "ragas", "question": "q0", "scores": {"context_recall": 1.0}}),
+                '{"type": "result", "index": 3, "res',
+            ]
+        )
+    )
+    asked = []
+
+    async def call_api(question, client):
+        asked.append(question)
+        return {"response": f"r{question[1:]}", "context": [], "error": None, "response_time": 0}
+
+    async def run_resumed():
+        done, scored = runner._load_checkpoint(checkpoint, dataset)
+        return done, scored, await runner._process_dataset(dataset, call_api, checkpoint, done)
+
+    done, scored, results = asyncio.run(run_resumed())
+
+    assert list(done) == [0]
+    assert scored == {"q0": {"context_recall": 1.0}}
+    assert sorted(asked) == ["q1", "q2", "q3"]
+    assert [r["response"] for r in results] == ["r0", "r1", "r2", "r3"]
+
+
+def test_token_bucket_limits_the_request_rate():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    async def run_acquires():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run_acquires()) >= 0.045
+
+
+def test_ragas_scores_in_batches_and_skips_scored_questions(tmp_path):
+    runner = make_runner(tmp_path, ragas_batch_size=2)
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    results = [
+        {"question": f"q{i}", "ground_truth": f"a{i}", "response": f"r{i}", "context": [{"text": "c"}], "error": None}
+        for i in range(6)
+    ]
+    results[5]["error"] = "failed"
+    batches = []
+
+    def fake_evaluate(dataset, metrics, llm, raise_exceptions, **kwargs):
+        batches.append(list(dataset["question"]))
+        return FakeRagasResult(dataset)
+
+    with patch.object(run, "evaluate", fake_evaluate):
+        records = asyncio.run(
+            runner._run_ragas_evaluation(
+                results, ["faithfulness"], checkpoint_path=checkpoint, scored={"q0": {"user_input": "q0"}}
+            )
+        )
+
+    assert batches == [["q1", "q2"], ["q3", "q4"]]
+    assert [r["user_input"] for r in records] == ["q0", "q1", "q2", "q3", "q4"]
+    assert [r["question"] for r in read_checkpoint(checkpoint)] == ["q1", "q2", "q3", "q4"]
+
+
+def test_search_api_returns_retrieved_contexts(tmp_path):
+    runner = make_runner(tmp_path, search={"vector_search": {"topk": 3}})
+    requests = []
+
+    def handler(request):
+        requests.append((request.url.path, json.loads(request.content), request.headers["Authorization"]))
+        return httpx.Response(200, json={"items": [{"content": "ctx", "score": 0.9, "recall_type": "vector_search"}]})
+
+    async def search():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await runner._call_search_api(["col-1", "col-2"], "who?", client)
+
+    result = asyncio.run(search())
+
+    assert [path for path, _, _ in requests] == [
+        "/api/v1/collections/col-1/searches",
+        "/api/v1/collections/col-2/searches",
+    ]
+    assert requests[0][1] == {"vector_search": {"topk": 3}, "query": "who?"}
+    assert requests[0][2] == "Bearer sk-test"
+    assert result["error"] is None and result["response"] == ""
+    assert [(c["text"], c["collection_id"]) for c in result["context"]] == [("ctx", "col-1"), ("ctx", "col-2")]
+
+
+def test_retrieval_mode_scores_contexts_without_generation(tmp_path):
+    runner = make_runner(tmp_path, concurrency=2)
+    # Context metrics need embeddings
+    runner.embeddings_for_eval = object()
+    task = {
+        "task_name": "retrieval",
+        "bot_id": "bot-1",
+        "dataset_path": "qa.csv",
+        "report_dir": str(tmp_path / "report"),
+        "mode": "retrieval",
+        "collection_ids": ["col-1"],
+        "metrics": ["faithfulness", "context_recall"],
+    }
+    search = AsyncMock(return_value={"response": "", "context": [{"text": "c"}], "error": None, "response_time": 0})
+    bot = AsyncMock()
+    evaluated = []
+
+    def fake_evaluate(dataset, metrics, llm, raise_exceptions, **kwargs):
+        evaluated.append(metrics)
+        return FakeRagasResult(dataset)
+
+    with (
+        patch.object(runner, "_load_dataset", return_value=make_dataset(3)),
+        patch.object(runner, "_call_search_api", search),
+        patch.object(runner, "_call_bot_api", bot),
+        patch.object(runner, "_generate_reports", AsyncMock()),
+        patch.object(run, "evaluate", fake_evaluate),
+    ):
+        outcome = asyncio.run(runner.run_evaluation(task))
+
+    assert search.await_count == 3
+    bot.assert_not_awaited()
+    assert evaluated == [[run.context_recall]]
+    assert len(outcome["ragas_results"]) == 3
+    # The checkpoint of a completed task is removed
+    assert not runner._checkpoint_path(task).exists()
@@ -0,0 +1,129 @@
+"""
+Unit tests for compiled flows and the compiled-flow cache of bot flows.
+"""
+
+import asyncio
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from aperag.flow.base.exceptions import CycleError
+from aperag.flow.base.models import NODE_RUNNER_REGISTRY, BaseNodeRunner, Edge
+from aperag.flow.compiled import CompiledFlowCache, compile_flow
+from aperag.flow.engine import FlowEngine
+from aperag.flow.parser import FlowParser
+
+
+class EchoInput(BaseModel):
+    text: Optional[Any] = None
+
+
+class EchoOutput(BaseModel):
+    text: Any = None
+
+
+class EchoRunner(BaseNodeRunner):
+    async def run(self, ui: EchoInput, si):
+        await asyncio.sleep(0)
+        return EchoOutput(text=ui.text), {}
+
+
+@pytest.fixture(autouse=True)
+def echo_runner():
+    with patch.dict(
+        NODE_RUNNER_REGISTRY, {"echo": {"runner": EchoRunner(), "input_model": EchoInput, "output_model": EchoOutput}}
+    ):
+        yield
+
+
+def flow_config(greeting="Hello"):
+    return {
+        "name": "bot_flow",
+        "nodes": [
+            {"id": "start", "type": "echo", "data": {"input": {"values": {"text": "start"}}}},
+            {
+                "id": "greet",
+                "type": "echo",
+                "data": {"input": {"values": {"text": greeting + " {{ nodes.start.output.text }}"}}},
+            },
+            {"id": "copy", "type": "echo", "data": {"input": {"values": {"text": "{{ nodes.greet.output.text }}"}}}},
+        ],
+        "edges": [{"source": "start", "target": "greet"}, {"source": "greet", "target": "copy"}],
+    }
+
+
+def test_compile_precomputes_plan_runners_and_templates():
+    compiled = compile_flow(FlowParser.parse(flow_config()))
+
+    assert compiled.successors == {"start": ["greet"], "greet": ["copy"], "copy": []}
+    assert compiled.in_degree == {"start": 0, "greet": 1, "copy": 1}
+    assert compiled.end_nodes == ["copy"]
+    assert compiled.runner_infos["echo"]["input_model"] is EchoInput
+    # Plain values are compiled too; pure variable references are resolved without Jinja
+    assert set(compiled.templates) == {"start", "Hello {{ nodes.start.output.text }}"}
+
+
+def test_compile_rejects_cycles():
+    flow = FlowParser.parse(flow_config())
+    flow.edges.append(Edge(source="copy", target="greet"))
+
+    with pytest.raises(CycleError):
+        compile_flow(flow)
+
+
+def test_engine_renders_with_compiled_templates():
+    compiled = compile_flow(FlowParser.parse(flow_config()))
+    engine = FlowEngine()
+    engine.jinja_env = MagicMock()
+
+    outputs, _ = asyncio.run(engine.execute_flow(compiled, {"query": "q", "user": "u"}))
+
+    engine.jinja_env.from_string.assert_not_called()
+    assert outputs["copy"].text == "Hello start"
+
+
+def test_compiled_flow_is_shared_by_concurrent_executions():
+    compiled = compile_flow(FlowParser.parse(flow_config()))
+
+    async def run():
+        return await asyncio.gather(
+            *(FlowEngine().execute_flow(compiled, {"query": str(i), "user": "u"}) for i in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert all(outputs["copy"].text == "Hello start" for outputs, _ in results)
+    assert compiled.flow.nodes["greet"].input_values == {"text": "Hello {{ nodes.start.output.text }}"}
+
+
+def test_cache_reuses_compiled_flow_until_config_changes():
+    cache = CompiledFlowCache()
+
+    first = cache.get("bot-1", flow_config())
+    with patch("aperag.flow.compiled.FlowParser.parse") as parse:
+        assert cache.get("bot-1", flow_config()) is first
+    parse.assert_not_called()
+
+    updated = cache.get("bot-1", flow_config("Hi"))
+
+    assert updated is not first
+    assert len(cache) == 1
+    outputs, _ = asyncio.run(FlowEngine().execute_flow(updated, {"query": "q", "user": "u"}))
+    assert outputs["copy"].text == "Hi start"
+
+
+def test_cache_invalidation_and_lru_bound():
+    cache = CompiledFlowCache(max_size=2)
+    first = cache.get("bot-1", flow_config())
+    cache.get("bot-2", flow_config())
+
+    cache.invalidate("bot-1")
+    assert cache.get("bot-1", flow_config()) is not first
+
+    cache.get("bot-3", flow_config())
+    assert len(cache) == 2
+
+    cache.invalidate()
+    assert len(cache) == 0
@@ -0,0 +1,136 @@
+"""
+Unit tests for the token-budgeted context packing of the LLM node.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from aperag.flow.runners import llm as llm_module
+from aperag.flow.runners.llm import LLMService, TokenCounter, pack_context, trim_to_sentences
+from aperag.query.query import DocumentWithScore
+
+
+def word_counter():
+    calls = []
+
+    def tokenize(text):
+        calls.append(text)
+        return text.split()
+
+    counter = TokenCounter(tokenizer=tokenize)
+    return counter, calls
+
+
+def doc(text, score):
+    return DocumentWithScore(text=text, score=score, metadata={"source": text[:5]})
+
+
+def test_token_counts_are_cached_per_text():
+    counter, calls = word_counter()
+
+    assert counter.count("one two three") == 3
+    assert counter.count("one two three") == 3
+    assert counter.count("") == 0
+    assert calls == ["one two three"]
+
+
+def test_token_counter_falls_back_to_a_character_estimate():
+    counter = TokenCounter()
+    with patch.object(llm_module, "get_default_tokenizer", side_effect=OSError("offline")):
+        assert counter.count("abcdef") == 4
+
+
+def test_documents_are_packed_by_score_and_skipped_when_too_large():
+    counter, _ = word_counter()
+    docs = [
+        doc("low score words here ", 0.1),
+        doc("a very long document that cannot fit at all ", 0.9),
+        doc("best match ", 0.95),
+        doc("small one ", 0.5),
+    ]
+
+    context, references, used = pack_context(docs, max_tokens=7, counter=counter)
+
+    assert [ref.score for ref in references] == [0.95, 0.5]
+    assert used == 4
+    assert context == "best match small one "
+
+
+def test_documents_without_scores_keep_their_order_after_scored_ones():
+    counter, _ = word_counter()
+    docs = [doc("first ", None), doc("second ", None), doc("scored ", 0.2)]
+
+    context, _, _ = pack_context(docs, max_tokens=10, counter=counter)
+
+    assert context == "scored first second "
+
+
+def test_first_document_that_does_not_fit_is_trimmed_to_sentences():
+    counter, _ = word_counter()
+    docs = [
+        doc("Top hit. ", 0.9),
+        doc("One two three. Four five six. Seven eight nine.", 0.8),
+        doc("tiny ", 0.1),
+    ]
+
+    context, references, used = pack_context(docs, max_tokens=8, trim_sentences=True, counter=counter)
+
+    assert context == "Top hit. One two three. Four five six."
+    assert references[1].text == "One two three. Four five six."
+    assert used == 8
+    assert len(references) == 2
+
+
+def test_trim_keeps_nothing_when_the_first_sentence_is_too_long():
+    counter, _ = word_counter()
+
+    assert trim_to_sentences("一 二 三。四 五。", 2, counter) == ""
+    assert trim_to_sentences("一 二 三。四 五。", 3, counter) == "一 二 三。"
+
+
+def test_generate_response_queries_model_metadata_once():
+    counter, _ = word_counter()
+    model_config = SimpleNamespace(
+        context_window=20, max_input_tokens=None, max_output_tokens=5, has_tag=lambda tag: False
+    )
+    db_ops = SimpleNamespace(
+        query_provider_api_key=AsyncMock(return_value="key"),
+        query_llm_provider_by_name=AsyncMock(return_value=SimpleNamespace(base_url="http://llm")),
+        query_llm_provider_model=AsyncMock(return_value=model_config),
+    )
+    docs = [doc("alpha beta ", 0.9), doc("gamma delta epsilon zeta eta theta iota kappa ", 0.8), doc("mu ", 0.1)]
+
+    prompts = []
+
+    async def agenerate_stream(history, prompt, images, memory):
+        prompts.append(prompt)
+        yield "answer"
+
+    async def run():
+        _, output = await LLMService(None).generate_response(
+            user="user-1",
+            query="what now",
+            message_id="m1",
+            history=None,
+            model_service_provider="openai",
+            model_name="gpt",
+            custom_llm_provider="openai",
+            prompt_template="Q: {query} C: {context}",
+            temperature=0.1,
+            docs=docs,
+        )
+        return [chunk async for chunk in output["async_generator"]()]
+
+    with (
+        patch.object(llm_module, "async_db_ops", db_ops),
+        patch.object(llm_module, "token_counter", counter),
+        patch.object(llm_module, "CompletionService") as completion_service,
+    ):
+        completion_service.return_value.agenerate_stream = agenerate_stream
+        chunks = asyncio.run(run())
+
+    db_ops.query_llm_provider_model.assert_awaited_once()
+    # 15 input tokens (20 - 5 reserved for output), 6 of them taken by the template and query
+    assert prompts == ["Q: what now C: alpha beta mu "]
+    assert chunks[0] == "answer"
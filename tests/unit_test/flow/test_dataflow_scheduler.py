@@ -0,0 +1,188 @@
+"""
+Unit tests for the dataflow scheduler of FlowEngine: readiness-based starts, timeouts and best-effort nodes.
+"""
+
+import asyncio
+from typing import Any, List, Optional
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from aperag.flow.base.exceptions import NodeTimeoutError
+from aperag.flow.base.models import NODE_RUNNER_REGISTRY, BaseNodeRunner, Edge, FlowInstance, NodeInstance
+from aperag.flow.engine import FlowEngine
+from aperag.flow.parser import FlowParser
+
+
+class StepInput(BaseModel):
+    delay: float = 0
+    fail: bool = False
+    value: Optional[Any] = None
+    upstream: Optional[List[Any]] = None
+
+
+class StepOutput(BaseModel):
+    value: Any = None
+
+
+class StepRunner(BaseNodeRunner):
+    def __init__(self):
+        self.log = []
+        self.cancelled = []
+
+    async def run(self, ui: StepInput, si):
+        name = ui.value
+        self.log.append(("start", name))
+        try:
+            await asyncio.sleep(ui.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        if ui.fail:
+            raise RuntimeError(f"{name} failed")
+        self.log.append(("end", name))
+        return StepOutput(value=[name, ui.upstream]), {}
+
+
+@pytest.fixture
+def runner():
+    runner = StepRunner()
+    with patch.dict(
+        NODE_RUNNER_REGISTRY, {"step": {"runner": runner, "input_model": StepInput, "output_model": StepOutput}}
+    ):
+        yield runner
+
+
+def step(node_id, delay=0, upstream=None, **kwargs):
+    values = {"delay": delay, "value": node_id}
+    if upstream:
+        values["upstream"] = [f"{{{{ nodes.{source}.output.value }}}}" for source in upstream]
+    return NodeInstance(id=node_id, type="step", input_values=values, **kwargs)
+
+
+def make_flow(nodes, edges):
+    return FlowInstance(
+        name="test",
+        title="test",
+        nodes={node.id: node for node in nodes},
+        edges=[Edge(source=source, target=target) for source, target in edges],
+    )
+
+
+def run_flow(flow):
+    engine = FlowEngine()
+    outputs, _ = asyncio.run(engine.execute_flow(flow, {"query": "q", "user": "u"}))
+    return engine, outputs
+
+
+def test_node_starts_when_its_own_inputs_are_done(runner):
+    # merge depends on fast and medium only; slow is on another branch at the same level
+    flow = make_flow(
+        [
+            step("start"),
+            step("fast", 0.01),
+            step("medium", 0.02),
+            step("slow", 0.2),
+            step("merge", upstream=["fast", "medium"]),
+            step("rerank", upstream=["merge"]),
+        ],
+        [
+            ("start", "fast"),
+            ("start", "medium"),
+            ("start", "slow"),
+            ("fast", "merge"),
+            ("medium", "merge"),
+            ("merge", "rerank"),
+        ],
+    )
+
+    _, outputs = run_flow(flow)
+
+    assert runner.log.index(("end", "rerank")) < runner.log.index(("end", "slow"))
+    assert outputs["rerank"].value == ["rerank", [["merge", [["fast", None], ["medium", None]]]]]
+
+
+def test_best_effort_node_is_dropped_after_its_timeout(runner):
+    flow = make_flow(
+        [
+            step("start"),
+            step("vector", 0.01),
+            step("graph", 1, timeout=0.05, best_effort=True),
+            step("merge", upstream=["vector", "graph"]),
+        ],
+        [("start", "vector"), ("start", "graph"), ("vector", "merge"), ("graph", "merge")],
+    )
+
+    engine, outputs = run_flow(flow)
+
+    assert engine.skipped_nodes == {"graph"}
+    assert runner.cancelled == ["graph"]
+    assert "graph" not in outputs
+    assert outputs["merge"].value == ["merge", [["vector", None], None]]
+
+
+def test_failed_best_effort_node_is_skipped(runner):
+    graph = step("graph", best_effort=True)
+    graph.input_values["fail"] = True
+    flow = make_flow(
+        [step("start"), graph, step("merge", upstream=["graph"])],
+        [("start", "graph"), ("graph", "merge")],
+    )
+
+    engine, outputs = run_flow(flow)
+
+    assert engine.skipped_nodes == {"graph"}
+    assert outputs["merge"].value == ["merge", [None]]
+
+
+def test_required_node_timeout_fails_the_flow_and_cancels_running_nodes(runner):
+    flow = make_flow(
+        [step("start"), step("vector", 0.05, timeout=0.01), step("graph", 1), step("merge")],
+        [("start", "vector"), ("start", "graph"), ("vector", "merge"), ("graph", "merge")],
+    )
+
+    with pytest.raises(NodeTimeoutError):
+        run_flow(flow)
+
+    assert sorted(runner.cancelled) == ["graph", "vector"]
+    assert ("start", "merge") not in runner.log
+
+
+def test_events_report_the_timed_out_node(runner):
+    flow = make_flow(
+        [step("start"), step("graph", 1, timeout=0.01, best_effort=True)],
+        [("start", "graph")],
+    )
+    engine = FlowEngine()
+
+    async def run():
+        await engine.execute_flow(flow, {"query": "q", "user": "u"})
+        events = []
+        while not engine._event_queue.empty():
+            events.append(engine._event_queue.get_nowait().to_dict())
+        return events
+
+    events = asyncio.run(run())
+
+    errors = [e for e in events if e["event_type"] == "node_error"]
+    assert [e["node_id"] for e in errors] == ["graph"]
+    assert "timed out" in errors[0]["data"]["error"]
+    assert events[-1]["event_type"] == "flow_end"
+
+
+def test_parser_reads_timeout_and_best_effort():
+    flow = FlowParser.parse(
+        {
+            "nodes": [
+                {"id": "start", "type": "start"},
+                {"id": "graph", "type": "graph_search", "timeout": 5, "best_effort": True},
+            ],
+            "edges": [{"source": "start", "target": "graph"}],
+        }
+    )
+
+    assert flow.nodes["graph"].timeout == 5.0
+    assert flow.nodes["graph"].best_effort is True
+    assert flow.nodes["start"].timeout is None
+    assert flow.nodes["start"].best_effort is False
@@ -0,0 +1,160 @@
+"""
+Unit tests for the concurrent, cached image asset loading of the LLM node.
+"""
+
+import asyncio
+import base64
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from PIL import Image
+
+from aperag.flow.runners import llm as llm_module
+from aperag.flow.runners.llm import ImageAssetLoader, encode_image
+from aperag.query.query import DocumentWithScore
+
+
+class FakeObjectStore:
+    def __init__(self, objects, delay=0.01):
+        self.objects = objects
+        self.delay = delay
+        self.gets = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_obj_size(self, path):
+        return len(self.objects[path]) if path in self.objects else None
+
+    async def get(self, path):
+        self.gets.append(path)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if path not in self.objects:
+            return None
+        data = self.objects[path]
+
+        async def stream():
+            yield data
+
+        return stream(), len(data)
+
+
+def image_doc(asset_id, document_id="doc-1"):
+    return DocumentWithScore(
+        text=f"image {asset_id}",
+        score=0.5,
+        metadata={
+            "asset_id": asset_id,
+            "mimetype": "image/png",
+            "collection_id": "col-1",
+            "document_id": document_id,
+        },
+    )
+
+
+@pytest.fixture
+def db_ops():
+    async def query_document(user, collection_id, document_id):
+        await asyncio.sleep(0.01)
+        if document_id == "deleted":
+            return None
+        return SimpleNamespace(object_store_base_path=lambda: f"user-1/{collection_id}/{document_id}")
+
+    ops = SimpleNamespace(query_document=AsyncMock(side_effect=query_document))
+    with patch.object(llm_module, "async_db_ops", ops):
+        yield ops
+
+
+def use_store(store):
+    return patch.object(llm_module, "get_async_object_store", return_value=store)
+
+
+def test_images_are_loaded_concurrently_in_document_order(db_ops):
+    store = FakeObjectStore({f"user-1/col-1/doc-1/assets/a{i}": f"img{i}".encode() for i in range(8)})
+    docs = [image_doc(f"a{i}") for i in range(8)]
+
+    with use_store(store):
+        loaded = asyncio.run(ImageAssetLoader().load_images("user-1", docs, limit=5))
+
+    assert [doc.metadata["asset_id"] for doc, _ in loaded] == ["a0", "a1", "a2", "a3", "a4"]
+    assert loaded[0][1] == "data:image/png;base64," + base64.b64encode(b"img0").decode()
+    assert store.peak == 5
+    assert len(store.gets) == 5
+    # One document lookup for all assets of the same document
+    db_ops.query_document.assert_awaited_once()
+
+
+def test_failed_images_are_replaced_by_later_ones(db_ops):
+    store = FakeObjectStore({f"user-1/col-1/doc-1/assets/a{i}": b"img" for i in (0, 2, 3)})
+    docs = [
+        image_doc("a0"),
+        image_doc("missing"),
+        image_doc("a1", document_id="deleted"),
+        image_doc("a2"),
+        image_doc("a3"),
+        image_doc("a4"),
+    ]
+
+    with use_store(store):
+        loaded = asyncio.run(ImageAssetLoader().load_images("user-1", docs, limit=3))
+
+    assert [doc.metadata["asset_id"] for doc, _ in loaded] == ["a0", "a2", "a3"]
+    # Later batches reuse the cached base path of doc-1
+    assert [c.args[2] if c.args else c.kwargs["document_id"] for c in db_ops.query_document.await_args_list] == [
+        "doc-1",
+        "deleted",
+    ]
+
+
+def test_encoded_images_are_cached_by_path_and_size(db_ops):
+    path = "user-1/col-1/doc-1/assets/a0"
+    store = FakeObjectStore({path: b"first"})
+    loader = ImageAssetLoader()
+
+    async def run():
+        first = await loader.load_images("user-1", [image_doc("a0")])
+        again = await loader.load_images("user-1", [image_doc("a0")])
+        store.objects[path] = b"rewritten"
+        changed = await loader.load_images("user-1", [image_doc("a0")])
+        return first[0][1], again[0][1], changed[0][1]
+
+    with use_store(store):
+        first, again, changed = asyncio.run(run())
+
+    assert first == again
+    assert changed != first
+    assert store.gets == [path, path]
+
+
+def test_image_cache_is_bounded_by_size(db_ops):
+    store = FakeObjectStore({f"user-1/col-1/doc-1/assets/a{i}": b"x" * 30 for i in range(3)})
+    loader = ImageAssetLoader(max_image_bytes=150)
+
+    async def run():
+        for i in range(3):
+            await loader.load_images("user-1", [image_doc(f"a{i}")])
+
+    with use_store(store):
+        asyncio.run(run())
+
+    assert len(loader._images) == 2
+    assert loader._image_bytes <= 150
+
+
+def test_images_are_downscaled_to_the_max_resolution():
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 200), "red").save(buffer, format="PNG")
+
+    image_uri = encode_image(buffer.getvalue(), "image/png", max_resolution=100)
+
+    header, data = image_uri.split(",", 1)
+    assert header == "data:image/png;base64"
+    with Image.open(io.BytesIO(base64.b64decode(data))) as image:
+        assert image.size == (100, 50)
+    assert encode_image(b"not an image", "image/png", max_resolution=100).endswith(
+        base64.b64encode(b"not an image").decode()
+    )
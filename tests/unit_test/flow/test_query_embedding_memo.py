@@ -0,0 +1,152 @@
+"""
+Unit tests for the per-execution query embedding memo shared by search nodes.
+"""
+
+import asyncio
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from aperag.flow.base.models import NodeInstance, QueryEmbeddingMemo, SystemInput
+from aperag.flow.engine import FlowEngine
+from aperag.flow.runners import summary_search, vector_search, vision_search
+
+
+class FakeEmbeddingModel:
+    def __init__(self, model="text-embedding", fail_times=0):
+        self.embedding_provider = "openai"
+        self.model = model
+        self.api_base = "https://api.example.com"
+        self.multimodal = False
+        self.calls = 0
+        self.fail_times = fail_times
+
+    async def aembed_query(self, text):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.calls <= self.fail_times:
+            raise RuntimeError("rate limited")
+        return [float(len(text)), float(self.calls)]
+
+
+def test_concurrent_nodes_share_one_embedding():
+    memo = QueryEmbeddingMemo()
+    model = FakeEmbeddingModel()
+
+    async def run():
+        return await asyncio.gather(*(memo.aembed_query(model, "hello") for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert model.calls == 1
+    assert results == [[5.0, 1.0]] * 3
+
+
+def test_embeddings_are_keyed_by_model_and_text():
+    memo = QueryEmbeddingMemo()
+    model = FakeEmbeddingModel()
+    other_model = FakeEmbeddingModel(model="other-embedding")
+
+    async def run():
+        await memo.aembed_query(model, "hello")
+        await memo.aembed_query(model, "hello")
+        await memo.aembed_query(model, "bye")
+        await memo.aembed_query(other_model, "hello")
+
+    asyncio.run(run())
+
+    assert model.calls == 2
+    assert other_model.calls == 1
+
+
+def test_failed_embedding_is_retried_by_later_callers():
+    memo = QueryEmbeddingMemo()
+    model = FakeEmbeddingModel(fail_times=1)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await memo.aembed_query(model, "hello")
+        return await memo.aembed_query(model, "hello")
+
+    assert asyncio.run(run()) == [5.0, 2.0]
+
+
+def test_cancelled_node_does_not_cancel_shared_embedding():
+    memo = QueryEmbeddingMemo()
+    model = FakeEmbeddingModel()
+
+    async def run():
+        cancelled = asyncio.ensure_future(memo.aembed_query(model, "hello"))
+        waiting = asyncio.ensure_future(memo.aembed_query(model, "hello"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await waiting
+
+    assert asyncio.run(run()) == [5.0, 1.0]
+    assert model.calls == 1
+
+
+def test_system_input_without_memo_embeds_directly():
+    model = FakeEmbeddingModel()
+    si = SystemInput(query="hello", user="u")
+
+    async def run():
+        await si.aembed_query(model, "hello")
+        await si.aembed_query(model, "hello")
+
+    asyncio.run(run())
+
+    assert model.calls == 2
+
+
+def test_engine_gives_all_nodes_of_an_execution_the_same_memo():
+    class Input(BaseModel):
+        pass
+
+    engine = FlowEngine()
+    engine.context.set_global("query", "hello")
+    engine.context.set_global("user", "u")
+    runner_info = {"input_model": Input}
+
+    _, first = engine._bind_node_inputs(NodeInstance(id="vector", type="vector_search"), runner_info)
+    _, second = engine._bind_node_inputs(NodeInstance(id="summary", type="summary_search"), runner_info)
+
+    assert first.query_embeddings is second.query_embeddings is engine.context.query_embeddings
+    assert FlowEngine().context.query_embeddings is not engine.context.query_embeddings
+
+
+def test_hybrid_search_embeds_the_query_once():
+    model = FakeEmbeddingModel()
+    repository = MagicMock()
+    repository.get_collection = AsyncMock(return_value=MagicMock(id="col-1"))
+    memo = QueryEmbeddingMemo()
+    modules = (vector_search, summary_search, vision_search)
+
+    async def run():
+        return await asyncio.gather(
+            vector_search.VectorSearchService(repository).execute_vector_search(
+                "u", "hello", 3, 0.2, ["col-1"], query_embeddings=memo
+            ),
+            summary_search.SummarySearchService(repository).execute_summary_search(
+                "u", "hello", 3, 0.2, ["col-1"], query_embeddings=memo
+            ),
+            vision_search.VisionSearchService(repository).execute_vision_search(
+                "u", "hello", 3, 0.2, ["col-1"], query_embeddings=memo
+            ),
+        )
+
+    aquery = AsyncMock(return_value=[])
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(vector_search.ContextManager, "aquery", aquery))
+        stack.enter_context(patch.object(vector_search.ContextManager, "__init__", return_value=None))
+        for module in modules:
+            stack.enter_context(
+                patch.object(module, "get_collection_embedding_service", AsyncMock(return_value=(model, 2)))
+            )
+        asyncio.run(run())
+
+    assert model.calls == 1
+    assert aquery.await_count == 3
+    assert all(call.kwargs["vector"] == [5.0, 1.0] for call in aquery.await_args_list)
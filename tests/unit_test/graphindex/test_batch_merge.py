@@ -0,0 +1,221 @@
+"""
+Unit tests for the batched entity/relation merge in LightRAG graph indexing.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from aperag.graph.lightrag import operate
+from aperag.graph.lightrag.base import BaseGraphStorage
+from aperag.graph.lightrag.prompt import GRAPH_FIELD_SEP
+
+
+class InMemoryGraphStorage(BaseGraphStorage):
+    """Graph storage keeping nodes and edges in dicts, counting storage calls"""
+
+    def __init__(self, nodes=None, edges=None):
+        super().__init__(namespace="test", workspace="ws", embedding_func=None)
+        self.nodes = dict(nodes or {})
+        self.edges = dict(edges or {})
+        self.calls = []
+
+    async def get_nodes_batch(self, node_ids):
+        self.calls.append("get_nodes_batch")
+        return {node_id: self.nodes[node_id] for node_id in node_ids if node_id in self.nodes}
+
+    async def get_edges_batch(self, pairs):
+        self.calls.append("get_edges_batch")
+        return {
+            (p["src"], p["tgt"]): self.edges[(p["src"], p["tgt"])] for p in pairs if (p["src"], p["tgt"]) in self.edges
+        }
+
+    async def upsert_nodes_batch(self, nodes):
+        self.calls.append("upsert_nodes_batch")
+        self.nodes.update(nodes)
+
+    async def upsert_edges_batch(self, edges):
+        self.calls.append("upsert_edges_batch")
+        self.edges.update(edges)
+
+    async def upsert_node(self, node_id, node_data):
+        raise AssertionError("per-node upsert must not be used")
+
+    async def upsert_edge(self, source_node_id, target_node_id, edge_data):
+        raise AssertionError("per-edge upsert must not be used")
+
+    async def get_node(self, node_id):
+        raise AssertionError("per-node lookup must not be used")
+
+    async def get_edge(self, source_node_id, target_node_id):
+        raise AssertionError("per-edge lookup must not be used")
+
+    async def has_node(self, node_id):
+        raise AssertionError("per-node lookup must not be used")
+
+    async def has_edge(self, source_node_id, target_node_id):
+        raise AssertionError("per-edge lookup must not be used")
+
+    async def node_degree(self, node_id):
+        return 0
+
+    async def edge_degree(self, src_id, tgt_id):
+        return 0
+
+    async def get_node_edges(self, source_node_id):
+        return []
+
+    async def delete_node(self, node_id):
+        pass
+
+    async def remove_nodes(self, nodes):
+        pass
+
+    async def remove_edges(self, edges):
+        pass
+
+    async def get_all_labels(self):
+        return []
+
+    async def get_knowledge_graph(self, node_label, max_depth=3, max_nodes=1000):
+        return None
+
+    async def drop(self):
+        return {}
+
+    async def index_done_callback(self):
+        pass
+
+
+def entity(name, description, chunk="chunk-1", entity_type="PERSON"):
+    return {
+        "entity_name": name,
+        "entity_type": entity_type,
+        "description": description,
+        "source_id": chunk,
+        "file_path": "doc.md",
+    }
+
+
+def relation(src, tgt, description, keywords="knows", chunk="chunk-1"):
+    return {
+        "src_id": src,
+        "tgt_id": tgt,
+        "weight": 1.0,
+        "description": description,
+        "keywords": keywords,
+        "source_id": chunk,
+        "file_path": "doc.md",
+    }
+
+
+async def run_merge(graph, chunk_results, entity_vdb=None, relationships_vdb=None, llm=None, force_summary=10):
+    return await operate._merge_nodes_and_edges_impl(
+        chunk_results,
+        "ws",
+        graph,
+        entity_vdb,
+        relationships_vdb,
+        llm or AsyncMock(return_value="summary"),
+        Mock(),
+        32768,
+        500,
+        {},
+        force_summary,
+        Mock(),
+    )
+
+
+def test_merge_uses_one_prefetch_and_one_upsert_per_kind():
+    graph = InMemoryGraphStorage(
+        nodes={"Alice": entity("Alice", "Existing description", chunk="chunk-0")},
+    )
+    entity_vdb = AsyncMock()
+    relationships_vdb = AsyncMock()
+    chunk_results = [
+        (
+            {"Alice": [entity("Alice", "An engineer")], "Bob": [entity("Bob", "A manager")]},
+            {("Bob", "Alice"): [relation("Bob", "Alice", "Bob manages Alice")]},
+        ),
+        ({"Bob": [entity("Bob", "A manager", chunk="chunk-2")]}, {}),
+    ]
+
+    result = asyncio.run(run_merge(graph, chunk_results, entity_vdb, relationships_vdb))
+
+    assert result == {"entity_count": 2, "relation_count": 1}
+    assert graph.calls == ["get_nodes_batch", "get_edges_batch", "upsert_nodes_batch", "upsert_edges_batch"]
+    assert graph.nodes["Alice"]["description"] == GRAPH_FIELD_SEP.join(["An engineer", "Existing description"])
+    assert set(graph.nodes["Alice"]["source_id"].split(GRAPH_FIELD_SEP)) == {"chunk-0", "chunk-1"}
+    assert set(graph.nodes["Bob"]["source_id"].split(GRAPH_FIELD_SEP)) == {"chunk-1", "chunk-2"}
+    # Edge keys are sorted, matching the undirected graph convention
+    assert graph.edges[("Alice", "Bob")]["description"] == "Bob manages Alice"
+
+    entity_vdb.upsert.assert_awaited_once()
+    assert {v["entity_name"] for v in entity_vdb.upsert.await_args.args[0].values()} == {"Alice", "Bob"}
+    relationships_vdb.upsert.assert_awaited_once()
+    assert len(relationships_vdb.upsert.await_args.args[0]) == 1
+
+
+def test_existing_edge_is_merged_and_self_loops_are_skipped():
+    graph = InMemoryGraphStorage(
+        nodes={"A": entity("A", "a"), "B": entity("B", "b")},
+        edges={("A", "B"): {"weight": 2.0, "description": "old", "keywords": "x", "source_id": "chunk-0"}},
+    )
+    chunk_results = [
+        ({}, {("A", "B"): [relation("A", "B", "new", keywords="y")], ("A", "A"): [relation("A", "A", "s")]})
+    ]
+
+    result = asyncio.run(run_merge(graph, chunk_results))
+
+    assert result["relation_count"] == 1
+    edge = graph.edges[("A", "B")]
+    assert edge["weight"] == 3.0
+    assert edge["keywords"] == "x,y"
+    assert edge["description"] == GRAPH_FIELD_SEP.join(["new", "old"])
+    assert ("A", "A") not in graph.edges
+
+
+def test_missing_relation_endpoints_get_placeholder_nodes():
+    graph = InMemoryGraphStorage(nodes={"Stored": entity("Stored", "kept")})
+    chunk_results = [
+        (
+            {"Alice": [entity("Alice", "An engineer")]},
+            {
+                ("Alice", "Ghost"): [relation("Alice", "Ghost", "Alice sees Ghost")],
+                ("Ghost", "Stored"): [relation("Ghost", "Stored", "Ghost haunts Stored")],
+            },
+        )
+    ]
+
+    asyncio.run(run_merge(graph, chunk_results))
+
+    assert graph.nodes["Ghost"]["entity_type"] == "UNKNOWN"
+    # The first relation mentioning the endpoint provides its placeholder data
+    assert graph.nodes["Ghost"]["description"] == "Alice sees Ghost"
+    assert graph.nodes["Stored"]["description"] == "kept"
+    assert graph.nodes["Alice"]["entity_type"] == "PERSON"
+
+
+@pytest.mark.parametrize("force_summary, expected_llm_calls", [(2, 2), (10, 0)])
+def test_only_needed_summaries_call_the_llm(force_summary, expected_llm_calls):
+    graph = InMemoryGraphStorage()
+    llm = AsyncMock(return_value="summary")
+    chunk_results = [
+        (
+            {
+                "Alice": [entity("Alice", "one"), entity("Alice", "two")],
+                "Bob": [entity("Bob", "only")],
+            },
+            {("Alice", "Bob"): [relation("Alice", "Bob", "r1"), relation("Alice", "Bob", "r2")]},
+        )
+    ]
+    summarize = AsyncMock(side_effect=lambda name, description, *args: f"summary of {name}")
+    with patch.object(operate, "_handle_entity_relation_summary", summarize):
+        asyncio.run(run_merge(graph, chunk_results, llm=llm, force_summary=force_summary))
+
+    assert summarize.await_count == expected_llm_calls
+    if expected_llm_calls:
+        assert graph.nodes["Alice"]["description"] == "summary of Alice"
+        assert graph.edges[("Alice", "Bob")]["description"] == "summary of (Alice, Bob)"
+    assert graph.nodes["Bob"]["description"] == "only"
@@ -0,0 +1,148 @@
+"""
+Unit tests for the bulk upserts of LightRAG doc chunks, entities and relations.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from aperag.db.repositories import lightrag as lightrag_repository
+from aperag.db.repositories.lightrag import LightragRepositoryMixin, copy_line
+
+
+class FakeCursor:
+    def __init__(self):
+        self.copies = []
+        self.closed = False
+
+    def copy_expert(self, sql, file):
+        self.copies.append((sql, file.read()))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.cursor = FakeCursor()
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+
+    def commit(self):
+        self.commits += 1
+
+    def connection(self):
+        return SimpleNamespace(connection=SimpleNamespace(cursor=lambda: self.cursor))
+
+
+class FakeRepository(LightragRepositoryMixin):
+    def __init__(self):
+        self.session = FakeSession()
+
+    def _execute_transaction(self, operation):
+        return operation(self.session)
+
+
+def compile_pg(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def entities(count):
+    return {
+        f"ent-{i}": {
+            "entity_name": f"E{i}",
+            "content": f"entity {i}",
+            "content_vector": np.array([0.5, float(i)]),
+            "chunk_ids": ["chunk-1"],
+            "file_path": "doc.md",
+        }
+        for i in range(count)
+    }
+
+
+def test_rows_are_upserted_with_one_statement_per_batch():
+    repo = FakeRepository()
+
+    with (
+        patch.object(lightrag_repository.settings, "lightrag_upsert_batch_size", 2),
+        patch.object(lightrag_repository.settings, "lightrag_upsert_copy_threshold", 0),
+    ):
+        repo.upsert_lightrag_vdb_entity("ws", entities(5))
+
+    assert len(repo.session.statements) == 3
+    assert repo.session.commits == 1
+    sql = compile_pg(repo.session.statements[0])
+    assert sql.count("VALUES") == 1
+    assert "ON CONFLICT (workspace, id) DO UPDATE" in sql
+    assert "content_vector = coalesce(excluded.content_vector, lightrag_vdb_entity.content_vector)" in sql
+    # The creation time of existing rows is kept
+    assert "create_time = excluded.create_time" not in sql
+
+
+def test_kv_chunks_without_vectors_keep_the_stored_vector():
+    repo = FakeRepository()
+
+    repo.upsert_lightrag_doc_chunks("ws", {"chunk-1": {"tokens": 3, "content": "text", "full_doc_id": "doc-1"}})
+
+    [statement] = repo.session.statements
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert params["content_vector_m0"] is None
+    assert params["id_m0"] == "chunk-1"
+    assert params["workspace_m0"] == "ws"
+
+
+def test_large_loads_are_copied_into_a_staging_table():
+    repo = FakeRepository()
+
+    with (
+        patch.object(lightrag_repository.settings, "lightrag_upsert_batch_size", 2),
+        patch.object(lightrag_repository.settings, "lightrag_upsert_copy_threshold", 3),
+    ):
+        repo.upsert_lightrag_vdb_relation(
+            "ws",
+            {
+                f"rel-{i}": {"source_id": "A", "target_id": f"B{i}", "content": "A\tB", "content_vector": [1.0, 2.0]}
+                for i in range(3)
+            },
+        )
+
+    create, upsert = (str(s) for s in repo.session.statements)
+    assert "CREATE TEMP TABLE tmp_lightrag_vdb_relation_upsert (LIKE lightrag_vdb_relation" in create
+    assert "ON COMMIT DROP" in create
+    assert len(repo.session.cursor.copies) == 2
+    copy_sql, data = repo.session.cursor.copies[0]
+    assert copy_sql.startswith("COPY tmp_lightrag_vdb_relation_upsert (workspace, id, source_id")
+    assert data.count("\n") == 2
+    assert repo.session.cursor.closed
+    assert upsert.startswith("INSERT INTO lightrag_vdb_relation (workspace, id, source_id")
+    assert "SELECT workspace, id, source_id" in upsert
+    assert "content_vector = COALESCE(EXCLUDED.content_vector, lightrag_vdb_relation.content_vector)" in upsert
+    assert repo.session.commits == 1
+
+
+def test_empty_upsert_does_nothing():
+    repo = FakeRepository()
+
+    repo.upsert_lightrag_vdb_entity("ws", {})
+
+    assert repo.session.statements == []
+    assert repo.session.commits == 0
+
+
+def test_copy_line_escapes_text_and_formats_arrays_and_vectors():
+    line = copy_line(
+        {
+            "id": "a\\b",
+            "content": "line1\nline2\tend",
+            "content_vector": [0.5, 1.0],
+            "chunk_ids": ['c"1', "c,2"],
+            "file_path": None,
+        }
+    )
+
+    assert line == 'a\\\\b\tline1\\nline2\\tend\t[0.5,1.0]\t{"c\\\\"1","c,2"}\t\\N\n'
@@ -0,0 +1,87 @@
+"""
+Unit tests for connected-component grouping and parallel component merging in LightRAG.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from aperag.graph.lightrag import lightrag as lightrag_module
+from aperag.graph.lightrag.lightrag import LightRAG
+
+
+def make_rag(max_parallel_merge: int = 4):
+    rag = SimpleNamespace(
+        lightrag_logger=Mock(),
+        max_parallel_merge=max_parallel_merge,
+        workspace="ws",
+        chunk_entity_relation_graph=None,
+        entities_vdb=None,
+        relationships_vdb=None,
+        llm_model_func=None,
+        tokenizer=None,
+        llm_model_max_token_size=32768,
+        summary_to_max_tokens=500,
+        addon_params={},
+        force_llm_summary_on_merge=10,
+    )
+    rag._group_by_connected_components = lambda chunk_results: LightRAG._group_by_connected_components(
+        rag, chunk_results
+    )
+    return rag
+
+
+def test_group_by_connected_components_splits_chunks_in_one_pass():
+    chunk_results = [
+        ({"A": ["a"], "B": ["b"], "X": ["x"]}, {("A", "B"): ["ab"]}),
+        ({"C": ["c"], "Y": ["y"]}, {("B", "C"): ["bc"], ("X", "Y"): ["xy"]}),
+        ({"Z": ["z"]}, {}),
+    ]
+
+    groups = LightRAG._group_by_connected_components(make_rag(), chunk_results)
+
+    assert [sorted(entities) for entities, _ in groups] == [["A", "B", "C"], ["X", "Y"], ["Z"]]
+    abc_results = groups[0][1]
+    assert abc_results == [
+        ({"A": ["a"], "B": ["b"]}, {("A", "B"): ["ab"]}),
+        ({"C": ["c"]}, {("B", "C"): ["bc"]}),
+    ]
+    assert groups[1][1] == [({"X": ["x"]}, {}), ({"Y": ["y"]}, {("X", "Y"): ["xy"]})]
+    assert groups[2][1] == [({"Z": ["z"]}, {})]
+
+
+def test_edge_endpoints_without_extracted_nodes_join_the_component():
+    chunk_results = [({"A": ["a"]}, {("A", "Ghost"): ["ag"]}), ({}, {("Ghost", "B"): ["gb"]})]
+
+    groups = LightRAG._group_by_connected_components(make_rag(), chunk_results)
+
+    assert len(groups) == 1
+    assert sorted(groups[0][0]) == ["A", "B", "Ghost"]
+
+
+def test_no_entities_yields_no_components():
+    assert LightRAG._group_by_connected_components(make_rag(), [({}, {})]) == []
+
+
+@pytest.mark.parametrize("max_parallel_merge, expected_peak", [(1, 1), (3, 3)])
+def test_components_are_merged_with_bounded_parallelism(max_parallel_merge, expected_peak):
+    chunk_results = [({f"E{i}": [i]}, {}) for i in range(6)]
+    in_flight = 0
+    peak = 0
+
+    async def fake_merge(chunk_results, component, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"entity_count": len(component), "relation_count": 0}
+
+    rag = make_rag(max_parallel_merge)
+    with patch.object(lightrag_module, "merge_nodes_and_edges", fake_merge):
+        result = asyncio.run(LightRAG._grouping_process_chunk_results(rag, chunk_results, "col"))
+
+    assert peak == expected_peak
+    assert result == {"groups_processed": 6, "total_entities": 6, "total_relations": 0, "collection_id": "col"}
@@ -0,0 +1,190 @@
+"""
+Unit tests for graph label search and the server-side subgraph traversal of the PostgreSQL graph storage.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from aperag.db.ops import db_ops
+from aperag.db.repositories.graph import BFS_SUBGRAPH_SQL, OVERVIEW_SQL, GraphRepositoryMixin, escape_like
+from aperag.graph.lightrag.kg.pg_ops_sync_graph_storage import PGOpsSyncGraphStorage
+
+
+class FakeResult:
+    def __init__(self, rows=(), scalars=()):
+        self.rows = list(rows)
+        self._scalars = list(scalars)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def mappings(self):
+        return SimpleNamespace(all=lambda: self.rows)
+
+    def scalars(self):
+        return self._scalars
+
+
+class FakeSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+        return self.results.pop(0)
+
+
+class FakeRepository(GraphRepositoryMixin):
+    def __init__(self, session):
+        self.session = session
+
+    def _execute_query(self, query_func):
+        return query_func(self.session)
+
+
+def compile_pg(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def node_row(entity_id, degree, total, entity_type="PERSON"):
+    return {
+        "entity_id": entity_id,
+        "entity_name": None,
+        "entity_type": entity_type,
+        "description": f"about {entity_id}",
+        "source_id": "chunk-1",
+        "file_path": None,
+        "createtime": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "degree": degree,
+        "depth": 0,
+        "total": total,
+    }
+
+
+def test_prefix_search_uses_an_anchored_pattern():
+    session = FakeSession(FakeResult([("Alice",), ("Alicia",)]))
+
+    labels = FakeRepository(session).search_graph_labels("ws", "Ali", mode="prefix", limit=10)
+
+    assert labels == ["Alice", "Alicia"]
+    sql, params = compile_pg(session.calls[0][0])
+    assert "lightrag_graph_nodes.entity_id ILIKE %(entity_id_1)s" in sql
+    assert params["entity_id_1"] == "Ali%"
+    assert params["param_1"] == 10
+
+
+def test_fuzzy_search_ranks_substring_matches_then_similarity():
+    session = FakeSession(FakeResult([("Bob",)]))
+
+    FakeRepository(session).search_graph_labels("ws", "bo_b", mode="fuzzy", limit=5)
+
+    sql, params = compile_pg(session.calls[0][0])
+    # Wildcards in the query are matched literally
+    assert params["entity_id_1"] == "%bo\\_b%"
+    assert "lightrag_graph_nodes.entity_id %% %(entity_id_2)s" in sql
+    assert params["entity_id_2"] == "bo_b"
+    assert "similarity(lightrag_graph_nodes.entity_id, %(similarity_1)s) DESC" in sql
+
+
+def test_unknown_search_mode_is_rejected():
+    with pytest.raises(ValueError):
+        FakeRepository(FakeSession()).search_graph_labels("ws", "a", mode="regex")
+
+
+def test_escape_like():
+    assert escape_like("50%_a\\b") == "50\\%\\_a\\\\b"
+
+
+def test_subgraph_runs_the_bfs_and_fetches_edges_between_its_nodes():
+    edges = [
+        SimpleNamespace(
+            source_entity_id="Alice",
+            target_entity_id="Bob",
+            weight=2,
+            keywords="knows",
+            description="friends",
+            source_id="chunk-1",
+            file_path=None,
+        )
+    ]
+    session = FakeSession(
+        FakeResult([node_row("Alice", 3, total=5), node_row("Bob", 1, total=5)]), FakeResult(scalars=edges)
+    )
+
+    subgraph = FakeRepository(session).get_graph_subgraph("ws", "Ali%", max_depth=2, max_nodes=2)
+
+    bfs_sql, params = session.calls[0]
+    assert str(bfs_sql) == BFS_SUBGRAPH_SQL
+    assert params == {"workspace": "ws", "max_nodes": 2, "label": "Ali%", "pattern": "%Ali\\%%", "max_depth": 2}
+    assert [node["entity_id"] for node in subgraph["nodes"]] == ["Alice", "Bob"]
+    assert subgraph["nodes"][0]["degree"] == 3
+    assert "file_path" not in subgraph["nodes"][0]
+    assert subgraph["edges"] == [
+        {
+            "source": "Alice",
+            "target": "Bob",
+            "weight": 2.0,
+            "keywords": "knows",
+            "description": "friends",
+            "source_id": "chunk-1",
+        }
+    ]
+    assert subgraph["is_truncated"] is True
+
+
+def test_overview_is_not_truncated_when_everything_fits():
+    session = FakeSession(FakeResult([node_row("Alice", 0, total=1)]), FakeResult())
+
+    subgraph = FakeRepository(session).get_graph_subgraph("ws", "*", max_nodes=10)
+
+    assert str(session.calls[0][0]) == OVERVIEW_SQL
+    assert subgraph["is_truncated"] is False
+
+
+def test_empty_subgraph_skips_the_edge_query():
+    session = FakeSession(FakeResult())
+
+    subgraph = FakeRepository(session).get_graph_subgraph("ws", "nobody")
+
+    assert subgraph == {"nodes": [], "edges": [], "is_truncated": False}
+    assert len(session.calls) == 1
+
+
+def test_storage_builds_the_knowledge_graph_from_one_subgraph_query():
+    subgraph = {
+        "nodes": [
+            {"entity_id": "Alice", "entity_type": "PERSON", "description": "d", "created_at": 1, "degree": 1},
+            {"entity_id": "Bob", "degree": 1},
+        ],
+        "edges": [{"source": "Alice", "target": "Bob", "weight": 1.0}],
+        "is_truncated": True,
+    }
+    storage = PGOpsSyncGraphStorage(namespace="graph", workspace="ws")
+
+    with patch.object(db_ops, "get_graph_subgraph", return_value=subgraph) as get_subgraph:
+        kg = asyncio.run(storage.get_knowledge_graph("Alice", max_depth=2, max_nodes=50))
+
+    get_subgraph.assert_called_once_with("ws", "Alice", 2, 50)
+    assert kg.is_truncated
+    assert [(node.id, node.labels) for node in kg.nodes] == [("Alice", ["PERSON"]), ("Bob", ["Bob"])]
+    assert kg.nodes[0].properties == {"entity_id": "Alice", "entity_type": "PERSON", "description": "d"}
+    assert [(edge.id, edge.source, edge.target, edge.properties) for edge in kg.edges] == [
+        ("Alice-Bob", "Alice", "Bob", {"weight": 1.0})
+    ]
+
+
+def test_storage_label_search_goes_to_the_database():
+    storage = PGOpsSyncGraphStorage(namespace="graph", workspace="ws")
+
+    with patch.object(db_ops, "search_graph_labels", return_value=["Alice"]) as search:
+        labels = asyncio.run(storage.search_labels("ali", "prefix", 5))
+
+    assert labels == ["Alice"]
+    search.assert_called_once_with("ws", "ali", "prefix", 5)
@@ -0,0 +1,146 @@
+"""
+Unit tests for the pooled LightRAG instances and the long-lived Celery worker loop.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from aperag.graph import lightrag_manager
+from aperag.graph.lightrag_manager import LightRAGInstancePool
+
+
+def make_collection(collection_id="col-1", config='{"enable_knowledge_graph": true}', user="user-1"):
+    return SimpleNamespace(id=collection_id, config=config, user=user)
+
+
+@pytest.fixture
+def created():
+    instances = []
+
+    async def fake_create(collection):
+        await asyncio.sleep(0)
+        rag = SimpleNamespace(collection_id=collection.id, finalize_storages=AsyncMock())
+        instances.append(rag)
+        return rag
+
+    with patch.object(lightrag_manager, "create_lightrag_instance", fake_create):
+        yield instances
+
+
+def test_instances_are_reused_per_collection(created):
+    pool = LightRAGInstancePool(max_size=4, ttl=60)
+
+    async def run():
+        first = await pool.get(make_collection())
+        second = await pool.get(make_collection())
+        other = await pool.get(make_collection("col-2"))
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+
+
+def test_concurrent_requests_create_one_instance(created):
+    pool = LightRAGInstancePool(max_size=4, ttl=60)
+
+    async def run():
+        return await asyncio.gather(*(pool.get(make_collection()) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(created) == 1
+    assert all(rag is created[0] for rag in results)
+
+
+def test_expired_instances_are_rebuilt(created):
+    pool = LightRAGInstancePool(max_size=4, ttl=60)
+
+    async def run():
+        with patch.object(lightrag_manager.time, "monotonic", return_value=1000.0):
+            first = await pool.get(make_collection())
+        with patch.object(lightrag_manager.time, "monotonic", return_value=1061.0):
+            second = await pool.get(make_collection())
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is not second
+    first.finalize_storages.assert_awaited_once()
+    assert len(pool) == 1
+
+
+def test_least_recently_used_instance_is_evicted(created):
+    pool = LightRAGInstancePool(max_size=2, ttl=60)
+
+    async def run():
+        await pool.get(make_collection("a"))
+        await pool.get(make_collection("b"))
+        await pool.get(make_collection("a"))
+        await pool.get(make_collection("c"))
+
+    asyncio.run(run())
+
+    evicted = [rag.collection_id for rag in created if rag.finalize_storages.await_count]
+    assert evicted == ["b"]
+    assert len(pool) == 2
+
+
+def test_config_change_replaces_the_collection_instance(created):
+    pool = LightRAGInstancePool(max_size=4, ttl=60)
+
+    async def run():
+        old = await pool.get(make_collection(config='{"completion": "a"}'))
+        new = await pool.get(make_collection(config='{"completion": "b"}'))
+        return old, new
+
+    old, new = asyncio.run(run())
+
+    assert old is not new
+    old.finalize_storages.assert_awaited_once()
+    assert len(pool) == 1
+
+
+def test_invalidation_is_applied_on_next_access(created):
+    async def get():
+        return await lightrag_manager.get_lightrag_instance(make_collection())
+
+    loop = asyncio.new_event_loop()
+    try:
+        with patch.object(lightrag_manager.settings, "lightrag_pool_size", 4):
+            first = loop.run_until_complete(get())
+            assert loop.run_until_complete(get()) is first
+
+            lightrag_manager.invalidate_lightrag_instances("col-1")
+            second = loop.run_until_complete(get())
+    finally:
+        loop.close()
+
+    assert second is not first
+    first.finalize_storages.assert_awaited_once()
+
+
+def test_pool_can_be_disabled(created):
+    async def run():
+        return [await lightrag_manager.get_lightrag_instance(make_collection()) for _ in range(2)]
+
+    with patch.object(lightrag_manager.settings, "lightrag_pool_size", 0):
+        first, second = asyncio.run(run())
+
+    assert first is not second
+
+
+def test_worker_loop_is_reused_between_calls():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = lightrag_manager.run_in_worker_loop(current_loop())
+    second = lightrag_manager.run_in_worker_loop(current_loop())
+
+    assert first is second
+    assert not first.is_closed()
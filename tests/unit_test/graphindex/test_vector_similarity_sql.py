@@ -0,0 +1,126 @@
+"""
+Unit tests for the index-friendly LightRAG vector similarity queries.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from aperag.db.repositories import lightrag as lightrag_repository
+from aperag.db.repositories.lightrag import LightragRepositoryMixin, build_similarity_sql, vector_literal
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((str(statement), params))
+        if "set_config" in str(statement):
+            return []
+        return [SimpleNamespace(_mapping=row) for row in self.rows]
+
+
+class FakeRepository(LightragRepositoryMixin):
+    def __init__(self, session):
+        self.session = session
+
+    def _execute_query(self, query_func):
+        return query_func(self.session)
+
+
+def test_vector_is_bound_and_ordered_by_distance():
+    session = FakeSession([{"entity_name": "Alice", "created_at": 1, "distance": 0.9}])
+    repo = FakeRepository(session)
+
+    with patch.object(lightrag_repository.settings, "lightrag_hnsw_ef_search", 80):
+        results = repo.query_lightrag_vdb_entity_similarity("ws", np.array([0.5, 0.25, 1.0]), 5, threshold=0.3)
+
+    assert results == [{"entity_name": "Alice", "created_at": 1, "distance": 0.9}]
+    (ef_sql, ef_params), (sql, params) = session.calls
+    assert "set_config('hnsw.ef_search'" in ef_sql
+    assert ef_params == {"ef_search": "80"}
+    assert params == {"workspace": "ws", "top_k": 5, "threshold": 0.3, "query_vector": "[0.5,0.25,1.0]"}
+    assert "0.25" not in sql
+    assert "ORDER BY cosine_distance\n        LIMIT :top_k" in sql
+    # The threshold only filters the nearest rows, outside the index scan
+    assert sql.index("LIMIT :top_k") < sql.index("> :threshold")
+
+
+def test_ef_search_can_be_left_to_the_server():
+    session = FakeSession([])
+    repo = FakeRepository(session)
+
+    with patch.object(lightrag_repository.settings, "lightrag_hnsw_ef_search", 0):
+        assert repo.query_lightrag_doc_chunks_similarity("ws", [1.0, 0.0], 3) == []
+
+    assert len(session.calls) == 1
+
+
+def test_sql_matches_the_partial_hnsw_index_expression():
+    sql = build_similarity_sql("lightrag_doc_chunks", 1024, filter_doc_ids=False)
+
+    assert "t.content_vector::vector(1024) <=> CAST(:query_vector AS vector(1024))" in sql
+    assert "vector_dims(t.content_vector) = 1024" in sql
+
+
+@pytest.mark.parametrize(
+    "table, doc_filter",
+    [
+        ("lightrag_doc_chunks", "t.full_doc_id = ANY(:doc_ids)"),
+        ("lightrag_vdb_entity", "c.id = ANY(t.chunk_ids)"),
+        ("lightrag_vdb_relation", "c.id = ANY(t.chunk_ids)"),
+    ],
+)
+def test_doc_id_filter(table, doc_filter):
+    assert doc_filter in build_similarity_sql(table, 8, filter_doc_ids=True)
+    assert ":doc_ids" not in build_similarity_sql(table, 8, filter_doc_ids=False)
+
+
+def test_relation_columns_keep_their_result_names():
+    sql = build_similarity_sql("lightrag_vdb_relation", 8, filter_doc_ids=False)
+
+    assert "t.source_id AS src_id" in sql
+    assert "t.target_id AS tgt_id" in sql
+    assert "1 - nearest.cosine_distance AS distance" in sql
+
+
+def test_batch_query_runs_one_statement_and_groups_rows_per_query():
+    session = FakeSession(
+        [
+            {"query_index": 0, "id": "c1", "distance": 0.9},
+            {"query_index": 0, "id": "c2", "distance": 0.8},
+            {"query_index": 2, "id": "c3", "distance": 0.7},
+        ]
+    )
+    repo = FakeRepository(session)
+
+    with patch.object(lightrag_repository.settings, "lightrag_hnsw_ef_search", 0):
+        results = repo.query_lightrag_doc_chunks_similarity_batch(
+            "ws", [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]], 2, doc_ids=["doc-1"]
+        )
+
+    assert results == [
+        [{"id": "c1", "distance": 0.9}, {"id": "c2", "distance": 0.8}],
+        [],
+        [{"id": "c3", "distance": 0.7}],
+    ]
+    [(sql, params)] = session.calls
+    assert "CROSS JOIN LATERAL" in sql
+    assert params["query_vectors"] == ["[1.0,0.0]", "[0.0,1.0]", "[0.5,0.5]"]
+    assert params["doc_ids"] == ["doc-1"]
+
+
+def test_mixed_dimensions_are_rejected():
+    repo = FakeRepository(FakeSession([]))
+
+    with pytest.raises(ValueError):
+        repo.query_lightrag_vdb_entity_similarity_batch("ws", [[1.0, 0.0], [1.0]], 2)
+
+
+def test_vector_literal():
+    assert vector_literal(np.array([1, 2.5], dtype=np.float32)) == "[1.0,2.5]"
+    assert vector_literal([3, 4]) == "[3,4]"
@@ -0,0 +1,139 @@
+import io
+import json
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from aperag.docparser.base import TextPart
+from aperag.index import chunk_artifact as chunk_artifact_module
+from aperag.index.chunk_artifact import (
+    ChunkArtifact,
+    build_chunk_artifact,
+    chunk_artifact_path,
+    get_chunk_artifact,
+    load_chunk_artifact,
+    save_chunk_artifact,
+)
+from aperag.tasks.models import LocalDocumentInfo, ParsedDocumentData
+
+
+def mock_tokenizer(text: str) -> List[int]:
+    return [len(word) for word in text.split()]
+
+
+class MemoryObjectStore:
+    def __init__(self):
+        self.objects = {}
+
+    def put(self, path, data):
+        self.objects[path] = data
+
+    def get(self, path):
+        data = self.objects.get(path)
+        return io.BytesIO(data) if data is not None else None
+
+
+@pytest.fixture
+def store():
+    store = MemoryObjectStore()
+    with (
+        patch.object(chunk_artifact_module, "get_object_store", return_value=store),
+        patch.object(chunk_artifact_module, "get_default_tokenizer", return_value=mock_tokenizer),
+    ):
+        yield store
+
+
+def make_parts(text: str = "first paragraph"):
+    return [TextPart(content=text, metadata={"titles": ["Title"]}), TextPart(content="", metadata={})]
+
+
+def test_build_counts_tokens_once_per_chunk(store):
+    artifact = build_chunk_artifact(make_parts(), chunk_size=100, chunk_overlap=0)
+
+    assert [c["content"] for c in artifact.chunks] == ["first paragraph"]
+    assert artifact.chunks[0]["tokens"] == 2
+    assert artifact.graph_chunks is None
+
+
+def test_to_parts_copies_metadata(store):
+    artifact = build_chunk_artifact(make_parts(), chunk_size=100, chunk_overlap=0)
+
+    vector_parts = artifact.to_parts({"indexer": "vector"})
+    fulltext_parts = artifact.to_parts()
+
+    assert vector_parts[0].metadata["indexer"] == "vector"
+    assert "indexer" not in fulltext_parts[0].metadata
+    assert "indexer" not in artifact.chunks[0]["metadata"]
+
+
+def test_save_and_load_round_trip(store):
+    artifact = build_chunk_artifact(make_parts(), chunk_size=100, chunk_overlap=0)
+    path = chunk_artifact_path("user-1/doc-1")
+
+    save_chunk_artifact(path, artifact)
+
+    assert path == "user-1/doc-1/chunks.json"
+    assert load_chunk_artifact(path) == artifact
+    assert load_chunk_artifact("missing/chunks.json") is None
+
+
+def test_get_uses_stored_artifact_without_rechunking(store):
+    parts = make_parts()
+    with (
+        patch.object(chunk_artifact_module.settings, "chunk_size", 100),
+        patch.object(chunk_artifact_module.settings, "chunk_overlap_size", 5),
+    ):
+        save_chunk_artifact("a/chunks.json", build_chunk_artifact(parts))
+        with patch.object(chunk_artifact_module, "rechunk") as rechunk:
+            artifact = get_chunk_artifact("a/chunks.json", parts)
+
+    rechunk.assert_not_called()
+    assert artifact.chunks[0]["content"] == "first paragraph"
+
+
+def test_get_rebuilds_stale_artifact(store):
+    with (
+        patch.object(chunk_artifact_module.settings, "chunk_size", 100),
+        patch.object(chunk_artifact_module.settings, "chunk_overlap_size", 5),
+    ):
+        save_chunk_artifact("a/chunks.json", build_chunk_artifact(make_parts("old text")))
+        artifact = get_chunk_artifact("a/chunks.json", make_parts("new text"))
+
+    assert [c["content"] for c in artifact.chunks] == ["new text"]
+    # The stored artifact is left for the parse stage to overwrite
+    stored = ChunkArtifact.from_dict(json.loads(store.objects["a/chunks.json"]))
+    assert stored.chunks[0]["content"] == "old text"
+
+
+def test_get_computes_missing_graph_chunks(store):
+    pytest.importorskip("aperag.graph.lightrag_manager")
+    parts = make_parts()
+    chunk_for_graph = MagicMock(return_value=[{"content": "graph chunk", "tokens": 2, "chunk_order_index": 0}])
+    with (
+        patch.object(chunk_artifact_module.settings, "chunk_size", 100),
+        patch.object(chunk_artifact_module.settings, "chunk_overlap_size", 5),
+        patch("aperag.graph.lightrag_manager.chunk_content_for_graph", chunk_for_graph),
+    ):
+        save_chunk_artifact("a/chunks.json", build_chunk_artifact(parts))
+        artifact = get_chunk_artifact("a/chunks.json", parts, "first paragraph", include_graph_chunks=True)
+
+    chunk_for_graph.assert_called_once_with("first paragraph")
+    assert artifact.graph_chunks[0]["content"] == "graph chunk"
+
+
+def test_parsed_document_data_carries_chunks_path():
+    data = ParsedDocumentData(
+        document_id="doc-1",
+        collection_id="col-1",
+        content="text",
+        doc_parts=[],
+        file_path="/tmp/doc.md",
+        local_doc_info=LocalDocumentInfo(path="/tmp/doc.md", is_temp=False),
+        chunks_path="user-1/doc-1/chunks.json",
+    )
+
+    restored = ParsedDocumentData.from_dict(data.to_dict())
+
+    assert restored.chunks_path == "user-1/doc-1/chunks.json"
+    assert ParsedDocumentData.from_dict({**data.to_dict(), "chunks_path": None}).chunks_path is None
@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from aperag.docparser.base import TextPart
+from aperag.index import fulltext_index
+from aperag.index.fulltext_index import MAX_REPORTED_FAILED_CHUNKS, FulltextIndexer
+
+
+@pytest.fixture
+def es():
+    client = MagicMock()
+    client.indices.exists.return_value.body = True
+    client.indices.get_settings.return_value.body = {"idx": {"settings": {"index": {"refresh_interval": "5s"}}}}
+    return client
+
+
+@pytest.fixture
+def indexer(es):
+    with (
+        patch.object(fulltext_index, "Elasticsearch", return_value=es),
+        patch.object(fulltext_index, "AsyncElasticsearch"),
+    ):
+        yield FulltextIndexer(es_host="http://es.example:9200")
+
+
+@pytest.fixture(autouse=True)
+def passthrough_rechunk():
+    with (
+        patch.object(fulltext_index, "rechunk", side_effect=lambda parts, *args: parts),
+        patch.object(fulltext_index, "get_default_tokenizer"),
+    ):
+        yield
+
+
+@pytest.fixture
+def bulk():
+    with patch.object(fulltext_index.helpers, "streaming_bulk") as mock_bulk:
+        mock_bulk.side_effect = lambda client, actions, **kwargs: [
+            (True, {"index": {"_id": action["_id"]}}) for action in actions
+        ]
+        yield mock_bulk
+
+
+def make_parts(count: int):
+    return [TextPart(content=f"chunk {i}", metadata={"titles": ["Title"]}) for i in range(count)]
+
+
+def failing_bulk(failed_ids):
+    def bulk(client, actions, **kwargs):
+        for action in actions:
+            if action["_id"] in failed_ids:
+                yield False, {"index": {"_id": action["_id"], "error": {"type": "mapper_parsing_exception"}}}
+            else:
+                yield True, {"index": {"_id": action["_id"]}}
+
+    return bulk
+
+
+def refresh_intervals(es):
+    return [c.kwargs["settings"]["index"]["refresh_interval"] for c in es.indices.put_settings.call_args_list]
+
+
+def test_process_chunks_checks_index_once_and_uses_bulk(indexer, es, bulk):
+    chunk_count, total_length, failed = indexer._process_chunks(1, make_parts(5), "doc.md", "idx")
+
+    assert chunk_count == 5
+    assert total_length == sum(len(f"chunk {i}") for i in range(5))
+    assert failed == []
+    es.indices.exists.assert_called_once_with(index="idx")
+    es.index.assert_not_called()
+    bulk.assert_called_once()
+    assert bulk.call_args.kwargs["raise_on_error"] is False
+    es.indices.put_settings.assert_not_called()
+
+
+def test_process_chunks_reports_partial_failures(indexer, bulk):
+    bulk.side_effect = failing_bulk({"1_1"})
+
+    chunk_count, _, failed = indexer._process_chunks(1, make_parts(3), "doc.md", "idx")
+
+    assert chunk_count == 2
+    assert [f["chunk_id"] for f in failed] == ["1_1"]
+    assert "mapper_parsing_exception" in failed[0]["error"]
+
+    result = indexer._create_success_result("idx", "doc.md", chunk_count, 10, "created", failed)
+    assert result.success
+    assert result.metadata["failed_chunk_count"] == 1
+
+
+def test_all_chunks_failed_is_a_failure_with_capped_report(indexer, bulk):
+    parts = make_parts(MAX_REPORTED_FAILED_CHUNKS + 5)
+    bulk.side_effect = failing_bulk({f"1_{i}" for i in range(len(parts))})
+
+    chunk_count, total_length, failed = indexer._process_chunks(1, parts, "doc.md", "idx")
+    result = indexer._create_success_result("idx", "doc.md", chunk_count, total_length, "created", failed)
+
+    assert chunk_count == 0
+    assert not result.success
+    assert "mapper_parsing_exception" in result.error
+    assert result.metadata["failed_chunk_count"] == len(parts)
+    assert len(result.metadata["failed_chunks"]) == MAX_REPORTED_FAILED_CHUNKS
+
+
+def test_process_chunks_skips_missing_index(indexer, es, bulk):
+    es.indices.exists.return_value.body = False
+
+    assert indexer._process_chunks(1, make_parts(3), "doc.md", "idx") == (0, 0, [])
+    bulk.assert_not_called()
+
+
+def test_refresh_is_disabled_and_restored_for_large_documents(indexer, es, bulk):
+    with patch.object(fulltext_index.settings, "es_bulk_disable_refresh_min_chunks", 3):
+        indexer._process_chunks(1, make_parts(3), "doc.md", "idx")
+
+    assert refresh_intervals(es) == ["-1", "5s"]
+    es.indices.refresh.assert_called_once_with(index="idx")
+
+
+def test_refresh_is_restored_when_bulk_raises(indexer, es, bulk):
+    bulk.side_effect = RuntimeError("boom")
+
+    with patch.object(fulltext_index.settings, "es_bulk_disable_refresh_min_chunks", 1):
+        with pytest.raises(RuntimeError):
+            indexer._process_chunks(1, make_parts(2), "doc.md", "idx")
+
+    assert refresh_intervals(es) == ["-1", "5s"]
+
+
+def test_refresh_already_disabled_is_left_alone(indexer, es, bulk):
+    # A concurrent bulk load into the same index owns the refresh setting
+    es.indices.get_settings.return_value.body = {"idx": {"settings": {"index": {"refresh_interval": "-1"}}}}
+
+    with patch.object(fulltext_index.settings, "es_bulk_disable_refresh_min_chunks", 1):
+        chunk_count, _, _ = indexer._process_chunks(1, make_parts(2), "doc.md", "idx")
+
+    assert chunk_count == 2
+    es.indices.put_settings.assert_not_called()
+    es.indices.refresh.assert_not_called()
+
+
+def test_refresh_untouched_when_reading_settings_fails(indexer, es, bulk):
+    es.indices.get_settings.side_effect = ConnectionError("es unavailable")
+
+    with patch.object(fulltext_index.settings, "es_bulk_disable_refresh_min_chunks", 1):
+        chunk_count, _, _ = indexer._process_chunks(1, make_parts(2), "doc.md", "idx")
+
+    assert chunk_count == 2
+    es.indices.put_settings.assert_not_called()
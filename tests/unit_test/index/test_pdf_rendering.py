@@ -0,0 +1,160 @@
+"""
+Unit tests for rendering PDF pages to image assets and uploading them while they are rendered.
+"""
+
+import io
+import threading
+import time
+from unittest.mock import patch
+
+import pikepdf
+import pytest
+from PIL import Image
+
+from aperag.docparser.base import AssetBinPart, MarkdownPart, PdfPart
+from aperag.index import document_parser as document_parser_module
+from aperag.index.document_parser import DocumentParser
+from aperag.index.pdf_renderer import PdfPageRenderer, PdfRenderOptions
+from aperag.schema.view_models import CollectionConfig
+
+
+def make_pdf(pages_with_text, path=None) -> bytes:
+    """A PDF of US letter pages, with a line of text on the pages flagged True"""
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(
+        pikepdf.Dictionary(Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica)
+    )
+    for has_text in pages_with_text:
+        page = pdf.add_blank_page(page_size=(612, 792))
+        if has_text:
+            page.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+            page.Contents = pdf.make_stream(b"BT /F1 24 Tf 72 700 Td (Hello) Tj ET")
+    with io.BytesIO() as buffer:
+        pdf.save(buffer)
+        data = buffer.getvalue()
+    if path is not None:
+        path.write_bytes(data)
+    return data
+
+
+def image_size(data: bytes):
+    with Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+class MemoryObjectStore:
+    def __init__(self, delay: float = 0):
+        self.objects = {}
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def put(self, path, data):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.objects[path] = data
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def store():
+    store = MemoryObjectStore()
+    with patch.object(document_parser_module, "get_object_store", return_value=store):
+        yield store
+
+
+def test_pages_are_rendered_at_the_requested_dpi(tmp_path):
+    path = tmp_path / "doc.pdf"
+    make_pdf([False, False], path)
+
+    pages = list(PdfPageRenderer().render(str(path), PdfRenderOptions(dpi=144)))
+
+    assert [page.index for page in pages] == [0, 1]
+    assert image_size(pages[0].data) == (1224, 1584)
+
+
+def test_pages_with_a_text_layer_can_be_skipped(tmp_path):
+    path = tmp_path / "doc.pdf"
+    make_pdf([True, False], path)
+
+    pages = list(PdfPageRenderer().render(str(path), PdfRenderOptions(skip_text_pages=True)))
+
+    assert [(page.index, page.data is None) for page in pages] == [(0, True), (1, False)]
+
+
+def test_process_pool_yields_every_page(tmp_path):
+    path = tmp_path / "doc.pdf"
+    make_pdf([False] * 5, path)
+
+    pages = list(PdfPageRenderer(workers=2, max_pending=2).render(str(path), PdfRenderOptions(dpi=36)))
+
+    assert sorted(page.index for page in pages) == [0, 1, 2, 3, 4]
+    assert all(image_size(page.data) == (306, 396) for page in pages)
+
+
+def test_render_options_follow_the_collection():
+    parser = DocumentParser()
+
+    with patch.object(document_parser_module.settings, "pdf_render_dpi", 100):
+        assert parser.get_pdf_render_options() == PdfRenderOptions(dpi=100, skip_text_pages=False)
+        assert parser.get_pdf_render_options(CollectionConfig(enable_vision=False)) == PdfRenderOptions(
+            dpi=100, skip_text_pages=True
+        )
+        assert parser.get_pdf_render_options(
+            CollectionConfig(enable_vision=True, pdf_render_dpi=200)
+        ) == PdfRenderOptions(dpi=200, skip_text_pages=False)
+
+
+def test_rendered_pages_are_uploaded_and_only_kept_for_the_vision_index(store):
+    parser = DocumentParser()
+    pdf_part = PdfPart(data=make_pdf([True, False, False]))
+    doc_parts = [MarkdownPart(markdown="Hello"), pdf_part]
+
+    with patch.object(document_parser_module.settings, "pdf_render_workers", 1):
+        pages = parser.render_pdf_pages(
+            [pdf_part], {"name": "doc.pdf"}, PdfRenderOptions(skip_text_pages=True), vision_index=False
+        )
+        parser.save_processed_content_and_assets(doc_parts, "user/doc", pages)
+
+    assert sorted(path for path in store.objects if "/assets/" in path) == [
+        "user/doc/assets/page_1.png",
+        "user/doc/assets/page_2.png",
+    ]
+    assert doc_parts == []
+
+
+def test_vision_pages_stay_in_the_parts(store):
+    parser = DocumentParser()
+    pdf_part = PdfPart(data=make_pdf([True, False]))
+    doc_parts = [pdf_part]
+
+    with patch.object(document_parser_module.settings, "pdf_render_workers", 1):
+        pages = parser.render_pdf_pages([pdf_part], {"name": "doc.pdf"}, PdfRenderOptions())
+        parser.save_processed_content_and_assets(doc_parts, "user/doc", pages)
+
+    assert sorted(part.asset_id for part in doc_parts) == ["page_0.png", "page_1.png"]
+    assert doc_parts[0].metadata["name"] == "doc.pdf"
+    assert "user/doc/assets/page_0.png" in store.objects
+
+
+def test_uploads_are_bounded_and_pull_assets_lazily():
+    store = MemoryObjectStore(delay=0.02)
+    produced = []
+
+    def assets():
+        for i in range(10):
+            # Assets are not produced further ahead than the uploads in flight
+            assert len(produced) - len(store.objects) <= 3
+            produced.append(i)
+            yield AssetBinPart(asset_id=f"page_{i}.png", data=b"png", mime_type="image/png")
+
+    with patch.object(document_parser_module.settings, "asset_upload_concurrency", 3):
+        count = DocumentParser().upload_assets(store, "base", assets())
+
+    assert count == 10
+    assert len(store.objects) == 10
+    assert store.max_in_flight <= 3
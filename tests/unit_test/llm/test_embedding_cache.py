@@ -0,0 +1,137 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from aperag.llm.embed import embedding_service as embedding_service_module
+from aperag.llm.embed.embedding_cache import (
+    EmbeddingCache,
+    _LRUCache,
+    make_cache_namespace,
+    pack_vector,
+    unpack_vector,
+)
+from aperag.llm.embed.embedding_service import EmbeddingService
+
+
+def fake_vector(text: str):
+    # Deterministic vector derived from the text, exactly representable in float32
+    return [float(len(text)), float(ord(text[0])), 0.5]
+
+
+@pytest.fixture
+def cache():
+    return EmbeddingCache(local_max_size=100, ttl=60, redis_url=None)
+
+
+@pytest.fixture
+def service(cache):
+    svc = EmbeddingService("openai", "text-embedding-3-small", "http://a.example/v1", "key", 2)
+    with patch.object(embedding_service_module, "get_embedding_cache", return_value=cache):
+        yield svc
+
+
+def record_batches(svc):
+    sent = []
+
+    def embed_batch_with_indices(batch, start_idx, caching=True):
+        sent.append((list(batch), caching))
+        return [(start_idx + i, fake_vector(text)) for i, text in enumerate(batch)]
+
+    svc._embed_batch_with_indices = embed_batch_with_indices
+    return sent
+
+
+def test_pack_unpack_round_trip():
+    vector = [0.1, -2.5, 3.0, 1e-3]
+    unpacked = unpack_vector(pack_vector(vector))
+    assert len(pack_vector(vector)) == 4 * len(vector)
+    assert unpacked == np.asarray(vector, dtype=np.float32).tolist()
+
+
+def test_lru_evicts_least_recently_used():
+    lru = _LRUCache(max_size=2)
+    lru.put("a", b"1")
+    lru.put("b", b"2")
+    assert lru.get("a") == b"1"
+    lru.put("c", b"3")
+    assert lru.get("b") is None
+    assert lru.get("a") == b"1"
+    assert lru.get("c") == b"3"
+
+
+def test_namespace_separates_deployments():
+    a = make_cache_namespace("openai", "m", "http://a.example/v1")
+    b = make_cache_namespace("openai", "m", "http://b.example/v1")
+    mm = make_cache_namespace("openai", "m", "http://a.example/v1", multimodal=True)
+    assert len({a, b, mm}) == 3
+    assert EmbeddingCache.make_key(a, "text") != EmbeddingCache.make_key(b, "text")
+
+
+def test_only_misses_are_sent_and_order_is_kept(service, cache):
+    sent = record_batches(service)
+    cache.put_many(service._cache_namespace(), ["beta", "delta"], [fake_vector("beta"), fake_vector("delta")])
+
+    texts = ["alpha", "beta", "gamma", "delta"]
+    result = service.embed_documents(texts)
+
+    assert result == [fake_vector(t) for t in texts]
+    assert sorted(t for batch, _ in sent for t in batch) == ["alpha", "gamma"]
+    # litellm's whole-batch cache is bypassed when the per-text cache is in use
+    assert all(caching is False for _, caching in sent)
+
+
+def test_duplicate_texts_are_embedded_once(service):
+    sent = record_batches(service)
+
+    result = service.embed_documents(["same", "other", "same", "same"])
+
+    assert [t for batch, _ in sent for t in batch].count("same") == 1
+    assert result == [fake_vector("same"), fake_vector("other"), fake_vector("same"), fake_vector("same")]
+
+    sent.clear()
+    assert service.embed_documents(["same"]) == [fake_vector("same")]
+    assert sent == []
+
+
+def test_misses_have_same_precision_as_hits(service):
+    service._embed_batch_with_indices = lambda batch, start_idx, caching=True: [
+        (start_idx + i, [0.1, 0.2]) for i in range(len(batch))
+    ]
+    first = service.embed_documents(["text"])
+    second = service.embed_documents(["text"])
+    assert first == second == [np.asarray([0.1, 0.2], dtype=np.float32).tolist()]
+
+
+def test_redis_errors_fall_back_to_miss():
+    cache = EmbeddingCache(local_max_size=0, ttl=60, redis_url="redis://localhost:1/2")
+    client = MagicMock()
+    client.mget.side_effect = ConnectionError("redis down")
+    client.pipeline.return_value.execute.side_effect = ConnectionError("redis down")
+
+    with patch.object(cache, "_get_redis", return_value=client):
+        packed = cache.put_many("ns", ["a"], [[1.0]])
+        assert cache.get_many("ns", ["a", "b"]) == {}
+
+    assert unpack_vector(packed[0]) == [1.0]
+
+
+def test_redis_hits_are_promoted_to_local_tier():
+    cache = EmbeddingCache(local_max_size=10, ttl=60, redis_url="redis://localhost:1/2")
+    client = MagicMock()
+    client.mget.return_value = [None, pack_vector([2.0, 3.0])]
+
+    with patch.object(cache, "_get_redis", return_value=client):
+        assert cache.get_many("ns", ["a", "b"]) == {1: [2.0, 3.0]}
+        client.mget.reset_mock()
+        assert cache.get_many("ns", ["b"]) == {0: [2.0, 3.0]}
+        client.mget.assert_not_called()
+
+
+def test_caching_disabled_bypasses_cache(cache):
+    svc = EmbeddingService("openai", "m", None, "key", 2, caching=False)
+    sent = record_batches(svc)
+    with patch.object(embedding_service_module, "get_embedding_cache", return_value=cache):
+        svc.embed_documents(["x"])
+        svc.embed_documents(["x"])
+    assert len(sent) == 2
@@ -0,0 +1,100 @@
+"""
+Unit tests for the in-process search path of the MCP tools and the pooled API client.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from aperag.exceptions import CollectionNotFoundException
+from aperag.mcp import server
+from aperag.schema.view_models import SearchResult, SearchResultItem
+from aperag.service.collection_service import collection_service
+
+
+def tool(func):
+    # Depending on the fastmcp version, tools are plain functions or FunctionTool objects
+    return getattr(func, "fn", func)
+
+
+def search_result(count):
+    return SearchResult(
+        query="q", items=[SearchResultItem(rank=i + 1, score=1.0 - i / 10, content=f"c{i}") for i in range(count)]
+    )
+
+
+@pytest.fixture
+def in_process(monkeypatch):
+    monkeypatch.setenv("APERAG_API_KEY", "sk-test")
+    server.enable_in_process_mode()
+    try:
+        with patch.object(server, "get_api_key_user_id", AsyncMock(return_value="user-1")) as get_user:
+            yield get_user
+    finally:
+        server.enable_in_process_mode(False)
+
+
+def test_collection_search_runs_in_process(in_process):
+    create_search = AsyncMock(return_value=search_result(8))
+
+    with (
+        patch.object(collection_service, "create_search", create_search),
+        patch.object(server, "get_http_client", side_effect=AssertionError("no HTTP call expected")),
+    ):
+        result = asyncio.run(tool(server.search_collection)("col-1", "what is aperag", topk=3, use_graph_index=False))
+
+    in_process.assert_awaited_once_with("sk-test")
+    user_id, collection_id, request = create_search.await_args.args
+    assert (user_id, collection_id) == ("user-1", "col-1")
+    assert request.query == "what is aperag"
+    assert request.graph_search is None
+    assert request.vector_search.topk == 3
+    assert [item["rank"] for item in result["items"]] == [1, 2, 3]
+
+
+def test_in_process_errors_are_reported_like_the_api(in_process):
+    with patch.object(collection_service, "create_search", AsyncMock(side_effect=CollectionNotFoundException("col-x"))):
+        result = asyncio.run(tool(server.search_collection)("col-x", "q"))
+
+    assert result["error"] == "Search failed: 404"
+    assert json.loads(result["details"])["error_code"] == "COLLECTION_NOT_FOUND"
+
+
+def test_unknown_api_key_is_rejected_in_process(in_process):
+    in_process.return_value = None
+    create_search = AsyncMock()
+
+    with patch.object(collection_service, "create_search", create_search):
+        result = asyncio.run(tool(server.search_collection)("col-1", "q"))
+
+    assert result["error"] == "Search failed: 401"
+    create_search.assert_not_awaited()
+
+
+def test_remote_mode_reuses_one_keep_alive_client(monkeypatch):
+    monkeypatch.setenv("APERAG_API_KEY", "sk-test")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=search_result(2).model_dump(mode="json"))
+
+    async def run():
+        client = httpx.AsyncClient(base_url=server.API_BASE_URL, transport=httpx.MockTransport(handler))
+        server._http_clients[asyncio.get_running_loop()] = client
+        first = await tool(server.search_chat_files)("chat-1", "q")
+        second = await tool(server.search_chat_files)("chat-1", "q")
+        same_client = server.get_http_client() is client
+        await server.close_http_client()
+        return first, second, same_client, client.is_closed
+
+    first, second, same_client, closed = asyncio.run(run())
+
+    assert same_client and closed
+    assert first == second
+    assert len(first["items"]) == 2
+    assert [str(r.url) for r in requests] == ["http://localhost:8000/api/v1/chats/chat-1/search"] * 2
+    assert requests[0].headers["Authorization"] == "Bearer sk-test"
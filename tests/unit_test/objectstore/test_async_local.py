@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import io
 import shutil
 import tempfile
@@ -366,3 +367,38 @@ async def test_delete_by_prefix_removes_empty_directories(async_local_service: A
     # Assert that the parent directory `level1_async` still exists because it contains `other.txt`
     assert level1_dir.is_dir()
     assert await async_local_service.obj_exists(other_file_in_parent)
+
+
+@pytest.mark.asyncio
+async def test_streams_are_read_in_chunks_of_the_configured_size(local_config: LocalConfig):
+    store = AsyncLocal(cfg=local_config, chunk_size=4)
+    await store.put("chunked.txt", b"0123456789")
+
+    iterator, size = await store.get("chunked.txt")
+    assert size == 10
+    assert [chunk async for chunk in iterator] == [b"0123", b"4567", b"89"]
+
+    iterator, length = await store.stream_range("chunked.txt", 3, 8)
+    assert length == 6
+    assert [chunk async for chunk in iterator] == [b"3456", b"78"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads(async_local_service: AsyncLocal):
+    await async_local_service.put("a.txt", b"a" * 100)
+    results = await asyncio.gather(*(async_local_service.get("a.txt") for _ in range(8)))
+
+    contents = [b"".join([chunk async for chunk in iterator]) for iterator, _ in results]
+    assert contents == [b"a" * 100] * 8
+
+
+@pytest.mark.asyncio
+async def test_local_path(async_local_service: AsyncLocal):
+    await async_local_service.put("docs/file.pdf", b"%PDF")
+
+    local_path = await async_local_service.local_path("docs/file.pdf")
+    assert local_path is not None
+    with open(local_path, "rb") as f:
+        assert f.read() == b"%PDF"
+    assert await async_local_service.local_path("docs/missing.pdf") is None
+    assert await async_local_service.local_path("../outside.pdf") is None
@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+import pytest
+
+from aperag.objectstore.local import Local, LocalConfig
+from aperag.tasks import parsed_artifact
+from aperag.tasks.models import LocalDocumentInfo, ParsedDocumentData
+from aperag.tasks.parsed_artifact import (
+    ParsedDataRef,
+    decode_parsed_data,
+    encode_parsed_data,
+    load_parsed_data,
+    resolve_parsed_data,
+    store_parsed_data,
+)
+
+
+class Part:
+    def __init__(self, content, metadata):
+        self.content = content
+        self.metadata = metadata
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = Local(LocalConfig(root_dir=str(tmp_path)))
+    with patch.object(parsed_artifact, "get_object_store", return_value=store):
+        yield store
+
+
+def assert_same_parsed_data(loaded: ParsedDocumentData, expected: ParsedDocumentData):
+    assert loaded.content == expected.content
+    assert loaded.chunks_path == expected.chunks_path
+    assert loaded.local_doc_info == expected.local_doc_info
+    assert [(p.content, p.metadata) for p in loaded.doc_parts] == [(p.content, p.metadata) for p in expected.doc_parts]
+
+
+def make_parsed_data(content: str = "hello world") -> ParsedDocumentData:
+    return ParsedDocumentData(
+        document_id="doc-1",
+        collection_id="col-1",
+        content=content,
+        doc_parts=[Part(content, {"titles": ["Title"], "image": "aGVsbG8=" * 100})],
+        file_path="/tmp/doc.md",
+        local_doc_info=LocalDocumentInfo(path="/tmp/doc.md", is_temp=True),
+        chunks_path="user-1/col-1/doc-1/chunks.json",
+    )
+
+
+def test_encode_decode_round_trip():
+    parsed_data = make_parsed_data()
+    data = encode_parsed_data(parsed_data)
+
+    decoded = decode_parsed_data(data)
+
+    assert_same_parsed_data(decoded, parsed_data)
+    assert len(data) < len(str(parsed_data.to_dict()))
+
+
+def test_decode_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        decode_parsed_data(b"{}")
+
+
+@pytest.mark.parametrize("mmap_enabled", [True, False])
+def test_store_and_load_by_reference(store, mmap_enabled):
+    parsed_data = make_parsed_data()
+    ref = store_parsed_data(parsed_data, "user-1/col-1/doc-1")
+
+    payload = ref.to_dict()
+    assert "content" not in payload
+    assert ref.key == f"user-1/col-1/doc-1/parsed_data/{ref.version}.bin"
+
+    with patch.object(parsed_artifact.settings, "parsed_artifact_mmap", mmap_enabled):
+        loaded = resolve_parsed_data(payload)
+
+    assert_same_parsed_data(loaded, parsed_data)
+
+
+def test_store_replaces_earlier_versions(store):
+    old_ref = store_parsed_data(make_parsed_data("old"), "user-1/col-1/doc-1")
+    new_ref = store_parsed_data(make_parsed_data("new"), "user-1/col-1/doc-1")
+
+    assert old_ref.version != new_ref.version
+    assert not store.obj_exists(old_ref.key)
+    with pytest.raises(FileNotFoundError):
+        load_parsed_data(old_ref)
+    assert load_parsed_data(new_ref).content == "new"
+
+
+def test_resolve_accepts_inline_parsed_data():
+    parsed_data = make_parsed_data()
+
+    resolved = resolve_parsed_data(parsed_data.to_dict())
+
+    assert not ParsedDataRef.is_ref(parsed_data.to_dict())
+    assert resolved.content == parsed_data.content
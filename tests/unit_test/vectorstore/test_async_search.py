@@ -0,0 +1,134 @@
+"""
+Unit tests for the async vector search path: shared connectors, ContextManager.aquery and the search runners.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from aperag.context.context import ContextManager
+from aperag.flow.runners import vector_search
+from aperag.flow.runners.vector_search import VectorSearchService
+from aperag.query.query import DocumentWithScore, QueryWithEmbedding
+from aperag.vectorstore.connector import get_vector_store_adaptor
+
+
+def memory_ctx(collection):
+    return {"url": ":memory:", "collection": collection, "distance": "Cosine"}
+
+
+def add_points(adaptor, collection):
+    client = adaptor.connector.client
+    client.create_collection(collection, vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    client.upsert(
+        collection,
+        points=[
+            PointStruct(
+                id=1,
+                vector=[1.0, 0.0],
+                payload={"text": "vector chunk", "metadata": {}, "indexer": "vector", "_node_content": "{}"},
+            ),
+            PointStruct(
+                id=2,
+                vector=[0.9, 0.1],
+                payload={"text": "summary chunk", "metadata": {}, "indexer": "summary", "_node_content": "{}"},
+            ),
+        ],
+    )
+
+
+def test_adaptors_are_shared_per_context():
+    first = get_vector_store_adaptor("qdrant", memory_ctx("shared-a"))
+    second = get_vector_store_adaptor("qdrant", memory_ctx("shared-a"))
+    other = get_vector_store_adaptor("qdrant", memory_ctx("shared-b"))
+
+    assert first is second
+    assert other is not first
+
+
+def test_aquery_matches_query():
+    collection = "aquery-collection"
+    embedding_model = MagicMock()
+    embedding_model.aembed_query = AsyncMock(return_value=[1.0, 0.0])
+    manager = ContextManager(collection, embedding_model, "qdrant", memory_ctx(collection))
+    add_points(manager.adaptor, collection)
+
+    async_results = asyncio.run(manager.aquery("q", score_threshold=0.1, topk=5, index_types=["vector"]))
+    sync_results = manager.query("q", score_threshold=0.1, topk=5, vector=[1.0, 0.0], index_types=["vector"])
+
+    embedding_model.aembed_query.assert_awaited_once_with("q")
+    embedding_model.embed_query.assert_not_called()
+    assert [r.text for r in async_results] == [r.text for r in sync_results] == ["vector chunk"]
+
+
+def test_remote_search_uses_the_async_client():
+    connector = get_vector_store_adaptor("qdrant", memory_ctx("remote")).connector
+    async_client = MagicMock()
+    async_client.query_points = AsyncMock(return_value=SimpleNamespace(points=[]))
+    query = QueryWithEmbedding(query="q", top_k=3, embedding=[1.0, 0.0])
+
+    with (
+        patch.object(connector, "url", "http://qdrant"),
+        patch.object(connector, "_get_async_client", return_value=async_client),
+        patch.object(connector.client, "query_points") as sync_query,
+    ):
+        result = asyncio.run(connector.asearch(query, score_threshold=0.3, filter="f"))
+
+    sync_query.assert_not_called()
+    kwargs = async_client.query_points.await_args.kwargs
+    assert kwargs["collection_name"] == "remote"
+    assert kwargs["limit"] == 3
+    assert kwargs["score_threshold"] == 0.3
+    assert kwargs["query_filter"] == "f"
+    assert result.results == []
+
+
+def test_async_clients_are_created_per_event_loop():
+    connector = get_vector_store_adaptor("qdrant", memory_ctx("per-loop")).connector
+
+    async def get_client():
+        first = connector._get_async_client()
+        assert connector._get_async_client() is first
+        return first
+
+    with patch("qdrant_client.AsyncQdrantClient", side_effect=lambda **kwargs: MagicMock()):
+        assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+
+@pytest.mark.parametrize(
+    "error, expected_log",
+    [(None, None), (RuntimeError("qdrant down"), "error")],
+)
+def test_vector_search_service_uses_async_calls(error, expected_log):
+    collection = SimpleNamespace(id="col-1", config="{}")
+    repository = MagicMock()
+    repository.get_collection = AsyncMock(return_value=collection)
+    embedding_model = MagicMock()
+    embedding_model.aembed_query = AsyncMock(return_value=[0.1, 0.2])
+    docs = [DocumentWithScore(text="chunk", score=0.9, metadata=None)]
+    aquery = AsyncMock(return_value=docs, side_effect=error)
+
+    with (
+        patch.object(vector_search, "get_collection_embedding_service", AsyncMock(return_value=(embedding_model, 2))),
+        patch.object(vector_search.settings, "vector_db_context", json.dumps({"url": ":memory:"})),
+        patch.object(vector_search.ContextManager, "aquery", aquery),
+        patch.object(vector_search.ContextManager, "query") as sync_query,
+    ):
+        results = asyncio.run(
+            VectorSearchService(repository).execute_vector_search(
+                user="u", query="q", top_k=3, similarity_threshold=0.2, collection_ids=["col-1"], chat_id="chat"
+            )
+        )
+
+    sync_query.assert_not_called()
+    embedding_model.embed_query.assert_not_called()
+    assert aquery.await_args.kwargs["vector"] == [0.1, 0.2]
+    assert aquery.await_args.kwargs["chat_id"] == "chat"
+    if error is None:
+        assert results[0].metadata == {"recall_type": "vector_search"}
+    else:
+        assert results == []